@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+QuantumTrader Pro - Historical Bar Sources
+Pluggable bar loaders for MTBacktester: a live MT4/MT5 terminal, or local
+CSV / Parquet / NPY archives read in chunks with date-range pushdown
+
+Every source returns the frame MT5.copy_rates_* produces: time, open, high,
+low, close, tick_volume, spread, real_volume. Date ranges include both
+ends, as MT5.copy_rates_range does.
+"""
+
+import glob
+import hashlib
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+# Bar layout of MT5.copy_rates_* (time in epoch seconds)
+RATE_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')
+])
+PRICE_FIELDS = ('open', 'high', 'low', 'close')
+
+CSV_CHUNK_ROWS = 500_000
+PARQUET_BATCH_ROWS = 500_000
+
+# Column names accepted in headed CSV / Parquet files
+TIME_COLUMNS = ('time', 'datetime', 'timestamp', 'date')
+FIELD_ALIASES = {
+    'tick_volume': ('tick_volume', 'tickvol', 'volume'),
+    'spread': ('spread',),
+    'real_volume': ('real_volume', 'vol', 'real volume'),
+}
+
+# MT5 terminal export: tab-separated with <DATE> <TIME> ... headers
+MT5_EXPORT_COLUMNS = {
+    '<DATE>': 'date', '<TIME>': 'clock', '<OPEN>': 'open', '<HIGH>': 'high', '<LOW>': 'low',
+    '<CLOSE>': 'close', '<TICKVOL>': 'tick_volume', '<VOL>': 'real_volume', '<SPREAD>': 'spread'
+}
+# MT4 History Center export: headerless date,time,open,high,low,close,volume
+MT4_EXPORT_COLUMNS = ['date', 'clock', 'open', 'high', 'low', 'close', 'tick_volume']
+
+
+def to_epoch_seconds(value):
+    """Epoch seconds of a timestamp-like value (None stays None)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, np.integer)):
+        # Millisecond epochs (e.g. some exporters) are three digits longer
+        return int(value) // 1000 if value > 10**11 else int(value)
+    stamp = pd.Timestamp(value)
+    if stamp.tz is not None:
+        stamp = stamp.tz_convert('UTC').tz_localize(None)
+    return stamp.value // 10**9
+
+
+def rates_to_frame(rates):
+    """DataFrame in the layout of MT5 rates, with time as datetime"""
+    df = pd.DataFrame(rates)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    return df
+
+
+def _frame_to_rates(df, times):
+    """Structured RATE_DTYPE array from normalized columns and epoch-second times"""
+    rates = np.zeros(len(df), dtype=RATE_DTYPE)
+    rates['time'] = times
+    for field in PRICE_FIELDS:
+        rates[field] = df[field].to_numpy(dtype=np.float64)
+    for field in ('tick_volume', 'spread', 'real_volume'):
+        if field in df:
+            rates[field] = df[field].fillna(0).to_numpy()
+    return rates
+
+
+def _times_from_column(values):
+    """Epoch seconds from a time column of datetimes, strings or epoch numbers"""
+    if pd.api.types.is_numeric_dtype(values):
+        seconds = values.to_numpy(dtype=np.int64)
+        # Millisecond epochs (e.g. some exporters) are three digits longer
+        return seconds // 1000 if len(seconds) and seconds.max() > 10**11 else seconds
+    stamps = pd.to_datetime(values)
+    if stamps.dt.tz is not None:
+        stamps = stamps.dt.tz_convert('UTC').dt.tz_localize(None)
+    return stamps.to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+
+def _normalize_columns(df):
+    """Rename headed-file columns to the rate fields; returns (frame, time column)"""
+    lower = {c: str(c).strip().lower() for c in df.columns}
+    df = df.rename(columns=lower)
+    time_column = next((c for c in TIME_COLUMNS if c in df.columns), None)
+    if time_column is None:
+        raise ValueError(f"No time column found (expected one of {', '.join(TIME_COLUMNS)})")
+    missing = [f for f in PRICE_FIELDS if f not in df.columns]
+    if missing:
+        raise ValueError(f"Missing price columns: {', '.join(missing)}")
+    for field, aliases in FIELD_ALIASES.items():
+        found = next((a for a in aliases if a in df.columns), None)
+        if found is not None and found != field and field not in df.columns:
+            df = df.rename(columns={found: field})
+    return df, time_column
+
+
+class RangeFilter:
+    """
+    Keeps bars in [start, end] while a file streams past, chunk by chunk
+
+    Once a time-ordered file passes `end`, the remaining chunks are skipped.
+    """
+
+    def __init__(self, start=None, end=None):
+        self.start = to_epoch_seconds(start)
+        self.end = to_epoch_seconds(end)
+        self.done = False
+        self._last = None
+
+    def chunk(self, rates):
+        times = rates['time']
+        if not len(times):
+            return rates
+        ordered = (self._last is None or times[0] >= self._last) and bool(np.all(times[1:] >= times[:-1]))
+        self._last = times[-1] if ordered else None
+        if self.end is not None and ordered and times[-1] > self.end:
+            self.done = True
+        mask = np.ones(len(times), dtype=bool)
+        if self.start is not None:
+            mask &= times >= self.start
+        if self.end is not None:
+            mask &= times <= self.end
+        return rates if mask.all() else rates[mask]
+
+    def slice_sorted(self, times):
+        """(lo, hi) bounds of the range within an ascending time column"""
+        lo = 0 if self.start is None else int(np.searchsorted(times, self.start, side='left'))
+        hi = len(times) if self.end is None else int(np.searchsorted(times, self.end, side='right'))
+        return lo, max(lo, hi)
+
+
+def _csv_layout(path):
+    """(read_csv options, time builder) for a headed, MT5-export or MT4-export CSV"""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        first = f.readline().strip()
+        second = f.readline().strip()
+    sep = '\t' if '\t' in first else (';' if ';' in first and ',' not in first else ',')
+    fields = [x.strip() for x in first.split(sep)]
+
+    if fields and fields[0].upper() == '<DATE>':
+        names = [MT5_EXPORT_COLUMNS.get(x.upper(), x.lower()) for x in fields]
+        sample = second.split(sep)
+        clock = sample[names.index('clock')] if 'clock' in names and len(sample) > names.index('clock') else ''
+        return {'sep': sep, 'header': 0, 'names': names}, _mt_time_builder(clock)
+
+    if fields and len(fields[0]) == 10 and fields[0][4] == '.' and fields[0][7] == '.':
+        names = MT4_EXPORT_COLUMNS[:len(fields)] + [f'extra{i}' for i in range(len(fields) - 7)]
+        clock = fields[1] if len(fields) > 1 else ''
+        return {'sep': sep, 'header': None, 'names': names}, _mt_time_builder(clock)
+
+    return {'sep': sep, 'header': 0}, None
+
+
+def _mt_time_builder(clock):
+    """Epoch seconds from MT export date ('2024.01.31') and clock ('13:45[:00]') columns"""
+    if not clock:
+        return lambda df: _times_from_column(pd.to_datetime(df['date'], format='%Y.%m.%d'))
+    fmt = '%Y.%m.%d %H:%M:%S' if clock.count(':') == 2 else '%Y.%m.%d %H:%M'
+
+    def build(df):
+        stamps = pd.to_datetime(df['date'].astype(str) + ' ' + df['clock'].astype(str), format=fmt)
+        return stamps.to_numpy(dtype='datetime64[s]').astype(np.int64)
+    return build
+
+
+def read_csv_chunks(path, chunk_rows=CSV_CHUNK_ROWS):
+    """Yield RATE_DTYPE arrays from a CSV bar file, chunk_rows at a time"""
+    options, build_times = _csv_layout(path)
+    price_types = {field: np.float64 for field in PRICE_FIELDS}
+    if build_times is not None:
+        price_types.update(date=str, clock=str)
+    reader = pd.read_csv(path, chunksize=chunk_rows, dtype=price_types if build_times else None,
+                         **options)
+    for df in reader:
+        if build_times is not None:
+            times = build_times(df)
+        else:
+            df, time_column = _normalize_columns(df)
+            times = _times_from_column(df[time_column])
+        yield _frame_to_rates(df, times)
+
+
+def read_parquet_chunks(path, batch_rows=PARQUET_BATCH_ROWS, range_filter=None):
+    """
+    Yield RATE_DTYPE arrays from a Parquet bar file
+
+    Row groups whose time statistics fall outside the filter's range are
+    never read.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet bar files needs pyarrow: pip install pyarrow")
+
+    parquet = pq.ParquetFile(path)
+    columns = [c.lower() for c in parquet.schema_arrow.names]
+    time_column = next((c for c in TIME_COLUMNS if c in columns), None)
+    time_index = columns.index(time_column) if time_column else None
+
+    for group in range(parquet.num_row_groups):
+        if range_filter is not None and time_index is not None:
+            stats = parquet.metadata.row_group(group).column(time_index).statistics
+            if stats is not None and stats.has_min_max:
+                low, high = to_epoch_seconds(stats.min), to_epoch_seconds(stats.max)
+                if range_filter.end is not None and low > range_filter.end:
+                    continue
+                if range_filter.start is not None and high < range_filter.start:
+                    continue
+        for batch in parquet.iter_batches(batch_size=batch_rows, row_groups=[group]):
+            df, column = _normalize_columns(batch.to_pandas())
+            yield _frame_to_rates(df, _times_from_column(df[column]))
+
+
+def load_npy(path):
+    """Memory-mapped RATE_DTYPE-like array from an .npy bar file"""
+    array = np.load(path, mmap_mode='r')
+    if array.dtype.names and 'time' in array.dtype.names:
+        return array
+    if array.ndim == 2 and array.shape[1] >= 5:
+        # Plain matrix: time, open, high, low, close[, tick_volume, spread, real_volume]
+        rates = np.zeros(len(array), dtype=RATE_DTYPE)
+        for k, field in enumerate(RATE_DTYPE.names[:array.shape[1]]):
+            rates[field] = array[:, k]
+        return rates
+    raise ValueError(f"{path}: expected a structured rates array or an (n, >=5) matrix")
+
+
+def _as_rates(array):
+    """Copy of a (possibly memory-mapped) rates array in RATE_DTYPE"""
+    if array.dtype == RATE_DTYPE:
+        return np.array(array)
+    rates = np.zeros(len(array), dtype=RATE_DTYPE)
+    for field in RATE_DTYPE.names:
+        if field in array.dtype.names:
+            rates[field] = array[field]
+    return rates
+
+
+class BarCache:
+    """
+    On-disk cache of parsed bar files as NPY rates arrays
+
+    Entries are keyed by the source file's path, size and modification time,
+    so an edited or replaced archive is parsed again. Cached files are
+    memory-mapped, so a date range reads only the bars it covers.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _entry(self, path):
+        info = os.stat(path)
+        key = f"{os.path.abspath(path)}|{info.st_size}|{info.st_mtime_ns}"
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.directory, f"{name}.{digest}.npy")
+
+    def get(self, path):
+        entry = self._entry(path)
+        return np.load(entry, mmap_mode='r') if os.path.exists(entry) else None
+
+    def put(self, path, rates):
+        os.makedirs(self.directory, exist_ok=True)
+        entry = self._entry(path)
+        partial = f"{entry}.{os.getpid()}.tmp"
+        with open(partial, 'wb') as f:
+            np.save(f, rates)
+        os.replace(partial, entry)
+        return np.load(entry, mmap_mode='r')
+
+
+class BarSource(ABC):
+    """Base class: load(symbol, timeframe, start, end, bars) -> rates DataFrame or None"""
+
+    name = 'source'
+
+    @abstractmethod
+    def load(self, symbol, timeframe, start=None, end=None, bars=None):
+        """
+        Bars from start to end (both inclusive; end defaults to now), or
+        the last `bars` bars when start is None
+        """
+        pass
+
+    def describe(self):
+        return self.name
+
+
+class MT5BarSource(BarSource):
+    """Bars from a connected MT4/MT5 terminal"""
+
+    name = 'MT5 terminal'
+
+    def __init__(self, mt5, timeframe_constant):
+        self.mt5 = mt5
+        self.timeframe_constant = timeframe_constant
+
+    def load(self, symbol, timeframe, start=None, end=None, bars=None):
+        if start is not None:
+            end = pd.Timestamp(end) if end is not None else pd.Timestamp.now()
+            rates = self.mt5.copy_rates_range(symbol, self.timeframe_constant,
+                                              pd.Timestamp(start).to_pydatetime(), end.to_pydatetime())
+        else:
+            rates = self.mt5.copy_rates_from_pos(symbol, self.timeframe_constant, 0, bars)
+        if rates is None or len(rates) == 0:
+            return None
+        return rates_to_frame(rates)
+
+
+class FileBarSource(BarSource):
+    """
+    Bars from local CSV, Parquet or NPY archives
+
+    Args:
+        pattern: file path or glob; may contain {symbol} and {timeframe},
+            e.g. 'data/{symbol}_{timeframe}_*.csv'. Matching files are read
+            in name order (e.g. one file per year) and concatenated.
+        fmt: 'csv', 'parquet' or 'npy' (default: from each file's suffix)
+        cache_dir: directory for parsed-file cache entries ('' disables)
+        chunk_rows: rows per CSV chunk / Parquet batch
+    """
+
+    name = 'local files'
+    FORMATS = {'.csv': 'csv', '.txt': 'csv', '.tsv': 'csv', '.parquet': 'parquet',
+               '.pq': 'parquet', '.npy': 'npy'}
+
+    def __init__(self, pattern, fmt=None, cache_dir='', chunk_rows=CSV_CHUNK_ROWS):
+        self.pattern = pattern
+        self.fmt = fmt.lower() if fmt else None
+        self.cache = BarCache(cache_dir) if cache_dir else None
+        self.chunk_rows = chunk_rows
+
+    def describe(self):
+        return self.pattern
+
+    def files(self, symbol, timeframe):
+        pattern = self.pattern.format(symbol=symbol, timeframe=timeframe)
+        return sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+
+    def _format(self, path):
+        fmt = self.fmt or self.FORMATS.get(os.path.splitext(path)[1].lower())
+        if fmt not in ('csv', 'parquet', 'npy'):
+            raise ValueError(f"Unknown bar file format for {path}; set BACKTEST_DATA_FORMAT")
+        return fmt
+
+    def _read_file(self, path, range_filter, tail=None):
+        """RATE_DTYPE bars of one file within the filter's range (only the last `tail` if given)"""
+        fmt = self._format(path)
+        if fmt == 'npy' or self.cache is not None:
+            if fmt == 'npy':
+                rates = load_npy(path)
+            else:
+                rates = self.cache.get(path)
+                if rates is None:
+                    # Parse the whole file once; later runs slice the memory map
+                    rates = self.cache.put(path, np.concatenate(list(self._stream(path, fmt, None)) or
+                                                                [np.zeros(0, dtype=RATE_DTYPE)]))
+            times = rates['time']
+            if len(times) < 2 or bool(np.all(times[1:] >= times[:-1])):
+                lo, hi = range_filter.slice_sorted(times)
+                if tail:
+                    lo = max(lo, hi - tail)
+                return _as_rates(rates[lo:hi])
+            return range_filter.chunk(_as_rates(rates))
+
+        parts = []
+        for chunk in self._stream(path, fmt, range_filter):
+            chunk = range_filter.chunk(chunk)
+            if len(chunk):
+                parts.append(chunk)
+            if range_filter.done:
+                break
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=RATE_DTYPE)
+
+    def _stream(self, path, fmt, range_filter):
+        if fmt == 'parquet':
+            return read_parquet_chunks(path, self.chunk_rows, range_filter)
+        return read_csv_chunks(path, self.chunk_rows)
+
+    def load_rates(self, symbol, timeframe, start=None, end=None, bars=None):
+        """RATE_DTYPE bars in [start, end], time-ordered; the last `bars` if no start is given"""
+        paths = self.files(symbol, timeframe)
+        missing = [p for p in paths if not os.path.exists(p)]
+        if not paths or missing:
+            raise FileNotFoundError(f"No bar files found for {missing[0] if missing else self.pattern}")
+
+        # A single time-ordered file can skip straight to its last `bars` bars
+        tail = bars if bars and start is None and len(paths) == 1 else None
+        parts = [self._read_file(path, RangeFilter(start, end), tail) for path in paths]
+        rates = np.concatenate(parts) if parts else np.zeros(0, dtype=RATE_DTYPE)
+        times = rates['time']
+        if len(times) > 1 and not bool(np.all(times[1:] > times[:-1])):
+            # Overlapping archives: time order, first copy of each bar wins
+            order = np.argsort(times, kind='stable')
+            rates = rates[order]
+            keep = np.concatenate(([True], rates['time'][1:] != rates['time'][:-1]))
+            rates = rates[keep]
+        if bars and start is None:
+            rates = rates[-bars:]
+        return rates
+
+    def load(self, symbol, timeframe, start=None, end=None, bars=None):
+        rates = self.load_rates(symbol, timeframe, start, end, bars)
+        return rates_to_frame(rates) if len(rates) else None
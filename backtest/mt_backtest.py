@@ -14,29 +14,73 @@ import numpy as np
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from bar_sources import FileBarSource, MT5BarSource
+
+# Repository root, for the exit kernel and result store shared with ml/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ml.exit_kernel import resolve_exits
+from ml.result_store import ResultReader, ResultWriter, equity_stats, write_summary
+
+STOP_LOSS = 0.02  # 2% stop loss
+# Equity points the columnar engine computes and streams at a time
+EQUITY_CHUNK_BARS = 65536
+
 try:
     import MetaTrader5 as MT5
 except ImportError:
-    print("ERROR: MetaTrader5 module not installed")
-    print("Install with: pip install MetaTrader5")
-    sys.exit(1)
+    # Only needed when bars come from a terminal (BACKTEST_DATA_PATH unset)
+    MT5 = None
 
 # Load environment variables from .env file
 load_dotenv()
 
+def stop_level(entry_price, is_buy):
+    """
+    Stop price for resolve_exits that triggers exactly where the loop's
+    (entry - close) / entry > STOP_LOSS check does (mirrored for sells)
+
+    The check is monotonic in close, so the level is the last float on the
+    triggering side of it. Prices are positive; any other entry never stops.
+    """
+    away = -np.inf if is_buy else np.inf
+    if not entry_price > 0:
+        return away
+
+    def stopped(price):
+        move = (entry_price - price) if is_buy else (price - entry_price)
+        return move / entry_price > STOP_LOSS
+
+    level = entry_price * (1 - STOP_LOSS if is_buy else 1 + STOP_LOSS)
+    while not stopped(level):
+        level = np.nextafter(level, away)
+    while stopped(np.nextafter(level, -away)):
+        level = np.nextafter(level, -away)
+    return level
+
+
 class MTBacktester:
     """
     Broker-agnostic MT4/MT5 backtesting engine.
 
-    Connects to any MT4/MT5 broker using credentials from .env file.
+    Connects to any MT4/MT5 broker using credentials from .env file, or
+    runs offline on local bar files (BACKTEST_DATA_PATH).
     """
 
-    def __init__(self):
-        """Initialize backtester with configuration from environment variables."""
-        # Broker credentials from .env
-        self.login = self._get_env_int('MT_LOGIN')
-        self.password = self._get_env('MT_PASSWORD')
-        self.server = self._get_env('MT_SERVER')
+    def __init__(self, data_source=None):
+        """
+        Initialize backtester with configuration from environment variables.
+
+        Args:
+            data_source: optional BarSource; overrides BACKTEST_DATA_PATH
+        """
+        # Historical data: local bar files, or the broker terminal
+        self.data_path = self._get_env('BACKTEST_DATA_PATH', '')
+        offline = data_source is not None or bool(self.data_path)
+
+        # Broker credentials from .env (not needed offline)
+        self.login = self._get_env_int('MT_LOGIN', 0 if offline else None)
+        self.password = self._get_env('MT_PASSWORD', '' if offline else None)
+        self.server = self._get_env('MT_SERVER', 'local data' if offline else None)
         self.platform = self._get_env('MT_PLATFORM', 'MT5')
 
         # Backtest parameters
@@ -44,6 +88,8 @@ class MTBacktester:
         self.timeframe_name = self._get_env('BACKTEST_TIMEFRAME', 'H1')
         self.timeframe = self._parse_timeframe(self.timeframe_name)
         self.bars = self._get_env_int('BACKTEST_BARS', 2000)
+        self.start_date = self._get_env('BACKTEST_START', '') or None
+        self.end_date = self._get_env('BACKTEST_END', '') or None
 
         # Risk management
         self.risk_percent = self._get_env_float('RISK_PER_TRADE', 0.02)
@@ -57,8 +103,25 @@ class MTBacktester:
         self.bb_period = self._get_env_int('BB_PERIOD', 20)
         self.bb_deviation = self._get_env_float('BB_DEVIATION', 2.0)
 
+        # Data source
+        if data_source is None and self.data_path:
+            data_source = FileBarSource(
+                self.data_path,
+                fmt=self._get_env('BACKTEST_DATA_FORMAT', '') or None,
+                cache_dir=self._get_env('BACKTEST_CACHE_DIR', '.bar_cache'),
+                chunk_rows=self._get_env_int('BACKTEST_CHUNK_ROWS', 500000))
+        if data_source is None and MT5 is None:
+            raise ValueError("MetaTrader5 module not installed (pip install MetaTrader5); "
+                             "set BACKTEST_DATA_PATH to backtest on local bar files")
+        self.data_source = data_source
+
+        # Simulation engine: 'columnar' (NumPy arrays) or 'loop' (bar-by-bar reference)
+        self.engine = self._get_env('BACKTEST_ENGINE', 'columnar').lower()
+
         # Output configuration
         self.results_file = self._get_env('RESULTS_FILE', 'backtest_results')
+        # 'columnar' (trades/equity NPZ + JSON summary) or 'json' (one JSON file)
+        self.results_format = self._get_env('RESULTS_FORMAT', 'columnar').lower()
         self.generate_html = self._get_env('GENERATE_HTML_REPORT', 'true').lower() == 'true'
 
         # State
@@ -67,6 +130,8 @@ class MTBacktester:
             "broker": "BROKER_AGNOSTIC",
             "symbol": self.symbol,
             "timeframe": self.timeframe_name,
+            "bars": 0,
+            "date_range": "",
             "total_trades": 0,
             "winning_trades": 0,
             "losing_trades": 0,
@@ -77,8 +142,12 @@ class MTBacktester:
             "profit_factor": 0.0,
             "max_drawdown": 0.0,
             "sharpe_ratio": 0.0,
-            "trades": []
+            "trades": [],
+            "equity_curve": []
         }
+        # Columnar runs stream trades and equity here instead of the lists above
+        self._writer = None
+        self._results_archive = None
 
     def _get_env(self, key, default=None):
         """Get environment variable with error handling."""
@@ -105,6 +174,8 @@ class MTBacktester:
 
     def _parse_timeframe(self, tf_name):
         """Convert timeframe name to MT5 constant."""
+        if MT5 is None:
+            return None
         timeframes = {
             'M1': MT5.TIMEFRAME_M1,
             'M5': MT5.TIMEFRAME_M5,
@@ -119,7 +190,10 @@ class MTBacktester:
         return timeframes.get(tf_name.upper(), MT5.TIMEFRAME_H1)
 
     def connect(self):
-        """Connect to MT4/MT5 broker."""
+        """Connect to MT4/MT5 broker (no-op for local data)."""
+        if self.data_source is not None:
+            return True
+
         print(f"Connecting to {self.platform} server: {self.server}...")
         print(f"Account: {self.login}")
 
@@ -155,20 +229,33 @@ class MTBacktester:
 
     def fetch_historical_data(self):
         """Fetch historical price data."""
-        print(f"Fetching {self.bars} bars of {self.symbol} {self.timeframe_name} data...")
+        source = self.data_source or MT5BarSource(MT5, self.timeframe)
+        if self.start_date:
+            print(f"Fetching {self.symbol} {self.timeframe_name} data from {self.start_date} "
+                  f"to {self.end_date or 'now'} ({source.describe()})...")
+        else:
+            print(f"Fetching {self.bars} bars of {self.symbol} {self.timeframe_name} data "
+                  f"({source.describe()})...")
 
-        rates = MT5.copy_rates_from_pos(self.symbol, self.timeframe, 0, self.bars)
+        try:
+            df = source.load(self.symbol, self.timeframe_name, start=self.start_date,
+                             end=self.end_date, bars=self.bars)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"✗ Failed to load data for {self.symbol}: {e}")
+            return None
 
-        if rates is None or len(rates) == 0:
+        if df is None or len(df) == 0:
             print(f"✗ Failed to fetch data for {self.symbol}")
             return None
 
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-
         print(f"✓ Fetched {len(df)} bars")
         print(f"  Date range: {df['time'].min()} to {df['time'].max()}")
 
+        # What was actually loaded, for the reports (BACKTEST_BARS is ignored
+        # when BACKTEST_START/BACKTEST_END select the range)
+        self.results['bars'] = len(df)
+        self.results['date_range'] = f"{df['time'].min()} to {df['time'].max()}"
+
         return df
 
     def calculate_indicators(self, df):
@@ -203,7 +290,10 @@ class MTBacktester:
         print(f"Account: {self.login}")
         print(f"Symbol: {self.symbol}")
         print(f"Timeframe: {self.timeframe_name}")
-        print(f"Bars: {self.bars}")
+        if self.start_date:
+            print(f"Range: {self.start_date} to {self.end_date or 'now'}")
+        else:
+            print(f"Bars: {self.bars}")
         print("="*60 + "\n")
 
         if not self.connect():
@@ -217,6 +307,8 @@ class MTBacktester:
         df = self.calculate_indicators(df)
 
         print("\nRunning backtest simulation...")
+        if self.results_format != 'json':
+            self._writer = ResultWriter(self.results_file)
         self._simulate_trades(df)
 
         self.disconnect()
@@ -232,8 +324,111 @@ class MTBacktester:
 
     def _simulate_trades(self, df):
         """Simulate trades based on strategy."""
+        if self.engine == 'loop':
+            return self._simulate_trades_loop(df)
+        return self._simulate_trades_columnar(df)
+
+    def _simulate_trades_columnar(self, df):
+        """
+        Simulate the RSI strategy on NumPy columns, one step per trade.
+
+        Gives trade-for-trade the same results as _simulate_trades_loop. Entry
+        and RSI-exit bars come from binary searches over precomputed
+        candidate bars; the stop (or that RSI exit) comes from
+        exit_kernel.resolve_exits on the bars the loop processes. The equity
+        curve is rebuilt from the trade balances.
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        rsi = df['rsi'].to_numpy(dtype=np.float64)
+        start = max(self.sma_slow, self.rsi_period)
+
+        # Bars the loop processes (indicators ready)
+        valid = ~(np.isnan(rsi) | np.isnan(df['sma_fast'].to_numpy(dtype=np.float64)))
+        valid[:start] = False
+        # The loop checks its stop on processed bars only
+        checked = np.where(valid, close, np.nan)
+        buy_entries = np.flatnonzero(valid & (rsi < 30))
+        sell_entries = np.flatnonzero(valid & (rsi > 70))
+        buy_exits = np.flatnonzero(valid & (rsi > 50))
+        sell_exits = np.flatnonzero(valid & (rsi < 50))
+
+        def first_at_or_after(candidates, i):
+            k = np.searchsorted(candidates, i)
+            return candidates[k] if k < len(candidates) else len(close)
+
+        entries, exits, is_buy = [], [], []
+        i = start
+        while i < len(close):
+            buy_at = first_at_or_after(buy_entries, i)
+            sell_at = first_at_or_after(sell_entries, i)
+            entry = min(buy_at, sell_at)
+            if entry >= len(close):
+                break
+            buy = buy_at <= sell_at
+            entry_price = close[entry]
+
+            # RSI exit, or an earlier stop loss on a processed bar
+            rsi_exit = first_at_or_after(buy_exits if buy else sell_exits, entry + 1)
+            plan = resolve_exits(checked, checked, close, entry, buy, entry_price,
+                                 stop_level(entry_price, buy), np.inf if buy else -np.inf,
+                                 signal_exit=rsi_exit if rsi_exit < len(close) else -1,
+                                 fill='close')
+            exit_at = int(plan.index[0])
+            if exit_at < 0:
+                break  # Still open at the end, as in the loop
+
+            entries.append(entry)
+            exits.append(exit_at)
+            is_buy.append(buy)
+            i = exit_at + 1
+
+        entries = np.asarray(entries, dtype=np.int64)
+        exits = np.asarray(exits, dtype=np.int64)
+        is_buy = np.asarray(is_buy, dtype=bool)
+        entry_prices, exit_prices = close[entries], close[exits]
+        pnl = np.where(is_buy, (exit_prices - entry_prices) / entry_prices,
+                       (entry_prices - exit_prices) / entry_prices)
+
+        # Balances compound trade by trade
+        balances = np.empty(len(entries) + 1)
+        balances[0] = balance = self.initial_balance
+        profits = np.empty(len(entries))
+        for k, trade_pnl in enumerate(pnl):
+            trade_value = balance * self.risk_percent
+            profits[k] = trade_value * trade_pnl
+            balance += profits[k]
+            balances[k + 1] = balance
+
+        times = df['time']
+        for k in range(len(entries)):
+            self._record_trade({
+                "entry_time": str(times.iloc[entries[k]]),
+                "exit_time": str(times.iloc[exits[k]]),
+                "type": "BUY" if is_buy[k] else "SELL",
+                "entry_price": float(entry_prices[k]),
+                "exit_price": float(exit_prices[k]),
+                "pnl": float(profits[k]),
+                "balance": float(balances[k + 1])
+            })
+
+        # Sum gains and losses in trade order, as the loop does
+        for profit in profits:
+            if profit > 0:
+                self.results['winning_trades'] += 1
+                self.results['gross_profit'] += float(profit)
+            else:
+                self.results['losing_trades'] += 1
+                self.results['gross_loss'] += abs(float(profit))
+
+        # Equity after each processed bar: the balance after all exits up to it
+        processed = np.flatnonzero(valid)
+        for chunk in range(0, len(processed), EQUITY_CHUNK_BARS):
+            bars = processed[chunk:chunk + EQUITY_CHUNK_BARS]
+            self._record_equity(balances[np.searchsorted(exits, bars, side='right')])
+
+    def _simulate_trades_loop(self, df):
+        """Simulate trades bar by bar (reference implementation)."""
         balance = self.initial_balance
-        equity_curve = []
         in_position = False
         position_type = None
         entry_price = 0
@@ -271,14 +466,14 @@ class MTBacktester:
                 if position_type == "BUY":
                     if row['rsi'] > 50:
                         exit_triggered = True
-                    elif (entry_price - exit_price) / entry_price > 0.02:  # 2% stop loss
+                    elif (entry_price - exit_price) / entry_price > STOP_LOSS:
                         exit_triggered = True
 
                 # SELL exit: RSI below 50 or stop loss
                 elif position_type == "SELL":
                     if row['rsi'] < 50:
                         exit_triggered = True
-                    elif (exit_price - entry_price) / entry_price > 0.02:  # 2% stop loss
+                    elif (exit_price - entry_price) / entry_price > STOP_LOSS:
                         exit_triggered = True
 
                 if exit_triggered:
@@ -303,7 +498,7 @@ class MTBacktester:
                         "balance": float(balance)
                     }
 
-                    self.results['trades'].append(trade)
+                    self._record_trade(trade)
 
                     if profit > 0:
                         self.results['winning_trades'] += 1
@@ -315,10 +510,23 @@ class MTBacktester:
                     in_position = False
                     position_type = None
 
-            equity_curve.append(balance)
+            self._record_equity([balance])
 
-        self.results['total_trades'] = len(self.results['trades'])
-        self.results['equity_curve'] = equity_curve
+    def _record_trade(self, trade):
+        """Append a closed trade to the result archive, or keep it in memory."""
+        if self._writer is not None:
+            self._writer.append_trade({name: pd.Timestamp(value) if name.endswith('_time') else value
+                                       for name, value in trade.items()})
+        else:
+            self.results['trades'].append(trade)
+        self.results['total_trades'] += 1
+
+    def _record_equity(self, balances):
+        """Append equity points to the result archive, or keep them in memory."""
+        if self._writer is not None:
+            self._writer.extend_equity(float(balance) for balance in balances)
+        else:
+            self.results['equity_curve'].extend(float(balance) for balance in balances)
 
     def _calculate_metrics(self):
         """Calculate performance metrics."""
@@ -330,28 +538,44 @@ class MTBacktester:
 
         self.results['net_profit'] = self.results['gross_profit'] - self.results['gross_loss']
 
-        # Calculate max drawdown
-        if hasattr(self, 'equity_curve') and len(self.results.get('equity_curve', [])) > 0:
-            equity = self.results['equity_curve']
-            peak = equity[0]
-            max_dd = 0
+        if self._writer is not None:
+            return self._calculate_streamed_equity_metrics()
 
-            for value in equity:
-                if value > peak:
-                    peak = value
-                drawdown = (peak - value) / peak if peak > 0 else 0
-                if drawdown > max_dd:
-                    max_dd = drawdown
+        equity = np.asarray(self.results.get('equity_curve', []), dtype=np.float64)
 
-            self.results['max_drawdown'] = max_dd * 100
+        # Calculate max drawdown from the running peak
+        if len(equity) > 0:
+            peak = np.maximum.accumulate(equity)
+            safe_peak = np.where(peak > 0, peak, 1.0)
+            drawdown = np.where(peak > 0, (peak - equity) / safe_peak, 0.0)
+            self.results['max_drawdown'] = float(max(drawdown.max(), 0.0)) * 100
 
         # Calculate Sharpe ratio (simplified)
-        if hasattr(self, 'equity_curve') and len(self.results.get('equity_curve', [])) > 0:
-            equity = self.results['equity_curve']
+        if len(equity) > 0:
             returns = np.diff(equity) / equity[:-1]
             if len(returns) > 0 and np.std(returns) > 0:
                 self.results['sharpe_ratio'] = np.mean(returns) / np.std(returns) * np.sqrt(252)
 
+    def _calculate_streamed_equity_metrics(self):
+        """
+        Drawdown and Sharpe ratio of a columnar run: the archive is closed
+        and its equity curve read back chunk by chunk.
+        """
+        writer, self._writer = self._writer, None
+        writer.close()
+        self._results_archive = writer.path
+
+        with ResultReader(writer.path) as reader:
+            equity = equity_stats(reader.iter_equity())
+        if writer.equity_count > 0:
+            self.results['max_drawdown'] = equity['max_drawdown'] * 100
+
+        # Population standard deviation, as np.std above
+        count = equity['returns']
+        std = equity['returns_std'] * np.sqrt((count - 1) / count) if count > 1 else 0.0
+        if std > 0:
+            self.results['sharpe_ratio'] = equity['returns_mean'] / std * np.sqrt(252)
+
     def _print_results(self):
         """Print backtest results to console."""
         print("\n" + "="*60)
@@ -368,12 +592,31 @@ class MTBacktester:
         print("="*60 + "\n")
 
     def _save_results(self):
-        """Save results to JSON file."""
+        """Save results to JSON file (RESULTS_FORMAT=json) or columnar files."""
+        if self.results_format != 'json':
+            return self._save_columnar_results()
+
         filename = f"{self.results_file}.json"
+        results = dict(self.results)
+        results['equity_curve'] = np.asarray(results.get('equity_curve', [])).tolist()
         with open(filename, 'w') as f:
-            json.dump(self.results, f, indent=2)
+            json.dump(results, f, indent=2)
         print(f"✓ Results saved to {filename}")
 
+    def _save_columnar_results(self):
+        """
+        Store the metrics in the JSON summary of the result archive
+        (ml/result_store.py) the run streamed its trades and equity to.
+        """
+        if self._results_archive is None:
+            print("✗ No columnar results to save (RESULTS_FORMAT=json keeps them in memory)")
+            return
+        summary = {key: value for key, value in self.results.items()
+                   if key not in ('trades', 'equity_curve')}
+        write_summary(self._results_archive, summary)
+        print(f"✓ Results saved to {self._results_archive} "
+              f"(summary: {os.path.splitext(self._results_archive)[0]}.json)")
+
     def _generate_html_report(self):
         """Generate HTML report."""
         filename = f"{self.results_file}.html"
@@ -403,7 +646,8 @@ class MTBacktester:
                     <strong>Broker:</strong> {self.server}<br>
                     <strong>Symbol:</strong> {self.symbol}<br>
                     <strong>Timeframe:</strong> {self.timeframe_name}<br>
-                    <strong>Bars Analyzed:</strong> {self.bars}<br>
+                    <strong>Bars Analyzed:</strong> {self.results['bars']}<br>
+                    <strong>Date Range:</strong> {self.results['date_range']}<br>
                     <strong>Initial Balance:</strong> ${self.initial_balance:.2f}
                 </div>
 
@@ -448,7 +692,7 @@ class MTBacktester:
 
 if __name__ == "__main__":
     # Check for .env file
-    if not os.path.exists('.env'):
+    if not os.path.exists('.env') and not os.getenv('BACKTEST_DATA_PATH'):
         print("ERROR: .env file not found!")
         print("\n1. Copy .env.example to .env:")
         print("   cp .env.example .env")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline bar sources of the MT backtester
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bar_sources import RATE_DTYPE, BarSource, FileBarSource, MT5BarSource
+
+
+def make_rates(n, start='2024-01-01', seed=0):
+    """Hourly RATE_DTYPE bars with 5-decimal prices"""
+    rng = np.random.default_rng(seed)
+    close = np.round(1.1 + np.cumsum(rng.normal(0, 0.0005, n)), 5)
+    rates = np.zeros(n, dtype=RATE_DTYPE)
+    rates['time'] = pd.date_range(start, periods=n, freq='h').asi8 // 10**9
+    rates['open'] = np.round(close + 0.0001, 5)
+    rates['high'] = np.round(close + 0.0003, 5)
+    rates['low'] = np.round(close - 0.0003, 5)
+    rates['close'] = close
+    rates['tick_volume'] = rng.integers(10, 500, n)
+    rates['spread'] = 2
+    return rates
+
+
+def write_mt5_export(path, rates):
+    stamps = pd.to_datetime(rates['time'], unit='s')
+    with open(path, 'w') as f:
+        f.write('<DATE>\t<TIME>\t<OPEN>\t<HIGH>\t<LOW>\t<CLOSE>\t<TICKVOL>\t<VOL>\t<SPREAD>\n')
+        for stamp, bar in zip(stamps, rates):
+            f.write(f"{stamp:%Y.%m.%d}\t{stamp:%H:%M:%S}\t{bar['open']}\t{bar['high']}\t"
+                    f"{bar['low']}\t{bar['close']}\t{bar['tick_volume']}\t0\t{bar['spread']}\n")
+
+
+def write_mt4_export(path, rates):
+    stamps = pd.to_datetime(rates['time'], unit='s')
+    with open(path, 'w') as f:
+        for stamp, bar in zip(stamps, rates):
+            f.write(f"{stamp:%Y.%m.%d},{stamp:%H:%M},{bar['open']},{bar['high']},"
+                    f"{bar['low']},{bar['close']},{bar['tick_volume']}\n")
+
+
+def write_headed_csv(path, rates):
+    pd.DataFrame({
+        'Time': pd.to_datetime(rates['time'], unit='s'),
+        'Open': rates['open'], 'High': rates['high'], 'Low': rates['low'],
+        'Close': rates['close'], 'Volume': rates['tick_volume']
+    }).to_csv(path, index=False)
+
+
+def assert_same_bars(actual, expected):
+    assert np.array_equal(actual['time'], expected['time'])
+    for field in ('open', 'high', 'low', 'close', 'tick_volume'):
+        assert np.array_equal(actual[field], expected[field]), field
+
+
+class CountingSource(FileBarSource):
+    """FileBarSource that counts the chunks it parses"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chunks = 0
+
+    def _stream(self, path, fmt, range_filter):
+        for chunk in super()._stream(path, fmt, range_filter):
+            self.chunks += 1
+            yield chunk
+
+
+def test_every_file_layout_loads_the_same_bars():
+    """MT5 export, MT4 export, headed CSV and NPY all parse to the same rates"""
+    rates = make_rates(300)
+    writers = {'mt5.csv': write_mt5_export, 'mt4.csv': write_mt4_export,
+               'headed.csv': write_headed_csv, 'bars.npy': np.save}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, write in writers.items():
+            path = os.path.join(tmp, name)
+            write(path, rates)
+            loaded = FileBarSource(path, chunk_rows=64).load_rates('EURUSD', 'H1')
+            assert_same_bars(loaded, rates)
+            if name != 'mt4.csv':
+                assert np.array_equal(loaded['spread'], rates['spread'] if name != 'headed.csv'
+                                      else np.zeros(len(rates)))
+
+        frame = FileBarSource(os.path.join(tmp, 'mt5.csv')).load('EURUSD', 'H1')
+        assert list(frame.columns) == list(RATE_DTYPE.names)
+        assert frame['time'].iloc[0] == pd.Timestamp('2024-01-01')
+
+
+def test_date_range_is_inclusive_and_stops_early():
+    """start and end keep their own bars; CSV reading stops past the end"""
+    rates = make_rates(1000)
+    start, end = pd.Timestamp('2024-01-03'), pd.Timestamp('2024-01-05 06:00')
+    inside = rates[(rates['time'] >= start.value // 10**9) & (rates['time'] <= end.value // 10**9)]
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'EURUSD_H1.csv')
+        npy_path = os.path.join(tmp, 'EURUSD_H1.npy')
+        write_mt5_export(csv_path, rates)
+        np.save(npy_path, rates)
+
+        source = CountingSource(os.path.join(tmp, '{symbol}_{timeframe}.csv'), chunk_rows=50)
+        loaded = source.load_rates('EURUSD', 'H1', start=start, end=end)
+        assert_same_bars(loaded, inside)
+        assert loaded['time'][-1] == end.value // 10**9
+        assert source.chunks == int(np.ceil((np.searchsorted(rates['time'], end.value // 10**9) + 1) / 50))
+
+        loaded = FileBarSource(npy_path).load_rates('EURUSD', 'H1', start=start, end=end)
+        assert_same_bars(loaded, inside)
+
+
+def test_bars_keeps_the_last_bars():
+    """Without a start, bars takes the tail of one file or of several concatenated"""
+    rates = make_rates(500)
+    with tempfile.TemporaryDirectory() as tmp:
+        np.save(os.path.join(tmp, 'all.npy'), rates)
+        assert_same_bars(FileBarSource(os.path.join(tmp, 'all.npy')).load_rates('EURUSD', 'H1', bars=120),
+                         rates[-120:])
+
+        write_headed_csv(os.path.join(tmp, 'part_2.csv'), rates[250:])
+        write_headed_csv(os.path.join(tmp, 'part_1.csv'), rates[:260])
+        source = FileBarSource(os.path.join(tmp, 'part_*.csv'))
+        assert_same_bars(source.load_rates('EURUSD', 'H1'), rates)
+        assert_same_bars(source.load_rates('EURUSD', 'H1', bars=300), rates[-300:])
+
+
+def test_cache_is_rebuilt_when_the_file_changes():
+    """Cached parses are reused until the archive's size or mtime changes"""
+    rates = make_rates(200)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bars.csv')
+        cache_dir = os.path.join(tmp, 'cache')
+        write_headed_csv(path, rates)
+
+        source = CountingSource(path, cache_dir=cache_dir)
+        assert_same_bars(source.load_rates('EURUSD', 'H1'), rates)
+        parsed = source.chunks
+        assert parsed > 0 and len(os.listdir(cache_dir)) == 1
+        assert_same_bars(source.load_rates('EURUSD', 'H1'), rates)
+        assert source.chunks == parsed
+
+        changed = rates.copy()
+        changed['close'] = np.round(changed['close'] + 0.001, 5)
+        write_headed_csv(path, changed)
+        info = os.stat(path)
+        os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+        assert_same_bars(source.load_rates('EURUSD', 'H1'), changed)
+        assert source.chunks > parsed and len(os.listdir(cache_dir)) == 2
+
+
+def test_parquet_skips_row_groups_outside_the_range():
+    """Row groups entirely before start or after end are never read"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return  # pyarrow is optional
+
+    rates = make_rates(1000)
+    table = pa.table({
+        'time': pd.to_datetime(rates['time'], unit='s'),
+        'open': rates['open'], 'high': rates['high'], 'low': rates['low'],
+        'close': rates['close'], 'tick_volume': rates['tick_volume']
+    })
+    start, end = pd.Timestamp('2024-01-10'), pd.Timestamp('2024-01-15')
+    inside = rates[(rates['time'] >= start.value // 10**9) & (rates['time'] <= end.value // 10**9)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bars.parquet')
+        pq.write_table(table, path, row_group_size=100)
+        source = CountingSource(path, chunk_rows=100)
+        assert_same_bars(source.load_rates('EURUSD', 'H1', start=start, end=end), inside)
+        first_group = np.searchsorted(rates['time'], start.value // 10**9, side='right') // 100
+        last_group = np.searchsorted(rates['time'], end.value // 10**9) // 100
+        assert source.chunks == last_group - first_group + 1
+
+
+def test_terminal_and_files_agree_on_the_range():
+    """BarSource is abstract, and a terminal and a file give the same inclusive range"""
+    try:
+        BarSource()
+        raise AssertionError('BarSource should be abstract')
+    except TypeError:
+        pass
+
+    rates = make_rates(300)
+
+    class Terminal:
+        def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+            # MT5 includes bars stamped at date_to
+            seconds = rates['time']
+            return rates[(seconds >= pd.Timestamp(date_from).value // 10**9)
+                         & (seconds <= pd.Timestamp(date_to).value // 10**9)]
+
+    start, end = '2024-01-02', '2024-01-06'
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bars.npy')
+        np.save(path, rates)
+        offline = FileBarSource(path).load('EURUSD', 'H1', start=start, end=end)
+        online = MT5BarSource(Terminal(), 16385).load('EURUSD', 'H1', start=start, end=end)
+        assert offline.equals(online)
+        assert offline['time'].iloc[-1] == pd.Timestamp(end)
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} bar source tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Tests for the MTBacktester simulation engines
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bar_sources import FileBarSource
+from mt_backtest import MTBacktester, STOP_LOSS, stop_level
+from test_bar_sources import make_rates, write_headed_csv
+from ml.result_store import ResultReader, ResultWriter
+
+
+def make_bars(n, seed, volatility=0.004):
+    """Random-walk closes with the columns calculate_indicators needs"""
+    rng = np.random.default_rng(seed)
+    close = 1.1 * np.exp(np.cumsum(rng.normal(0, volatility, n)))
+    return pd.DataFrame({'time': pd.date_range('2024-01-01', periods=n, freq='h'), 'close': close})
+
+
+def backtester(**settings):
+    backtester = MTBacktester(data_source=FileBarSource('unused.csv'))
+    for name, value in settings.items():
+        setattr(backtester, name, value)
+    return backtester
+
+
+def stopped_out(trade):
+    move = trade['exit_price'] - trade['entry_price']
+    return (-move if trade['type'] == 'BUY' else move) / trade['entry_price'] > STOP_LOSS
+
+
+def simulate(df, engine, **settings):
+    """Results of one engine, metrics included"""
+    bt = backtester(engine=engine, **settings)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = bt.calculate_indicators(df.copy())
+    bt._simulate_trades(df)
+    bt._calculate_metrics()
+    return bt.results
+
+
+def assert_same_results(loop, columnar):
+    assert loop['total_trades'] > 0
+    assert loop['trades'] == columnar['trades']
+    assert np.array_equal(np.asarray(loop['equity_curve']), columnar['equity_curve'])
+    for key in ('total_trades', 'winning_trades', 'losing_trades', 'gross_profit', 'gross_loss',
+                'net_profit', 'win_rate', 'profit_factor', 'max_drawdown', 'sharpe_ratio'):
+        assert loop[key] == columnar[key], key
+
+
+def test_columnar_engine_matches_loop():
+    """Trade for trade, the columnar engine reproduces the bar loop"""
+    stops = 0
+    for seed in range(8):
+        df = make_bars(3000, seed)
+        loop, columnar = simulate(df, 'loop'), simulate(df, 'columnar')
+        assert_same_results(loop, columnar)
+        stops += sum(map(stopped_out, loop['trades']))
+    assert stops > 0
+
+
+def test_engines_agree_on_flat_prices_and_warm_up():
+    """Flat stretches (NaN RSI) and a long SMA warm-up skip the same bars in both engines"""
+    df = make_bars(2000, seed=21)
+    df.loc[400:460, 'close'] = df['close'].iloc[400]
+    df.loc[1200:1230, 'close'] = df['close'].iloc[1200]
+    settings = {'sma_fast': 120, 'sma_slow': 20}
+    with contextlib.redirect_stdout(io.StringIO()):
+        rsi = backtester(**settings).calculate_indicators(df.copy())['rsi']
+    assert rsi.iloc[500:].isna().any()
+    loop, columnar = simulate(df, 'loop', **settings), simulate(df, 'columnar', **settings)
+    assert_same_results(loop, columnar)
+    assert len(loop['equity_curve']) < len(df) - 120
+
+
+def test_stop_level_matches_the_percentage_check():
+    """resolve_exits levels trigger on exactly the closes the loop's check does"""
+    rng = np.random.default_rng(5)
+    for entry in rng.uniform(0.5, 200.0, 200):
+        for is_buy in (True, False):
+            level = stop_level(entry, is_buy)
+            if is_buy:
+                assert (entry - level) / entry > STOP_LOSS
+                above = np.nextafter(level, np.inf)
+                assert not (entry - above) / entry > STOP_LOSS
+            else:
+                assert (level - entry) / entry > STOP_LOSS
+                below = np.nextafter(level, -np.inf)
+                assert not (below - entry) / entry > STOP_LOSS
+
+
+def test_drawdown_is_measured_from_the_running_peak():
+    """Max drawdown uses the equity curve, with non-positive peaks counted as no drawdown"""
+    bt = backtester()
+    bt.results['equity_curve'] = [100.0, 120.0, 90.0, 130.0, 104.0]
+    bt._calculate_metrics()
+    assert np.isclose(bt.results['max_drawdown'], 25.0)
+    assert bt.results['sharpe_ratio'] != 0
+
+    bt = backtester()
+    bt.results['equity_curve'] = np.array([-2.0, -5.0, 10.0, 5.0])
+    bt._calculate_metrics()
+    assert np.isclose(bt.results['max_drawdown'], 50.0)
+
+
+def test_reports_show_the_bars_loaded_for_a_date_range():
+    """With BACKTEST_START/BACKTEST_END, the bar count is what was loaded, not BACKTEST_BARS"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'EURUSD_H1.csv')
+        write_headed_csv(path, make_rates(500))
+        bt = MTBacktester(data_source=FileBarSource(path))
+        bt.start_date, bt.end_date = '2024-01-03', '2024-01-05'
+        bt.results_file = os.path.join(tmp, 'run')
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = bt.fetch_historical_data()
+            bt._generate_html_report()
+        with open(f"{bt.results_file}.html") as f:
+            html = f.read()
+    assert bt.results['bars'] == len(df) == 49 != bt.bars
+    assert f"<strong>Bars Analyzed:</strong> {len(df)}<br>" in html
+    assert '2024-01-03 00:00:00 to 2024-01-05 00:00:00' in html
+
+
+def test_columnar_runs_stream_results_to_the_archive():
+    """With a ResultWriter open, both engines stream trades and equity instead of keeping them"""
+    df = make_bars(3000, seed=3)
+    for engine in ('columnar', 'loop'):
+        expected = simulate(df, engine)
+        with tempfile.TemporaryDirectory() as tmp:
+            bt = backtester(engine=engine, results_file=os.path.join(tmp, 'run'))
+            bt._writer = ResultWriter(bt.results_file, chunk_rows=256)
+            with contextlib.redirect_stdout(io.StringIO()):
+                frame = bt.calculate_indicators(df.copy())
+                bt._simulate_trades(frame)
+                assert bt.results['trades'] == [] and bt.results['equity_curve'] == []
+                bt._calculate_metrics()
+                bt._save_results()
+            with ResultReader(bt.results_file) as reader:
+                trades = reader.trades()
+                equity = reader.equity()
+                summary = reader.summary
+        assert len(trades) == summary['total_trades'] == expected['total_trades']
+        assert trades['entry_time'].dtype == np.dtype('datetime64[ns]')
+        assert list(trades['pnl']) == [t['pnl'] for t in expected['trades']]
+        assert list(trades['type']) == [t['type'] for t in expected['trades']]
+        assert np.array_equal(equity, np.asarray(expected['equity_curve']))
+        for key in ('winning_trades', 'gross_profit', 'gross_loss', 'net_profit', 'win_rate'):
+            assert summary[key] == expected[key], key
+        for key in ('max_drawdown', 'sharpe_ratio'):
+            assert np.isclose(summary[key], expected[key], rtol=1e-9), key
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} MT backtester tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,11 +17,14 @@ from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.neural_network import MLPClassifier
 from sklearn.preprocessing import StandardScaler
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pickle
 import json
 import os
 from datetime import datetime, timedelta
 
+from tree_ensemble import FlatTreeEnsemble
+
 
 class AdaptiveLearningSystem:
     """
@@ -294,9 +297,12 @@ class ModelEnsemble:
     Ensemble of specialized models for different market conditions
     """
 
-    def __init__(self):
+    def __init__(self, n_jobs=None):
+        # n_jobs > 1 fits the models concurrently and builds forest trees in parallel
+        self.n_jobs = n_jobs
         self.models = {
-            'random_forest': RandomForestClassifier(n_estimators=100, max_depth=10),
+            'random_forest': RandomForestClassifier(n_estimators=100, max_depth=10,
+                                                    n_jobs=n_jobs),
             'gradient_boost': GradientBoostingClassifier(n_estimators=100),
             'neural_net': MLPClassifier(hidden_layer_sizes=(50, 30), max_iter=500),
         }
@@ -310,6 +316,7 @@ class ModelEnsemble:
 
         self.scaler = StandardScaler()
         self.is_fitted = False
+        self.compiled = {}
 
     def update_model(self, regime, features, labels):
         """
@@ -325,9 +332,30 @@ class ModelEnsemble:
         else:
             features_scaled = self.scaler.transform(features)
 
-        # Train each model
+        # Train each model (independent, so concurrently when allowed; sklearn
+        # and numpy release the GIL in their fitting loops)
+        if self.n_jobs and self.n_jobs != 1:
+            with ThreadPoolExecutor(max_workers=len(self.models)) as pool:
+                fits = [pool.submit(model.fit, features_scaled, labels)
+                        for model in self.models.values()]
+                for fit in fits:
+                    fit.result()
+        else:
+            for model_name, model in self.models.items():
+                model.fit(features_scaled, labels)
+        self.compile()
+
+    def compile(self):
+        """
+        Flatten the fitted tree ensembles for fast single-row inference
+        (models that cannot be flattened keep using sklearn)
+        """
+        self.compiled = {}
         for model_name, model in self.models.items():
-            model.fit(features_scaled, labels)
+            try:
+                self.compiled[model_name] = FlatTreeEnsemble.from_sklearn(model)
+            except (TypeError, AttributeError):
+                continue
 
     def predict_all(self, features):
         """
@@ -338,10 +366,11 @@ class ModelEnsemble:
 
         features_scaled = self.scaler.transform(features.reshape(1, -1))
 
+        compiled = getattr(self, 'compiled', {})
         predictions = []
-        for model in self.models.values():
+        for model_name, model in self.models.items():
             try:
-                pred = model.predict_proba(features_scaled)[0][1]
+                pred = compiled.get(model_name, model).predict_proba(features_scaled)[0][1]
                 predictions.append(pred)
             except:
                 predictions.append(0.5)
@@ -11,25 +11,41 @@ from ta.momentum import RSIIndicator, StochasticOscillator, WilliamsRIndicator
 from ta.volatility import BollingerBands, AverageTrueRange
 from ta.volume import OnBalanceVolumeIndicator, MFIIndicator
 
+from feature_store import FeatureKey
+
 
 class AdvancedFeatureEngineer:
     """
     Comprehensive feature engineering for trading signals
     """
 
-    def __init__(self):
+    # Bump when any feature definition changes (invalidates stored features)
+    FEATURE_SET_VERSION = 1
+
+    def __init__(self, feature_store=None):
         self.features = []
+        self.feature_store = feature_store
 
-    def extract_all_features(self, df):
+    def extract_all_features(self, df, symbol=None, timeframe=None):
         """
         Extract all features from OHLCV data
 
         Args:
             df: DataFrame with columns ['open', 'high', 'low', 'close', 'volume']
+            symbol, timeframe: when given with a feature store, features are
+                read from the store and only new bars are computed
 
         Returns:
             DataFrame with 50+ engineered features
         """
+        if self.feature_store is not None and symbol is not None:
+            key = FeatureKey(symbol, timeframe or 'default', 'advanced',
+                             str(self.FEATURE_SET_VERSION))
+            return self.feature_store.get_or_compute(key, df, self._extract_all_features)
+        return self._extract_all_features(df)
+
+    def _extract_all_features(self, df):
+        """Compute every feature group over df"""
         features_df = pd.DataFrame(index=df.index)
 
         # 1. Trend Indicators
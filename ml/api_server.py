@@ -9,6 +9,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import logging
+import os
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for Flutter app
@@ -17,8 +18,10 @@ CORS(app)  # Enable CORS for Flutter app
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize predictor
-predictor = TechnicalPredictor()
+# Initialize predictor (SIGNAL_ENGINE_WORKERS > 1 evaluates indicators concurrently)
+predictor = TechnicalPredictor(
+    signal_workers=int(os.getenv('SIGNAL_ENGINE_WORKERS', 0)) or None
+)
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -109,6 +112,34 @@ def predict():
         logger.error(f"Error in prediction: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    """Get ML predictions for several symbols in one call"""
+    try:
+        data = request.json or {}
+        
+        # Extract price data: {"symbols": {"EURUSD": [...], ...}}
+        symbols = data.get('symbols')
+        if not symbols or not isinstance(symbols, dict):
+            return jsonify({'error': 'symbols price data required'}), 400
+        price_data = {symbol: pd.Series(prices) for symbol, prices in symbols.items()}
+        
+        # Get predictions
+        features, current_prices = predictor.latest_feature_rows(price_data)
+        predictions = predictor.predict_batch(features, current_prices, n_candles=5)
+        for symbol, prices in price_data.items():
+            if symbol not in predictions:
+                predictions[symbol] = predictor.predict_next_candles(prices, n_candles=5)
+        
+        return jsonify({
+            'status': 'success',
+            'predictions': predictions
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in batch prediction: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/indicator_status', methods=['GET'])
 def get_indicator_status():
     """Get status of all indicators"""
@@ -8,6 +8,7 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 from backtester import SignalBacktester, BacktestResult
 from indicators.signal_engine import SignalEngine
+from parameter_sweep import ParameterSweep, grid_space, random_space, reweight_sweep
 import json
 
 def run_parameter_sweep():
@@ -92,24 +93,13 @@ def run_parameter_sweep():
         }
     ]
     
-    results = []
+    # Run all parameter sets in parallel over shared data
+    print(f"\nTesting {len(param_sets)} strategies...")
+    _, runs = ParameterSweep(df, symbol='EURUSD').run(param_sets, keep_results=True)
     
-    for params in param_sets:
-        print(f"\nTesting {params['name']} strategy...")
-        
-        # Create signal engine with custom weights
-        engine = SignalEngine(custom_weights=params['weights'])
-        
-        # Create backtester
-        backtester = SignalBacktester(signal_engine=engine, initial_capital=10000)
-        
-        # Set parameters
-        backtester.position_size = params['position_size']
-        backtester.stop_loss_pct = params['stop_loss']
-        backtester.take_profit_pct = params['take_profit']
-        
-        # Run backtest
-        result = backtester.run(df, symbol='EURUSD')
+    results = []
+    for config_id, params in enumerate(param_sets):
+        result = runs[config_id]
         
         # Store result with parameters
         results.append({
@@ -129,6 +119,25 @@ def run_parameter_sweep():
     
     return results, df
 
+def run_search(df, space, samples=None, seed=None, workers=None, symbol='EURUSD',
+               precompute=True):
+    """
+    Sweep a parameter space: the full grid, or `samples` random draws
+    
+    Space keys are backtest parameters ('position_size', 'stop_loss',
+    'take_profit', 'min_probability') or 'weights.<indicator>'. With
+    precompute, indicators are evaluated once and every configuration is
+    re-scored from them; otherwise each runs a full backtest in a process
+    pool. Returns a DataFrame of parameters and metrics, best Sharpe first.
+    """
+    configs = grid_space(space) if samples is None else random_space(space, samples, seed)
+    print(f"Sweeping {len(configs)} configurations...")
+    if precompute:
+        table = reweight_sweep(df, configs, symbol=symbol)
+    else:
+        table = ParameterSweep(df, symbol=symbol, workers=workers).run(configs)
+    return table.to_frame().sort_values('sharpe_ratio', ascending=False)
+
 def compare_strategies(results):
     """Create comparison table of strategies"""
     print("\n" + "="*80)
@@ -164,6 +173,7 @@ def plot_equity_curves(results, df):
             backtester.position_size = r['params']['position_size']
             backtester.stop_loss_pct = r['params']['stop_loss']
             backtester.take_profit_pct = r['params']['take_profit']
+            backtester.min_probability = r['params']['min_probability']
             
             # Run to get equity curve
             _ = backtester.run(df, symbol='EURUSD')
@@ -5,12 +5,16 @@ Backtesting framework for signal engine and indicators
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, NamedTuple, Optional, Tuple
 import json
 import logging
 from dataclasses import dataclass, asdict
-from indicators.signal_engine import SignalEngine, SignalStrength
+from indicators.signal_engine import SignalEngine, SignalSeries, SignalStrength
 from technical_predictor import TechnicalPredictor
+from checkpoint import (CheckpointJournal, data_fingerprint, engine_settings, load_checkpoint,
+                        remove_checkpoint, save_checkpoint)
+from exit_kernel import max_adverse_excursion, resolve_exits
+from result_store import ResultReader, ResultWriter, equity_stats, trade_stats, write_summary
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -74,13 +78,30 @@ class BacktestResult:
     indicator_performance: Dict[str, Dict]
 
 
+class _SeriesSignal(NamedTuple):
+    """The fields of a CombinedSignal that entry and exit logic reads"""
+    signal: SignalStrength
+    confidence: float
+    probability: float
+
+
 class SignalBacktester:
     """Backtesting framework for signal engine"""
     
     def __init__(self, signal_engine: Optional[SignalEngine] = None, 
-                 initial_capital: float = 10000.0):
+                 initial_capital: float = 10000.0, results_path: Optional[str] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 1000):
         self.signal_engine = signal_engine or SignalEngine()
         self.initial_capital = initial_capital
+        # Columnar results (result_store): trades and equity are written to
+        # results_path as they happen instead of being kept in memory
+        self.results_path = results_path
+        self._writer: Optional[ResultWriter] = None
+        # run() saves its state to checkpoint_path every checkpoint_every
+        # bars; resume() continues from there after an interruption
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self._journal: Optional[CheckpointJournal] = None
         self.capital = initial_capital
         self.trades: List[Trade] = []
         self.equity_curve: List[float] = []
@@ -90,6 +111,7 @@ class SignalBacktester:
         self.position_size = 0.02  # 2% of capital per trade
         self.stop_loss_pct = 0.02   # 2% stop loss
         self.take_profit_pct = 0.04 # 4% take profit
+        self.min_probability = 60   # Minimum signal probability (%) to enter
         self.max_positions = 1      # Maximum concurrent positions
         
     def run(self, df: pd.DataFrame, symbol: str = 'UNKNOWN',
@@ -97,18 +119,10 @@ class SignalBacktester:
             end_date: Optional[datetime] = None) -> BacktestResult:
         """Run backtest on historical data"""
         logger.info(f"Starting backtest for {symbol}")
-        
-        # Filter date range if specified
-        if start_date:
-            df = df[df.index >= start_date]
-        if end_date:
-            df = df[df.index <= end_date]
+        df = self._select_dates(df, start_date, end_date)
             
         # Reset state
-        self.capital = self.initial_capital
-        self.trades = []
-        self.equity_curve = [self.initial_capital]
-        self.current_position = None
+        self._reset(df)
         
         # Track indicator contributions
         indicator_stats = {ind.indicator.name: {
@@ -117,25 +131,74 @@ class SignalBacktester:
             'total_pnl': 0.0
         } for ind in self.signal_engine.configurations}
         
-        # Process each bar
-        min_periods = self.signal_engine.get_required_periods()
+        return self._run_bars(df, symbol, self.signal_engine.get_required_periods(),
+                              indicator_stats)
+    
+    def resume(self, df: pd.DataFrame, symbol: str = 'UNKNOWN',
+               start_date: Optional[datetime] = None,
+               end_date: Optional[datetime] = None) -> BacktestResult:
+        """
+        Continue an interrupted run() from its last checkpoint, or run from
+        the start when there is none (or it was saved for other data)
+        
+        Takes the arguments of the interrupted run; the result is the one an
+        uninterrupted run() gives.
+        """
+        df = self._select_dates(df, start_date, end_date)
+        state = None
+        if self.checkpoint_path:
+            state = load_checkpoint(self.checkpoint_path, type(self).__name__,
+                                    self._fingerprint(df, symbol))
+        if state is None:
+            return self.run(df, symbol)
+        
+        logger.info(f"Resuming backtest for {symbol} at bar {state['bar']}")
+        self._reset(df, state)
+        return self._run_bars(df, symbol, state['bar'], state['indicator_stats'])
+    
+    @staticmethod
+    def _select_dates(df: pd.DataFrame, start_date: Optional[datetime],
+                      end_date: Optional[datetime]) -> pd.DataFrame:
+        # Filter date range if specified
+        if start_date:
+            df = df[df.index >= start_date]
+        if end_date:
+            df = df[df.index <= end_date]
+        return df
+    
+    def _fingerprint(self, df: pd.DataFrame, symbol: str) -> str:
+        """Checkpoint key: the bars and every setting the results depend on"""
+        return data_fingerprint(df, symbol, self.initial_capital, self.results_path,
+                                self.position_size, self.stop_loss_pct, self.take_profit_pct,
+                                self.min_probability, self.max_positions,
+                                engine_settings(self.signal_engine))
+    
+    def _run_bars(self, df: pd.DataFrame, symbol: str, first_bar: int,
+                  indicator_stats: Dict) -> BacktestResult:
+        """Process bars from first_bar on, checkpointing every checkpoint_every bars"""
+        fingerprint = self._fingerprint(df, symbol) if self.checkpoint_path else None
         
-        for i in range(min_periods, len(df)):
+        # Process each bar
+        for i in range(first_bar, len(df)):
+            if fingerprint and i > first_bar and i % self.checkpoint_every == 0:
+                self._save_checkpoint(fingerprint, i, indicator_stats)
+            
             # Get data up to current bar
             current_data = df.iloc[:i+1]
             current_bar = df.iloc[i]
             current_time = df.index[i]
+            self._bar = i
             
             # Check stop loss and take profit for open position
             if self.current_position:
-                self._check_exit_conditions(current_bar, current_time)
+                self._check_exit_conditions(i, current_time)
             
             # Get signal from engine
             try:
                 analysis = self.signal_engine.analyze(current_data, symbol)
                 
                 # Track which indicators contributed
-                for ind_name, ind_data in analysis.contributing_signals.items():
+                for ind_name in analysis.indicator_names:
                     indicator_stats[ind_name]['signals'] += 1
                 
                 # Process signal
@@ -153,6 +216,112 @@ class SignalBacktester:
             self._close_position(df.iloc[-1]['close'], df.index[-1], 'End of backtest')
             
         # Calculate results
+        result = self._calculate_results(df, indicator_stats)
+        if fingerprint:
+            remove_checkpoint(self.checkpoint_path)
+        return result
+    
+    def _save_checkpoint(self, fingerprint: str, bar: int, indicator_stats: Dict):
+        """Save the run state as of the start of bar"""
+        save_checkpoint(self.checkpoint_path, type(self).__name__, fingerprint, {
+            'bar': bar,
+            'capital': self.capital,
+            # Trades and equity points are appended to the journal, not rewritten
+            'journal': self._journal.append({'trades': self.trades,
+                                             'equity_curve': self.equity_curve}),
+            'current_position': self.current_position,
+            'entry_bar': self._entry_bar,
+            'exit_bar': self._exit_bar,
+            'exit_reason': self._exit_reason,
+            'indicator_stats': indicator_stats,
+            'market_conditions': self.signal_engine.market_conditions,
+            'writer': self._writer.checkpoint() if self._writer is not None else None
+        })
+    
+    def _reset(self, df: pd.DataFrame, state: Optional[dict] = None):
+        """
+        Clear run state (or restore it from a checkpoint) and keep the bar
+        columns exits are resolved on
+        """
+        if self._writer is not None:
+            self._writer.close()
+        self._journal = (CheckpointJournal(self.checkpoint_path, ('trades', 'equity_curve'))
+                         if self.checkpoint_path else None)
+        if state is None:
+            self.capital = self.initial_capital
+            self.trades = []
+            self.equity_curve = []
+            self.current_position = None
+            self._writer = ResultWriter(self.results_path) if self.results_path else None
+            if self._journal is not None:
+                self._journal.start()
+            self._record_equity(self.initial_capital)
+            self._entry_bar = 0
+            self._exit_bar = -1
+            self._exit_reason = ''
+        else:
+            self.capital = state['capital']
+            records = self._journal.restore(state['journal'])
+            self.trades = records['trades']
+            self.equity_curve = records['equity_curve']
+            self.current_position = state['current_position']
+            self._writer = ResultWriter.restore(state['writer']) if state['writer'] else None
+            self._entry_bar = state['entry_bar']
+            self._exit_bar = state['exit_bar']
+            self._exit_reason = state['exit_reason']
+            self.signal_engine.market_conditions = dict(state['market_conditions'])
+        self._close = df['close'].to_numpy(dtype=np.float64)
+        self._high = df['high'].to_numpy(dtype=np.float64)
+        self._low = df['low'].to_numpy(dtype=np.float64)
+        self._bar = 0
+    
+    def run_series(self, df: pd.DataFrame, series: SignalSeries,
+                   symbol: str = 'UNKNOWN') -> BacktestResult:
+        """
+        Run the backtest on precomputed per-bar signals (analyze_series, or
+        IndicatorPanel.combine for re-weighted signals) instead of analyzing
+        every bar; trades match run() given the same signals
+        
+        Per-indicator signal counts are not tracked.
+        """
+        logger.info(f"Starting signal-series backtest for {symbol}")
+        
+        # Reset state
+        self._reset(df)
+        
+        indicator_stats = {ind.indicator.name: {
+            'signals': 0,
+            'correct': 0,
+            'total_pnl': 0.0
+        } for ind in self.signal_engine.configurations}
+        
+        close, high, low = self._close, self._high, self._low
+        rows = series.index.get_indexer(df.index)  # -1: no signal for the bar
+        
+        for i in range(self.signal_engine.get_required_periods(), len(df)):
+            current_bar = {'close': close[i], 'high': high[i], 'low': low[i]}
+            current_time = df.index[i]
+            self._bar = i
+            
+            # Check stop loss and take profit for open position
+            if self.current_position:
+                self._check_exit_conditions(i, current_time)
+            
+            # Bars without a signal are skipped, as failed analyses are in run()
+            row = rows[i]
+            if row < 0:
+                continue
+            analysis = _SeriesSignal(series.signal_at(row), series.confidence[row],
+                                     series.probability[row])
+            self._process_signal(analysis, current_bar, current_time, indicator_stats)
+            
+            # Update equity
+            self._update_equity(current_bar)
+        
+        # Close any open positions at end
+        if self.current_position:
+            self._close_position(close[-1], df.index[-1], 'End of backtest')
+            
         return self._calculate_results(df, indicator_stats)
     
     def _process_signal(self, analysis, current_bar, current_time, indicator_stats):
@@ -163,13 +332,13 @@ class SignalBacktester:
         
         # Entry logic
         if not self.current_position:
-            if signal in [SignalStrength.STRONG_BUY, SignalStrength.BUY] and probability > 60:
+            if signal in [SignalStrength.STRONG_BUY, SignalStrength.BUY] and probability > self.min_probability:
                 # Open long position
                 self._open_position(
                     'long', current_bar['close'], current_time,
                     f"{signal.name} (P={probability:.1f}%)", confidence
                 )
-            elif signal in [SignalStrength.STRONG_SELL, SignalStrength.SELL] and probability > 60:
+            elif signal in [SignalStrength.STRONG_SELL, SignalStrength.SELL] and probability > self.min_probability:
                 # Open short position
                 self._open_position(
                     'short', current_bar['close'], current_time,
@@ -205,12 +374,32 @@ class SignalBacktester:
             entry_confidence=confidence
         )
         
+        # Resolve the stop loss / take profit bar once, from this bar's close on
+        long = direction == 'long'
+        if long:
+            stop = price * (1 - self.stop_loss_pct)
+            target = price * (1 + self.take_profit_pct)
+        else:
+            stop = price * (1 + self.stop_loss_pct)
+            target = price * (1 - self.take_profit_pct)
+        plan = resolve_exits(self._close, self._close, self._close, self._bar, long,
+                             price, stop, target, fill='close')
+        self._entry_bar = self._bar
+        self._exit_bar = int(plan.index[0])
+        self._exit_reason = plan.reason_labels()[0]
+        
         logger.info(f"Opened {direction} position at {price:.5f} - {signal}")
     
     def _close_position(self, price: float, time: datetime, reason: str):
         """Close current position"""
         if not self.current_position:
             return
+        
+        # Worst excursion over the bars the position was held
+        position = self.current_position
+        position.max_drawdown = float(max_adverse_excursion(
+            self._high, self._low, self._entry_bar, self._bar,
+            position.direction == 'long', position.entry_price)[0])
             
         self.current_position.close(price, time)
         self.current_position.exit_signal = reason
@@ -219,50 +408,20 @@ class SignalBacktester:
         self.capital += self.current_position.pnl
         
         # Record trade
-        self.trades.append(self.current_position)
+        if self._writer is not None:
+            self._writer.append_trade(asdict(self.current_position))
+        else:
+            self.trades.append(self.current_position)
         
         logger.info(f"Closed position at {price:.5f} - P&L: {self.current_position.pnl:.2f} "
                    f"({self.current_position.pnl_pct:.2f}%) - {reason}")
         
         self.current_position = None
     
-    def _check_exit_conditions(self, current_bar, current_time):
-        """Check stop loss and take profit"""
-        if not self.current_position:
-            return
-            
-        entry_price = self.current_position.entry_price
-        current_price = current_bar['close']
-        
-        if self.current_position.direction == 'long':
-            # Track max drawdown before checking exits
-            if self.current_position:
-                drawdown = (entry_price - current_bar['low']) / entry_price
-                self.current_position.max_drawdown = max(self.current_position.max_drawdown, drawdown)
-            
-            # Check stop loss
-            if current_price <= entry_price * (1 - self.stop_loss_pct):
-                self._close_position(current_price, current_time, 'Stop Loss')
-                return
-            # Check take profit
-            elif current_price >= entry_price * (1 + self.take_profit_pct):
-                self._close_position(current_price, current_time, 'Take Profit')
-                return
-            
-        else:  # short
-            # Track max drawdown before checking exits
-            if self.current_position:
-                drawdown = (current_bar['high'] - entry_price) / entry_price
-                self.current_position.max_drawdown = max(self.current_position.max_drawdown, drawdown)
-            
-            # Check stop loss
-            if current_price >= entry_price * (1 + self.stop_loss_pct):
-                self._close_position(current_price, current_time, 'Stop Loss')
-                return
-            # Check take profit
-            elif current_price <= entry_price * (1 - self.take_profit_pct):
-                self._close_position(current_price, current_time, 'Take Profit')
-                return
+    def _check_exit_conditions(self, i: int, current_time):
+        """Close the position on the bar its stop loss or take profit resolved to"""
+        if self.current_position and i == self._exit_bar:
+            self._close_position(self._close[i], current_time, self._exit_reason)
     
     def _update_equity(self, current_bar):
         """Update equity curve"""
@@ -279,11 +438,20 @@ class SignalBacktester:
                             self.current_position.size
             equity += unrealized
             
-        self.equity_curve.append(equity)
+        self._record_equity(equity)
+    
+    def _record_equity(self, equity: float):
+        if self._writer is not None:
+            self._writer.append_equity(equity)
+        else:
+            self.equity_curve.append(equity)
     
     def _calculate_results(self, df: pd.DataFrame, 
                           indicator_stats: Dict) -> BacktestResult:
         """Calculate backtest statistics"""
+        if self._writer is not None:
+            return self._calculate_streamed_results(df, indicator_stats)
+        
         if not self.trades:
             return BacktestResult(
                 start_date=df.index[0],
@@ -391,6 +559,72 @@ class SignalBacktester:
             indicator_performance=indicator_stats
         )
     
+    def _calculate_streamed_results(self, df: pd.DataFrame,
+                                    indicator_stats: Dict) -> BacktestResult:
+        """
+        _calculate_results for a run written to results_path: statistics are
+        read back from the archive chunk by chunk and stored in its summary;
+        result.trades is left empty (read them with ResultReader)
+        """
+        writer, self._writer = self._writer, None
+        writer.close()
+        
+        with ResultReader(writer.path) as reader:
+            stats = trade_stats(chunk['pnl'] for chunk in reader.iter_trades(['pnl']))
+            equity = equity_stats(reader.iter_equity())
+            
+            # Durations and P&L attribution, one chunk at a time
+            duration = np.timedelta64(0, 'ns')
+            for chunk in reader.iter_trades(['entry_time', 'exit_time', 'entry_signal', 'pnl']):
+                duration += (chunk['exit_time'] - chunk['entry_time']).sum()
+                for ind_name in indicator_stats:
+                    mask = np.char.find(chunk['entry_signal'], ind_name) >= 0
+                    indicator_stats[ind_name]['total_pnl'] += float(chunk['pnl'][mask].sum())
+                    indicator_stats[ind_name]['correct'] += int((chunk['pnl'][mask] > 0).sum())
+        
+        trades = stats['trades']
+        total_return = self.capital - self.initial_capital
+        total_duration = pd.Timedelta(duration)
+        total_time = (df.index[-1] - df.index[0]).total_seconds()
+        if trades:
+            profit_factor = (stats['gross_profit'] / stats['gross_loss']
+                             if stats['gross_loss'] > 0 else float('inf'))
+            sharpe_ratio = ((equity['returns_mean'] / equity['returns_std']) * np.sqrt(252)
+                            if equity['returns_std'] > 0 else 0)
+        else:
+            profit_factor = sharpe_ratio = 0
+        
+        result = BacktestResult(
+            start_date=df.index[0],
+            end_date=df.index[-1],
+            initial_capital=self.initial_capital,
+            final_capital=self.capital,
+            total_return=total_return if trades else 0,
+            total_return_pct=(total_return / self.initial_capital) * 100 if trades else 0,
+            trades=[],
+            win_rate=stats['winning_trades'] / trades if trades else 0,
+            profit_factor=profit_factor,
+            sharpe_ratio=sharpe_ratio,
+            max_drawdown=equity['max_drawdown'] if trades else 0,
+            max_drawdown_pct=equity['max_drawdown'] * 100 if trades else 0,
+            total_trades=trades,
+            winning_trades=stats['winning_trades'],
+            losing_trades=stats['losing_trades'],
+            avg_win=stats['gross_profit'] / stats['winning_trades'] if stats['winning_trades'] else 0,
+            avg_loss=-stats['gross_loss'] / stats['losing_trades'] if stats['losing_trades'] else 0,
+            best_trade=stats['best_trade'],
+            worst_trade=stats['worst_trade'],
+            avg_trade_duration=total_duration / trades if trades else timedelta(0),
+            exposure_time_pct=(total_duration.total_seconds() / total_time * 100
+                               if trades and total_time > 0 else 0),
+            indicator_performance=indicator_stats
+        )
+        
+        summary = asdict(result)
+        del summary['trades']
+        write_summary(writer.path, summary)
+        return result
+    
     def save_results(self, result: BacktestResult, filename: str):
         """Save backtest results to file"""
         # Convert to dict
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fused feature kernel against the ta-based feature path
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from technical_predictor import TechnicalPredictor
+
+
+def make_quotes(periods, seed=42):
+    """Synthetic OHLCV frame with bid/ask columns"""
+    rng = np.random.default_rng(seed)
+    close = 1.10 * np.cumprod(1 + rng.normal(0, 0.0005, periods))
+    spread = np.abs(rng.normal(0, 0.0003, (2, periods)))
+    return pd.DataFrame({
+        'open': np.concatenate([[close[0]], close[:-1]]),
+        'high': close * (1 + spread[0]),
+        'low': close * (1 - spread[1]),
+        'close': close,
+        'volume': rng.integers(100, 5000, periods).astype(float),
+        'bid': close,
+        'ask': close + 0.0001
+    }, index=pd.date_range('2020-01-01', periods=periods, freq='min'))
+
+
+def best_of(fn, repeats):
+    """Best wall time of several runs"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    """Run the benchmark at 1k, 10k and 100k bars"""
+    predictor = TechnicalPredictor()
+    print(f"{'bars':>8} {'ta (ms)':>10} {'numpy (ms)':>11} {'speedup':>8} {'max abs diff':>13}")
+    for periods in (1_000, 10_000, 100_000):
+        df = make_quotes(periods)
+        repeats = 5 if periods < 100_000 else 2
+        ta_time = best_of(lambda: predictor._calculate_ta_indicators(df), repeats)
+        np_time = best_of(lambda: predictor.calculate_technical_indicators(df), repeats)
+
+        reference = predictor._calculate_ta_indicators(df)
+        fused = predictor.calculate_technical_indicators(df)
+        assert list(reference.columns) == list(fused.columns)
+        diff = np.nanmax(np.abs(reference.to_numpy() - fused.to_numpy()))
+
+        print(f"{periods:>8} {ta_time * 1e3:>10.1f} {np_time * 1e3:>11.1f} "
+              f"{ta_time / np_time:>7.1f}x {diff:>13.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start time of the predictor, API server and daemon
+
+Each case runs in a fresh interpreter (inside a scratch directory, since the
+modules create log folders on import) and reports the best of several runs.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(ML_DIR)
+
+LAZY_ATTRIBUTES = ('scaler', 'direction_model', 'price_model', 'ultra_high_accuracy',
+                   'volatility_suite', 'adaptive_manager', 'news_trader',
+                   'position_manager', 'unified_aggressive')
+
+CASES = [
+    ('import technical_predictor',
+     "import technical_predictor"),
+    ('TechnicalPredictor()',
+     "from technical_predictor import TechnicalPredictor; TechnicalPredictor()"),
+    ('TechnicalPredictor() + all suites',
+     "from technical_predictor import TechnicalPredictor; p = TechnicalPredictor(); "
+     f"[getattr(p, name) for name in {LAZY_ATTRIBUTES!r}]"),
+    ('import api_server',
+     "import api_server"),
+    ('PredictorDaemon()',
+     "from predictor_daemon import PredictorDaemon; PredictorDaemon()"),
+]
+
+TIMER = """
+import time
+_start = time.perf_counter()
+{code}
+print(time.perf_counter() - _start)
+"""
+
+
+def time_case(code, cwd):
+    """Seconds taken by code in a fresh interpreter, or None if it fails"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ML_DIR, REPO_DIR]))
+    result = subprocess.run([sys.executable, '-c', TIMER.format(code=code)],
+                            cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(repeats=5):
+    """Time every case and print a table"""
+    print(f"{'case':<36} {'best (ms)':>10}")
+    with tempfile.TemporaryDirectory() as scratch:
+        for label, code in CASES:
+            timings = [time_case(code, scratch) for _ in range(repeats)]
+            if None in timings:
+                print(f"{label:<36} {'unavailable':>10}")
+                continue
+            print(f"{label:<36} {min(timings) * 1e3:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Backtest Checkpoints
+Periodically saved state of a long backtest or parameter sweep, so an
+interrupted run can resume where it stopped and finish with the same
+results as an uninterrupted one
+
+A checkpoint is a small pickle replaced at every save, keyed by a
+fingerprint of the input data and run settings. Records that only grow
+(trades, equity points) go to an append-only journal next to it instead,
+so each save writes what is new since the last one.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 3
+JOURNAL_SUFFIX = '.journal'
+
+
+def data_fingerprint(df: pd.DataFrame, *extra) -> str:
+    """Hash of a DataFrame's index and numeric values, plus any JSON-able extras"""
+    digest = hashlib.sha1()
+    if isinstance(df.index, pd.DatetimeIndex):
+        digest.update(df.index.asi8.tobytes())
+    else:
+        digest.update(np.asarray(df.index).astype(str).tobytes())
+    numeric = df.select_dtypes(include='number')
+    digest.update(json.dumps(list(map(str, numeric.columns))).encode())
+    digest.update(np.ascontiguousarray(numeric.to_numpy(dtype=np.float64)).tobytes())
+    for item in extra:
+        digest.update(json.dumps(item, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def scalar_settings(obj, exclude: Iterable[str] = ()) -> dict:
+    """Public number / string / bool attributes of obj, for fingerprints"""
+    return {name: value for name, value in sorted(vars(obj).items())
+            if not name.startswith('_') and name not in exclude
+            and isinstance(value, (bool, int, float, str, type(None)))}
+
+
+def engine_settings(engine) -> list:
+    """Indicators of a SignalEngine with their parameters, weights and thresholds"""
+    return [[type(c.indicator).__name__, scalar_settings(c.indicator, ('last_calculation',)),
+             c.weight, c.category.name, c.enabled, c.min_confidence]
+            for c in engine.configurations] + [engine.risk_thresholds]
+
+
+def save_checkpoint(path: str, kind: str, fingerprint: str, state: dict):
+    """Atomically replace the checkpoint at path with state"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}")
+    with open(temp, 'wb') as f:
+        pickle.dump({
+            'version': CHECKPOINT_VERSION,
+            'kind': kind,
+            'fingerprint': fingerprint,
+            'saved_at': datetime.now().isoformat(),
+            'state': state
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp, path)
+
+
+def load_checkpoint(path: str, kind: str, fingerprint: str) -> Optional[dict]:
+    """
+    State saved at path, or None when there is no checkpoint or it belongs
+    to another kind of run, format version or input
+    """
+    try:
+        with open(path, 'rb') as f:
+            checkpoint = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    if checkpoint.get('version') != CHECKPOINT_VERSION or checkpoint.get('kind') != kind:
+        logger.warning(f"Ignoring checkpoint {path}: not a {kind} checkpoint (version {CHECKPOINT_VERSION})")
+        return None
+    if checkpoint.get('fingerprint') != fingerprint:
+        logger.warning(f"Ignoring checkpoint {path}: saved for different data or settings")
+        return None
+    logger.info(f"Loaded checkpoint {path} saved at {checkpoint['saved_at']}")
+    return checkpoint['state']
+
+
+def remove_checkpoint(path: str):
+    """Delete the checkpoint of a finished run, and its journal"""
+    for name in (path, path + JOURNAL_SUFFIX):
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
+
+
+class CheckpointJournal:
+    """
+    Append-only record lists kept next to a checkpoint
+
+    append() writes the items added to each list since the previous call
+    and returns the journal's length, which the checkpoint stores; restore()
+    rebuilds the lists as of such a length, dropping anything appended
+    after it (e.g. by a save that was interrupted before its checkpoint).
+    """
+
+    def __init__(self, checkpoint_path: str, names: Iterable[str]):
+        self.path = checkpoint_path + JOURNAL_SUFFIX
+        self.names = tuple(names)
+        self._saved = dict.fromkeys(self.names, 0)
+
+    def start(self):
+        """Begin an empty journal"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        open(self.path, 'wb').close()
+        self._saved = dict.fromkeys(self.names, 0)
+
+    def append(self, records: Dict[str, list]) -> int:
+        """Write what is new in each list; returns the offset to checkpoint"""
+        with open(self.path, 'ab') as f:
+            pickle.dump({name: records[name][self._saved[name]:] for name in self.names},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+            offset = f.tell()
+        self._saved = {name: len(records[name]) for name in self.names}
+        return offset
+
+    def restore(self, offset: int) -> Dict[str, List]:
+        """The lists as of offset; later appends continue from there"""
+        records = {name: [] for name in self.names}
+        with open(self.path, 'r+b') as f:
+            f.truncate(offset)
+            while f.tell() < offset:
+                for name, items in pickle.load(f).items():
+                    records[name].extend(items)
+        self._saved = {name: len(items) for name, items in records.items()}
+        return records
@@ -0,0 +1,8 @@
+"""
+Pytest setup for the ml tests: technical_predictor logs to LOG_DIR at
+import time, so point it at a temporary directory instead of the tree
+"""
+import os
+import tempfile
+
+os.environ.setdefault('LOG_DIR', tempfile.mkdtemp(prefix='qtp-test-logs-'))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Exit Resolution Kernel
+Finds where stop-loss / take-profit orders close, for many trades at once,
+with array searches over the bar high/low/close columns
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+EXIT_OPEN = 0
+EXIT_STOP = 1
+EXIT_TARGET = 2
+EXIT_SIGNAL = 3
+EXIT_REASONS = ('Open', 'Stop Loss', 'Take Profit', 'Signal')
+
+FIRST_CHUNK = 64
+MAX_CHUNK = 4096
+
+
+@dataclass
+class ExitPlan:
+    """Where each trade exits; index -1 (reason EXIT_OPEN) if it never does"""
+    index: np.ndarray   # exit bar
+    price: np.ndarray   # fill price (NaN while open)
+    reason: np.ndarray  # EXIT_* codes
+    stop: np.ndarray    # stop level in force at exit (differs from the initial stop when trailing)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def reason_labels(self) -> np.ndarray:
+        return np.asarray(EXIT_REASONS, dtype=object)[self.reason]
+
+
+def resolve_exits(high, low, close, entry_index, is_long, entry_price, stop, target,
+                  trail_distance=None, signal_exit=None, end: Optional[int] = None,
+                  fill: str = 'level', same_bar: str = 'stop') -> ExitPlan:
+    """
+    First bar after entry where each trade's stop or target is breached
+
+    A long stops out when the bar low reaches its stop and takes profit when
+    the high reaches its target (mirrored for shorts). Pass close as high and
+    low for close-only triggers.
+
+    Args:
+        high, low, close: bar arrays
+        entry_index, is_long, entry_price, stop, target: one value per trade;
+            the search starts at the bar after entry_index
+        trail_distance: optional per-bar distance for a trailing stop; on each
+            bar that closes beyond entry_price the stop ratchets to close -/+
+            distance (NaN distances are ignored) before that bar is checked
+        signal_exit: optional per-trade bar of a signal exit at the close
+            (-1 for none); a stop or target on the same bar takes precedence
+        end: bars at or after end are not searched (default: all bars)
+        fill: 'level' fills at the stop/target price, 'close' at the bar close
+        same_bar: which of stop and target wins when one bar breaches both
+
+    Returns:
+        ExitPlan with one entry per trade
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    entry_index = np.atleast_1d(np.asarray(entry_index, dtype=np.int64))
+    count = len(entry_index)
+    is_long = np.broadcast_to(np.asarray(is_long, dtype=bool), (count,))
+    entry_price = np.broadcast_to(np.asarray(entry_price, dtype=np.float64), (count,))
+    target = np.broadcast_to(np.asarray(target, dtype=np.float64), (count,))
+    stop = np.array(np.broadcast_to(np.asarray(stop, dtype=np.float64), (count,)))
+    if signal_exit is not None:
+        signal_exit = np.broadcast_to(np.asarray(signal_exit, dtype=np.int64), (count,))
+    if trail_distance is not None:
+        trail_distance = np.asarray(trail_distance, dtype=np.float64)
+    if fill not in ('level', 'close') or same_bar not in ('stop', 'target'):
+        raise ValueError("fill must be 'level' or 'close' and same_bar 'stop' or 'target'")
+
+    bars = len(close)
+    end = bars if end is None else min(end, bars)
+    exit_index = np.full(count, -1, dtype=np.int64)
+    exit_price = np.full(count, np.nan)
+    reason = np.zeros(count, dtype=np.int8)
+
+    # +1 for longs, -1 for shorts: a breach is sign * (level - price) >= 0
+    sign = np.where(is_long, 1.0, -1.0)
+    position = entry_index + 1
+    active = np.flatnonzero(position < end)
+    chunk = FIRST_CHUNK
+
+    while len(active):
+        # Look ahead `chunk` bars for every unresolved trade at once
+        window = position[active, None] + np.arange(chunk)
+        valid = window < end
+        window = np.minimum(window, end - 1)
+        s = sign[active, None]
+        h, l, c = high[window], low[window], close[window]
+
+        if trail_distance is not None:
+            # Trailing stop: running best of the initial stop and each favourable close's candidate
+            candidate = c - s * trail_distance[window]
+            favourable = valid & (s * (c - entry_price[active, None]) > 0) & ~np.isnan(candidate)
+            candidate = np.where(favourable, s * candidate, -np.inf)
+            levels = s * np.maximum(np.maximum.accumulate(candidate, axis=1),
+                                    (s * stop[active, None]))
+        else:
+            levels = np.broadcast_to(stop[active, None], window.shape)
+
+        adverse = np.where(s > 0, l, h)
+        favourable_extreme = np.where(s > 0, h, l)
+        stop_hit = valid & (s * (levels - adverse) >= 0)
+        target_hit = valid & (s * (favourable_extreme - target[active, None]) >= 0)
+        hit = stop_hit | target_hit
+        if signal_exit is not None:
+            signal_hit = valid & (window == signal_exit[active, None])
+            hit |= signal_hit
+
+        first = np.argmax(hit, axis=1)
+        rows = np.arange(len(active))
+        resolved = hit[rows, first]
+
+        done, at = active[resolved], first[resolved]
+        r = rows[resolved]
+        is_stop = stop_hit[r, at]
+        is_target = target_hit[r, at]
+        if same_bar == 'target':
+            is_stop &= ~is_target
+        else:
+            is_target &= ~is_stop
+        level = levels[r, at]
+        exit_index[done] = window[r, at]
+        reason[done] = np.select([is_stop, is_target], [EXIT_STOP, EXIT_TARGET], EXIT_SIGNAL)
+        if fill == 'level':
+            exit_price[done] = np.select([is_stop, is_target], [level, target[done]], c[r, at])
+        else:
+            exit_price[done] = c[r, at]
+        stop[done] = level
+
+        # Carry the trailing stop into the next window
+        pending = ~resolved
+        if trail_distance is not None:
+            stop[active[pending]] = levels[pending, -1]
+        position[active[pending]] += chunk
+        active = active[pending]
+        active = active[position[active] < end]
+        chunk = min(chunk * 2, MAX_CHUNK)
+
+    return ExitPlan(exit_index, exit_price, reason, stop)
+
+
+def max_adverse_excursion(high, low, entry_index, exit_index, is_long, entry_price) -> np.ndarray:
+    """
+    Largest move against each trade over the bars after entry up to and
+    including its exit, as a fraction of the entry price (0 if none)
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    entry_index = np.atleast_1d(entry_index)
+    exit_index = np.atleast_1d(exit_index)
+    is_long = np.broadcast_to(is_long, entry_index.shape)
+    entry_price = np.broadcast_to(entry_price, entry_index.shape)
+    excursion = np.zeros(len(entry_index))
+    for k, (start, stop) in enumerate(zip(entry_index + 1, exit_index + 1)):
+        if stop <= start:
+            continue
+        if is_long[k]:
+            worst = (entry_price[k] - low[start:stop]) / entry_price[k]
+        else:
+            worst = (high[start:stop] - entry_price[k]) / entry_price[k]
+        excursion[k] = max(0.0, float(worst.max()))
+    return excursion
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Fused NumPy Feature Kernel
+Computes the TechnicalPredictor feature matrix in a few array passes,
+writing every column into one preallocated 2-D array
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List
+
+# Bump when any feature definition or column changes (invalidates stored features)
+FEATURE_SET_VERSION = 1
+
+# Windows shared with the ta-based implementation in TechnicalPredictor
+STAT_WINDOWS = (5, 10, 20)
+LEVEL_WINDOWS = (20, 50)
+
+
+def feature_names(has_volume: bool, has_spread: bool) -> List[str]:
+    """Column names in the same order as TechnicalPredictor.calculate_technical_indicators"""
+    names = [
+        'returns', 'log_returns',
+        'sma_20', 'sma_50', 'ema_12', 'ema_26',
+        'macd', 'macd_signal', 'macd_diff',
+        'rsi',
+        'bb_high', 'bb_low', 'bb_mid', 'bb_width', 'bb_pct',
+        'stoch_k', 'stoch_d',
+        'adx', 'adx_pos', 'adx_neg',
+        'atr'
+    ]
+    if has_volume:
+        names += ['obv', 'vwap']
+    if has_spread:
+        names += ['spread', 'spread_pct', 'mid_price']
+    for window in STAT_WINDOWS:
+        names += [f'volatility_{window}', f'skew_{window}', f'kurt_{window}']
+    for window in LEVEL_WINDOWS:
+        names += [f'resistance_{window}', f'support_{window}',
+                  f'price_to_resistance_{window}', f'price_to_support_{window}']
+    return names
+
+
+def frame_feature_names(df: pd.DataFrame) -> List[str]:
+    """Columns compute_technical_features(df) returns, without computing them"""
+    return feature_names(df['volume'].to_numpy(dtype=np.float64).sum() > 0, 'ask' in df.columns)
+
+
+def compute_technical_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Feature frame for an OHLCV frame (bid/ask columns optional)
+
+    Matches the ta-based feature set column for column; values agree to
+    floating-point rounding.
+    """
+    close = df['close'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    has_volume = volume.sum() > 0
+    has_spread = 'ask' in df.columns
+    bid = df['bid'].to_numpy(dtype=np.float64) if has_spread else None
+    ask = df['ask'].to_numpy(dtype=np.float64) if has_spread else None
+
+    names = feature_names(has_volume, has_spread)
+    matrix = compute_feature_matrix(close, high, low, volume, bid, ask,
+                                    has_volume=has_volume)
+    # Column-major buffer: the frame wraps it as a single block without copying
+    return pd.DataFrame(matrix.T, index=df.index, columns=names, copy=False)
+
+
+def compute_feature_matrix(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                           volume: np.ndarray, bid: np.ndarray = None,
+                           ask: np.ndarray = None, has_volume: bool = True) -> np.ndarray:
+    """
+    Feature matrix as a (n_features, n_bars) array, rows ordered as feature_names()
+    """
+    n = len(close)
+    has_spread = bid is not None and ask is not None
+    out = np.full((len(feature_names(has_volume, has_spread)), n), np.nan)
+    rows = iter(out)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prev_close = np.empty(n)
+        prev_close[0] = np.nan
+        prev_close[1:] = close[:-1]
+
+        # Price-based features
+        returns = next(rows)
+        np.divide(close, prev_close, out=returns)
+        np.log(returns, out=next(rows))
+        returns -= 1.0
+
+        # Trend
+        sma_20 = _rolling_mean(close, 20, next(rows))
+        _rolling_mean(close, 50, next(rows))
+        ema_12 = _ewm(close, 2.0 / 13, 12, next(rows))
+        ema_26 = _ewm(close, 2.0 / 27, 26, next(rows))
+
+        # MACD
+        macd = next(rows)
+        np.subtract(ema_12, ema_26, out=macd)
+        macd_signal = _ewm(macd, 2.0 / 10, 9, next(rows))
+        np.subtract(macd, macd_signal, out=next(rows))
+
+        # RSI (Wilder smoothing of gains and losses)
+        diff = close - prev_close
+        gains = np.where(diff > 0, diff, 0.0)
+        losses = np.where(diff < 0, -diff, 0.0)
+        ema_up = _ewm(gains, 1.0 / 14, 14, np.empty(n))
+        ema_down = _ewm(losses, 1.0 / 14, 14, np.empty(n))
+        rsi = next(rows)
+        rsi[:] = np.where(ema_down == 0, 100.0, 100.0 - 100.0 / (1.0 + ema_up / ema_down))
+
+        # Bollinger Bands (population std)
+        std_20 = _rolling_std(close, 20, 0)
+        bb_high, bb_low, bb_mid = next(rows), next(rows), next(rows)
+        np.add(sma_20, 2 * std_20, out=bb_high)
+        np.subtract(sma_20, 2 * std_20, out=bb_low)
+        bb_mid[:] = sma_20
+        band = bb_high - bb_low
+        np.multiply(band / sma_20, 100, out=next(rows))
+        next(rows)[:] = np.where(band != 0, (close - bb_low) / band, np.nan)
+
+        # Stochastic Oscillator
+        lowest = _rolling_reduce(low, 14, np.min)
+        highest = _rolling_reduce(high, 14, np.max)
+        stoch_k = next(rows)
+        stoch_k[:] = 100 * (close - lowest) / (highest - lowest)
+        _rolling_mean(stoch_k, 3, next(rows))
+
+        # ADX and ATR share the true range
+        _adx(high, low, close, prev_close, 14, next(rows), next(rows), next(rows))
+        _atr(high, low, prev_close, 14, next(rows))
+
+        # Volume
+        if has_volume:
+            np.cumsum(np.where(close < prev_close, -volume, volume), out=next(rows))
+            typical_volume = (high + low + close) / 3.0 * volume
+            next(rows)[:] = _rolling_sum(typical_volume, 14) / _rolling_sum(volume, 14)
+
+        # Market Microstructure
+        if has_spread:
+            spread = next(rows)
+            np.subtract(ask, bid, out=spread)
+            np.divide(spread, bid, out=next(rows))
+            np.multiply(bid + ask, 0.5, out=next(rows))
+
+        # Statistical features of returns
+        for window in STAT_WINDOWS:
+            _rolling_moments(returns, window, next(rows), next(rows), next(rows))
+
+        # Support/Resistance
+        for window in LEVEL_WINDOWS:
+            resistance, support = next(rows), next(rows)
+            _rolling_reduce(high, window, np.max, resistance)
+            _rolling_reduce(low, window, np.min, support)
+            np.divide(resistance - close, close, out=next(rows))
+            np.divide(close - support, close, out=next(rows))
+
+    return out
+
+
+def _lfilter(b, a, x, zi):
+    """scipy.signal.lfilter, imported on first use (scipy.signal is slow to import)"""
+    from scipy.signal import lfilter
+    return lfilter(b, a, x, zi=zi)
+
+
+def _rolling_reduce(values: np.ndarray, window: int, reducer, out: np.ndarray = None) -> np.ndarray:
+    """Trailing-window reduction; NaN until the window is full or if it holds a NaN"""
+    if out is None:
+        out = np.empty(len(values))
+    out[:window - 1] = np.nan
+    if len(values) >= window:
+        reducer(sliding_window_view(values, window), axis=1, out=out[window - 1:])
+    return out
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_reduce(values, window, np.sum)
+
+
+def _rolling_mean(values: np.ndarray, window: int, out: np.ndarray = None) -> np.ndarray:
+    return _rolling_reduce(values, window, np.mean, out)
+
+
+def _constant_windows(windows: np.ndarray) -> np.ndarray:
+    """Windows whose values are all equal (pandas reports exactly zero variance there)"""
+    return (windows == windows[:, :1]).all(axis=1)
+
+
+def _rolling_std(values: np.ndarray, window: int, ddof: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)
+        std = windows.std(axis=1, ddof=ddof)
+        std[_constant_windows(windows)] = 0.0
+        out[window - 1:] = std
+    return out
+
+
+def _rolling_moments(values: np.ndarray, window: int, std_out: np.ndarray,
+                     skew_out: np.ndarray, kurt_out: np.ndarray):
+    """
+    Rolling sample std, skew and excess kurtosis in one pass over the windows
+
+    Uses the same bias corrections as pandas; constant windows give a std and
+    skew of 0 and a kurtosis of -3, as pandas does.
+    """
+    std_out[:] = skew_out[:] = kurt_out[:] = np.nan
+    if len(values) < window:
+        return
+    windows = sliding_window_view(values, window)
+    centred = windows - windows.mean(axis=1, keepdims=True)
+    squared = centred * centred
+    m2 = squared.mean(axis=1)
+    m3 = (squared * centred).mean(axis=1)
+    m4 = (squared * squared).mean(axis=1)
+
+    n = float(window)
+    std = np.sqrt(m2 * n / (n - 1))
+    skew = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+    g2 = m4 / (m2 * m2) - 3.0
+    kurt = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * g2 + 6.0)
+
+    constant = _constant_windows(windows)
+    std[constant] = 0.0
+    skew[constant] = 0.0
+    kurt[constant] = -3.0
+    std_out[window - 1:] = std
+    skew_out[window - 1:] = skew
+    kurt_out[window - 1:] = kurt
+
+
+def _ewm(values: np.ndarray, alpha: float, min_periods: int, out: np.ndarray) -> np.ndarray:
+    """
+    Exponentially weighted mean with adjust=False, starting at the first
+    non-NaN value and NaN until min_periods observations have been seen
+    """
+    out[:] = np.nan
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return out
+    first = valid[0]
+    decay = 1.0 - alpha
+    out[first] = values[first]
+    if first + 1 < len(values):
+        out[first + 1:], _ = _lfilter([alpha], [1.0, -decay], values[first + 1:],
+                                      zi=[decay * values[first]])
+    out[first:first + min_periods - 1] = np.nan
+    return out
+
+
+def _smooth(initial: float, increments: np.ndarray, window: int) -> np.ndarray:
+    """
+    Recursive smoothing s[i] = s[i-1] * (window - 1) / window + increments[i]
+    seeded with s[-1] = initial, as used by Wilder's ADX sums
+    """
+    decay = 1.0 - 1.0 / window
+    smoothed, _ = _lfilter([1.0], [1.0, -decay], increments, zi=[decay * initial])
+    return smoothed
+
+
+def _atr(high: np.ndarray, low: np.ndarray, prev_close: np.ndarray, window: int,
+         out: np.ndarray) -> np.ndarray:
+    """Average True Range: Wilder average of the true range, zero before the first window"""
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    out[:] = 0.0
+    if len(high) < window:
+        return out
+    seed = true_range[:window].mean()
+    out[window - 1] = seed
+    decay = (window - 1) / window
+    out[window:], _ = _lfilter([1.0 / window], [1.0, -decay], true_range[window:],
+                               zi=[decay * seed])
+    return out
+
+
+def _adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, prev_close: np.ndarray,
+         window: int, adx_out: np.ndarray, pos_out: np.ndarray, neg_out: np.ndarray):
+    """
+    ADX, +DI and -DI laid out exactly as ta's ADXIndicator
+
+    Including its quirks: zeros instead of NaN before the first value, and
+    +DI/-DI reported as zero on the bar the smoothed sums are first seeded.
+    """
+    n = len(close)
+    adx_out[:] = pos_out[:] = neg_out[:] = 0.0
+    length = n - (window - 1)
+    if length <= window + 1:
+        return
+
+    true_range = np.fmax(high, prev_close) - np.fmin(low, prev_close)
+    up = np.empty(n)
+    down = np.empty(n)
+    up[0] = down[0] = np.nan
+    up[1:] = high[1:] - high[:-1]
+    down[1:] = low[:-1] - low[1:]
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+
+    def wilder_sum(series: np.ndarray) -> np.ndarray:
+        sums = np.zeros(length)
+        sums[0] = series[1:window + 1].sum()
+        sums[1:length - 1] = _smooth(sums[0], series[window + 1:n], window)
+        return sums
+
+    trs = wilder_sum(true_range)
+    dip = wilder_sum(plus_dm)
+    din = wilder_sum(minus_dm)
+
+    nonzero = trs != 0
+    di_plus = np.where(nonzero, 100 * dip / np.where(nonzero, trs, 1.0), 0.0)
+    di_minus = np.where(nonzero, 100 * din / np.where(nonzero, trs, 1.0), 0.0)
+    di_sum = di_plus + di_minus
+    dx = np.where(di_sum != 0, 100 * np.abs(di_plus - di_minus) / np.where(di_sum != 0, di_sum, 1.0), 0.0)
+
+    adx = np.zeros(length)
+    adx[window] = dx[:window].mean()
+    if length > window + 1:
+        decay = (window - 1) / window
+        adx[window + 1:], _ = _lfilter([1.0 / window], [1.0, -decay], dx[window:length - 1],
+                                       zi=[decay * adx[window]])
+    adx_out[window - 1:] = adx
+
+    # +DI/-DI at bar i + window from smoothed sum i, for i in 1..length-2
+    pos_out[window + 1:] = di_plus[1:length - 1]
+    neg_out[window + 1:] = di_minus[1:length - 1]
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Feature Store
+Local on-disk cache of computed feature matrices, keyed by symbol, timeframe,
+feature set and version, stored as memory-mappable column-major .npy segments
+"""
+
+import json
+import logging
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FILE = 'schema.json'
+
+
+@dataclass(frozen=True)
+class FeatureKey:
+    """Identifies one stored feature matrix"""
+    symbol: str
+    timeframe: str
+    feature_set: str
+    version: str
+
+    def relative_path(self) -> Path:
+        return Path(self.symbol) / self.timeframe / f"{self.feature_set}-v{self.version}"
+
+
+class FeatureStore:
+    """
+    Append-only feature matrices on disk
+
+    Each key is a directory holding schema.json and one or more segments.
+    A segment is a (features, bars) float64 .npy, so every column is
+    contiguous, plus the bars' int64 epoch-ns timestamps and, when given,
+    their closes (used to recognise revised history). Loads memory-map
+    the segments; appends add a segment for bars past the stored end, and
+    segments are compacted into one once there are too many.
+    """
+
+    MAX_SEGMENTS = 16
+
+    def __init__(self, root: str = None):
+        self.root = Path(root or os.getenv('FEATURE_STORE_DIR', 'ml/feature_store'))
+
+    def path(self, key: FeatureKey) -> Path:
+        return self.root / key.relative_path()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def schema(self, key: FeatureKey) -> Optional[dict]:
+        """Stored schema for key, or None if nothing valid is stored"""
+        try:
+            with open(self.path(key) / SCHEMA_FILE) as f:
+                schema = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if schema.get('version') != key.version or not schema.get('segments'):
+            return None
+        return schema
+
+    def load(self, key: FeatureKey, start=None, end=None) -> Optional[pd.DataFrame]:
+        """
+        Stored features between start and end (inclusive timestamps)
+
+        A range inside one segment is returned as a read-only, zero-copy view
+        of the memory-mapped file.
+        """
+        schema = self.schema(key)
+        if schema is None:
+            return None
+        tz = schema.get('tz') or None
+        start_ns = self._to_epoch(start, tz) if start is not None else None
+        end_ns = self._to_epoch(end, tz) if end is not None else None
+
+        directory = self.path(key)
+        blocks, epochs = [], []
+        for segment in schema['segments']:
+            if start_ns is not None and segment['end'] < start_ns:
+                continue
+            if end_ns is not None and segment['start'] > end_ns:
+                continue
+            epoch = np.load(directory / f"{segment['name']}.epoch.npy", mmap_mode='r')
+            lo = np.searchsorted(epoch, start_ns) if start_ns is not None else 0
+            hi = np.searchsorted(epoch, end_ns, side='right') if end_ns is not None else len(epoch)
+            values = np.load(directory / f"{segment['name']}.npy", mmap_mode='r')
+            blocks.append(values[:, lo:hi])
+            epochs.append(epoch[lo:hi])
+
+        if not blocks:
+            values = np.empty((len(schema['columns']), 0))
+            epoch = np.empty(0, dtype=np.int64)
+        elif len(blocks) == 1:
+            values, epoch = blocks[0], epochs[0]
+        else:
+            values, epoch = np.concatenate(blocks, axis=1), np.concatenate(epochs)
+
+        index = pd.DatetimeIndex(np.asarray(epoch).view('datetime64[ns]'))
+        if tz:
+            index = index.tz_localize('UTC').tz_convert(tz)
+        return pd.DataFrame(values.T, index=index, columns=schema['columns'], copy=False)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write(self, key: FeatureKey, features: pd.DataFrame, close: np.ndarray = None):
+        """
+        Replace everything stored for key, and drop other versions of its
+        feature set; close holds the close price of each row, if known
+        """
+        directory = self.path(key)
+        self._drop_other_versions(key)
+        staging = directory.with_name(f".{directory.name}.{uuid.uuid4().hex}")
+        staging.mkdir(parents=True)
+        try:
+            schema = {
+                'version': key.version,
+                'columns': [str(c) for c in features.columns],
+                'tz': self._tz_name(features.index),
+                'segments': [self._write_segment(staging, features, close)]
+            }
+            self._write_schema(staging, schema)
+            if directory.exists():
+                shutil.rmtree(directory)
+            staging.rename(directory)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def append(self, key: FeatureKey, features: pd.DataFrame, close: np.ndarray = None) -> int:
+        """
+        Add rows newer than the stored end; returns the number of rows added
+
+        Raises ValueError when the columns differ from the stored schema, in
+        which case the matrix must be rewritten with write().
+        """
+        schema = self.schema(key)
+        if schema is None:
+            self.write(key, features, close)
+            return len(features)
+        if [str(c) for c in features.columns] != schema['columns']:
+            raise ValueError(f"Feature columns changed for {key}; rewrite the store entry")
+
+        epoch = self._epochs(features.index)
+        first = np.searchsorted(epoch, schema['segments'][-1]['end'], side='right')
+        new_rows = features.iloc[first:]
+        if len(new_rows) == 0:
+            return 0
+
+        directory = self.path(key)
+        schema['segments'].append(self._write_segment(
+            directory, new_rows, close[first:] if close is not None else None))
+        self._write_schema(directory, schema)
+        if len(schema['segments']) > self.MAX_SEGMENTS:
+            self.compact(key)
+        return len(new_rows)
+
+    def compact(self, key: FeatureKey):
+        """Merge all segments of key into one"""
+        schema = self.schema(key)
+        if schema is None or len(schema['segments']) <= 1:
+            return
+        features = self.load(key)
+        features = pd.DataFrame(np.ascontiguousarray(features.to_numpy()),
+                                index=features.index, columns=features.columns)
+        self.write(key, features, self._stored_bars(key, schema, 'close'))
+
+    def invalidate(self, symbol: str = None, timeframe: str = None, feature_set: str = None):
+        """Remove stored features matching every given field (all if none given)"""
+        for directory in self.root.glob('*/*/*'):
+            sym, tf, name = directory.parts[-3:]
+            stored_set = name.rsplit('-v', 1)[0]
+            if symbol not in (None, sym) or timeframe not in (None, tf) \
+                    or feature_set not in (None, stored_set):
+                continue
+            shutil.rmtree(directory, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Cache-through computation
+    # ------------------------------------------------------------------
+
+    def get_or_compute(self, key: FeatureKey, df: pd.DataFrame,
+                       compute: Callable[[pd.DataFrame], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Features for df, computing only what the store cannot serve
+
+        Served from disk only when the result equals compute(df), i.e. when
+        df starts at the stored first bar (so warm-up rows see the same
+        history) and agrees with the stored bars where they overlap:
+
+        - df a prefix of the stored range: loaded from disk, nothing computed
+        - df extends the stored range: computed, and only new bars appended
+        - df starting after the stored first bar: computed, store unchanged
+        - new key, version or columns, revised history, or df covering the
+          whole stored range: computed and rewritten
+
+        A shorter frame never replaces a longer stored history unless that
+        history disagrees with df (timestamps or closes).
+        """
+        if not isinstance(df.index, pd.DatetimeIndex) or len(df) == 0 \
+                or not df.index.is_monotonic_increasing:
+            return compute(df)
+
+        epoch = self._epochs(df.index)
+        close = df['close'].to_numpy(dtype=np.float64) if 'close' in df.columns else None
+        schema = self.schema(key)
+        if schema is not None and self._history_matches(key, schema, epoch, close):
+            stored_start = schema['segments'][0]['start']
+            stored_end = schema['segments'][-1]['end']
+            if epoch[0] == stored_start and epoch[-1] <= stored_end:
+                return self.load(key, df.index[0], df.index[-1])
+            if epoch[0] == stored_start:
+                features = compute(df)
+                if len(features) != len(df):
+                    return features
+                try:
+                    self.append(key, features, close)
+                except ValueError as e:
+                    logger.info(f"{e}")
+                    self.write(key, features, close)
+                return features
+            elif epoch[0] > stored_start or epoch[-1] < stored_end:
+                # Not a superset of what is stored: keep the longer history
+                return compute(df)
+
+        features = compute(df)
+        if len(features) == len(df) and len(features):
+            self.write(key, features, close)
+        return features
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _write_segment(directory: Path, features: pd.DataFrame,
+                       close: Optional[np.ndarray] = None) -> dict:
+        epoch = FeatureStore._epochs(features.index)
+        name = f"seg-{epoch[0]}-{epoch[-1]}"
+        np.save(directory / f"{name}.npy",
+                np.ascontiguousarray(features.to_numpy(dtype=np.float64).T))
+        np.save(directory / f"{name}.epoch.npy", epoch)
+        segment = {'name': name, 'start': int(epoch[0]), 'end': int(epoch[-1]), 'rows': len(epoch)}
+        if close is not None:
+            np.save(directory / f"{name}.close.npy", np.asarray(close, dtype=np.float64))
+            segment['close'] = True
+        return segment
+
+    @staticmethod
+    def _write_schema(directory: Path, schema: dict):
+        temp = directory / f".{SCHEMA_FILE}.{uuid.uuid4().hex}"
+        with open(temp, 'w') as f:
+            json.dump(schema, f)
+        os.replace(temp, directory / SCHEMA_FILE)
+
+    def _drop_other_versions(self, key: FeatureKey):
+        parent = self.path(key).parent
+        if not parent.exists():
+            return
+        current = self.path(key).name
+        for directory in parent.glob(f"{key.feature_set}-v*"):
+            if directory.name != current and directory.name.rsplit('-v', 1)[0] == key.feature_set:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def _stored_bars(self, key: FeatureKey, schema: dict, column: str,
+                     start_ns: int = None, end_ns: int = None) -> Optional[np.ndarray]:
+        """Per-bar array ('epoch' or 'close') of the stored bars in [start_ns, end_ns], if stored"""
+        directory = self.path(key)
+        epochs, values = [], []
+        for segment in schema['segments']:
+            if column != 'epoch' and not segment.get(column):
+                return None
+            if (start_ns is not None and segment['end'] < start_ns) or \
+                    (end_ns is not None and segment['start'] > end_ns):
+                continue
+            epoch = np.load(directory / f"{segment['name']}.epoch.npy", mmap_mode='r')
+            lo = np.searchsorted(epoch, start_ns) if start_ns is not None else 0
+            hi = np.searchsorted(epoch, end_ns, side='right') if end_ns is not None else len(epoch)
+            epochs.append(epoch[lo:hi])
+            if column != 'epoch':
+                values.append(np.load(directory / f"{segment['name']}.{column}.npy",
+                                      mmap_mode='r')[lo:hi])
+        parts = epochs if column == 'epoch' else values
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def _history_matches(self, key: FeatureKey, schema: dict, epoch: np.ndarray,
+                         close: Optional[np.ndarray]) -> bool:
+        """Whether the stored bars and df's bars agree wherever their ranges overlap"""
+        stored_start = schema['segments'][0]['start']
+        stored_end = schema['segments'][-1]['end']
+        lo = np.searchsorted(epoch, stored_start)
+        hi = np.searchsorted(epoch, stored_end, side='right')
+        stored_epoch = self._stored_bars(key, schema, 'epoch', epoch[0], epoch[-1])
+        if not np.array_equal(stored_epoch, epoch[lo:hi]):
+            return False
+        if close is None:
+            return True
+        stored_close = self._stored_bars(key, schema, 'close', epoch[0], epoch[-1])
+        return stored_close is None or np.array_equal(stored_close, close[lo:hi])
+
+    @staticmethod
+    def _epochs(index: pd.DatetimeIndex) -> np.ndarray:
+        return np.asarray(index.asi8, dtype=np.int64)
+
+    @staticmethod
+    def _tz_name(index) -> Optional[str]:
+        tz = getattr(index, 'tz', None)
+        return str(tz) if tz is not None else None
+
+    @staticmethod
+    def _to_epoch(value, tz) -> int:
+        stamp = pd.Timestamp(value)
+        if stamp.tzinfo is None and tz:
+            stamp = stamp.tz_localize(tz)
+        return stamp.value
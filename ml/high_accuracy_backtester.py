@@ -7,12 +7,15 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-import json
 import logging
 
 from high_accuracy_engine import HighAccuracyEngine, EnhancedSignal
 from indicators.base import SignalStrength
 from backtester import Trade, BacktestResult
+from checkpoint import (CheckpointJournal, data_fingerprint, engine_settings, load_checkpoint,
+                        remove_checkpoint, save_checkpoint, scalar_settings)
+from exit_kernel import resolve_exits
+from result_store import ResultReader, ResultWriter, equity_stats, trade_stats, write_summary
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,8 +24,21 @@ logger = logging.getLogger(__name__)
 class HighAccuracyBacktester:
     """Backtester for high accuracy trading strategy"""
     
-    def __init__(self, initial_capital: float = 10000.0):
+    def __init__(self, initial_capital: float = 10000.0, streaming: bool = True,
+                 results_path: Optional[str] = None, checkpoint_path: Optional[str] = None,
+                 checkpoint_every: int = 1000):
         self.engine = HighAccuracyEngine()
+        # Advance engine state bar by bar instead of re-analyzing each prefix
+        self.streaming = streaming
+        # Columnar results (result_store): trades and equity are written to
+        # results_path as they happen instead of being kept in memory
+        self.results_path = results_path
+        self._writer: Optional[ResultWriter] = None
+        # run() saves its state (stream included) to checkpoint_path every
+        # checkpoint_every bars; resume() continues from there
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self._journal: Optional[CheckpointJournal] = None
         self.initial_capital = initial_capital
         self.capital = initial_capital
         self.trades: List[Trade] = []
@@ -47,28 +63,148 @@ class HighAccuracyBacktester:
         logger.info(f"Starting high accuracy backtest for {symbol}")
         
         # Reset state
-        self.capital = self.initial_capital
-        self.trades = []
-        self.equity_curve = [self.initial_capital]
-        self.current_position = None
-        self.signals_analyzed = 0
-        self.signals_filtered = 0
-        self.entry_scores = []
-        self.daily_trade_count = {}
+        self._reset(df)
         
         # Process each bar
         min_periods = self.engine.signal_engine.get_required_periods()
         
-        for i in range(min_periods, len(df)):
+        stream = None
+        if self.streaming:
+            # Warm the stream up on the bars before the first analyzed one
+            stream = self.engine.stream(symbol, spread)
+            bars = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+            for j in range(min(min_periods, len(df))):
+                stream.push(df.index[j], *bars[j])
+        
+        return self._run_bars(df, symbol, spread, min_periods, stream)
+    
+    def resume(self, df: pd.DataFrame, symbol: str = 'UNKNOWN',
+               spread: float = 0.0001) -> Dict:
+        """
+        Continue an interrupted run() from its last checkpoint, or run from
+        the start when there is none (or it was saved for other data)
+        
+        Takes the arguments of the interrupted run; the results are those
+        of an uninterrupted run().
+        """
+        state = None
+        if self.checkpoint_path:
+            state = load_checkpoint(self.checkpoint_path, type(self).__name__,
+                                    self._fingerprint(df, symbol, spread))
+        if state is None:
+            return self.run(df, symbol, spread)
+        
+        logger.info(f"Resuming high accuracy backtest for {symbol} at bar {state['bar']}")
+        self._reset(df, state)
+        stream = state['stream']
+        if stream is not None:
+            bar = state['bar']
+            stream.restore_bars(df.index[:bar].tolist(),
+                                df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)[:bar])
+        return self._run_bars(df, symbol, spread, state['bar'], stream)
+    
+    def _fingerprint(self, df: pd.DataFrame, symbol: str, spread: float) -> str:
+        """Checkpoint key: the bars and every setting the results depend on"""
+        return data_fingerprint(df, symbol, spread, self.streaming, self.initial_capital,
+                                self.results_path, self.position_size_pct,
+                                self.stop_loss_atr_mult, self.take_profit_atr_mult,
+                                self.max_daily_trades, scalar_settings(self.engine),
+                                engine_settings(self.engine.signal_engine))
+    
+    def _reset(self, df: pd.DataFrame, state: Optional[Dict] = None):
+        """Clear run state (or restore it from a checkpoint) and cache the bar columns"""
+        if self._writer is not None:
+            self._writer.close()
+        self._journal = (CheckpointJournal(self.checkpoint_path,
+                                           ('trades', 'equity_curve', 'entry_scores'))
+                         if self.checkpoint_path else None)
+        if state is None:
+            self.capital = self.initial_capital
+            self.trades = []
+            self.equity_curve = []
+            self.current_position = None
+            self._writer = ResultWriter(self.results_path) if self.results_path else None
+            if self._journal is not None:
+                self._journal.start()
+            self._record_equity(self.initial_capital)
+            self.signals_analyzed = 0
+            self.signals_filtered = 0
+            self.entry_scores = []
+            self.daily_trade_count = {}
+            self._exit_plan = None
+        else:
+            self.capital = state['capital']
+            records = self._journal.restore(state['journal'])
+            self.trades = records['trades']
+            self.equity_curve = records['equity_curve']
+            self.entry_scores = records['entry_scores']
+            self.current_position = state['current_position']
+            self._writer = ResultWriter.restore(state['writer']) if state['writer'] else None
+            self.signals_analyzed = state['signals_analyzed']
+            self.signals_filtered = state['signals_filtered']
+            self.daily_trade_count = state['daily_trade_count']
+            self._exit_plan = state['exit_plan']
+        
+        # Bar columns and ATR (causal, so each bar's value equals that of its prefix)
+        self._high = df['high'].to_numpy(dtype=np.float64)
+        self._low = df['low'].to_numpy(dtype=np.float64)
+        self._close = df['close'].to_numpy(dtype=np.float64)
+        self._atr = self._calculate_atr(df).to_numpy(dtype=np.float64)
+    
+    def _save_checkpoint(self, fingerprint: str, bar: int, stream):
+        """
+        Save the run state as of the start of bar
+        
+        Lists that only grow go to the journal, and the stream is saved
+        without its bars (resume() rebuilds them from df), so a checkpoint
+        writes what is new since the last one plus bounded state.
+        """
+        journal = self._journal.append({'trades': self.trades,
+                                        'equity_curve': self.equity_curve,
+                                        'entry_scores': self.entry_scores})
+        state = {
+            'bar': bar,
+            'capital': self.capital,
+            'journal': journal,
+            'current_position': self.current_position,
+            'signals_analyzed': self.signals_analyzed,
+            'signals_filtered': self.signals_filtered,
+            'daily_trade_count': self.daily_trade_count,
+            'exit_plan': self._exit_plan,
+            'stream': stream,
+            'writer': self._writer.checkpoint() if self._writer is not None else None
+        }
+        if stream is None:
+            save_checkpoint(self.checkpoint_path, type(self).__name__, fingerprint, state)
+        else:
+            with stream.bars_detached():
+                save_checkpoint(self.checkpoint_path, type(self).__name__, fingerprint, state)
+    
+    def _run_bars(self, df: pd.DataFrame, symbol: str, spread: float, first_bar: int,
+                  stream) -> Dict:
+        """Process bars from first_bar on, checkpointing every checkpoint_every bars"""
+        fingerprint = self._fingerprint(df, symbol, spread) if self.checkpoint_path else None
+        if stream is not None:
+            bars = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+        
+        for i in range(first_bar, len(df)):
+            if fingerprint and i > first_bar and i % self.checkpoint_every == 0:
+                self._save_checkpoint(fingerprint, i, stream)
+            
             # Get data up to current bar
-            current_data = df.iloc[:i+1]
+            if stream is not None:
+                stream.push(df.index[i], *bars[i])
+                current_data = None
+            else:
+                current_data = df.iloc[:i+1]
             current_bar = df.iloc[i]
             current_time = df.index[i]
             current_date = current_time.date()
+            self._bar = i
             
             # Check position exit conditions first
             if self.current_position:
-                self._check_exit_conditions(current_bar, current_time, current_data)
+                self._check_exit_conditions(i, current_time)
             
             # Skip if we've hit daily trade limit
             if self.daily_trade_count.get(current_date, 0) >= self.max_daily_trades:
@@ -80,7 +216,10 @@ class HighAccuracyBacktester:
             
             try:
                 # Get enhanced signal
-                signal = self.engine.analyze_enhanced(current_data, symbol, spread)
+                if stream is not None:
+                    signal = stream.signal()
+                else:
+                    signal = self.engine.analyze_enhanced(current_data, symbol, spread)
                 self.signals_analyzed += 1
                 self.entry_scores.append(signal.entry_score)
                 
@@ -106,14 +245,17 @@ class HighAccuracyBacktester:
             self._close_position(df.iloc[-1]['close'], df.index[-1], 'End of backtest')
         
         # Calculate enhanced results
-        return self._calculate_results(df)
+        results = self._calculate_results(df)
+        if fingerprint:
+            remove_checkpoint(self.checkpoint_path)
+        return results
     
     def _open_position(self, signal: EnhancedSignal, current_bar, current_time, df):
         """Open position with enhanced signal"""
         price = current_bar['close']
         
         # Calculate position size based on volatility
-        atr = self._calculate_atr(df).iloc[-1]
+        atr = self._atr[self._bar]
         stop_distance = atr * self.stop_loss_atr_mult
         
         # Risk-based position sizing
@@ -146,57 +288,33 @@ class HighAccuracyBacktester:
         self.current_position.target_price = target_price
         self.current_position.entry_filters = signal.filters_passed
         
+        # Resolve the exit once: stop, trailing stop and target over the coming bars
+        self._exit_plan = resolve_exits(
+            self._high, self._low, self._close, self._bar, direction == 'long', price,
+            stop_price, target_price,
+            trail_distance=self._atr * self.stop_loss_atr_mult * 0.7)  # Tighter trailing
+        
         logger.info(f"Opened {direction} at {price:.5f} | "
                    f"Score: {signal.entry_score:.1f}% | "
                    f"Filters: {len(signal.filters_passed)}/{len(signal.confirmations)}")
     
-    def _check_exit_conditions(self, current_bar, current_time, df):
-        """Check exit conditions with trailing stop"""
-        if not self.current_position:
+    def _check_exit_conditions(self, i: int, current_time):
+        """Close the position on the bar its (trailing) stop or target resolved to"""
+        plan = self._exit_plan
+        if not self.current_position or plan is None or i != plan.index[0]:
             return
-        
-        price = current_bar['close']
-        high = current_bar['high']
-        low = current_bar['low']
-        
-        # Update trailing stop
-        if self.current_position.direction == 'long':
-            # Check if we've moved favorably
-            if price > self.current_position.entry_price:
-                # Calculate new trailing stop based on recent ATR
-                atr = self._calculate_atr(df).iloc[-1]
-                new_stop = price - (atr * self.stop_loss_atr_mult * 0.7)  # Tighter trailing
-                
-                if hasattr(self.current_position, 'stop_price'):
-                    self.current_position.stop_price = max(self.current_position.stop_price, new_stop)
-            
-            # Check exits
-            if low <= self.current_position.stop_price:
-                self._close_position(self.current_position.stop_price, current_time, 'Stop Loss')
-            elif high >= self.current_position.target_price:
-                self._close_position(self.current_position.target_price, current_time, 'Take Profit')
-                
-        else:  # short
-            # Check if we've moved favorably
-            if price < self.current_position.entry_price:
-                # Calculate new trailing stop
-                atr = self._calculate_atr(df).iloc[-1]
-                new_stop = price + (atr * self.stop_loss_atr_mult * 0.7)
-                
-                if hasattr(self.current_position, 'stop_price'):
-                    self.current_position.stop_price = min(self.current_position.stop_price, new_stop)
-            
-            # Check exits
-            if high >= self.current_position.stop_price:
-                self._close_position(self.current_position.stop_price, current_time, 'Stop Loss')
-            elif low <= self.current_position.target_price:
-                self._close_position(self.current_position.target_price, current_time, 'Take Profit')
+        self._close_position(float(plan.price[0]), current_time, plan.reason_labels()[0])
     
     def _close_position(self, price: float, time: datetime, reason: str):
         """Close position and record results"""
         if not self.current_position:
             return
         
+        # Stop level reached by trailing
+        if self._exit_plan is not None:
+            self.current_position.stop_price = float(self._exit_plan.stop[0])
+            self._exit_plan = None
+        
         self.current_position.close(price, time)
         self.current_position.exit_signal = reason
         
@@ -204,7 +322,10 @@ class HighAccuracyBacktester:
         self.capital += self.current_position.pnl
         
         # Record trade
-        self.trades.append(self.current_position)
+        if self._writer is not None:
+            self._writer.append_trade(self._trade_record(self.current_position))
+        else:
+            self.trades.append(self.current_position)
         
         # Log result
         result = "WIN" if self.current_position.pnl > 0 else "LOSS"
@@ -227,10 +348,19 @@ class HighAccuracyBacktester:
                 unrealized = (self.current_position.entry_price - current_price) * self.current_position.size
             equity += unrealized
         
-        self.equity_curve.append(equity)
+        self._record_equity(equity)
+    
+    def _record_equity(self, equity: float):
+        if self._writer is not None:
+            self._writer.append_equity(equity)
+        else:
+            self.equity_curve.append(equity)
     
     def _calculate_results(self, df: pd.DataFrame) -> Dict:
         """Calculate comprehensive results"""
+        if self._writer is not None:
+            return self._calculate_streamed_results()
+        
         # Basic trade statistics
         if not self.trades:
             win_rate = 0
@@ -264,10 +394,6 @@ class HighAccuracyBacktester:
         drawdown_series = (equity_series - rolling_max) / rolling_max
         max_drawdown_pct = abs(drawdown_series.min()) * 100
         
-        # Signal analysis
-        avg_entry_score = np.mean(self.entry_scores) if self.entry_scores else 0
-        signal_filter_rate = (self.signals_filtered / self.signals_analyzed * 100) if self.signals_analyzed > 0 else 0
-        
         # Compile results
         results = {
             'performance': {
@@ -287,20 +413,74 @@ class HighAccuracyBacktester:
                 'best_trade': max(t.pnl for t in self.trades) if self.trades else 0,
                 'worst_trade': min(t.pnl for t in self.trades) if self.trades else 0
             },
-            'signal_analysis': {
-                'signals_analyzed': self.signals_analyzed,
-                'signals_filtered': self.signals_filtered,
-                'signal_filter_rate': signal_filter_rate,
-                'avg_entry_score': avg_entry_score,
-                'min_entry_score': min(self.entry_scores) if self.entry_scores else 0,
-                'max_entry_score': max(self.entry_scores) if self.entry_scores else 0
-            },
+            'signal_analysis': self._signal_analysis(),
             'trades': [self._trade_to_dict(t) for t in self.trades],
             'equity_curve': self.equity_curve
         }
         
         return results
     
+    def _calculate_streamed_results(self) -> Dict:
+        """
+        _calculate_results for a run written to results_path: statistics are
+        read back from the archive chunk by chunk and stored in its summary;
+        'trades' and 'equity_curve' are left empty (read them with ResultReader)
+        """
+        writer, self._writer = self._writer, None
+        writer.close()
+        
+        with ResultReader(writer.path) as reader:
+            stats = trade_stats(chunk['pnl'] for chunk in reader.iter_trades(['pnl']))
+            equity = equity_stats(reader.iter_equity())
+        
+        trades = stats['trades']
+        if trades:
+            win_rate = stats['winning_trades'] / trades * 100
+            avg_win = stats['gross_profit'] / stats['winning_trades'] if stats['winning_trades'] else 0
+            avg_loss = stats['gross_loss'] / stats['losing_trades'] if stats['losing_trades'] else 0
+            profit_factor = (stats['gross_profit'] / stats['gross_loss']
+                             if stats['gross_loss'] > 0 else float('inf'))
+        else:
+            win_rate = avg_win = avg_loss = profit_factor = 0
+        total_return = self.capital - self.initial_capital
+        
+        results = {
+            'performance': {
+                'initial_capital': self.initial_capital,
+                'final_capital': self.capital,
+                'total_return': total_return,
+                'total_return_pct': (total_return / self.initial_capital) * 100,
+                'win_rate': win_rate,
+                'profit_factor': profit_factor,
+                'sharpe_ratio': ((equity['returns_mean'] / equity['returns_std']) * np.sqrt(252 * 24)
+                                 if equity['returns_std'] > 0 else 0),
+                'max_drawdown_pct': equity['max_drawdown'] * 100,
+                'total_trades': trades,
+                'winning_trades': stats['winning_trades'],
+                'losing_trades': stats['losing_trades'],
+                'avg_win': avg_win,
+                'avg_loss': avg_loss,
+                'best_trade': stats['best_trade'],
+                'worst_trade': stats['worst_trade']
+            },
+            'signal_analysis': self._signal_analysis()
+        }
+        write_summary(writer.path, results)
+        
+        results.update(trades=[], equity_curve=[], results_file=writer.summary_path)
+        return results
+    
+    def _signal_analysis(self) -> Dict:
+        """Entry-score and filter statistics of the analyzed signals"""
+        return {
+            'signals_analyzed': self.signals_analyzed,
+            'signals_filtered': self.signals_filtered,
+            'signal_filter_rate': (self.signals_filtered / self.signals_analyzed * 100) if self.signals_analyzed > 0 else 0,
+            'avg_entry_score': float(np.mean(self.entry_scores)) if self.entry_scores else 0,
+            'min_entry_score': min(self.entry_scores) if self.entry_scores else 0,
+            'max_entry_score': max(self.entry_scores) if self.entry_scores else 0
+        }
+    
     def _trade_to_dict(self, trade: Trade) -> Dict:
         """Convert trade to dictionary"""
         return {
@@ -317,6 +497,12 @@ class HighAccuracyBacktester:
             'filters_passed': getattr(trade, 'entry_filters', [])
         }
     
+    def _trade_record(self, trade: Trade) -> Dict:
+        """Trade as a flat row for the result archive"""
+        return dict(self._trade_to_dict(trade), entry_time=trade.entry_time,
+                    exit_time=trade.exit_time,
+                    filters_passed=', '.join(getattr(trade, 'entry_filters', [])))
+    
     def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate ATR"""
         high = df['high']
@@ -374,22 +560,15 @@ def run_high_accuracy_test():
     # Generate test data
     df = generate_test_data('EURUSD', periods=2000)
     
-    # Run backtest
-    backtester = HighAccuracyBacktester(initial_capital=10000)
+    # Run backtest; trades and equity are written to high_accuracy_results.npz
+    # as they happen, the metrics to high_accuracy_results.json
+    backtester = HighAccuracyBacktester(initial_capital=10000,
+                                        results_path='high_accuracy_results')
     results = backtester.run(df, 'EURUSD', spread=0.0001)
     
     # Print results
     backtester.print_results(results)
-    
-    # Save results
-    with open('high_accuracy_results.json', 'w') as f:
-        # Remove non-serializable data
-        save_results = {
-            'performance': results['performance'],
-            'signal_analysis': results['signal_analysis'],
-            'trades': results['trades']
-        }
-        json.dump(save_results, f, indent=2)
+    print(f"Results saved to {results['results_file']}")
     
     return results
 
@@ -5,6 +5,7 @@ Implements multiple confirmation layers and strict entry criteria
 """
 import pandas as pd
 import numpy as np
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
@@ -12,7 +13,8 @@ from enum import Enum
 import logging
 
 from indicators.signal_engine import SignalEngine, SignalStrength, CombinedSignal
-from indicators.base import SignalStrength as BaseSignalStrength
+from indicators.base import SignalStrength as BaseSignalStrength, MarketFrame
+from indicators.streaming import BarBuffer, SignalStream, RollingMean, RollingVar, Ewm, rolling_mean, sample_std
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -53,12 +55,34 @@ class EnhancedSignal:
     filters_failed: List[str]
 
 
+@dataclass
+class IndicatorSnapshot:
+    """Latest values of the full-history indicators the filters read"""
+    atr: float
+    rsi: float
+    momentum: float  # 10-bar rate of change
+    sma20: float
+    sma50: float
+    std20: float
+    macd: float
+    macd_signal: float
+    has_volume: bool
+
+
 class HighAccuracyEngine:
     """
     Advanced trading engine with multiple confirmation layers
     Designed for 94.7%+ win rate through strict filtering
     """
     
+    # Simulated timeframes: bars sampled every n base bars (if base is 5m)
+    TIMEFRAME_SAMPLING = {
+        TimeFrame.M5: 1,
+        TimeFrame.M15: 3,
+        TimeFrame.H1: 12,
+        TimeFrame.H4: 48,
+    }
+    
     def __init__(self):
         # Initialize base signal engine with optimized weights
         self.signal_engine = SignalEngine(custom_weights={
@@ -89,16 +113,52 @@ class HighAccuracyEngine:
         """
         Perform enhanced analysis with multiple confirmation layers
         """
+        # One validated frame (and column cache) for every layer below
+        df = MarketFrame.wrap(df)
+        
         # Get base signal
         base_signal = self.signal_engine.analyze(df, symbol)
+        timeframe_signals = self._get_timeframe_alignment(df, symbol)
+        
+        return self._score_signal(df, base_signal, timeframe_signals,
+                                  self._indicator_snapshot(df), spread)
+    
+    def stream(self, symbol: str, spread: float = 0.0001) -> 'HighAccuracyStream':
+        """Incremental analyze_enhanced for one symbol, advanced bar by bar"""
+        return HighAccuracyStream(self, symbol, spread)
+    
+    def _indicator_snapshot(self, df: MarketFrame) -> IndicatorSnapshot:
+        """Full-history indicator values at the last bar of df"""
+        close = df['close']
+        macd, macd_signal = self._calculate_macd(df)
+        return IndicatorSnapshot(
+            atr=self._calculate_atr(df, 14).iloc[-1],
+            rsi=self._calculate_rsi(df, 14).iloc[-1],
+            momentum=close.pct_change(10).iloc[-1],
+            sma20=close.rolling(20).mean().iloc[-1],
+            sma50=close.rolling(50).mean().iloc[-1],
+            std20=close.rolling(20).std().iloc[-1],
+            macd=macd.iloc[-1],
+            macd_signal=macd_signal.iloc[-1],
+            has_volume='volume' in df.columns and df['volume'].sum() != 0
+        )
+    
+    def _score_signal(self, df, base_signal: CombinedSignal,
+                      timeframe_signals: Dict[TimeFrame, SignalStrength],
+                      snapshot: IndicatorSnapshot, spread: float) -> EnhancedSignal:
+        """
+        Run the confirmation layers and score the entry
         
+        df may be a MarketFrame or a streaming bar buffer: only len() and
+        trailing windows of the high/low/close/volume arrays are read.
+        """
         # Initialize confirmations
         confirmations = {}
         filters_passed = []
         filters_failed = []
         
         # 1. Market Regime Analysis
-        regime = self._analyze_market_regime(df)
+        regime = self._analyze_market_regime(df, snapshot)
         confirmations['regime_optimal'] = regime in [MarketRegime.STRONG_TREND, MarketRegime.OPTIMAL]
         if confirmations['regime_optimal']:
             filters_passed.append('Market Regime')
@@ -106,7 +166,7 @@ class HighAccuracyEngine:
             filters_failed.append(f'Market Regime ({regime.value})')
         
         # 2. Volatility Analysis
-        volatility_score = self._calculate_volatility_score(df)
+        volatility_score = self._calculate_volatility_score(df, snapshot.atr)
         confirmations['volatility_optimal'] = self.min_volatility <= volatility_score <= self.max_volatility
         if confirmations['volatility_optimal']:
             filters_passed.append('Volatility Range')
@@ -114,7 +174,6 @@ class HighAccuracyEngine:
             filters_failed.append(f'Volatility ({volatility_score:.4f})')
         
         # 3. Multi-Timeframe Confirmation
-        timeframe_signals = self._get_timeframe_alignment(df, symbol)
         alignment_score = self._calculate_alignment_score(timeframe_signals)
         confirmations['timeframe_aligned'] = alignment_score >= 0.8
         if confirmations['timeframe_aligned']:
@@ -131,7 +190,7 @@ class HighAccuracyEngine:
             filters_failed.append(f'Support/Resistance ({sr_score:.2f})')
         
         # 5. Momentum Confirmation
-        momentum_confirmed = self._confirm_momentum(df, base_signal.signal)
+        momentum_confirmed = self._confirm_momentum(snapshot, base_signal.signal)
         confirmations['momentum_confirmed'] = momentum_confirmed
         if momentum_confirmed:
             filters_passed.append('Momentum')
@@ -139,7 +198,7 @@ class HighAccuracyEngine:
             filters_failed.append('Momentum')
         
         # 6. Volume Confirmation
-        volume_confirmed = self._confirm_volume(df, base_signal.signal)
+        volume_confirmed = self._confirm_volume(df, snapshot, base_signal.signal)
         confirmations['volume_confirmed'] = volume_confirmed
         if volume_confirmed:
             filters_passed.append('Volume')
@@ -163,7 +222,7 @@ class HighAccuracyEngine:
             filters_failed.append(f'Spread ({spread:.5f})')
         
         # 9. Risk/Reward Analysis
-        rr_ratio = self._calculate_risk_reward(df, base_signal.signal)
+        rr_ratio = self._calculate_risk_reward(snapshot.atr)
         confirmations['risk_reward_ok'] = rr_ratio >= self.risk_reward_min
         if confirmations['risk_reward_ok']:
             filters_passed.append('Risk/Reward')
@@ -171,7 +230,7 @@ class HighAccuracyEngine:
             filters_failed.append(f'Risk/Reward ({rr_ratio:.2f})')
         
         # 10. ML Ensemble Confirmation
-        ml_score = self._get_ml_ensemble_score(df)
+        ml_score = self._get_ml_ensemble_score(df.close[-1], snapshot)
         confirmations['ml_ensemble'] = ml_score >= 0.8
         if confirmations['ml_ensemble']:
             filters_passed.append('ML Ensemble')
@@ -222,21 +281,15 @@ class HighAccuracyEngine:
         # All checks passed
         return True, f"Trade approved with {signal.entry_score:.1f}% score"
     
-    def _analyze_market_regime(self, df: pd.DataFrame) -> MarketRegime:
+    def _analyze_market_regime(self, df: MarketFrame, snapshot: IndicatorSnapshot) -> MarketRegime:
         """Analyze current market regime"""
-        # Calculate indicators
-        sma20 = df['close'].rolling(20).mean()
-        sma50 = df['close'].rolling(50).mean()
-        atr = self._calculate_atr(df, 14)
-        
         # Get recent values
-        current_close = df['close'].iloc[-1]
-        current_atr = atr.iloc[-1]
-        atr_pct = current_atr / current_close
+        current_close = df.close[-1]
+        atr_pct = snapshot.atr / current_close
         
         # Calculate trend strength
         if len(df) >= 50:
-            trend_strength = abs(sma20.iloc[-1] - sma50.iloc[-1]) / current_close
+            trend_strength = abs(snapshot.sma20 - snapshot.sma50) / current_close
             
             # Strong trend
             if trend_strength > 0.01 and atr_pct < 0.015:
@@ -256,17 +309,18 @@ class HighAccuracyEngine:
         
         return MarketRegime.RANGING
     
-    def _calculate_volatility_score(self, df: pd.DataFrame) -> float:
+    def _calculate_volatility_score(self, df: MarketFrame, atr: float) -> float:
         """Calculate normalized volatility score"""
-        returns = df['close'].pct_change().dropna()
+        # Returns over the last 240 bars at most
+        closes = df.close[-241:]
+        returns = closes[1:] / closes[:-1] - 1
         
         # Multiple volatility measures
-        std_1h = returns.tail(60).std() if len(returns) >= 60 else returns.std()
-        std_4h = returns.tail(240).std() if len(returns) >= 240 else std_1h
+        std_1h = sample_std(returns[-60:]) if len(returns) >= 60 else sample_std(returns)
+        std_4h = sample_std(returns) if len(returns) >= 240 else std_1h
         
         # ATR-based volatility
-        atr = self._calculate_atr(df, 14)
-        atr_pct = atr.iloc[-1] / df['close'].iloc[-1]
+        atr_pct = atr / df.close[-1]
         
         # Combine measures
         volatility_score = (std_1h + std_4h + atr_pct) / 3
@@ -278,17 +332,10 @@ class HighAccuracyEngine:
         alignment = {}
         
         # Simulate different timeframes by sampling
-        timeframes = {
-            TimeFrame.M5: 1,    # Every bar (if base is 5m)
-            TimeFrame.M15: 3,   # Every 3 bars
-            TimeFrame.H1: 12,   # Every 12 bars
-            TimeFrame.H4: 48,   # Every 48 bars
-        }
-        
-        for tf, sample_rate in timeframes.items():
+        for tf, sample_rate in self.TIMEFRAME_SAMPLING.items():
             if len(df) >= sample_rate * 50:  # Need enough data
-                # Resample data
-                tf_df = df.iloc[::sample_rate].copy()
+                # Resample data (strided view, no copy)
+                tf_df = MarketFrame.wrap(df).slice(step=sample_rate)
                 
                 try:
                     # Get signal for this timeframe
@@ -344,14 +391,14 @@ class HighAccuracyEngine:
         
         return aligned_weight / total_weight if total_weight > 0 else 0.0
     
-    def _check_support_resistance(self, df: pd.DataFrame, signal: SignalStrength) -> float:
+    def _check_support_resistance(self, df: MarketFrame, signal: SignalStrength) -> float:
         """Check if price is near support/resistance levels"""
-        current_price = df['close'].iloc[-1]
+        current_price = df.close[-1]
         
         # Find recent highs and lows
         window = 50
-        recent_high = df['high'].tail(window).max()
-        recent_low = df['low'].tail(window).min()
+        recent_high = df.high[-window:].max()
+        recent_low = df.low[-window:].min()
         
         # Calculate distances
         dist_to_high = abs(current_price - recent_high) / current_price
@@ -380,14 +427,10 @@ class HighAccuracyEngine:
         
         return score
     
-    def _confirm_momentum(self, df: pd.DataFrame, signal: SignalStrength) -> bool:
+    def _confirm_momentum(self, snapshot: IndicatorSnapshot, signal: SignalStrength) -> bool:
         """Confirm momentum supports the signal"""
-        # Calculate RSI
-        rsi = self._calculate_rsi(df, 14)
-        current_rsi = rsi.iloc[-1]
-        
-        # Calculate momentum
-        momentum = df['close'].pct_change(10).iloc[-1]
+        current_rsi = snapshot.rsi
+        momentum = snapshot.momentum
         
         # Check based on signal
         if signal in [SignalStrength.BUY, SignalStrength.STRONG_BUY]:
@@ -400,14 +443,15 @@ class HighAccuracyEngine:
         
         return True
     
-    def _confirm_volume(self, df: pd.DataFrame, signal: SignalStrength) -> bool:
+    def _confirm_volume(self, df: MarketFrame, snapshot: IndicatorSnapshot,
+                        signal: SignalStrength) -> bool:
         """Confirm volume supports the move"""
-        if 'volume' not in df.columns or df['volume'].sum() == 0:
+        if not snapshot.has_volume:
             return True  # Skip if no volume data
         
         # Compare recent volume to average
-        recent_vol = df['volume'].tail(5).mean()
-        avg_vol = df['volume'].tail(50).mean()
+        recent_vol = df.volume[-5:].mean()
+        avg_vol = df.volume[-50:].mean()
         
         # Volume should be above average for strong moves
         if signal in [SignalStrength.STRONG_BUY, SignalStrength.STRONG_SELL]:
@@ -415,21 +459,21 @@ class HighAccuracyEngine:
         else:
             return recent_vol > avg_vol * 0.8
     
-    def _assess_pattern_quality(self, df: pd.DataFrame) -> float:
+    def _assess_pattern_quality(self, df: MarketFrame) -> float:
         """Assess the quality of recent price patterns"""
         # Check for clean trends vs choppy action
-        closes = df['close'].tail(20)
+        closes = df.close[-20:]
         
         if len(closes) < 20:
             return 0.5
         
         # Calculate smoothness (lower is smoother)
-        returns = closes.pct_change().dropna()
-        smoothness = returns.std()
+        returns = closes[1:] / closes[:-1] - 1
+        smoothness = sample_std(returns)
         
         # Calculate trend consistency
-        sma = closes.rolling(5).mean()
-        trend_consistency = (sma.diff() > 0).sum() / len(sma.diff())
+        sma = rolling_mean(closes, 5)
+        trend_consistency = (np.diff(sma) > 0).sum() / len(closes)
         
         # Score calculation
         smoothness_score = max(0, 1 - smoothness * 50)  # Lower volatility = higher score
@@ -437,18 +481,15 @@ class HighAccuracyEngine:
         
         return (smoothness_score + consistency_score) / 2
     
-    def _calculate_risk_reward(self, df: pd.DataFrame, signal: SignalStrength) -> float:
+    def _calculate_risk_reward(self, atr: float) -> float:
         """Calculate potential risk/reward ratio"""
-        current_price = df['close'].iloc[-1]
-        atr = self._calculate_atr(df, 14).iloc[-1]
-        
         # Use ATR for stop and target
         stop_distance = atr * 1.5  # 1.5 ATR stop
         target_distance = atr * 4.5  # 4.5 ATR target
         
         return target_distance / stop_distance
     
-    def _get_ml_ensemble_score(self, df: pd.DataFrame) -> float:
+    def _get_ml_ensemble_score(self, price: float, snapshot: IndicatorSnapshot) -> float:
         """Get ensemble score from multiple ML models (simplified)"""
         # In production, this would call multiple ML models
         # For now, use technical indicator consensus
@@ -456,7 +497,7 @@ class HighAccuracyEngine:
         scores = []
         
         # RSI score
-        rsi = self._calculate_rsi(df, 14).iloc[-1]
+        rsi = snapshot.rsi
         if 40 < rsi < 60:
             scores.append(0.9)  # Neutral RSI is good for entries
         elif 30 < rsi < 70:
@@ -465,23 +506,23 @@ class HighAccuracyEngine:
             scores.append(0.3)
         
         # MACD score
-        macd_score = self._calculate_macd_score(df)
+        macd_score = self._calculate_macd_score(snapshot.macd, snapshot.macd_signal, price)
         scores.append(macd_score)
         
         # Bollinger Band score
-        bb_score = self._calculate_bb_score(df)
+        bb_score = self._calculate_bb_score(price, snapshot.sma20, snapshot.std20)
         scores.append(bb_score)
         
         return np.mean(scores)
     
-    def _is_choppy(self, df: pd.DataFrame) -> bool:
+    def _is_choppy(self, df: MarketFrame) -> bool:
         """Detect choppy market conditions"""
         if len(df) < 20:
             return False
         
         # Count direction changes
-        closes = df['close'].tail(20)
-        direction_changes = (closes.diff().shift(1) * closes.diff() < 0).sum()
+        moves = np.diff(df.close[-20:])
+        direction_changes = (moves[:-1] * moves[1:] < 0).sum()
         
         # Choppy if too many direction changes
         return direction_changes > 12
@@ -514,22 +555,21 @@ class HighAccuracyEngine:
         
         return rsi
     
-    def _calculate_macd_score(self, df: pd.DataFrame) -> float:
-        """Calculate MACD-based score"""
+    def _calculate_macd(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        """Calculate MACD and its signal line"""
         close = df['close']
-        
-        # MACD calculation
         ema12 = close.ewm(span=12).mean()
         ema26 = close.ewm(span=26).mean()
         macd = ema12 - ema26
         signal = macd.ewm(span=9).mean()
         
-        # Check for convergence/divergence
-        current_macd = macd.iloc[-1]
-        current_signal = signal.iloc[-1]
-        
+        return macd, signal
+    
+    def _calculate_macd_score(self, current_macd: float, current_signal: float,
+                              price: float) -> float:
+        """Calculate MACD-based score"""
         # Good if MACD is close to signal line (potential crossover)
-        distance = abs(current_macd - current_signal) / df['close'].iloc[-1]
+        distance = abs(current_macd - current_signal) / price
         
         if distance < 0.001:
             return 0.9
@@ -538,18 +578,10 @@ class HighAccuracyEngine:
         else:
             return 0.5
     
-    def _calculate_bb_score(self, df: pd.DataFrame) -> float:
+    def _calculate_bb_score(self, current_price: float, sma: float, std: float) -> float:
         """Calculate Bollinger Bands score"""
-        close = df['close']
-        sma = close.rolling(20).mean()
-        std = close.rolling(20).std()
-        
-        upper_band = sma + 2 * std
-        lower_band = sma - 2 * std
-        
-        current_price = close.iloc[-1]
-        current_upper = upper_band.iloc[-1]
-        current_lower = lower_band.iloc[-1]
+        current_upper = sma + 2 * std
+        current_lower = sma - 2 * std
         
         # Calculate position within bands
         band_width = current_upper - current_lower
@@ -564,6 +596,148 @@ class HighAccuracyEngine:
             return 0.4
 
 
+class HighAccuracyStream:
+    """
+    HighAccuracyEngine.analyze_enhanced evaluated incrementally
+    
+    push() appends one bar; signal() returns the EnhancedSignal that
+    analyze_enhanced would for all bars pushed so far. The full-history
+    indicators (ATR, RSI, moving averages, Bollinger, MACD) are updated in
+    O(1) per bar, filters that read a fixed trailing window run the engine's
+    own code on that window, and each sampled timeframe keeps a SignalStream
+    that only advances (and is only re-evaluated) when a sampled bar arrives.
+    """
+    
+    def __init__(self, engine: HighAccuracyEngine, symbol: str, spread: float = 0.0001):
+        self.engine = engine
+        self.symbol = symbol
+        self.spread = spread
+        self.base = SignalStream(engine.signal_engine, symbol)
+        self.bars = self.base.bars
+        
+        # Sampled timeframes (step 1 is the base stream itself) and their last signals
+        self.timeframes = {tf: SignalStream(engine.signal_engine, symbol)
+                           for tf, step in engine.TIMEFRAME_SAMPLING.items() if step > 1}
+        self._timeframe_signals: Dict[TimeFrame, Tuple[int, SignalStrength]] = {}
+        
+        self.atr = RollingMean(14)
+        self.gain = RollingMean(14)
+        self.loss = RollingMean(14)
+        self.sma20 = RollingMean(20)
+        self.sma50 = RollingMean(50)
+        self.var20 = RollingVar(20)
+        self.ema12 = Ewm(12)
+        self.ema26 = Ewm(26)
+        self.macd_signal = Ewm(9)
+        self.macd = np.nan
+        self.has_volume = False
+        
+    def __len__(self) -> int:
+        return len(self.bars)
+    
+    @contextmanager
+    def bars_detached(self):
+        """
+        The stream without its bar buffers, whose size grows with the run,
+        e.g. to checkpoint the rest; restore_bars() refills them
+        """
+        streams = [self.base, *self.timeframes.values()]
+        buffers = [stream.bars for stream in streams]
+        for stream in streams:
+            stream.bars = None
+        self.bars = None
+        try:
+            yield self
+        finally:
+            for stream, buffer in zip(streams, buffers):
+                stream.bars = buffer
+            self.bars = self.base.bars
+    
+    def restore_bars(self, times: List, bars: np.ndarray):
+        """Refill detached bar buffers with the bars pushed so far (times and OHLCV rows)"""
+        self.base.bars = BarBuffer.from_arrays(times, bars)
+        for tf, stream in self.timeframes.items():
+            step = self.engine.TIMEFRAME_SAMPLING[tf]
+            stream.bars = BarBuffer.from_arrays(times[::step], bars[::step])
+        self.bars = self.base.bars
+    
+    def push(self, time, open: float, high: float, low: float, close: float,
+             volume: float = 0.0):
+        """Advance every indicator by one bar"""
+        position = len(self.bars)
+        self.base.push(time, open, high, low, close, volume)
+        for tf, stream in self.timeframes.items():
+            if position % self.engine.TIMEFRAME_SAMPLING[tf] == 0:
+                stream.push(time, open, high, low, close, volume)
+        
+        bars = self.bars
+        high, low, close = bars.high[-1], bars.low[-1], bars.close[-1]
+        if position:
+            prev_close = bars.close[-2]
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            delta = close - prev_close
+            gain = delta if delta > 0 else 0.0
+            loss = -(delta if delta < 0 else 0.0)
+        else:
+            true_range = high - low
+            gain, loss = 0.0, -0.0
+        self.atr.push(true_range)
+        self.gain.push(gain)
+        self.loss.push(loss)
+        
+        self.sma20.push(close)
+        self.sma50.push(close)
+        self.var20.push(close)
+        self.macd = self.ema12.push(close) - self.ema26.push(close)
+        self.macd_signal.push(self.macd)
+        self.has_volume = self.has_volume or bars.volume[-1] != 0
+        
+    def signal(self) -> EnhancedSignal:
+        """Enhanced signal for the bars pushed so far"""
+        base_signal = self.base.signal()
+        return self.engine._score_signal(self.bars, base_signal,
+                                         self._timeframe_alignment(base_signal),
+                                         self._snapshot(), self.spread)
+    
+    def _snapshot(self) -> IndicatorSnapshot:
+        closes = self.bars.close
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.float64(self.gain.value) / np.float64(self.loss.value)
+            rsi = 100 - (100 / (1 + rs))
+            momentum = closes[-1] / closes[-11] - 1 if len(closes) > 10 else np.nan
+        return IndicatorSnapshot(
+            atr=np.float64(self.atr.value),
+            rsi=rsi,
+            momentum=np.float64(momentum),
+            sma20=np.float64(self.sma20.value),
+            sma50=np.float64(self.sma50.value),
+            std20=np.float64(self.var20.std),
+            macd=np.float64(self.macd),
+            macd_signal=np.float64(self.macd_signal.value),
+            has_volume=self.has_volume
+        )
+    
+    def _timeframe_alignment(self, base_signal: CombinedSignal) -> Dict[TimeFrame, SignalStrength]:
+        """Stream counterpart of HighAccuracyEngine._get_timeframe_alignment"""
+        alignment = {}
+        for tf, sample_rate in self.engine.TIMEFRAME_SAMPLING.items():
+            if len(self.bars) < sample_rate * 50:
+                alignment[tf] = SignalStrength.NEUTRAL
+            elif tf not in self.timeframes:
+                alignment[tf] = base_signal.signal
+            else:
+                stream = self.timeframes[tf]
+                cached = self._timeframe_signals.get(tf)
+                if cached is None or cached[0] != len(stream):
+                    try:
+                        signal = stream.signal().signal
+                    except Exception:
+                        signal = SignalStrength.NEUTRAL
+                    cached = self._timeframe_signals[tf] = (len(stream), signal)
+                alignment[tf] = cached[1]
+        return alignment
+
+
 def create_high_accuracy_strategy():
     """Factory function to create high accuracy engine"""
     return HighAccuracyEngine()
\ No newline at end of file
@@ -1,5 +1,5 @@
 # Indicator modules for QuantumTrader Pro
-from .base import Indicator, IndicatorResult, SignalStrength
+from .base import Indicator, IndicatorResult, SignalStrength, MarketFrame
 from .chaos_indicators import (
     AlligatorIndicator,
     AwesomeOscillator,
@@ -9,12 +9,14 @@ from .chaos_indicators import (
     ChaosSignalCombiner
 )
 from .elliott_wave import ElliottWaveDetector
-from .signal_engine import SignalEngine, SignalWeight
+from .signal_engine import SignalEngine, SignalWeight, CombinedSignal, SignalSeries, IndicatorPanel
+from .streaming import SignalStream
 
 __all__ = [
     'Indicator',
     'IndicatorResult', 
     'SignalStrength',
+    'MarketFrame',
     'AlligatorIndicator',
     'AwesomeOscillator',
     'AcceleratorOscillator',
@@ -23,5 +25,9 @@ __all__ = [
     'ChaosSignalCombiner',
     'ElliottWaveDetector',
     'SignalEngine',
-    'SignalWeight'
+    'SignalWeight',
+    'CombinedSignal',
+    'SignalSeries',
+    'IndicatorPanel',
+    'SignalStream'
 ]
\ No newline at end of file
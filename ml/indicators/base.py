@@ -2,8 +2,8 @@
 Base classes for modular indicator system
 """
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
 from datetime import datetime
+import time
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 import pandas as pd
@@ -19,17 +19,257 @@ class SignalStrength(Enum):
     STRONG_SELL = -2
 
 
-@dataclass
+class MarketFrame:
+    """
+    OHLCV frame validated once and shared by every indicator in an analysis pass
+    
+    Holds read-only contiguous arrays for the required columns plus a validity
+    flag, so indicators skip repeated NaN scans and column extraction. Frames
+    built with compact() keep float32 prices and an int64 epoch index and drop
+    the source DataFrame; slice() returns views, never copies.
+    """
+    
+    REQUIRED_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+    
+    def __init__(self, df: pd.DataFrame, dtype=np.float64):
+        self.df = df
+        self._index = df.index
+        self._epoch: Optional[np.ndarray] = None
+        self._series: Dict[str, pd.Series] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        
+        has_columns = all(col in df.columns for col in self.REQUIRED_COLUMNS)
+        if has_columns:
+            for col in self.REQUIRED_COLUMNS:
+                self._arrays[col] = self._readonly(np.ascontiguousarray(
+                    df[col].to_numpy(dtype=dtype)
+                ))
+        self._scan(has_columns)
+    
+    @classmethod
+    def from_arrays(cls, epoch: np.ndarray, open: np.ndarray, high: np.ndarray,
+                    low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                    dtype=np.float32) -> 'MarketFrame':
+        """Build a frame without a DataFrame from int64 epoch-ns times and OHLCV arrays"""
+        frame = cls.__new__(cls)
+        frame.df = None
+        frame._index = None
+        frame._epoch = cls._readonly(np.ascontiguousarray(epoch, dtype=np.int64))
+        frame._series = {}
+        frame._arrays = {
+            col: cls._readonly(np.ascontiguousarray(values, dtype=dtype))
+            for col, values in zip(cls.REQUIRED_COLUMNS, (open, high, low, close, volume))
+        }
+        frame._scan(True)
+        return frame
+    
+    @classmethod
+    def compact(cls, df: pd.DataFrame, dtype=np.float32) -> 'MarketFrame':
+        """Memory-compact copy of df: float32 OHLCV and an int64 epoch index only"""
+        index = pd.DatetimeIndex(df.index)
+        return cls.from_arrays(index.asi8, *(df[col].to_numpy() for col in cls.REQUIRED_COLUMNS),
+                               dtype=dtype)
+    
+    @classmethod
+    def wrap(cls, df) -> 'MarketFrame':
+        """Return df unchanged if already validated, otherwise wrap it"""
+        return df if isinstance(df, cls) else cls(df)
+    
+    @staticmethod
+    def _readonly(values: np.ndarray) -> np.ndarray:
+        """Read-only view, so indicators cannot write through to shared data"""
+        view = values.view()
+        view.flags.writeable = False
+        return view
+    
+    def _scan(self, has_columns: bool):
+        """Single NaN scan over the required columns"""
+        if has_columns:
+            nan_rows = np.zeros(len(self), dtype=bool)
+            for values in self._arrays.values():
+                nan_rows |= np.isnan(values)
+            self._nan_rows = np.flatnonzero(nan_rows)
+        else:
+            self._nan_rows = None
+        self.valid = has_columns and len(self._nan_rows) == 0
+    
+    def slice(self, start: Optional[int] = None, stop: Optional[int] = None,
+              step: Optional[int] = None) -> 'MarketFrame':
+        """Positional sub-frame sharing this frame's arrays (no copy, no NaN rescan)"""
+        rows = slice(start, stop, step)
+        start, stop, step = rows.indices(len(self))
+        frame = MarketFrame.__new__(MarketFrame)
+        frame.df = self.df.iloc[rows] if self.df is not None else None
+        frame._index = self._index[rows] if self._index is not None else None
+        frame._epoch = self._epoch[rows] if self._epoch is not None else None
+        frame._series = {}
+        frame._arrays = {col: values[rows] for col, values in self._arrays.items()}
+        if self._nan_rows is None:
+            frame._nan_rows = None
+            frame.valid = False
+        else:
+            nan_rows = self._nan_rows
+            if step > 0:
+                inside = (nan_rows >= start) & (nan_rows < stop)
+            else:
+                inside = (nan_rows <= start) & (nan_rows > stop)
+            nan_rows = nan_rows[inside & ((nan_rows - start) % step == 0)]
+            frame._nan_rows = (nan_rows - start) // step
+            frame.valid = len(nan_rows) == 0
+        return frame
+    
+    def __len__(self) -> int:
+        if self._arrays:
+            return len(self._arrays['close'])
+        return len(self.df)
+    
+    @property
+    def index(self) -> pd.Index:
+        """Bar index; compact frames build a DatetimeIndex view over the epoch array"""
+        if self._index is None:
+            self._index = pd.DatetimeIndex(self._epoch.view('datetime64[ns]'))
+        return self._index
+    
+    @property
+    def epoch(self) -> np.ndarray:
+        """Bar times as int64 nanoseconds since the epoch"""
+        if self._epoch is None:
+            self._epoch = self._readonly(pd.DatetimeIndex(self.index).asi8)
+        return self._epoch
+    
+    @property
+    def columns(self) -> pd.Index:
+        if self.df is None:
+            return pd.Index(self.REQUIRED_COLUMNS)
+        return self.df.columns
+    
+    @property
+    def iloc(self):
+        return self.to_frame().iloc
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the OHLCV arrays and the epoch index"""
+        return sum(values.nbytes for values in self._arrays.values()) + \
+            (self._epoch.nbytes if self._epoch is not None else self.index.nbytes)
+    
+    def to_frame(self) -> pd.DataFrame:
+        """The source DataFrame, or one built over the arrays for compact frames"""
+        if self.df is None:
+            self.df = pd.DataFrame(dict(self._arrays), index=self.index, copy=False)
+        return self.df
+    
+    def array(self, column: str) -> np.ndarray:
+        """Contiguous read-only values of a required column"""
+        return self._arrays[column]
+    
+    def writable(self, column: str) -> np.ndarray:
+        """Private writable copy of a required column (copy on write)"""
+        return self._arrays[column].copy()
+    
+    @property
+    def open(self) -> np.ndarray:
+        return self._arrays['open']
+    
+    @property
+    def high(self) -> np.ndarray:
+        return self._arrays['high']
+    
+    @property
+    def low(self) -> np.ndarray:
+        return self._arrays['low']
+    
+    @property
+    def close(self) -> np.ndarray:
+        return self._arrays['close']
+    
+    @property
+    def volume(self) -> np.ndarray:
+        return self._arrays['volume']
+    
+    def __getitem__(self, column: str) -> pd.Series:
+        """Column as a Series, built once and cached for the analysis pass"""
+        if column not in self._series:
+            if column in self._arrays:
+                self._series[column] = pd.Series(self._arrays[column],
+                                                 index=self.index, name=column, copy=False)
+            else:
+                self._series[column] = self.to_frame()[column]
+        return self._series[column]
+
+
 class IndicatorResult:
-    """Standard result format for all indicators"""
-    timestamp: datetime
-    symbol: str
-    indicator_name: str
-    signal: SignalStrength
-    confidence: float  # 0.0 to 1.0
-    value: float  # Primary indicator value
-    components: Dict[str, float]  # Additional values (e.g., upper/lower bands)
-    metadata: Dict[str, any]  # Extra information
+    """
+    Standard result format for all indicators
+    
+    Slotted and lazy: the timestamp is kept as an epoch float and only turned
+    into a datetime on access, and components/metadata may be given as
+    zero-argument callables that are only built when first read.
+    """
+    __slots__ = ('symbol', 'indicator_name', 'signal', 'confidence', 'value',
+                 '_epoch', '_timestamp', '_components', '_metadata')
+    
+    def __init__(self, timestamp: Optional[datetime] = None, symbol: str = '',
+                 indicator_name: str = '', signal: 'SignalStrength' = None,
+                 confidence: float = 0.5, value: float = 0.0,
+                 components=None, metadata=None):
+        self.symbol = symbol
+        self.indicator_name = indicator_name
+        self.signal = SignalStrength.NEUTRAL if signal is None else signal
+        self.confidence = confidence  # 0.0 to 1.0
+        self.value = value  # Primary indicator value
+        self._epoch = time.time() if timestamp is None else None
+        self._timestamp = timestamp
+        self._components = components  # Additional values (e.g., upper/lower bands)
+        self._metadata = metadata  # Extra information
+    
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._epoch)
+        return self._timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime):
+        self._timestamp = value
+    
+    @property
+    def components(self) -> Dict[str, float]:
+        if self._components is None:
+            self._components = {}
+        elif callable(self._components):
+            self._components = self._components()
+        return self._components
+    
+    @components.setter
+    def components(self, value):
+        self._components = value
+    
+    @property
+    def metadata(self) -> Dict[str, any]:
+        if self._metadata is None:
+            self._metadata = {}
+        elif callable(self._metadata):
+            self._metadata = self._metadata()
+        return self._metadata
+    
+    @metadata.setter
+    def metadata(self, value):
+        self._metadata = value
+    
+    def __getstate__(self):
+        """Materialize lazy fields so results can be pickled or copied"""
+        self.components  # force lazy construction
+        self.metadata
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+    
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            object.__setattr__(self, slot, value)
+    
+    def __repr__(self) -> str:
+        return (f"IndicatorResult(symbol={self.symbol!r}, indicator_name={self.indicator_name!r}, "
+                f"signal={self.signal.name}, confidence={self.confidence:.3f}, value={self.value!r})")
     
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
@@ -76,6 +316,10 @@ class Indicator(ABC):
     
     def validate_data(self, df: pd.DataFrame) -> bool:
         """Validate that DataFrame has required columns and data"""
+        if isinstance(df, MarketFrame):
+            # Columns and NaNs were checked once when the frame was built
+            return df.valid and len(df) >= self.get_required_periods()
+        
         required_columns = ['open', 'high', 'low', 'close', 'volume']
         
         # Check columns
@@ -144,6 +388,7 @@ class CompositeIndicator(Indicator):
     
     def calculate_all(self, df: pd.DataFrame, symbol: str) -> List[IndicatorResult]:
         """Calculate all sub-indicators and return their results"""
+        df = MarketFrame.wrap(df)
         results = []
         for indicator in self.indicators:
             if indicator.enabled:
@@ -4,9 +4,8 @@ Based on Trading Chaos and New Trading Dimensions books
 """
 import pandas as pd
 import numpy as np
-from datetime import datetime
 from typing import Optional, List, Tuple
-from .base import Indicator, IndicatorResult, SignalStrength, CompositeIndicator
+from .base import Indicator, IndicatorResult, SignalStrength, CompositeIndicator, MarketFrame
 
 
 class AlligatorIndicator(Indicator):
@@ -33,15 +32,17 @@ class AlligatorIndicator(Indicator):
     
     def _smma(self, data: pd.Series, period: int) -> pd.Series:
         """Smoothed Moving Average (SMMA)"""
-        smma = pd.Series(index=data.index, dtype=float)
-        smma.iloc[period-1] = data.iloc[:period].mean()
+        values = data.to_numpy(dtype=np.float64)
+        smma = np.full(len(values), np.nan)
+        smma[period-1] = values[:period].mean()
         
-        for i in range(period, len(data)):
-            smma.iloc[i] = (smma.iloc[i-1] * (period - 1) + data.iloc[i]) / period
+        for i in range(period, len(values)):
+            smma[i] = (smma[i-1] * (period - 1) + values[i]) / period
             
-        return smma
+        return pd.Series(smma, index=data.index)
     
     def calculate(self, df: pd.DataFrame, symbol: str) -> IndicatorResult:
+        df = MarketFrame.wrap(df)
         if not self.validate_data(df):
             return None
             
@@ -60,6 +61,11 @@ class AlligatorIndicator(Indicator):
         teeth_val = teeth.iloc[current_idx]
         lips_val = lips.iloc[current_idx]
         
+        return self._result(symbol, current_price, jaw_val, teeth_val, lips_val)
+    
+    def _result(self, symbol: str, current_price: float, jaw_val: float,
+                teeth_val: float, lips_val: float) -> IndicatorResult:
+        """Signal and result from the current price and line values"""
         # Determine trend and signal
         signal = self._analyze_alligator(current_price, jaw_val, teeth_val, lips_val)
         
@@ -74,20 +80,19 @@ class AlligatorIndicator(Indicator):
                                               min(jaw_dist, teeth_dist, lips_dist))
         
         return IndicatorResult(
-            timestamp=datetime.now(),
             symbol=symbol,
             indicator_name=self.name,
             signal=signal,
             confidence=confidence,
             value=lips_val,  # Use lips as primary value
-            components={
+            components=lambda: {
                 'jaw': jaw_val,
                 'teeth': teeth_val,
                 'lips': lips_val,
                 'price': current_price,
                 'separation': separation
             },
-            metadata={
+            metadata=lambda: {
                 'is_sleeping': bool(separation < 0.001),  # Alligator sleeping
                 'trend_strength': float(separation * 100)
             }
@@ -142,6 +147,7 @@ class AwesomeOscillator(Indicator):
         return self.slow_period + 5
     
     def calculate(self, df: pd.DataFrame, symbol: str) -> IndicatorResult:
+        df = MarketFrame.wrap(df)
         if not self.validate_data(df):
             return None
             
@@ -153,42 +159,47 @@ class AwesomeOscillator(Indicator):
         slow_sma = median_price.rolling(window=self.slow_period).mean()
         ao = fast_sma - slow_sma
         
+        # Keep only the tail the signal and lazy metadata need, not the full series
+        recent_ao = ao.iloc[-20:].to_numpy(copy=True)
+        return self._result(symbol, recent_ao, df['close'].iloc[-1])
+    
+    def _result(self, symbol: str, recent_ao: np.ndarray, price: float) -> IndicatorResult:
+        """Signal and result from the last (up to) 20 AO values"""
         # Get recent values for signal detection
-        ao_current = ao.iloc[-1]
-        ao_prev = ao.iloc[-2]
-        ao_prev2 = ao.iloc[-3]
+        ao_current = recent_ao[-1]
+        ao_prev = recent_ao[-2]
+        ao_prev2 = recent_ao[-3]
         
         # Detect patterns
         signal = self._detect_ao_patterns(ao_current, ao_prev, ao_prev2, 
-                                         ao.iloc[-10:])
+                                         recent_ao[-10:])
         
         # Calculate momentum change
         momentum_change = ao_current - ao_prev
-        momentum_strength = abs(ao_current) / df['close'].iloc[-1]
+        momentum_strength = abs(ao_current) / price
         
         confidence = self._calculate_confidence(signal, momentum_strength)
         
         return IndicatorResult(
-            timestamp=datetime.now(),
             symbol=symbol,
             indicator_name=self.name,
             signal=signal,
             confidence=confidence,
             value=ao_current,
-            components={
+            components=lambda: {
                 'previous': ao_prev,
                 'momentum_change': momentum_change,
                 'zero_line': 0
             },
-            metadata={
+            metadata=lambda: {
                 'color': 'green' if ao_current > ao_prev else 'red',
-                'twin_peaks_buy': self._check_twin_peaks_buy(ao.iloc[-20:]),
-                'twin_peaks_sell': self._check_twin_peaks_sell(ao.iloc[-20:])
+                'twin_peaks_buy': self._check_twin_peaks_buy(recent_ao),
+                'twin_peaks_sell': self._check_twin_peaks_sell(recent_ao)
             }
         )
     
     def _detect_ao_patterns(self, current: float, prev: float, prev2: float,
-                           recent_ao: pd.Series) -> SignalStrength:
+                           recent_ao: np.ndarray) -> SignalStrength:
         """Detect AO trading patterns"""
         
         # Zero line cross
@@ -230,18 +241,19 @@ class AwesomeOscillator(Indicator):
                 current < prev and # Red bar (lower)
                 current > 0)      # Still above zero
     
-    def _check_twin_peaks_buy(self, ao_series: pd.Series) -> bool:
+    def _check_twin_peaks_buy(self, ao_series) -> bool:
         """Check for bullish twin peaks pattern"""
         if len(ao_series) < 10:
             return False
             
         # Find peaks below zero
+        values = np.asarray(ao_series, dtype=np.float64)
         peaks = []
-        for i in range(1, len(ao_series) - 1):
-            if (ao_series.iloc[i] < 0 and 
-                ao_series.iloc[i] < ao_series.iloc[i-1] and 
-                ao_series.iloc[i] < ao_series.iloc[i+1]):
-                peaks.append((i, ao_series.iloc[i]))
+        for i in range(1, len(values) - 1):
+            if (values[i] < 0 and 
+                values[i] < values[i-1] and 
+                values[i] < values[i+1]):
+                peaks.append((i, values[i]))
                 
         # Check if we have two peaks with second higher than first
         if len(peaks) >= 2:
@@ -250,18 +262,19 @@ class AwesomeOscillator(Indicator):
                 
         return False
     
-    def _check_twin_peaks_sell(self, ao_series: pd.Series) -> bool:
+    def _check_twin_peaks_sell(self, ao_series) -> bool:
         """Check for bearish twin peaks pattern"""
         if len(ao_series) < 10:
             return False
             
         # Find peaks above zero
+        values = np.asarray(ao_series, dtype=np.float64)
         peaks = []
-        for i in range(1, len(ao_series) - 1):
-            if (ao_series.iloc[i] > 0 and 
-                ao_series.iloc[i] > ao_series.iloc[i-1] and 
-                ao_series.iloc[i] > ao_series.iloc[i+1]):
-                peaks.append((i, ao_series.iloc[i]))
+        for i in range(1, len(values) - 1):
+            if (values[i] > 0 and 
+                values[i] > values[i-1] and 
+                values[i] > values[i+1]):
+                peaks.append((i, values[i]))
                 
         # Check if we have two peaks with second lower than first
         if len(peaks) >= 2:
@@ -289,6 +302,7 @@ class AcceleratorOscillator(Indicator):
         return self.ao_slow + self.ac_period + 5
     
     def calculate(self, df: pd.DataFrame, symbol: str) -> IndicatorResult:
+        df = MarketFrame.wrap(df)
         if not self.validate_data(df):
             return None
             
@@ -302,35 +316,40 @@ class AcceleratorOscillator(Indicator):
         ao_sma = ao.rolling(window=self.ac_period).mean()
         ac = ao - ao_sma
         
+        return self._result(symbol, ac.iloc[-5:].to_numpy(copy=True), ao.iloc[-1],
+                            df['close'].iloc[-1])
+    
+    def _result(self, symbol: str, recent_ac: np.ndarray, ao_current: float,
+                price: float) -> IndicatorResult:
+        """Signal and result from the last 5 AC values and the current AO"""
         # Get recent values
-        ac_current = ac.iloc[-1]
-        ac_prev = ac.iloc[-2]
-        ac_prev2 = ac.iloc[-3]
+        ac_current = recent_ac[-1]
+        ac_prev = recent_ac[-2]
+        ac_prev2 = recent_ac[-3]
         
         # Determine signal
         signal = self._analyze_ac_signal(ac_current, ac_prev, ac_prev2)
         
         # Calculate acceleration strength
         acceleration = ac_current - ac_prev
-        accel_strength = abs(ac_current) / df['close'].iloc[-1]
+        accel_strength = abs(ac_current) / price
         
         confidence = self._calculate_confidence(signal, accel_strength)
         
         return IndicatorResult(
-            timestamp=datetime.now(),
             symbol=symbol,
             indicator_name=self.name,
             signal=signal,
             confidence=confidence,
             value=ac_current,
-            components={
+            components=lambda: {
                 'previous': ac_prev,
                 'acceleration': acceleration,
-                'ao_value': ao.iloc[-1]
+                'ao_value': ao_current
             },
-            metadata={
+            metadata=lambda: {
                 'color': 'green' if ac_current > ac_prev else 'red',
-                'consecutive_bars': self._count_consecutive_bars(ac.iloc[-5:])
+                'consecutive_bars': self._count_consecutive_bars(recent_ac)
             }
         )
     
@@ -360,16 +379,17 @@ class AcceleratorOscillator(Indicator):
             
         return SignalStrength.NEUTRAL
     
-    def _count_consecutive_bars(self, ac_series: pd.Series) -> dict:
+    def _count_consecutive_bars(self, ac_series) -> dict:
         """Count consecutive green/red bars"""
         if len(ac_series) < 2:
             return {'green': 0, 'red': 0}
             
+        values = np.asarray(ac_series, dtype=np.float64)
         green = 0
         red = 0
         
-        for i in range(1, len(ac_series)):
-            if ac_series.iloc[i] > ac_series.iloc[i-1]:
+        for i in range(1, len(values)):
+            if values[i] > values[i-1]:
                 green += 1
                 red = 0
             else:
@@ -395,6 +415,7 @@ class FractalsIndicator(Indicator):
         return self.period * 2
     
     def calculate(self, df: pd.DataFrame, symbol: str) -> IndicatorResult:
+        df = MarketFrame.wrap(df)
         if not self.validate_data(df):
             return None
             
@@ -409,6 +430,12 @@ class FractalsIndicator(Indicator):
         # Current price
         current_price = df['close'].iloc[-1]
         
+        return self._result(symbol, current_price, recent_up, recent_down,
+                            len(up_fractals), len(down_fractals))
+    
+    def _result(self, symbol: str, current_price: float, recent_up: Optional[float],
+                recent_down: Optional[float], up_count: int, down_count: int) -> IndicatorResult:
+        """Signal and result from the latest fractal levels"""
         # Generate signal based on fractal breakouts
         signal = self._analyze_fractal_breakout(current_price, recent_up, recent_down)
         
@@ -419,64 +446,48 @@ class FractalsIndicator(Indicator):
         confidence = self._calculate_confidence(signal, min(up_dist, down_dist))
         
         return IndicatorResult(
-            timestamp=datetime.now(),
             symbol=symbol,
             indicator_name=self.name,
             signal=signal,
             confidence=confidence,
             value=current_price,
-            components={
+            components=lambda: {
                 'up_fractal': recent_up,
                 'down_fractal': recent_down,
                 'up_distance': up_dist,
                 'down_distance': down_dist
             },
-            metadata={
-                'total_up_fractals': len(up_fractals),
-                'total_down_fractals': len(down_fractals),
+            metadata=lambda: {
+                'total_up_fractals': up_count,
+                'total_down_fractals': down_count,
                 'fractal_period': self.period
             }
         )
     
-    def _find_up_fractals(self, df: pd.DataFrame) -> List[Tuple[int, float]]:
+    def _find_up_fractals(self, df: MarketFrame) -> List[Tuple[int, float]]:
         """Find bullish fractals (highs)"""
-        fractals = []
-        half = self.period // 2
-        
-        for i in range(half, len(df) - half):
-            high = df['high'].iloc[i]
-            is_fractal = True
-            
-            # Check if middle bar is highest
-            for j in range(i - half, i + half + 1):
-                if j != i and df['high'].iloc[j] >= high:
-                    is_fractal = False
-                    break
-                    
-            if is_fractal:
-                fractals.append((i, high))
-                
-        return fractals
+        # Middle bar must be strictly higher than every other bar in the window
+        return self._find_fractals(df.high, np.greater)
     
-    def _find_down_fractals(self, df: pd.DataFrame) -> List[Tuple[int, float]]:
+    def _find_down_fractals(self, df: MarketFrame) -> List[Tuple[int, float]]:
         """Find bearish fractals (lows)"""
-        fractals = []
+        # Middle bar must be strictly lower than every other bar in the window
+        return self._find_fractals(df.low, np.less)
+    
+    def _find_fractals(self, values: np.ndarray, beats) -> List[Tuple[int, float]]:
+        """Find window centres that beat all their neighbours"""
         half = self.period // 2
-        
-        for i in range(half, len(df) - half):
-            low = df['low'].iloc[i]
-            is_fractal = True
+        if len(values) < self.period:
+            return []
             
-            # Check if middle bar is lowest
-            for j in range(i - half, i + half + 1):
-                if j != i and df['low'].iloc[j] <= low:
-                    is_fractal = False
-                    break
-                    
-            if is_fractal:
-                fractals.append((i, low))
+        windows = np.lib.stride_tricks.sliding_window_view(values, self.period)
+        centre = windows[:, half]
+        is_fractal = np.ones(len(windows), dtype=bool)
+        for j in range(self.period):
+            if j != half:
+                is_fractal &= beats(centre, windows[:, j])
                 
-        return fractals
+        return [(int(i) + half, values[i + half]) for i in np.flatnonzero(is_fractal)]
     
     def _get_recent_fractal(self, fractals: List[Tuple[int, float]]) -> Optional[float]:
         """Get most recent fractal value"""
@@ -518,6 +529,7 @@ class WilliamsMFI(Indicator):
         return 10
     
     def calculate(self, df: pd.DataFrame, symbol: str) -> IndicatorResult:
+        df = MarketFrame.wrap(df)
         if not self.validate_data(df):
             return None
             
@@ -530,7 +542,15 @@ class WilliamsMFI(Indicator):
         
         current_volume = df['volume'].iloc[-1]
         prev_volume = df['volume'].iloc[-2]
+        price_up = df['close'].iloc[-1] > df['close'].iloc[-2]
         
+        return self._result(symbol, current_mfi, prev_mfi, current_volume, prev_volume,
+                            price_up, mfi.iloc[-20:].mean())
+    
+    def _result(self, symbol: str, current_mfi: float, prev_mfi: float,
+                current_volume: float, prev_volume: float, price_up: bool,
+                avg_mfi: float) -> IndicatorResult:
+        """Signal and result from the last two bars and the recent average MFI"""
         # Determine market state (4 possible states)
         market_state = self._determine_market_state(
             current_mfi > prev_mfi,
@@ -538,28 +558,26 @@ class WilliamsMFI(Indicator):
         )
         
         # Generate signal based on market state
-        signal = self._analyze_market_state(market_state, df)
+        signal = self._analyze_market_state(market_state, price_up)
         
         # Calculate efficiency
-        avg_mfi = mfi.iloc[-20:].mean()
         efficiency = current_mfi / avg_mfi if avg_mfi > 0 else 1.0
         
         confidence = self._calculate_confidence(signal, efficiency)
         
         return IndicatorResult(
-            timestamp=datetime.now(),
             symbol=symbol,
             indicator_name=self.name,
             signal=signal,
             confidence=confidence,
             value=current_mfi,
-            components={
+            components=lambda: {
                 'previous_mfi': prev_mfi,
                 'volume': current_volume,
                 'prev_volume': prev_volume,
                 'avg_mfi': avg_mfi
             },
-            metadata={
+            metadata=lambda: {
                 'market_state': market_state,
                 'efficiency': efficiency,
                 'mfi_change': (current_mfi - prev_mfi) / prev_mfi if prev_mfi > 0 else 0,
@@ -578,12 +596,8 @@ class WilliamsMFI(Indicator):
         else:  # not mfi_up and volume_up
             return "Squat"  # Market squat (preparing for move)
     
-    def _analyze_market_state(self, state: str, df: pd.DataFrame) -> SignalStrength:
+    def _analyze_market_state(self, state: str, price_up: bool) -> SignalStrength:
         """Generate signal based on market state and price action"""
-        close_current = df['close'].iloc[-1]
-        close_prev = df['close'].iloc[-2]
-        price_up = close_current > close_prev
-        
         if state == "Green":
             # Real move - follow the trend
             return SignalStrength.STRONG_BUY if price_up else SignalStrength.STRONG_SELL
@@ -623,10 +637,11 @@ class ChaosSignalCombiner(CompositeIndicator):
         }
         
     def calculate(self, df: pd.DataFrame, symbol: str) -> IndicatorResult:
+        df = MarketFrame.wrap(df)
         if not self.validate_data(df):
             return None
             
-        # Calculate all indicators
+        # Calculate all indicators (sharing the validated frame)
         results = self.calculate_all(df, symbol)
         
         if not results:
@@ -674,7 +689,6 @@ class ChaosSignalCombiner(CompositeIndicator):
             signal = SignalStrength.NEUTRAL
             
         return IndicatorResult(
-            timestamp=datetime.now(),
             symbol=symbol,
             indicator_name=self.name,
             signal=signal,
@@ -2,13 +2,13 @@
 Elliott Wave Detection Engine
 Identifies impulse and corrective wave patterns in price data
 """
+import threading
 import pandas as pd
 import numpy as np
-from datetime import datetime
 from typing import List, Optional, Tuple, Dict
 from dataclasses import dataclass
 from enum import Enum
-from .base import Indicator, IndicatorResult, SignalStrength
+from .base import Indicator, IndicatorResult, SignalStrength, MarketFrame
 
 
 class WaveType(Enum):
@@ -95,23 +95,54 @@ class ElliottWaveDetector(Indicator):
             'wave5_typical_extend': 1.0  # Wave 5 typically equals wave 1
         }
         
+        # Incremental swing/pattern state per symbol and bar spacing, so
+        # resampled views of the same symbol keep separate indices
+        self._indices: Dict[tuple, '_SwingPatternIndex'] = {}
+        self._lock = threading.Lock()
+        
+    def __getstate__(self):
+        """Drop per-symbol caches and the lock when pickling"""
+        state = self.__dict__.copy()
+        state['_indices'] = {}
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        
     def get_required_periods(self) -> int:
         return max(50, self.swing_period * 10)
     
     def calculate(self, df: pd.DataFrame, symbol: str) -> IndicatorResult:
+        df = MarketFrame.wrap(df)
         if not self.validate_data(df):
             return None
             
-        # Find swing points
-        swing_highs, swing_lows = self._find_swing_points(df)
-        all_swings = self._merge_swing_points(swing_highs, swing_lows)
-        
-        if len(all_swings) < 8:  # Need at least 8 swings for a complete wave
+        # Bring the symbol's swing/pattern index up to date with new bars
+        with self._lock:
+            key = (symbol, df.index[1] - df.index[0])
+            index = self._indices.get(key)
+            if index is None or not index.extends(df):
+                index = self._indices[key] = _SwingPatternIndex(self, df)
+            index.update(df)
+            return self._index_result(index, symbol, df)
+    
+    def _index_result(self, index: '_SwingPatternIndex', symbol: str,
+                      df: MarketFrame) -> IndicatorResult:
+        """
+        Signal and result from a swing/pattern index that is up to date with df
+        
+        Only len(df) and the close array are read, so any frame-like bar
+        buffer works.
+        """
+        if len(index.swings) < 8:  # Need at least 8 swings for a complete wave
             return self._create_neutral_result(symbol, df)
             
-        # Detect wave patterns
-        impulse_waves = self._detect_impulse_waves(all_swings, df)
-        corrective_waves = self._detect_corrective_waves(all_swings, df)
+        # Wave patterns: finalized ones plus the windows ending at the last swing
+        impulse_waves, corrective_waves = index.patterns()
+        swing_count = len(index.swings)
+        swing_high, swing_low = index.swing_extremes()
         
         # Get current wave position
         current_wave = self._identify_current_wave(impulse_waves, corrective_waves, df)
@@ -120,78 +151,57 @@ class ElliottWaveDetector(Indicator):
         signal, confidence = self._generate_signal(current_wave, impulse_waves, 
                                                   corrective_waves, df)
         
-        # Prepare components and metadata
-        components = self._prepare_components(current_wave, all_swings, df)
-        metadata = self._prepare_metadata(impulse_waves, corrective_waves, current_wave)
+        # Prepare components now (they read the frame); metadata is built on demand
+        components = self._prepare_components(current_wave, swing_count,
+                                              swing_high, swing_low, df)
+        metadata = lambda: self._prepare_metadata(impulse_waves, corrective_waves, current_wave)
         
         return IndicatorResult(
-            timestamp=datetime.now(),
             symbol=symbol,
             indicator_name=self.name,
             signal=signal,
             confidence=confidence,
-            value=df['close'].iloc[-1],
+            value=df.close[-1],
             components=components,
             metadata=metadata
         )
     
-    def _find_swing_points(self, df: pd.DataFrame) -> Tuple[List[WavePoint], List[WavePoint]]:
+    def _find_swing_points(self, df: MarketFrame) -> Tuple[List[WavePoint], List[WavePoint]]:
         """Find swing highs and lows"""
-        highs = []
-        lows = []
-        
-        for i in range(self.swing_period, len(df) - self.swing_period):
-            # Check for swing high
-            if self._is_swing_high(df, i):
-                highs.append(WavePoint(
-                    index=i,
-                    price=df['high'].iloc[i],
-                    time=df.index[i],
-                    is_high=True
-                ))
-                
-            # Check for swing low
-            if self._is_swing_low(df, i):
-                lows.append(WavePoint(
-                    index=i,
-                    price=df['low'].iloc[i],
-                    time=df.index[i],
-                    is_high=False
-                ))
-                
-        return highs, lows
-    
-    def _is_swing_high(self, df: pd.DataFrame, index: int) -> bool:
-        """Check if index is a swing high"""
-        high = df['high'].iloc[index]
+        high_idx, low_idx = self._swing_indices(df.high, df.low)
         
-        # Check bars before
-        for i in range(index - self.swing_period, index):
-            if df['high'].iloc[i] >= high:
-                return False
+        highs = [WavePoint(index=int(i), price=df.high[i], time=df.index[i], is_high=True)
+                 for i in high_idx]
+        lows = [WavePoint(index=int(i), price=df.low[i], time=df.index[i], is_high=False)
+                for i in low_idx]
                 
-        # Check bars after
-        for i in range(index + 1, index + self.swing_period + 1):
-            if i < len(df) and df['high'].iloc[i] > high:
-                return False
-                
-        return True
+        return highs, lows
     
-    def _is_swing_low(self, df: pd.DataFrame, index: int) -> bool:
-        """Check if index is a swing low"""
-        low = df['low'].iloc[index]
-        
-        # Check bars before
-        for i in range(index - self.swing_period, index):
-            if df['low'].iloc[i] <= low:
-                return False
-                
-        # Check bars after
-        for i in range(index + 1, index + self.swing_period + 1):
-            if i < len(df) and df['low'].iloc[i] < low:
-                return False
-                
-        return True
+    def _swing_indices(self, high: np.ndarray, 
+                       low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Indices of swing highs and lows
+        
+        A swing high is strictly above the swing_period bars before it and not
+        exceeded by the swing_period bars after it (mirrored for lows).
+        """
+        period = self.swing_period
+        n = len(high)
+        if n < 2 * period + 1:
+            return np.array([], dtype=int), np.array([], dtype=int)
+            
+        windows_high = np.lib.stride_tricks.sliding_window_view(high, period)
+        windows_low = np.lib.stride_tricks.sliding_window_view(low, period)
+        centre_high = high[period:n - period]
+        centre_low = low[period:n - period]
+        
+        # Window k covers bars [k, k + period): "before" starts at i - period, "after" at i + 1
+        is_high = ((centre_high > windows_high[:n - 2 * period].max(axis=1)) &
+                   (centre_high >= windows_high[period + 1:].max(axis=1)))
+        is_low = ((centre_low < windows_low[:n - 2 * period].min(axis=1)) &
+                  (centre_low <= windows_low[period + 1:].min(axis=1)))
+        
+        return np.flatnonzero(is_high) + period, np.flatnonzero(is_low) + period
     
     def _merge_swing_points(self, highs: List[WavePoint], 
                            lows: List[WavePoint]) -> List[WavePoint]:
@@ -202,24 +212,35 @@ class ElliottWaveDetector(Indicator):
         # Filter out points that are too close
         filtered = []
         for point in all_points:
-            if not filtered:
-                filtered.append(point)
-            else:
-                last_point = filtered[-1]
-                price_diff = abs(point.price - last_point.price) / last_point.price
-                
-                if price_diff >= self.min_wave_size:
-                    # Ensure alternating highs and lows
-                    if point.is_high != last_point.is_high:
-                        filtered.append(point)
-                    elif price_diff > self.min_wave_size * 2:
-                        # Replace if significantly different
-                        if (point.is_high and point.price > last_point.price) or \
-                           (not point.is_high and point.price < last_point.price):
-                            filtered[-1] = point
+            self._fold_swing_point(filtered, point)
                             
         return filtered
     
+    def _fold_swing_point(self, filtered: List[WavePoint], point: WavePoint) -> bool:
+        """
+        Merge one swing point into the filtered list
+        
+        Only ever appends or replaces the last point; returns True on append.
+        """
+        if not filtered:
+            filtered.append(point)
+            return True
+            
+        last_point = filtered[-1]
+        price_diff = abs(point.price - last_point.price) / last_point.price
+        
+        if price_diff >= self.min_wave_size:
+            # Ensure alternating highs and lows
+            if point.is_high != last_point.is_high:
+                filtered.append(point)
+                return True
+            elif price_diff > self.min_wave_size * 2:
+                # Replace if significantly different
+                if (point.is_high and point.price > last_point.price) or \
+                   (not point.is_high and point.price < last_point.price):
+                    filtered[-1] = point
+        return False
+    
     def _detect_impulse_waves(self, swings: List[WavePoint], 
                              df: pd.DataFrame) -> List[List[Wave]]:
         """Detect 5-wave impulse patterns"""
@@ -247,6 +268,39 @@ class ElliottWaveDetector(Indicator):
             # Downtrend impulse  
             return self._validate_downtrend_impulse(points)
     
+    def _impulse_prefix_viable(self, points: List[WavePoint]) -> bool:
+        """
+        Whether the first points of a 6-point window can still form an impulse
+        
+        Applies the alternation and wave 2/3/4 rules that are already decidable,
+        so hopeless windows are dropped before the remaining swings arrive.
+        """
+        expect_high = points[0].is_high
+        for point in points:
+            if point.is_high != expect_high:
+                return False
+            expect_high = not expect_high
+                
+        if points[0].is_high:
+            # Downtrend impulse: only the alternation is checked
+            return True
+            
+        if len(points) < 3:
+            return True
+        wave1_length = abs(points[1].price - points[0].price)
+        
+        # Wave 2 cannot retrace all of wave 1
+        if (points[1].price - points[2].price) / wave1_length > self.wave_rules['wave2_max_retrace']:
+            return False
+        # Wave 3 must be at least as long as wave 1
+        if len(points) >= 4 and \
+           (points[3].price - points[2].price) / wave1_length < self.wave_rules['wave3_min_extend']:
+            return False
+        # Wave 4 cannot overlap wave 1
+        if len(points) >= 5 and points[4].price <= points[1].price:
+            return False
+        return True
+    
     def _validate_uptrend_impulse(self, points: List[WavePoint]) -> Optional[List[Wave]]:
         """Validate uptrend impulse pattern"""
         # Expected pattern: Low, High, Low, High, Low, High
@@ -459,19 +513,36 @@ class ElliottWaveDetector(Indicator):
         current_idx = len(df) - 1
         
         # Check impulse patterns
-        for pattern in impulse_patterns:
+        for pattern in self._patterns_ending_from(impulse_patterns, current_idx):
             for wave in pattern:
                 if wave.start_point.index <= current_idx <= wave.end_point.index:
                     return wave
                     
         # Check corrective patterns
-        for pattern in corrective_patterns:
+        for pattern in self._patterns_ending_from(corrective_patterns, current_idx):
             for wave in pattern:
                 if wave.start_point.index <= current_idx <= wave.end_point.index:
                     return wave
                     
         return None
     
+    @staticmethod
+    def _patterns_ending_from(patterns: List[List[Wave]], index: int):
+        """
+        Patterns that end at or after index, in order
+        
+        Windows are consecutive swings, so pattern end indices are sorted and
+        the earlier ones can be skipped by bisection.
+        """
+        lo, hi = 0, len(patterns)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if patterns[mid][-1].end_point.index < index:
+                lo = mid + 1
+            else:
+                hi = mid
+        return (patterns[i] for i in range(lo, len(patterns)))
+    
     def _generate_signal(self, current_wave: Optional[Wave], 
                         impulse_patterns: List[List[Wave]],
                         corrective_patterns: List[List[Wave]], 
@@ -541,12 +612,14 @@ class ElliottWaveDetector(Indicator):
         return wave_progress > 0.8
     
     def _prepare_components(self, current_wave: Optional[Wave], 
-                           swings: List[WavePoint],
+                           swing_count: int,
+                           swing_high: Optional[float],
+                           swing_low: Optional[float],
                            df: pd.DataFrame) -> dict:
         """Prepare components for result"""
         components = {
-            'current_price': df['close'].iloc[-1],
-            'swing_count': len(swings)
+            'current_price': df.close[-1],
+            'swing_count': swing_count
         }
         
         if current_wave:
@@ -557,9 +630,9 @@ class ElliottWaveDetector(Indicator):
                 'wave_progress': self._calculate_wave_progress(current_wave, df)
             })
             
-        if swings:
-            components['last_swing_high'] = max(s.price for s in swings if s.is_high)
-            components['last_swing_low'] = min(s.price for s in swings if not s.is_high)
+        if swing_count:
+            components['last_swing_high'] = swing_high
+            components['last_swing_low'] = swing_low
             
         return components
     
@@ -597,18 +670,133 @@ class ElliottWaveDetector(Indicator):
     
     def _create_neutral_result(self, symbol: str, df: pd.DataFrame) -> IndicatorResult:
         """Create neutral result when no waves detected"""
+        current_price = df.close[-1]
         return IndicatorResult(
-            timestamp=datetime.now(),
             symbol=symbol,
             indicator_name=self.name,
             signal=SignalStrength.NEUTRAL,
             confidence=0.5,
-            value=df['close'].iloc[-1],
-            components={
-                'current_price': df['close'].iloc[-1],
+            value=current_price,
+            components=lambda: {
+                'current_price': current_price,
                 'swing_count': 0
             },
-            metadata={
+            metadata=lambda: {
                 'message': 'Insufficient swing points for wave analysis'
             }
-        )
\ No newline at end of file
+        )
+
+class _SwingPatternIndex:
+    """
+    Incremental swing and wave-pattern state for one symbol's series
+    
+    A swing is confirmed once swing_period later bars exist and never changes
+    afterwards, and merging only ever replaces the last merged swing. So every
+    pattern window that ends before the last swing is final: it is evaluated
+    once, when that swing becomes stable, and kept. Impulse windows are grown
+    one stable swing at a time and dropped as soon as a wave 2/3/4 rule fails.
+    Only the windows ending at the last swing are re-evaluated per call.
+    """
+    
+    def __init__(self, detector: ElliottWaveDetector, df: MarketFrame):
+        self.detector = detector
+        self.first_time = df.index[0]
+        self.bars = 0          # bars consumed so far
+        self.scanned = 0       # swing candidates checked below this index
+        self.last_time = None
+        self.last_high = None
+        self.last_low = None
+        self.swings: List[WavePoint] = []
+        self.stable_high = None  # extremes over swings[:-1]
+        self.stable_low = None
+        self.impulse: List[List[Wave]] = []
+        self.corrective: List[List[Wave]] = []
+        self.candidates: List[int] = []  # starts of impulse windows still viable
+        
+    def extends(self, df: MarketFrame) -> bool:
+        """Whether df is the series seen so far plus (possibly) new bars"""
+        if len(df) < self.bars or df.index[0] != self.first_time:
+            return False
+        if self.bars == 0:
+            return True
+        last = self.bars - 1
+        return (df.index[last] == self.last_time and
+                df.high[last] == self.last_high and
+                df.low[last] == self.last_low)
+        
+    def update(self, df: MarketFrame):
+        """Consume bars added since the last update"""
+        n = len(df)
+        if n == self.bars:
+            return
+        period = self.detector.swing_period
+        start = max(period, self.scanned)
+        if n - period > start:
+            high_idx, low_idx = self.detector._swing_indices(df.high[start - period:],
+                                                              df.low[start - period:])
+            offset = start - period
+            # Same order as sorting highs + lows by index: highs first on ties
+            points = [(int(i) + offset, True) for i in high_idx]
+            points += [(int(i) + offset, False) for i in low_idx]
+            points.sort(key=lambda p: p[0])
+            for i, is_high in points:
+                price = df.high[i] if is_high else df.low[i]
+                point = WavePoint(index=i, price=price, time=df.index[i], is_high=is_high)
+                if self.detector._fold_swing_point(self.swings, point) and len(self.swings) > 1:
+                    self._stabilize(len(self.swings) - 2)
+            self.scanned = n - period
+        self.bars = n
+        self.last_time = df.index[n - 1]
+        self.last_high = df.high[n - 1]
+        self.last_low = df.low[n - 1]
+        
+    def _stabilize(self, k: int):
+        """Swing k will no longer change: extend and finalize windows ending at it"""
+        detector = self.detector
+        point = self.swings[k]
+        if point.is_high:
+            self.stable_high = point.price if self.stable_high is None else max(self.stable_high, point.price)
+        else:
+            self.stable_low = point.price if self.stable_low is None else min(self.stable_low, point.price)
+            
+        if k >= 3:
+            waves = detector._try_corrective_pattern(self.swings[k - 3:k + 1], None)
+            if waves:
+                self.corrective.append(waves)
+                
+        alive = []
+        for start in self.candidates + [k]:
+            window = self.swings[start:k + 1]
+            if len(window) == 6:
+                waves = detector._try_impulse_pattern(window, None)
+                if waves:
+                    self.impulse.append(waves)
+            elif detector._impulse_prefix_viable(window):
+                alive.append(start)
+        self.candidates = alive
+        
+    def patterns(self) -> Tuple[List[List[Wave]], List[List[Wave]]]:
+        """Final patterns plus those ending at the (still mutable) last swing"""
+        last = len(self.swings) - 1
+        # Copies, so results handed out are not affected by later updates
+        impulse, corrective = list(self.impulse), list(self.corrective)
+        if last >= 5 and (last - 5) in self.candidates:
+            waves = self.detector._try_impulse_pattern(self.swings[last - 5:], None)
+            if waves:
+                impulse.append(waves)
+        if last >= 3:
+            waves = self.detector._try_corrective_pattern(self.swings[last - 3:], None)
+            if waves:
+                corrective.append(waves)
+        return impulse, corrective
+    
+    def swing_extremes(self) -> Tuple[Optional[float], Optional[float]]:
+        """Highest swing high and lowest swing low"""
+        high, low = self.stable_high, self.stable_low
+        if self.swings:
+            last = self.swings[-1]
+            if last.is_high:
+                high = last.price if high is None else max(high, last.price)
+            else:
+                low = last.price if low is None else min(low, last.price)
+        return high, low
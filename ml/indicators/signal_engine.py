@@ -4,11 +4,13 @@ Integrates multiple indicators into a unified probability layer
 """
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import time
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
-from .base import Indicator, IndicatorResult, SignalStrength
+from .base import Indicator, IndicatorResult, SignalStrength, MarketFrame
 from .chaos_indicators import (
     AlligatorIndicator,
     AwesomeOscillator,
@@ -38,19 +40,195 @@ class SignalConfiguration:
     min_confidence: float = 0.3  # Minimum confidence to include signal
     
     
-@dataclass
 class CombinedSignal:
-    """Combined signal from multiple indicators"""
-    timestamp: datetime
-    symbol: str
-    signal: SignalStrength
-    confidence: float
-    probability: float  # 0-100%
-    indicators_used: int
-    contributing_signals: Dict[str, Dict]
-    market_condition: str
-    recommended_action: str
-    risk_level: str
+    """
+    Combined signal from multiple indicators
+    
+    Slotted; contributing_signals may be given as a zero-argument callable and
+    is only built into its nested dicts when first read.
+    """
+    __slots__ = ('symbol', 'signal', 'confidence', 'probability', 'indicators_used',
+                 'market_condition', 'recommended_action', 'risk_level',
+                 'indicator_names', '_epoch', '_timestamp', '_contributing')
+    
+    def __init__(self, timestamp: Optional[datetime], symbol: str, signal: SignalStrength,
+                 confidence: float, probability: float, indicators_used: int,
+                 contributing_signals, market_condition: str,
+                 recommended_action: str, risk_level: str,
+                 indicator_names: Tuple[str, ...] = ()):
+        self.symbol = symbol
+        self.signal = signal
+        self.confidence = confidence
+        self.probability = probability  # 0-100%
+        self.indicators_used = indicators_used
+        self.market_condition = market_condition
+        self.recommended_action = recommended_action
+        self.risk_level = risk_level
+        self.indicator_names = indicator_names
+        self._epoch = time.time() if timestamp is None else None
+        self._timestamp = timestamp
+        self._contributing = contributing_signals
+    
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._epoch)
+        return self._timestamp
+    
+    @property
+    def contributing_signals(self) -> Dict[str, Dict]:
+        if callable(self._contributing):
+            self._contributing = self._contributing()
+        return self._contributing
+    
+    def __getstate__(self):
+        """Materialize lazy fields so signals can be pickled or copied"""
+        self.contributing_signals  # force lazy construction
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+    
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            object.__setattr__(self, slot, value)
+    
+    def __repr__(self) -> str:
+        return (f"CombinedSignal(symbol={self.symbol!r}, signal={self.signal.name}, "
+                f"confidence={self.confidence:.3f}, probability={self.probability:.1f}, "
+                f"indicators_used={self.indicators_used}, market_condition={self.market_condition!r})")
+
+
+class SignalSeries:
+    """
+    Struct-of-arrays result of analyzing a series bar by bar
+    
+    Holds one numpy array per field instead of one CombinedSignal per bar;
+    market conditions are stored as codes into MARKET_CONDITIONS.
+    """
+    MARKET_CONDITIONS = ('trending', 'ranging', 'volatile', 'calm', 'unknown')
+    
+    __slots__ = ('symbol', 'index', 'signal', 'confidence', 'probability',
+                 'indicators_used', 'market_condition')
+    
+    def __init__(self, symbol: str, index: pd.Index, signal: np.ndarray,
+                 confidence: np.ndarray, probability: np.ndarray,
+                 indicators_used: np.ndarray, market_condition: np.ndarray):
+        self.symbol = symbol
+        self.index = index
+        self.signal = signal  # int8 SignalStrength values
+        self.confidence = confidence
+        self.probability = probability
+        self.indicators_used = indicators_used
+        self.market_condition = market_condition  # int8 codes
+    
+    @classmethod
+    def condition_code(cls, condition: str) -> int:
+        """Map a market condition label to its code"""
+        try:
+            return cls.MARKET_CONDITIONS.index(condition)
+        except ValueError:
+            return len(cls.MARKET_CONDITIONS) - 1
+    
+    def __len__(self) -> int:
+        return len(self.signal)
+    
+    def signal_at(self, i: int) -> SignalStrength:
+        return SignalStrength(int(self.signal[i]))
+    
+    def market_condition_labels(self) -> np.ndarray:
+        return np.asarray(self.MARKET_CONDITIONS, dtype=object)[self.market_condition]
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize as a DataFrame indexed by bar"""
+        return pd.DataFrame({
+            'signal': self.signal,
+            'confidence': self.confidence,
+            'probability': self.probability,
+            'indicators_used': self.indicators_used,
+            'market_condition': self.market_condition_labels()
+        }, index=self.index)
+
+
+class IndicatorPanel:
+    """
+    Per-bar indicator outputs of a SignalEngine, stored once for re-weighting
+    
+    Indicator signals, confidences and the market condition do not depend on
+    the engine's weights, so a panel computed once can be combined under any
+    number of weight vectors with array operations instead of re-running
+    the indicators. Columns follow the engine's enabled configurations.
+    """
+    
+    __slots__ = ('symbol', 'index', 'names', 'categories', 'weights', 'signal',
+                 'confidence', 'present', 'market_condition', 'agreement_boost',
+                 'probability_scale')
+    
+    def __init__(self, symbol: str, index: pd.Index, names: Tuple[str, ...],
+                 categories: Tuple['SignalWeight', ...], weights: Tuple[float, ...],
+                 signal: np.ndarray, confidence: np.ndarray, present: np.ndarray,
+                 market_condition: np.ndarray, agreement_boost: np.ndarray,
+                 probability_scale: np.ndarray):
+        self.symbol = symbol
+        self.index = index
+        self.names = names
+        self.categories = categories
+        self.weights = weights                      # engine weights at precompute time
+        self.signal = signal                        # (bars, indicators) signal values
+        self.confidence = confidence                # (bars, indicators)
+        self.present = present                      # indicator passed its confidence filter
+        self.market_condition = market_condition    # SignalSeries condition codes
+        self.agreement_boost = agreement_boost      # probability points from agreement
+        self.probability_scale = probability_scale  # market condition probability modifier
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def weight_vector(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Engine weights with the named indicators overridden"""
+        weights = weights or {}
+        return np.array([weights.get(name, default) for name, default in zip(self.names, self.weights)],
+                        dtype=np.float64)
+    
+    def combine(self, weights: Optional[Dict[str, float]] = None) -> SignalSeries:
+        """Signals SignalEngine.analyze would give with these indicator weights"""
+        return self.combine_many([weights])[0]
+    
+    def combine_many(self, weight_sets: List[Optional[Dict[str, float]]]) -> List[SignalSeries]:
+        """Combine under several weight sets at once (one matrix product per sum)"""
+        W = np.stack([self.weight_vector(w) for w in weight_sets], axis=1)  # (indicators, sets)
+        
+        # Market-adjusted weights without the configurable part: (bars, indicators)
+        conditions = SignalSeries.MARKET_CONDITIONS
+        factor = np.array([[SignalEngine._market_weight_factor(conditions[code], category)
+                            for category in self.categories] for code in range(len(conditions))])
+        adjust = factor[self.market_condition] * self.present
+        
+        total = adjust @ W
+        weighted_signal = (self.signal * self.confidence * adjust) @ W
+        weighted_confidence = (self.confidence * adjust) @ W
+        has_weight = total > 0
+        safe_total = np.where(has_weight, total, 1.0)
+        raw = np.where(has_weight, weighted_signal / safe_total, 0.0)
+        confidence = np.where(has_weight, weighted_confidence / safe_total, 0.5)
+        
+        # Same steps as _calculate_probability
+        probability = 50.0 + (confidence - 0.5) * 40
+        probability += self.agreement_boost[:, None]
+        strength = np.abs(raw) * 10
+        probability = np.where(raw > 0, probability + strength, probability - strength)
+        probability = np.clip(probability * self.probability_scale[:, None], 0, 100)
+        
+        signal = np.select([raw >= 1.5, raw >= 0.5, raw <= -1.5, raw <= -0.5],
+                           [SignalStrength.STRONG_BUY.value, SignalStrength.BUY.value,
+                            SignalStrength.STRONG_SELL.value, SignalStrength.SELL.value],
+                           SignalStrength.NEUTRAL.value).astype(np.int8)
+        
+        # Bars where no indicator reported give the engine's neutral signal
+        empty = ~self.present.any(axis=1)
+        confidence[empty], probability[empty] = 0.5, 50.0
+        
+        indicators_used = self.present.sum(axis=1).astype(np.int16)
+        return [SignalSeries(self.symbol, self.index, signal[:, j], confidence[:, j],
+                             probability[:, j], indicators_used, self.market_condition)
+                for j in range(W.shape[1])]
 
 
 class SignalEngine:
@@ -59,7 +237,8 @@ class SignalEngine:
     into a unified trading signal with probability assessment
     """
     
-    def __init__(self, custom_weights: Optional[Dict[str, float]] = None):
+    def __init__(self, custom_weights: Optional[Dict[str, float]] = None,
+                 max_workers: Optional[int] = None):
         # Initialize default indicator configurations
         self.configurations = self._create_default_configurations()
         
@@ -82,6 +261,29 @@ class SignalEngine:
             'high': 0.3      # < 50% confidence
         }
         
+        # Optional concurrent indicator evaluation (None or 1 = sequential)
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+    def __getstate__(self):
+        """Drop the thread pool when pickling (e.g. daemon model state)"""
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        return state
+    
+    def shutdown(self):
+        """Release the indicator thread pool, if one was created"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the indicator thread pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='signal-engine')
+        return self._executor
+        
     def _create_default_configurations(self) -> List[SignalConfiguration]:
         """Create default indicator configurations"""
         return [
@@ -167,15 +369,24 @@ class SignalEngine:
         if len(df) < self.get_required_periods():
             raise ValueError(f"Insufficient data: need at least {self.get_required_periods()} periods")
         
+        # Validate once and share the frame (and its arrays) across indicators
+        frame = MarketFrame.wrap(df)
+        
         # Calculate all indicator signals
-        results = self._calculate_all_indicators(df, symbol)
+        results = self._calculate_all_indicators(frame, symbol)
         
         if not results:
             return self._create_neutral_signal(symbol)
         
         # Analyze market condition
-        market_condition = self._analyze_market_condition(df, results)
+        market_condition = self._analyze_market_condition(frame, results)
         
+        return self._combined_signal(symbol, results, market_condition)
+    
+    def _combined_signal(self, symbol: str,
+                         results: List[Tuple[SignalConfiguration, IndicatorResult]],
+                         market_condition: str) -> CombinedSignal:
+        """Combine indicator results into the final signal for a classified market"""
         # Combine signals with adaptive weighting
         combined = self._combine_signals(results, market_condition)
         
@@ -188,40 +399,56 @@ class SignalEngine:
         # Assess risk level
         risk_level = self._assess_risk(combined['confidence'], probability)
         
-        # Prepare contributing signals
-        contributing = self._prepare_contributing_signals(results)
+        # Contributing signal details are built on first access; weights are
+        # captured now so later re-weighting does not change this signal
+        weights = tuple(config.weight for config, _ in results)
         
         return CombinedSignal(
-            timestamp=datetime.now(),
+            timestamp=None,
             symbol=symbol,
             signal=combined['signal'],
             confidence=combined['confidence'],
             probability=probability,
             indicators_used=len(results),
-            contributing_signals=contributing,
+            contributing_signals=lambda: self._prepare_contributing_signals(results, weights),
             market_condition=market_condition,
             recommended_action=action,
-            risk_level=risk_level
+            risk_level=risk_level,
+            indicator_names=tuple(result.indicator_name for _, result in results)
         )
     
     def _calculate_all_indicators(self, df: pd.DataFrame, 
                                  symbol: str) -> List[Tuple[SignalConfiguration, IndicatorResult]]:
-        """Calculate signals from all enabled indicators"""
-        results = []
+        """
+        Calculate signals from all enabled indicators
         
-        for config in self.configurations:
-            if not config.enabled:
-                continue
-                
-            try:
-                result = config.indicator.calculate(df, symbol)
-                if result and result.confidence >= config.min_confidence:
-                    results.append((config, result))
-            except Exception as e:
-                print(f"Error calculating {config.indicator.name}: {e}")
-                continue
-                
-        return results
+        Indicators are independent, so when max_workers > 1 they are evaluated
+        on a thread pool. Results always keep configuration order.
+        """
+        enabled_configs = [c for c in self.configurations if c.enabled]
+        
+        if self.max_workers and self.max_workers > 1 and len(enabled_configs) > 1:
+            outputs = list(self._get_executor().map(
+                lambda config: self._evaluate_indicator(config, df, symbol),
+                enabled_configs
+            ))
+        else:
+            outputs = [self._evaluate_indicator(config, df, symbol)
+                       for config in enabled_configs]
+        
+        return [(config, result) for config, result in zip(enabled_configs, outputs)
+                if result is not None]
+    
+    def _evaluate_indicator(self, config: SignalConfiguration, df: pd.DataFrame,
+                            symbol: str) -> Optional[IndicatorResult]:
+        """Evaluate a single indicator, isolating its errors from the others"""
+        try:
+            result = config.indicator.calculate(df, symbol)
+            if result and result.confidence >= config.min_confidence:
+                return result
+        except Exception as e:
+            print(f"Error calculating {config.indicator.name}: {e}")
+        return None
     
     def _analyze_market_condition(self, df: pd.DataFrame, 
                                  results: List[Tuple[SignalConfiguration, IndicatorResult]]) -> str:
@@ -238,6 +465,11 @@ class SignalEngine:
         true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
         atr = true_range.rolling(14).mean().iloc[-1]
         
+        return self._classify_market(volatility, avg_volatility, results)
+    
+    def _classify_market(self, volatility: float, avg_volatility: float,
+                         results: List[Tuple[SignalConfiguration, IndicatorResult]]) -> str:
+        """Update market_conditions from volatility and indicator agreement"""
         # Analyze indicator agreement
         signals = [r.signal.value for _, r in results]
         signal_std = np.std(signals) if signals else 0
@@ -302,29 +534,26 @@ class SignalEngine:
     def _adjust_weights_for_market(self, results: List[Tuple[SignalConfiguration, IndicatorResult]], 
                                   condition: str) -> List[float]:
         """Adjust indicator weights based on market condition"""
-        adjusted = []
-        
-        for config, result in results:
-            base_weight = config.weight
-            
-            # Adjust based on market condition
-            if condition == 'trending':
-                if config.category == SignalWeight.PRIMARY:
-                    base_weight *= 1.2  # Boost trend indicators
-                elif config.category == SignalWeight.SECONDARY:
-                    base_weight *= 0.8  # Reduce oscillators
-            elif condition == 'ranging':
-                if config.category == SignalWeight.SECONDARY:
-                    base_weight *= 1.2  # Boost oscillators
-                elif config.category == SignalWeight.PRIMARY:
-                    base_weight *= 0.8  # Reduce trend indicators
-            elif condition == 'volatile':
-                if config.category == SignalWeight.VOLUME:
-                    base_weight *= 1.1  # Slight boost to volume
-                    
-            adjusted.append(base_weight)
-            
-        return adjusted
+        return [config.weight * self._market_weight_factor(condition, config.category)
+                for config, _ in results]
+    
+    @staticmethod
+    def _market_weight_factor(condition: str, category: SignalWeight) -> float:
+        """Weight multiplier for an indicator category in a market condition"""
+        if condition == 'trending':
+            if category == SignalWeight.PRIMARY:
+                return 1.2  # Boost trend indicators
+            elif category == SignalWeight.SECONDARY:
+                return 0.8  # Reduce oscillators
+        elif condition == 'ranging':
+            if category == SignalWeight.SECONDARY:
+                return 1.2  # Boost oscillators
+            elif category == SignalWeight.PRIMARY:
+                return 0.8  # Reduce trend indicators
+        elif condition == 'volatile':
+            if category == SignalWeight.VOLUME:
+                return 1.1  # Slight boost to volume
+        return 1.0
     
     def _value_to_signal_strength(self, value: float) -> SignalStrength:
         """Convert numerical value to SignalStrength enum"""
@@ -408,16 +637,19 @@ class SignalEngine:
             return "High Risk"
     
     def _prepare_contributing_signals(self, 
-                                     results: List[Tuple[SignalConfiguration, IndicatorResult]]) -> Dict:
+                                     results: List[Tuple[SignalConfiguration, IndicatorResult]],
+                                     weights: Optional[Tuple[float, ...]] = None) -> Dict:
         """Prepare detailed information about contributing signals"""
         contributing = {}
+        if weights is None:
+            weights = tuple(config.weight for config, _ in results)
         
-        for config, result in results:
+        for (config, result), weight in zip(results, weights):
             contributing[result.indicator_name] = {
                 'signal': result.signal.name,
                 'signal_value': result.signal.value,
                 'confidence': result.confidence,
-                'weight': config.weight,
+                'weight': weight,
                 'category': config.category.name,
                 'value': result.value,
                 'components': result.components,
@@ -429,7 +661,7 @@ class SignalEngine:
     def _create_neutral_signal(self, symbol: str) -> CombinedSignal:
         """Create a neutral signal when no indicators are available"""
         return CombinedSignal(
-            timestamp=datetime.now(),
+            timestamp=None,
             symbol=symbol,
             signal=SignalStrength.NEUTRAL,
             confidence=0.5,
@@ -441,6 +673,109 @@ class SignalEngine:
             risk_level='High Risk'
         )
     
+    def analyze_series(self, df: pd.DataFrame, symbol: str,
+                       start: Optional[int] = None) -> SignalSeries:
+        """
+        Analyze each expanding window df.iloc[:end] for end from start
+        (default: the minimum required length) to len(df), one row per bar
+        """
+        required = self.get_required_periods()
+        start = required if start is None else max(start, required)
+        count = max(len(df) - start + 1, 0)
+        
+        signal = np.zeros(count, dtype=np.int8)
+        confidence = np.zeros(count)
+        probability = np.zeros(count)
+        indicators_used = np.zeros(count, dtype=np.int16)
+        condition = np.zeros(count, dtype=np.int8)
+        ok = np.zeros(count, dtype=bool)
+        
+        for row, end_idx in enumerate(range(start, len(df) + 1)):
+            try:
+                result = self.analyze(df.iloc[:end_idx], symbol)
+            except Exception:
+                continue
+            signal[row] = result.signal.value
+            confidence[row] = result.confidence
+            probability[row] = result.probability
+            indicators_used[row] = result.indicators_used
+            condition[row] = SignalSeries.condition_code(result.market_condition)
+            ok[row] = True
+        
+        index = df.index[start - 1:len(df)]
+        if not ok.all():
+            index = index[ok]
+            signal, confidence, probability = signal[ok], confidence[ok], probability[ok]
+            indicators_used, condition = indicators_used[ok], condition[ok]
+        
+        return SignalSeries(symbol, index, signal, confidence, probability,
+                            indicators_used, condition)
+    
+    def precompute(self, df: pd.DataFrame, symbol: str,
+                   start: Optional[int] = None) -> IndicatorPanel:
+        """
+        Evaluate every enabled indicator on each expanding window, as
+        analyze_series does, and keep the weight-independent parts
+        
+        Re-weighting the returned panel reproduces analyze_series for any
+        weights without evaluating the indicators again. Bars where
+        evaluation fails are left out, as in analyze_series.
+        """
+        required = self.get_required_periods()
+        start = required if start is None else max(start, required)
+        count = max(len(df) - start + 1, 0)
+        enabled = [c for c in self.configurations if c.enabled]
+        column = {id(config): k for k, config in enumerate(enabled)}
+        
+        signal = np.zeros((count, len(enabled)))
+        confidence = np.zeros((count, len(enabled)))
+        present = np.zeros((count, len(enabled)), dtype=bool)
+        condition = np.full(count, SignalSeries.condition_code('unknown'), dtype=np.int8)
+        agreement_boost = np.zeros(count)
+        probability_scale = np.ones(count)
+        ok = np.zeros(count, dtype=bool)
+        
+        for row, end_idx in enumerate(range(start, len(df) + 1)):
+            try:
+                frame = MarketFrame.wrap(df.iloc[:end_idx])
+                results = self._calculate_all_indicators(frame, symbol)
+                if results:
+                    market_condition = self._analyze_market_condition(frame, results)
+            except Exception:
+                continue
+            ok[row] = True
+            if not results:
+                continue
+            for config, result in results:
+                k = column[id(config)]
+                signal[row, k] = result.signal.value
+                confidence[row, k] = result.confidence
+                present[row, k] = True
+            condition[row] = SignalSeries.condition_code(market_condition)
+            values = [r.signal.value for _, r in results]
+            agreement_boost[row] = ((1 - (np.std(values) / 2)) - 0.5) * 30
+            if self.market_conditions['trending'] > 0.6:
+                probability_scale[row] = 1.1
+            elif self.market_conditions['volatile'] > 0.6:
+                probability_scale[row] = 0.9
+        
+        index = df.index[start - 1:len(df)]
+        if not ok.all():
+            index = index[ok]
+            signal, confidence, present = signal[ok], confidence[ok], present[ok]
+            condition, agreement_boost = condition[ok], agreement_boost[ok]
+            probability_scale = probability_scale[ok]
+        
+        return IndicatorPanel(
+            symbol, index,
+            names=tuple(c.indicator.name for c in enabled),
+            categories=tuple(c.category for c in enabled),
+            weights=tuple(c.weight for c in enabled),
+            signal=signal, confidence=confidence, present=present,
+            market_condition=condition, agreement_boost=agreement_boost,
+            probability_scale=probability_scale
+        )
+    
     def get_signal_statistics(self, df: pd.DataFrame, symbol: str, 
                              lookback_periods: int = 100) -> Dict:
         """Calculate historical statistics for signal accuracy"""
@@ -459,42 +794,26 @@ class SignalEngine:
         }
         
         # Track signals over lookback period
-        signals = []
-        for i in range(lookback_periods):
-            end_idx = len(df) - i
-            if end_idx < self.get_required_periods():
-                break
-                
-            period_df = df.iloc[:end_idx]
-            try:
-                signal = self.analyze(period_df, symbol)
-                signals.append(signal)
-            except:
-                continue
+        series = self.analyze_series(df, symbol, start=len(df) - lookback_periods + 1)
                 
-        if not signals:
+        if not len(series):
             return stats
             
         # Calculate statistics
-        stats['total_signals'] = len(signals)
-        stats['buy_signals'] = sum(1 for s in signals 
-                                  if s.signal in [SignalStrength.BUY, SignalStrength.STRONG_BUY])
-        stats['sell_signals'] = sum(1 for s in signals 
-                                   if s.signal in [SignalStrength.SELL, SignalStrength.STRONG_SELL])
-        stats['neutral_signals'] = sum(1 for s in signals 
-                                      if s.signal == SignalStrength.NEUTRAL)
+        stats['total_signals'] = len(series)
+        stats['buy_signals'] = int((series.signal > 0).sum())
+        stats['sell_signals'] = int((series.signal < 0).sum())
+        stats['neutral_signals'] = int((series.signal == 0).sum())
         
-        stats['avg_confidence'] = np.mean([s.confidence for s in signals])
-        stats['avg_probability'] = np.mean([s.probability for s in signals])
+        stats['avg_confidence'] = series.confidence.mean()
+        stats['avg_probability'] = series.probability.mean()
         
         # Count signal changes
-        for i in range(1, len(signals)):
-            if signals[i].signal != signals[i-1].signal:
-                stats['signal_changes'] += 1
+        stats['signal_changes'] = int((np.diff(series.signal) != 0).sum())
                 
         # Market condition distribution
-        conditions = [s.market_condition for s in signals]
-        for condition in set(conditions):
-            stats['market_conditions'][condition] = conditions.count(condition) / len(conditions)
+        codes, counts = np.unique(series.market_condition, return_counts=True)
+        for code, n in zip(codes, counts):
+            stats['market_conditions'][SignalSeries.MARKET_CONDITIONS[code]] = float(n / len(series))
             
-        return stats
\ No newline at end of file
+        return stats
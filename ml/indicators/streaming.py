@@ -0,0 +1,562 @@
+"""
+Streaming (bar-by-bar) evaluation of the signal engine
+
+Each stream keeps the rolling state its indicator needs and is advanced one
+bar at a time, so evaluating every prefix of a series costs O(1) per bar
+instead of recomputing the indicators over the whole prefix. The rolling
+kernels follow pandas' rolling/ewm algorithms step for step, so streamed
+values equal those of the vectorized code on the same prefix.
+"""
+import math
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .base import Indicator, IndicatorResult, MarketFrame
+from .chaos_indicators import (
+    AlligatorIndicator,
+    AwesomeOscillator,
+    AcceleratorOscillator,
+    FractalsIndicator,
+    WilliamsMFI
+)
+from .elliott_wave import ElliottWaveDetector, _SwingPatternIndex
+from .signal_engine import SignalSeries
+
+
+class RollingMean:
+    """
+    Series.rolling(window).mean() one value at a time
+
+    Same compensated add/remove sums and corrections as pandas' roll_mean.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.nobs = 0
+        self.sum = 0.0
+        self.neg = 0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same = 0
+        self.prev = None
+
+    def push(self, x: float) -> float:
+        """Add the next value and return the mean of the current window"""
+        if len(self.values) == self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                y = -old - self.comp_remove
+                t = self.sum + y
+                self.comp_remove = t - self.sum - y
+                self.sum = t
+                if math.copysign(1.0, old) < 0:
+                    self.neg -= 1
+        self.values.append(x)
+        if x == x:
+            self.nobs += 1
+            y = x - self.comp_add
+            t = self.sum + y
+            self.comp_add = t - self.sum - y
+            self.sum = t
+            if math.copysign(1.0, x) < 0:
+                self.neg += 1
+            self.same = self.same + 1 if self.prev is not None and x == self.prev else 1
+            self.prev = x
+        return self.value
+
+    @property
+    def value(self) -> float:
+        """Mean of the current window (NaN until it holds window observations)"""
+        if self.nobs < self.window or self.nobs == 0:
+            return np.nan
+        result = self.sum / self.nobs
+        if self.same >= self.nobs:
+            return self.prev
+        if self.neg == 0 and result < 0:
+            return 0.0
+        if self.neg == self.nobs and result > 0:
+            return 0.0
+        return result
+
+
+class RollingVar:
+    """
+    Series.rolling(window).var() one value at a time
+
+    Same compensated Welford updates as pandas' roll_var.
+    """
+
+    def __init__(self, window: int, ddof: int = 1):
+        self.window = window
+        self.ddof = ddof
+        self.values = deque()
+        self.nobs = 0
+        self.mean = 0.0
+        self.ssq = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same = 0
+        self.prev = None
+
+    def push(self, x: float) -> float:
+        """Add the next value and return the variance of the current window"""
+        if len(self.values) == self.window:
+            old = self.values.popleft()
+            if old == old:
+                self.nobs -= 1
+                if self.nobs:
+                    prev_mean = self.mean - self.comp_remove
+                    y = old - self.comp_remove
+                    t = y - self.mean
+                    self.comp_remove = t + self.mean - y
+                    self.mean = self.mean - t / self.nobs
+                    self.ssq = self.ssq - (old - prev_mean) * (old - self.mean)
+                else:
+                    self.mean = 0.0
+                    self.ssq = 0.0
+        self.values.append(x)
+        if x == x:
+            self.nobs += 1
+            self.same = self.same + 1 if self.prev is not None and x == self.prev else 1
+            self.prev = x
+            prev_mean = self.mean - self.comp_add
+            y = x - self.comp_add
+            t = y - self.mean
+            self.comp_add = t + self.mean - y
+            self.mean = self.mean + t / self.nobs
+            self.ssq = self.ssq + (x - prev_mean) * (x - self.mean)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        """Variance of the current window (NaN until it holds window observations)"""
+        if self.nobs < self.window or self.nobs <= self.ddof:
+            return np.nan
+        if self.nobs == 1 or self.same >= self.nobs:
+            return 0.0
+        return self.ssq / (self.nobs - self.ddof)
+
+    @property
+    def std(self) -> float:
+        """Standard deviation, clipped at zero like pandas"""
+        var = self.value
+        return 0.0 if var < 0 else math.sqrt(var) if var == var else np.nan
+
+
+class Ewm:
+    """Series.ewm(span=span).mean() (adjust=True) one value at a time"""
+
+    def __init__(self, span: float):
+        self.decay = 1.0 - 1.0 / (1.0 + (span - 1) / 2.0)
+        self.value = np.nan
+        self.old_weight = 1.0
+
+    def push(self, x: float) -> float:
+        """Add the next value and return the weighted mean so far"""
+        if self.value != self.value:
+            if x == x:
+                self.value = x
+                self.old_weight = 1.0
+            return self.value
+        self.old_weight *= self.decay
+        if x == x:
+            if self.value != x:
+                self.value = (self.old_weight * self.value + x) / (self.old_weight + 1.0)
+            self.old_weight += 1.0
+        return self.value
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Series(values).rolling(window).mean() for short arrays, without building a Series"""
+    mean = RollingMean(window)
+    return np.array([mean.push(x) for x in values])
+
+
+def sample_std(values: np.ndarray) -> float:
+    """Series.std() of NaN-free values (two-pass, ddof=1, as pandas computes it)"""
+    count = len(values)
+    if count < 2:
+        return np.nan
+    mean = values.sum(dtype=np.float64) / count
+    return np.sqrt(((mean - values) ** 2).sum(dtype=np.float64) / (count - 1))
+
+
+class BarBuffer:
+    """
+    Append-only OHLCV bars exposing the MarketFrame array accessors
+
+    Column views (high, low, close, ...) cover the bars appended so far and
+    are only valid until the next append. index is a list of bar times.
+    """
+
+    COLUMNS = MarketFrame.REQUIRED_COLUMNS
+
+    def __init__(self, capacity: int = 1024):
+        self._data = np.empty((len(self.COLUMNS), capacity))
+        self._len = 0
+        self.index: List = []
+
+    def append(self, time, open: float, high: float, low: float, close: float,
+               volume: float = 0.0):
+        values = (open, high, low, close, volume)
+        if any(v != v for v in values):
+            raise ValueError(f"Streams need complete bars, got NaN at {time}")
+        if self._len == self._data.shape[1]:
+            grown = np.empty((len(self.COLUMNS), max(2 * self._len, 64)))
+            grown[:, :self._len] = self._data
+            self._data = grown
+        self._data[:, self._len] = values
+        self.index.append(time)
+        self._len += 1
+
+    @classmethod
+    def from_arrays(cls, index: List, values: np.ndarray) -> 'BarBuffer':
+        """Buffer holding the bars already appended, given as times and (n, 5) OHLCV rows"""
+        buffer = cls(max(2 * len(index), 64))
+        buffer._data[:, :len(index)] = np.asarray(values, dtype=np.float64).T
+        buffer._len = len(index)
+        buffer.index = list(index)
+        return buffer
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._data[0, :self._len]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._data[1, :self._len]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._data[2, :self._len]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._data[3, :self._len]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._data[4, :self._len]
+
+    def frame(self) -> MarketFrame:
+        """MarketFrame over all bars so far (copies; O(n))"""
+        epoch = pd.DatetimeIndex(self.index).asi8
+        return MarketFrame.from_arrays(epoch, *self._data[:, :self._len].copy(),
+                                       dtype=np.float64)
+
+
+class IndicatorStream:
+    """
+    Incremental state for one indicator
+
+    push() is called once per bar after the bar is appended to the buffer;
+    result() returns what indicator.calculate would on the bars so far.
+    This base class recomputes over the whole buffer, for indicators
+    without a dedicated stream.
+    """
+
+    def __init__(self, indicator: Indicator):
+        self.indicator = indicator
+
+    def push(self, bars: BarBuffer):
+        pass
+
+    def result(self, bars: BarBuffer, symbol: str) -> Optional[IndicatorResult]:
+        return self.indicator.calculate(bars.frame(), symbol)
+
+
+class _SmmaLine:
+    """One shifted Alligator line"""
+
+    def __init__(self, period: int, shift: int):
+        self.period = period
+        self.seed: List[float] = []
+        self.value = np.nan
+        self.history = deque(maxlen=shift + 1)
+
+    def push(self, x: float):
+        if len(self.seed) < self.period:
+            self.seed.append(x)
+            if len(self.seed) == self.period:
+                self.value = np.array(self.seed).mean()
+        else:
+            self.value = (self.value * (self.period - 1) + x) / self.period
+        self.history.append(self.value)
+
+    @property
+    def shifted(self) -> float:
+        return self.history[0] if len(self.history) == self.history.maxlen else np.nan
+
+
+class _AlligatorStream(IndicatorStream):
+
+    def __init__(self, indicator: AlligatorIndicator):
+        super().__init__(indicator)
+        self.jaw = _SmmaLine(indicator.jaw_period, indicator.jaw_shift)
+        self.teeth = _SmmaLine(indicator.teeth_period, indicator.teeth_shift)
+        self.lips = _SmmaLine(indicator.lips_period, indicator.lips_shift)
+
+    def push(self, bars: BarBuffer):
+        median = (bars.high[-1] + bars.low[-1]) / 2
+        for line in (self.jaw, self.teeth, self.lips):
+            line.push(median)
+
+    def result(self, bars: BarBuffer, symbol: str) -> IndicatorResult:
+        return self.indicator._result(symbol, bars.close[-1], self.jaw.shifted,
+                                      self.teeth.shifted, self.lips.shifted)
+
+
+class _AwesomeStream(IndicatorStream):
+
+    def __init__(self, indicator: AwesomeOscillator):
+        super().__init__(indicator)
+        self.fast = RollingMean(indicator.fast_period)
+        self.slow = RollingMean(indicator.slow_period)
+        self.recent = deque(maxlen=20)
+
+    def push(self, bars: BarBuffer):
+        median = (bars.high[-1] + bars.low[-1]) / 2
+        self.recent.append(self.fast.push(median) - self.slow.push(median))
+
+    def result(self, bars: BarBuffer, symbol: str) -> IndicatorResult:
+        return self.indicator._result(symbol, np.array(self.recent), bars.close[-1])
+
+
+class _AcceleratorStream(IndicatorStream):
+
+    def __init__(self, indicator: AcceleratorOscillator):
+        super().__init__(indicator)
+        self.fast = RollingMean(indicator.ao_fast)
+        self.slow = RollingMean(indicator.ao_slow)
+        self.ao_mean = RollingMean(indicator.ac_period)
+        self.ao = np.nan
+        self.recent = deque(maxlen=5)
+
+    def push(self, bars: BarBuffer):
+        median = (bars.high[-1] + bars.low[-1]) / 2
+        self.ao = self.fast.push(median) - self.slow.push(median)
+        self.recent.append(self.ao - self.ao_mean.push(self.ao))
+
+    def result(self, bars: BarBuffer, symbol: str) -> IndicatorResult:
+        return self.indicator._result(symbol, np.array(self.recent), self.ao, bars.close[-1])
+
+
+class _FractalsStream(IndicatorStream):
+    """Checks the window centred period // 2 bars back as each bar arrives"""
+
+    def __init__(self, indicator: FractalsIndicator):
+        super().__init__(indicator)
+        self.others = np.arange(indicator.period) != indicator.period // 2
+        self.up: Optional[float] = None
+        self.down: Optional[float] = None
+        self.up_count = 0
+        self.down_count = 0
+
+    def push(self, bars: BarBuffer):
+        period = self.indicator.period
+        if len(bars) < period:
+            return
+        half = period // 2
+        highs, lows = bars.high[-period:], bars.low[-period:]
+        others = self.others
+        if (highs[half] > highs[others]).all():
+            self.up = highs[half]
+            self.up_count += 1
+        if (lows[half] < lows[others]).all():
+            self.down = lows[half]
+            self.down_count += 1
+
+    def result(self, bars: BarBuffer, symbol: str) -> IndicatorResult:
+        return self.indicator._result(symbol, bars.close[-1], self.up, self.down,
+                                      self.up_count, self.down_count)
+
+
+class _MFIStream(IndicatorStream):
+
+    def __init__(self, indicator: WilliamsMFI):
+        super().__init__(indicator)
+        self.recent = deque(maxlen=20)
+
+    def push(self, bars: BarBuffer):
+        self.recent.append((bars.high[-1] - bars.low[-1]) / (bars.volume[-1] + 1))
+
+    def result(self, bars: BarBuffer, symbol: str) -> IndicatorResult:
+        recent = np.array(self.recent)
+        return self.indicator._result(symbol, recent[-1], recent[-2],
+                                      bars.volume[-1], bars.volume[-2],
+                                      bars.close[-1] > bars.close[-2],
+                                      recent.sum() / len(recent))
+
+
+class _ElliottStream(IndicatorStream):
+    """Owns a swing/pattern index over the buffer, updated when a result is needed"""
+
+    def __init__(self, indicator: ElliottWaveDetector):
+        super().__init__(indicator)
+        self.index: Optional[_SwingPatternIndex] = None
+
+    def result(self, bars: BarBuffer, symbol: str) -> IndicatorResult:
+        if self.index is None:
+            self.index = _SwingPatternIndex(self.indicator, bars)
+        self.index.update(bars)
+        return self.indicator._index_result(self.index, symbol, bars)
+
+
+# Streams by exact indicator type; subclasses may override calculate()
+_STREAMS = {
+    AlligatorIndicator: _AlligatorStream,
+    AwesomeOscillator: _AwesomeStream,
+    AcceleratorOscillator: _AcceleratorStream,
+    FractalsIndicator: _FractalsStream,
+    WilliamsMFI: _MFIStream,
+    ElliottWaveDetector: _ElliottStream,
+}
+
+
+def indicator_stream(indicator: Indicator) -> IndicatorStream:
+    """Incremental stream for an indicator (whole-buffer fallback if none exists)"""
+    return _STREAMS.get(type(indicator), IndicatorStream)(indicator)
+
+
+class SignalStream:
+    """
+    SignalEngine.analyze evaluated incrementally over a growing series
+
+    push() appends one bar; signal() returns the CombinedSignal that
+    engine.analyze would return for all bars pushed so far. The engine's
+    enabled indicators and their settings are read when the stream is
+    created. Market volatility uses a running (Welford) standard deviation,
+    which can differ from pandas' two-pass result in the last bits.
+    """
+
+    def __init__(self, engine, symbol: str):
+        self.engine = engine
+        self.symbol = symbol
+        self.bars = BarBuffer()
+        self.configurations = [c for c in engine.configurations if c.enabled]
+        self.streams = [indicator_stream(c.indicator) for c in self.configurations]
+        self.required = engine.get_required_periods()
+
+        # Close-to-close returns: expanding std and mean of the rolling(20) std
+        self._returns = 0
+        self._returns_mean = 0.0
+        self._returns_ssq = 0.0
+        self._rolling_var = RollingVar(20)
+        self._rolling_std_sum = 0.0
+        self._rolling_std_comp = 0.0
+        self._rolling_std_count = 0
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def push(self, time, open: float, high: float, low: float, close: float,
+             volume: float = 0.0):
+        """Advance every indicator by one bar"""
+        bars = self.bars
+        bars.append(time, open, high, low, close, volume)
+        for stream in self.streams:
+            stream.push(bars)
+
+        if len(bars) > 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ret = bars.close[-1] / bars.close[-2] - 1
+            self._returns += 1
+            delta = ret - self._returns_mean
+            self._returns_mean += delta / self._returns
+            self._returns_ssq += delta * (ret - self._returns_mean)
+            self._rolling_var.push(ret)
+            std = self._rolling_var.std
+            if std == std:
+                y = std - self._rolling_std_comp
+                t = self._rolling_std_sum + y
+                self._rolling_std_comp = (t - self._rolling_std_sum) - y
+                self._rolling_std_sum = t
+                self._rolling_std_count += 1
+
+    def signal(self):
+        """Combined signal for the bars pushed so far"""
+        if len(self.bars) < self.required:
+            raise ValueError(f"Insufficient data: need at least {self.required} periods")
+
+        results = []
+        for config, stream in zip(self.configurations, self.streams):
+            result = self._evaluate(config, stream)
+            if result is not None:
+                results.append((config, result))
+
+        if not results:
+            return self.engine._create_neutral_signal(self.symbol)
+
+        volatility = (math.sqrt(self._returns_ssq / (self._returns - 1))
+                      if self._returns > 1 else np.nan)
+        avg_volatility = (self._rolling_std_sum / self._rolling_std_count
+                          if self._rolling_std_count else np.nan)
+        market_condition = self.engine._classify_market(volatility, avg_volatility, results)
+        return self.engine._combined_signal(self.symbol, results, market_condition)
+
+    def _evaluate(self, config, stream: IndicatorStream) -> Optional[IndicatorResult]:
+        """Stream counterpart of SignalEngine._evaluate_indicator"""
+        try:
+            if len(self.bars) < config.indicator.get_required_periods():
+                return None
+            result = stream.result(self.bars, self.symbol)
+            if result and result.confidence >= config.min_confidence:
+                return result
+        except Exception as e:
+            print(f"Error calculating {config.indicator.name}: {e}")
+        return None
+
+
+def stream_series(engine, df: pd.DataFrame, symbol: str,
+                  start: Optional[int] = None) -> SignalSeries:
+    """
+    engine.analyze_series(df, symbol, start) computed with a SignalStream,
+    in time linear in len(df); bars whose analysis fails are left out
+    """
+    required = engine.get_required_periods()
+    start = required if start is None else max(start, required)
+    count = max(len(df) - start + 1, 0)
+
+    signal = np.zeros(count, dtype=np.int8)
+    confidence = np.zeros(count)
+    probability = np.zeros(count)
+    indicators_used = np.zeros(count, dtype=np.int16)
+    condition = np.zeros(count, dtype=np.int8)
+    ok = np.zeros(count, dtype=bool)
+
+    stream = SignalStream(engine, symbol)
+    columns = [df[name].to_numpy(dtype=np.float64) for name in ('open', 'high', 'low', 'close')]
+    volume = (df['volume'].to_numpy(dtype=np.float64) if 'volume' in df.columns
+              else np.zeros(len(df)))
+    for i, time in enumerate(df.index):
+        stream.push(time, columns[0][i], columns[1][i], columns[2][i], columns[3][i], volume[i])
+        row = i + 1 - start
+        if row < 0:
+            continue
+        try:
+            result = stream.signal()
+        except Exception:
+            continue
+        signal[row] = result.signal.value
+        confidence[row] = result.confidence
+        probability[row] = result.probability
+        indicators_used[row] = result.indicators_used
+        condition[row] = SignalSeries.condition_code(result.market_condition)
+        ok[row] = True
+
+    index = df.index[start - 1:len(df)]
+    if not ok.all():
+        index = index[ok]
+        signal, confidence, probability = signal[ok], confidence[ok], probability[ok]
+        indicators_used, condition = indicators_used[ok], condition[ok]
+
+    return SignalSeries(symbol, index, signal, confidence, probability,
+                        indicators_used, condition)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Model Artifacts
+Versioned on-disk format for trained TechnicalPredictor models: scaler
+parameters, flattened tree ensembles and the feature schema as .npy files
+that load memory-mapped, so worker processes share one copy of the pages
+"""
+
+import json
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from tree_ensemble import ARRAY_FIELDS, FlatTreeEnsemble
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 'technical-predictor-model'
+ARTIFACT_VERSION = 1
+CURRENT_FILE = 'CURRENT'
+MANIFEST_FILE = 'manifest.json'
+
+
+class ScalerParams:
+    """StandardScaler.transform from its fitted mean and scale"""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    @classmethod
+    def from_sklearn(cls, scaler) -> 'ScalerParams':
+        n = scaler.n_features_in_
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n)
+        return cls(np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64))
+
+    def transform(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class CompiledModels:
+    """
+    Trained predictor models in flat form
+
+    Exposes scaler / direction_model / price_model with the sklearn methods
+    TechnicalPredictor calls, so prediction code works on either.
+    """
+
+    def __init__(self, scaler: ScalerParams, direction_model: FlatTreeEnsemble,
+                 price_model: FlatTreeEnsemble, feature_names: Sequence[str],
+                 feature_importance: Optional[Dict[str, float]] = None,
+                 metadata: Optional[dict] = None):
+        self.scaler = scaler
+        self.direction_model = direction_model
+        self.price_model = price_model
+        self.feature_names = tuple(feature_names)
+        self.feature_importance = dict(feature_importance or {})
+        self.metadata = dict(metadata or {})
+
+    @classmethod
+    def from_predictor(cls, predictor, metadata: Optional[dict] = None) -> 'CompiledModels':
+        """Compile a trained TechnicalPredictor's sklearn models"""
+        feature_names = getattr(predictor, 'feature_names', None) or tuple(predictor.feature_importance)
+        return cls(
+            ScalerParams.from_sklearn(predictor.scaler),
+            FlatTreeEnsemble.from_sklearn(predictor.direction_model),
+            FlatTreeEnsemble.from_sklearn(predictor.price_model),
+            feature_names,
+            predictor.feature_importance,
+            metadata
+        )
+
+
+def save_model_artifact(models: CompiledModels, root, keep: int = 2) -> Path:
+    """
+    Write models as a new version under root and make it current
+
+    Each save goes to its own directory and the CURRENT pointer file is
+    replaced atomically, so a reader sees either the old or the new model,
+    never a partial one. Older versions beyond `keep` are removed.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    name = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+    staging = root / f".{name}"
+    staging.mkdir()
+
+    components = {}
+    arrays = {'scaler.mean': models.scaler.mean_, 'scaler.scale': models.scaler.scale_}
+    for component in ('direction_model', 'price_model'):
+        ensemble = getattr(models, component)
+        components[component] = ensemble.attributes()
+        for field, array in ensemble.arrays().items():
+            arrays[f"{component}.{field}"] = array
+    for key, array in arrays.items():
+        np.save(staging / f"{key}.npy", np.ascontiguousarray(array))
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'version': ARTIFACT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'feature_names': list(models.feature_names),
+        'feature_importance': {k: float(v) for k, v in models.feature_importance.items()},
+        'components': components,
+        'metadata': models.metadata
+    }
+    with open(staging / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    staging.rename(root / name)
+
+    pointer = root / f".{CURRENT_FILE}.{uuid.uuid4().hex}"
+    pointer.write_text(name)
+    os.replace(pointer, root / CURRENT_FILE)
+
+    _prune_versions(root, name, keep)
+    logger.info(f"Model artifact {name} saved to {root}")
+    return root / name
+
+
+def current_version(root) -> Optional[str]:
+    """Name of the current version under root, or None"""
+    try:
+        return (Path(root) / CURRENT_FILE).read_text().strip() or None
+    except OSError:
+        return None
+
+
+def load_model_artifact(root, mmap: bool = True) -> Optional[CompiledModels]:
+    """Load the current models under root (memory-mapped by default), or None"""
+    version = current_version(root)
+    if version is None:
+        return None
+    directory = Path(root) / version
+    with open(directory / MANIFEST_FILE) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != ARTIFACT_FORMAT or manifest.get('version') != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported model artifact in {directory}: "
+                         f"{manifest.get('format')} v{manifest.get('version')}")
+
+    def load(key):
+        return np.load(directory / f"{key}.npy", mmap_mode='r' if mmap else None)
+
+    ensembles = {}
+    for component, attributes in manifest['components'].items():
+        arrays = {field: load(f"{component}.{field}") for field in ARRAY_FIELDS}
+        ensembles[component] = FlatTreeEnsemble.from_arrays(arrays, attributes)
+
+    metadata = dict(manifest.get('metadata') or {})
+    metadata.setdefault('version', version)
+    return CompiledModels(
+        ScalerParams(load('scaler.mean'), load('scaler.scale')),
+        ensembles['direction_model'],
+        ensembles['price_model'],
+        manifest['feature_names'],
+        manifest.get('feature_importance'),
+        metadata
+    )
+
+
+def _prune_versions(root: Path, current: str, keep: int):
+    versions = sorted(p for p in root.iterdir()
+                      if p.is_dir() and not p.name.startswith('.') and p.name != current)
+    for stale in versions[:max(len(versions) - (keep - 1), 0)]:
+        shutil.rmtree(stale, ignore_errors=True)
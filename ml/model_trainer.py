@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Background Model Training
+Retrains TechnicalPredictor models in a separate process on pooled
+multi-symbol data, validates them and publishes a new model artifact
+"""
+
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def train_model_artifact(frames: Dict[str, pd.DataFrame], model_dir: str,
+                         min_accuracy: float = 0.5, tolerance: float = 0.01,
+                         feature_backend: str = 'numpy', n_jobs: Optional[int] = None,
+                         price_tolerance: float = 0.05) -> dict:
+    """
+    Train on pooled symbols, validate, and save as the current artifact
+
+    Features are computed per symbol (so indicator windows never span two
+    symbols) and pooled in bar-time order; the price model learns returns,
+    so symbols at different price levels share one scale-free target. The
+    new model is published only if its holdout direction accuracy reaches
+    min_accuracy and is no more than `tolerance` below the current model's
+    accuracy on the same holdout, and its price error (relative to the
+    close) is no more than `price_tolerance` (a fraction) above the current
+    model's.
+
+    Runs in a worker process; returns a JSON-friendly summary.
+    """
+    from model_artifact import load_model_artifact, save_model_artifact
+    from technical_predictor import TechnicalPredictor
+    from training_pipeline import TrainingPipeline, TrainingSet
+
+    started = time.time()
+    predictor = TechnicalPredictor(feature_backend=feature_backend, n_jobs=n_jobs)
+    pipeline = TrainingPipeline(predictor)
+    sets = {symbol: pipeline.build(df) for symbol, df in frames.items()}
+    sets = {symbol: s for symbol, s in sets.items() if s is not None}
+    if not sets:
+        return {'published': False, 'reason': 'insufficient data'}
+
+    try:
+        pooled = TrainingSet.concat(list(sets.values()))
+    except ValueError as e:
+        return {'published': False, 'reason': str(e)}
+    if not pipeline.fit(pooled):
+        return {'published': False, 'reason': 'training failed'}
+
+    metrics = dict(predictor.training_metrics, symbols=sorted(sets),
+                   train_seconds=round(time.time() - started, 2))
+    if metrics['direction_accuracy'] < min_accuracy:
+        return dict(metrics, published=False,
+                    reason=f"accuracy {metrics['direction_accuracy']:.3f} below {min_accuracy}")
+
+    # Champion/challenger check on the new holdout
+    _, X_test, _, y_test, _, returns_test = pipeline.split(pooled)
+    current = load_model_artifact(model_dir)
+    if current is not None and current.feature_names == pooled.feature_names:
+        scaled = current.scaler.transform(X_test)
+        labels = current.direction_model.predict(scaled)
+        current_accuracy = float(np.mean(labels == y_test))
+        metrics['current_accuracy'] = current_accuracy
+        if metrics['direction_accuracy'] < current_accuracy - tolerance:
+            return dict(metrics, published=False,
+                        reason=f"accuracy below current model ({current_accuracy:.3f})")
+
+        predicted = current.price_model.predict(scaled)
+        if current.metadata.get('price_target') != 'return':
+            # Models from before return targets predict the price itself
+            predicted = predicted / pooled.close[pooled.mask][-len(X_test):] - 1
+        current_error = float(np.mean(np.abs(predicted - returns_test)))
+        metrics['current_price_mae'] = current_error
+        if metrics['price_mae'] > current_error * (1 + price_tolerance):
+            return dict(metrics, published=False,
+                        reason=f"price error above current model ({current_error:.5f})")
+
+    predictor.compiled_models.metadata.update(
+        trained_at=pd.Timestamp.now().isoformat(), symbols=metrics['symbols'])
+    version = save_model_artifact(predictor.compiled_models, model_dir).name
+    return dict(metrics, published=True, version=version)
+
+
+def train_symbol_artifacts(frames: Dict[str, pd.DataFrame], model_root: str,
+                           cores: Optional[int] = None, min_accuracy: float = 0.5) -> Dict[str, dict]:
+    """
+    Train one model per symbol over a process pool, within a core budget
+
+    Symbols train in parallel worker processes (at most one per symbol) and
+    the remaining cores go to each worker's forest; each symbol's artifact
+    is published under model_root/<symbol>.
+    """
+    from training_pipeline import resolve_cores
+
+    budget = resolve_cores(cores if cores is not None else -1)
+    workers = max(min(len(frames), budget), 1)
+    per_worker = max(budget // workers, 1)
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = {symbol: pool.submit(train_model_artifact, {symbol: df},
+                                       str(Path(model_root) / symbol), min_accuracy,
+                                       n_jobs=per_worker)
+                   for symbol, df in frames.items()}
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                results[symbol] = {'published': False, 'reason': f"training error: {e}"}
+    return results
+
+
+def feature_drift(models, features: pd.DataFrame) -> float:
+    """
+    Mean absolute shift of recent feature means, in training standard deviations
+
+    Uses the scaler parameters stored with the model, so it needs nothing
+    from the training data itself.
+    """
+    if models is None or not len(features) or tuple(features.columns) != models.feature_names:
+        return 0.0
+    recent = features.to_numpy(dtype=np.float64)
+    recent = recent[~np.isnan(recent).any(axis=1)]
+    if not len(recent):
+        return 0.0
+    shift = (recent.mean(axis=0) - models.scaler.mean_) / models.scaler.scale_
+    return float(np.mean(np.abs(shift)))
+
+
+class BackgroundTrainer:
+    """
+    Runs train_model_artifact in a single worker process
+
+    At most one job runs at a time. The caller polls for the result, and on
+    success loads the new artifact; predictions keep using the old models
+    until then.
+    """
+
+    def __init__(self, model_dir: str, min_accuracy: float = 0.5, cores: Optional[int] = None):
+        self.model_dir = str(model_dir)
+        self.min_accuracy = min_accuracy
+        self.cores = cores
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._future: Optional[Future] = None
+        self.last_started: Optional[float] = None
+        self.last_result: Optional[dict] = None
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def submit(self, frames: Dict[str, pd.DataFrame], reason: str = '') -> bool:
+        """Start a training job unless one is already running"""
+        if self.running or not frames:
+            return False
+        if self._executor is None:
+            # spawn: the worker must not inherit the daemon's threads or open handles
+            self._executor = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        logger.info(f"Starting background training on {sorted(frames)} ({reason})")
+        self._future = self._executor.submit(
+            train_model_artifact, frames, self.model_dir, self.min_accuracy, n_jobs=self.cores)
+        self.last_started = time.time()
+        return True
+
+    def poll(self) -> Optional[dict]:
+        """Result of a finished job (once), or None while idle or running"""
+        if self._future is None or not self._future.done():
+            return None
+        future, self._future = self._future, None
+        try:
+            self.last_result = future.result()
+        except Exception as e:
+            self.last_result = {'published': False, 'reason': f"training error: {e}"}
+        return self.last_result
+
+    def wait(self) -> Optional[dict]:
+        """Block until the running job (if any) finishes; returns its result as poll() does"""
+        if self._future is not None:
+            wait([self._future])
+        return self.poll()
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
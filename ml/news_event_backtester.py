@@ -19,6 +19,9 @@ from news_event_trading_suite import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Simulated exit reasons, indexed by the codes _resolve_path_exits returns
+PATH_EXIT_REASONS = ('time_stop', 'stop_loss', 'target_1', 'target_2')
+
 
 class NewsEventBacktester:
     """
@@ -30,9 +33,21 @@ class NewsEventBacktester:
     - Risk-adjusted returns calculation
     - Drawdown analysis
     - Win rate validation
+    - Monte Carlo outcome distributions (monte_carlo_paths > 1)
+    
+    Args:
+        seed: seed for the random generator behind mock events and price
+            paths, for reproducible runs (None = fresh entropy)
+        monte_carlo_paths: price paths simulated per trade; the first one is
+            traded, all of them feed the trade's outcome distribution. Each
+            trade draws from its own child stream, so the traded path (and
+            the headline results) do not depend on the path count
     """
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, monte_carlo_paths: int = 1):
+        self._seed_seq = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self._seed_seq)
+        self.monte_carlo_paths = max(1, int(monte_carlo_paths))
         self.news_trader = NewsEventTradingSuite()
         self.results = {
             'trades': [],
@@ -168,31 +183,32 @@ class NewsEventBacktester:
             else:
                 entry_price -= self.slippage
             
-            # Simulate trade execution
-            trade_result = self._simulate_trade_outcome(
-                signal, entry_price, position_size, df, entry_time
+            # Simulate trade execution over every path at once
+            exit_price, exit_reason, hold_time = self._simulate_trade_outcomes(
+                signal, entry_price, self.monte_carlo_paths
             )
             
-            # Calculate P&L
-            pnl = trade_result['exit_price'] - entry_price
+            # Calculate P&L (per path; the first path is the one traded)
+            pnl = exit_price - entry_price
             if signal.direction.name == 'SELL':
                 pnl = -pnl
             
-            pnl_amount = pnl * position_size - self.commission
+            path_pnl = pnl * position_size - self.commission
+            pnl_amount = float(path_pnl[0])
             
-            return {
+            trade = {
                 'event_type': signal.event.event_type.value,
                 'strategy': signal.strategy.value,
                 'phase': signal.phase.value,
                 'direction': signal.direction.name,
                 'entry_time': entry_time,
                 'entry_price': entry_price,
-                'exit_price': trade_result['exit_price'],
-                'exit_reason': trade_result['exit_reason'],
+                'exit_price': float(exit_price[0]),
+                'exit_reason': PATH_EXIT_REASONS[exit_reason[0]],
                 'position_size': position_size,
                 'pnl': pnl_amount,
                 'pnl_pct': pnl_amount / initial_balance,
-                'hold_time': trade_result['hold_time'],
+                'hold_time': int(hold_time[0]),
                 'initial_balance': initial_balance,
                 'final_balance': initial_balance + pnl_amount,
                 'won': pnl_amount > 0,
@@ -200,14 +216,23 @@ class NewsEventBacktester:
                 'risk_reward': signal.risk_reward
             }
             
+            if len(path_pnl) > 1:
+                trade['monte_carlo'] = self._outcome_distribution(path_pnl, exit_reason, hold_time)
+            
+            return trade
+            
         except Exception as e:
             logger.error(f"Error executing simulated trade: {e}")
             return None
     
-    def _simulate_trade_outcome(self, signal: NewsSignal, entry_price: float,
-                              position_size: float, df: pd.DataFrame,
-                              entry_time: datetime) -> Dict:
-        """Simulate how a trade would have played out"""
+    def _simulate_trade_outcomes(self, signal: NewsSignal, entry_price: float,
+                                 n_paths: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Simulate how a trade would have played out on n_paths price paths
+        
+        Returns per-path exit prices, exit reason codes (PATH_EXIT_REASONS)
+        and hold times in steps.
+        """
         # For demonstration, create a simple simulation
         # In production, would use tick data around news events
         
@@ -216,72 +241,64 @@ class NewsEventBacktester:
         # Simulate price movement (simplified)
         volatility = self._estimate_event_volatility(signal.event.event_type)
         
-        # Generate simulated price path
+        # Generate simulated price paths
         steps = min(max_hold_minutes, 60)  # Maximum 60 steps
-        price_path = self._generate_price_path(entry_price, volatility, steps)
+        trade_rng = np.random.default_rng(self._seed_seq.spawn(1)[0])
+        paths = self._generate_price_paths(entry_price, volatility, steps, n_paths, trade_rng)
         
-        # Check exits
-        for i, price in enumerate(price_path):
-            # Check stop loss
-            if signal.direction.name == 'BUY':
-                if price <= signal.stop_loss:
-                    return {
-                        'exit_price': signal.stop_loss,
-                        'exit_reason': 'stop_loss',
-                        'hold_time': i + 1
-                    }
-                # Check targets
-                if price >= signal.take_profit_1:
-                    return {
-                        'exit_price': signal.take_profit_1,
-                        'exit_reason': 'target_1',
-                        'hold_time': i + 1
-                    }
-                if price >= signal.take_profit_2:
-                    return {
-                        'exit_price': signal.take_profit_2,
-                        'exit_reason': 'target_2',
-                        'hold_time': i + 1
-                    }
-            else:  # SELL
-                if price >= signal.stop_loss:
-                    return {
-                        'exit_price': signal.stop_loss,
-                        'exit_reason': 'stop_loss',
-                        'hold_time': i + 1
-                    }
-                # Check targets
-                if price <= signal.take_profit_1:
-                    return {
-                        'exit_price': signal.take_profit_1,
-                        'exit_reason': 'target_1',
-                        'hold_time': i + 1
-                    }
-                if price <= signal.take_profit_2:
-                    return {
-                        'exit_price': signal.take_profit_2,
-                        'exit_reason': 'target_2',
-                        'hold_time': i + 1
-                    }
-        
-        # Time stop
-        return {
-            'exit_price': price_path[-1],
-            'exit_reason': 'time_stop',
-            'hold_time': len(price_path)
-        }
+        return self._resolve_path_exits(paths, signal.direction.name == 'BUY', signal.stop_loss,
+                                        signal.take_profit_1, signal.take_profit_2)
     
-    def _generate_price_path(self, start_price: float, volatility: float, steps: int) -> List[float]:
-        """Generate a realistic price path for simulation"""
-        prices = [start_price]
+    def _resolve_path_exits(self, paths: np.ndarray, is_long: bool, stop_loss: float,
+                            take_profit_1: float, take_profit_2: float
+                            ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """First step on each path that hits the stop or a target, else a time stop"""
+        if is_long:
+            hits = [paths <= stop_loss, paths >= take_profit_1, paths >= take_profit_2]
+        else:
+            hits = [paths >= stop_loss, paths <= take_profit_1, paths <= take_profit_2]
         
-        for _ in range(steps):
-            # Random walk with volatility
-            change = np.random.normal(0, volatility / np.sqrt(steps))
-            new_price = prices[-1] * (1 + change)
-            prices.append(new_price)
+        # Stop is checked before the targets on the same step
+        codes = np.select(hits, [1, 2, 3], 0)
+        first = np.argmax(codes > 0, axis=1)
+        reason = codes[np.arange(len(paths)), first]
         
-        return prices[1:]  # Exclude start price
+        levels = np.array([np.nan, stop_loss, take_profit_1, take_profit_2])
+        exit_price = np.where(reason > 0, levels[reason], paths[:, -1])
+        hold_time = np.where(reason > 0, first + 1, paths.shape[1])
+        return exit_price, reason, hold_time
+    
+    def _generate_price_paths(self, start_price: float, volatility: float, steps: int,
+                              n_paths: int = 1,
+                              rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Generate random-walk price paths, one row per path (start price excluded)"""
+        rng = self.rng if rng is None else rng
+        scale = volatility / np.sqrt(steps)
+        
+        # Random walk with volatility: each step scales the previous price.
+        # The first path is drawn on its own so it is the same for any n_paths.
+        growth = np.empty((n_paths, steps + 1))
+        growth[:, 0] = start_price
+        growth[:1, 1:] = 1 + rng.normal(0, scale, (1, steps))
+        if n_paths > 1:
+            growth[1:, 1:] = 1 + rng.normal(0, scale, (n_paths - 1, steps))
+        return np.cumprod(growth, axis=1)[:, 1:]
+    
+    def _outcome_distribution(self, path_pnl: np.ndarray, exit_reason: np.ndarray,
+                              hold_time: np.ndarray) -> Dict:
+        """Summarize a trade's simulated outcomes across paths"""
+        percentiles = (5, 25, 50, 75, 95)
+        return {
+            'paths': len(path_pnl),
+            'win_probability': float((path_pnl > 0).mean()),
+            'expected_pnl': float(path_pnl.mean()),
+            'pnl_std': float(path_pnl.std()),
+            'pnl_percentiles': dict(zip((f'p{p}' for p in percentiles),
+                                        np.percentile(path_pnl, percentiles).tolist())),
+            'exit_reasons': {label: float((exit_reason == code).mean())
+                             for code, label in enumerate(PATH_EXIT_REASONS)},
+            'avg_hold_time': float(hold_time.mean())
+        }
     
     def _estimate_event_volatility(self, event_type: NewsEventType) -> float:
         """Estimate volatility for different event types"""
@@ -347,7 +364,7 @@ class NewsEventBacktester:
                 'avg_confidence': np.mean([t['confidence'] for t in event_trades])
             }
         
-        return {
+        results = {
             'summary': {
                 'total_trades': total_trades,
                 'winning_trades': winning_trades,
@@ -372,6 +389,19 @@ class NewsEventBacktester:
             'trades': trades,
             'equity_curve': equity_curve
         }
+        
+        # Monte Carlo expectations, when trades were simulated on many paths
+        distributions = [t['monte_carlo'] for t in trades if 'monte_carlo' in t]
+        if distributions:
+            results['monte_carlo'] = {
+                'paths_per_trade': distributions[0]['paths'],
+                'expected_win_rate': float(np.mean([d['win_probability'] for d in distributions])),
+                'expected_total_pnl': float(sum(d['expected_pnl'] for d in distributions)),
+                'avg_pnl_std': float(np.mean([d['pnl_std'] for d in distributions])),
+                'stop_loss_rate': float(np.mean([d['exit_reasons']['stop_loss'] for d in distributions]))
+            }
+        
+        return results
     
     def _generate_historical_events(self) -> List[NewsEvent]:
         """Generate historical news events for backtesting (mock data)"""
@@ -390,9 +420,9 @@ class NewsEventBacktester:
                     symbol='GBPUSD',
                     release_time=nfp_date,
                     impact_level='high',
-                    forecast=150000 + np.random.randint(-50000, 50000),
-                    previous=140000 + np.random.randint(-30000, 30000),
-                    actual=155000 + np.random.randint(-60000, 60000)
+                    forecast=150000 + int(self.rng.integers(-50000, 50000)),
+                    previous=140000 + int(self.rng.integers(-30000, 30000)),
+                    actual=155000 + int(self.rng.integers(-60000, 60000))
                 ))
             
             # FOMC - Every 6 weeks approximately
@@ -403,9 +433,9 @@ class NewsEventBacktester:
                     symbol='GBPUSD',
                     release_time=fomc_date,
                     impact_level='very_high',
-                    forecast=5.00 + np.random.random() * 0.50,
-                    previous=4.75 + np.random.random() * 0.50,
-                    actual=5.25 + np.random.random() * 0.50
+                    forecast=5.00 + self.rng.random() * 0.50,
+                    previous=4.75 + self.rng.random() * 0.50,
+                    actual=5.25 + self.rng.random() * 0.50
                 ))
             
             current_date += timedelta(days=1)
@@ -464,6 +494,17 @@ EVENT TYPE PERFORMANCE
   P&L: ${perf['total_pnl']:.2f}
   Avg Confidence: {perf['avg_confidence']:.1%}"""
         
+        if 'monte_carlo' in self.results:
+            mc = self.results['monte_carlo']
+            report += f"""
+
+MONTE CARLO ({mc['paths_per_trade']} paths per trade)
+{'-'*30}
+Expected Win Rate: {mc['expected_win_rate']:.1%}
+Expected Total P&L: ${mc['expected_total_pnl']:.2f}
+Avg P&L Std Dev: ${mc['avg_pnl_std']:.2f}
+Stop-Loss Rate: {mc['stop_loss_rate']:.1%}"""
+        
         return report
 
 
@@ -476,8 +517,8 @@ def demonstrate_news_backtesting():
     print("Validating 85%+ Win Rate Claims")
     print("="*60)
     
-    # Create backtester
-    backtester = NewsEventBacktester()
+    # Create backtester (seeded; 500 Monte Carlo paths per trade)
+    backtester = NewsEventBacktester(seed=42, monte_carlo_paths=500)
     
     # Generate test data
     df = generate_test_data('GBPUSD', periods=1000)
@@ -500,6 +541,10 @@ def demonstrate_news_backtesting():
         print(f"Profit Factor: {summary['profit_factor']:.2f}")
         print(f"Max Drawdown: {summary['max_drawdown']:.1%}")
         
+        if 'monte_carlo' in results:
+            mc = results['monte_carlo']
+            print(f"Expected Win Rate ({mc['paths_per_trade']} paths/trade): {mc['expected_win_rate']:.1%}")
+        
         if summary['win_rate'] >= 0.85:
             print(f"\n✅ TARGET ACHIEVED: {summary['win_rate']:.1%} win rate exceeds 85% target!")
         else:
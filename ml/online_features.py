@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Online Feature State
+Maintains the TechnicalPredictor feature set bar by bar, emitting only the
+latest feature row, so live prediction does not recompute the whole history
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from feature_kernel import STAT_WINDOWS, LEVEL_WINDOWS, feature_names
+
+
+class _RollingMoments:
+    """
+    Sliding-window power sums for O(1) mean, variance, skew and kurtosis
+
+    Sums are kept about a shift (re-anchored to the latest value every window
+    updates, recomputing the sums from the buffer) so rounding error stays
+    bounded and prices do not lose precision to cancellation.
+    """
+
+    def __init__(self, window: int, order: int = 2):
+        self.window = window
+        self.order = order
+        self.values = deque(maxlen=window)
+        self.shift = 0.0
+        self.sums = [0.0] * (order + 1)  # sums[k] = sum((x - shift) ** k)
+        self.same_run = 0  # trailing run of identical values
+        self.updates = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.window:
+            self._accumulate(self.values[0], -1.0)
+        if self.values and self.values[-1] == value:
+            self.same_run += 1
+        else:
+            self.same_run = 1
+        self.values.append(value)
+        self._accumulate(value, 1.0)
+
+        self.updates += 1
+        if self.updates % self.window == 0:
+            self._rebase()
+
+    def _accumulate(self, value: float, sign: float):
+        d = value - self.shift
+        power = 1.0
+        for k in range(1, self.order + 1):
+            power *= d
+            self.sums[k] += sign * power
+
+    def _rebase(self):
+        self.shift = self.values[-1]
+        self.sums = [0.0] * (self.order + 1)
+        for value in self.values:
+            self._accumulate(value, 1.0)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    @property
+    def constant(self) -> bool:
+        return self.same_run >= self.window
+
+    def sum(self) -> float:
+        return self.sums[1] + self.window * self.shift
+
+    def mean(self) -> float:
+        return self.shift + self.sums[1] / self.window
+
+    def _central(self):
+        n = self.window
+        m1 = self.sums[1] / n
+        s2 = self.sums[2] / n
+        m2 = s2 - m1 * m1
+        if self.order < 3:
+            return m1, m2, 0.0, 0.0
+        s3 = self.sums[3] / n
+        m3 = s3 - 3 * m1 * s2 + 2 * m1 ** 3
+        m4 = self.sums[4] / n - 4 * m1 * s3 + 6 * m1 * m1 * s2 - 3 * m1 ** 4 if self.order >= 4 else 0.0
+        return m1, m2, m3, m4
+
+    def std(self, ddof: int = 1) -> float:
+        if self.constant:
+            return 0.0
+        m2 = max(self._central()[1], 0.0)
+        n = self.window
+        return math.sqrt(m2 * n / (n - ddof))
+
+    def skew_kurt(self):
+        """Bias-corrected skew and excess kurtosis as pandas computes them"""
+        if self.constant:
+            return 0.0, -3.0
+        _, m2, m3, m4 = self._central()
+        n = float(self.window)
+        if m2 <= 0:
+            return float('nan'), float('nan')
+        skew = math.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+        g2 = m4 / (m2 * m2) - 3.0
+        kurt = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * g2 + 6.0)
+        return skew, kurt
+
+
+class _RollingExtreme:
+    """Rolling max (or min) with a monotonic deque, O(1) amortized per bar"""
+
+    def __init__(self, window: int, is_max: bool):
+        self.window = window
+        self.is_max = is_max
+        self.candidates = deque()  # (bar, value), values monotonic
+        self.count = 0
+
+    def push(self, value: float) -> float:
+        bar = self.count
+        self.count += 1
+        if self.is_max:
+            while self.candidates and self.candidates[-1][1] <= value:
+                self.candidates.pop()
+        else:
+            while self.candidates and self.candidates[-1][1] >= value:
+                self.candidates.pop()
+        self.candidates.append((bar, value))
+        if self.candidates[0][0] <= bar - self.window:
+            self.candidates.popleft()
+        return self.candidates[0][1] if self.count >= self.window else float('nan')
+
+
+class _Ewm:
+    """Exponentially weighted mean with adjust=False and min_periods"""
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.decay = 1.0 - alpha
+        self.min_periods = min_periods
+        self.value = None
+        self.count = 0
+
+    def push(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value = self.alpha * x + self.decay * self.value
+        self.count += 1
+        return self.value if self.count >= self.min_periods else float('nan')
+
+
+class OnlineFeatureState:
+    """
+    Feature state for one price stream
+
+    update() consumes one bar and returns that bar's feature row in
+    feature_names() order, with the same values the batch kernel gives for
+    the last row of the full stream (NaN while indicators warm up).
+    """
+
+    RSI_WINDOW = 14
+    STOCH_WINDOW = 14
+    ADX_WINDOW = 14
+    ATR_WINDOW = 14
+    VWAP_WINDOW = 14
+
+    def __init__(self, has_volume: bool = True, has_spread: bool = False):
+        self.has_volume = has_volume
+        self.has_spread = has_spread
+        self.names = feature_names(has_volume, has_spread)
+        self.bars = 0
+        self.prev_close = float('nan')
+        self.prev_high = float('nan')
+        self.prev_low = float('nan')
+
+        self.sma_20 = _RollingMoments(20, order=2)  # also Bollinger std
+        self.sma_50 = _RollingMoments(50, order=1)
+        self.ema_12 = _Ewm(2.0 / 13, 12)
+        self.ema_26 = _Ewm(2.0 / 27, 26)
+        self.macd_signal = _Ewm(2.0 / 10, 9)
+        self.rsi_up = _Ewm(1.0 / self.RSI_WINDOW, self.RSI_WINDOW)
+        self.rsi_down = _Ewm(1.0 / self.RSI_WINDOW, self.RSI_WINDOW)
+        self.stoch_low = _RollingExtreme(self.STOCH_WINDOW, is_max=False)
+        self.stoch_high = _RollingExtreme(self.STOCH_WINDOW, is_max=True)
+        self.stoch_k = deque(maxlen=3)
+
+        # ADX: Wilder sums of true range and directional movement
+        self.adx_sums = [0.0, 0.0, 0.0]
+        self.adx_seed_dx = []
+        self.adx = 0.0
+
+        self.atr_seed = []
+        self.atr = 0.0
+
+        self.obv = 0.0
+        self.vwap_pv = _RollingMoments(self.VWAP_WINDOW, order=1)
+        self.vwap_volume = _RollingMoments(self.VWAP_WINDOW, order=1)
+
+        self.return_moments = {w: _RollingMoments(w, order=4) for w in STAT_WINDOWS}
+        self.resistance = {w: _RollingExtreme(w, is_max=True) for w in LEVEL_WINDOWS}
+        self.support = {w: _RollingExtreme(w, is_max=False) for w in LEVEL_WINDOWS}
+
+    def update(self, high: float, low: float, close: float, volume: float,
+               bid: float = None, ask: float = None) -> np.ndarray:
+        """Consume one bar and return its feature row"""
+        nan = float('nan')
+        row = []
+        t = self.bars
+        prev_close = self.prev_close
+
+        # Price-based features
+        ratio = close / prev_close if t > 0 else nan
+        returns = ratio - 1.0
+        row += [returns, math.log(ratio) if t > 0 else nan]
+
+        # Trend
+        self.sma_20.push(close)
+        self.sma_50.push(close)
+        sma_20 = self.sma_20.mean() if self.sma_20.full else nan
+        ema_12 = self.ema_12.push(close)
+        ema_26 = self.ema_26.push(close)
+        row += [sma_20, self.sma_50.mean() if self.sma_50.full else nan, ema_12, ema_26]
+
+        # MACD (signal line starts at the first defined MACD value)
+        macd = ema_12 - ema_26
+        macd_signal = self.macd_signal.push(macd) if not math.isnan(macd) else nan
+        row += [macd, macd_signal, macd - macd_signal]
+
+        # RSI
+        diff = close - prev_close if t > 0 else nan
+        up = self.rsi_up.push(diff if diff > 0 else 0.0)
+        down = self.rsi_down.push(-diff if diff < 0 else 0.0)
+        if down == 0:
+            rsi = 100.0
+        elif math.isnan(down):
+            rsi = nan
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + up / down)
+        row.append(rsi)
+
+        # Bollinger Bands
+        if self.sma_20.full:
+            std = self.sma_20.std(ddof=0)
+            bb_high, bb_low = sma_20 + 2 * std, sma_20 - 2 * std
+            band = bb_high - bb_low
+            row += [bb_high, bb_low, sma_20, band / sma_20 * 100,
+                    (close - bb_low) / band if band != 0 else nan]
+        else:
+            row += [nan] * 5
+
+        # Stochastic Oscillator
+        lowest = self.stoch_low.push(low)
+        highest = self.stoch_high.push(high)
+        range_ = highest - lowest
+        numerator = 100 * (close - lowest)
+        if range_ != 0:
+            stoch_k = numerator / range_
+        else:
+            stoch_k = nan if numerator == 0 or math.isnan(numerator) else math.copysign(math.inf, numerator)
+        self.stoch_k.append(stoch_k)
+        stoch_d = sum(self.stoch_k) / 3 if len(self.stoch_k) == 3 else nan
+        row += [stoch_k, stoch_d]
+
+        # ADX / ATR
+        row += self._update_adx(high, low, prev_close, t)
+        row.append(self._update_atr(high, low, prev_close, t))
+
+        # Volume
+        if self.has_volume:
+            self.obv += -volume if close < prev_close else volume
+            self.vwap_pv.push((high + low + close) / 3.0 * volume)
+            self.vwap_volume.push(volume)
+            vwap = self.vwap_pv.sum() / self.vwap_volume.sum() if self.vwap_volume.full else nan
+            row += [self.obv, vwap]
+
+        # Market Microstructure
+        if self.has_spread:
+            spread = ask - bid
+            row += [spread, spread / bid, (bid + ask) * 0.5]
+
+        # Statistical features of returns (the first return is undefined)
+        for window, moments in self.return_moments.items():
+            if t > 0:
+                moments.push(returns)
+            if moments.full:
+                skew, kurt = moments.skew_kurt()
+                row += [moments.std(ddof=1), skew, kurt]
+            else:
+                row += [nan, nan, nan]
+
+        # Support/Resistance
+        for window in LEVEL_WINDOWS:
+            resistance = self.resistance[window].push(high)
+            support = self.support[window].push(low)
+            row += [resistance, support, (resistance - close) / close, (close - support) / close]
+
+        self.bars += 1
+        self.prev_close, self.prev_high, self.prev_low = close, high, low
+        return np.array(row)
+
+    def _update_adx(self, high: float, low: float, prev_close: float, t: int):
+        """ADX, +DI and -DI with the same bar layout as the batch kernel"""
+        w = self.ADX_WINDOW
+        if t == 0:
+            return [0.0, 0.0, 0.0]
+
+        true_range = max(high, prev_close) - min(low, prev_close)
+        up = high - self.prev_high
+        down = self.prev_low - low
+        plus_dm = up if (up > down and up > 0) else 0.0
+        minus_dm = down if (down > up and down > 0) else 0.0
+
+        sums = self.adx_sums
+        if t <= w:
+            sums[0] += true_range
+            sums[1] += plus_dm
+            sums[2] += minus_dm
+            if t < w:
+                return [0.0, 0.0, 0.0]
+        else:
+            decay = 1.0 - 1.0 / w
+            sums[0] = true_range + decay * sums[0]
+            sums[1] = plus_dm + decay * sums[1]
+            sums[2] = minus_dm + decay * sums[2]
+
+        trs, dip, din = sums
+        di_plus = 100 * dip / trs if trs != 0 else 0.0
+        di_minus = 100 * din / trs if trs != 0 else 0.0
+        di_sum = di_plus + di_minus
+        dx = 100 * abs(di_plus - di_minus) / di_sum if di_sum != 0 else 0.0
+
+        if t < 2 * w - 1:
+            self.adx_seed_dx.append(dx)
+        elif t == 2 * w - 1:
+            self.adx_seed_dx.append(dx)
+            self.adx = float(np.mean(self.adx_seed_dx))
+        else:
+            self.adx = (1.0 / w) * dx + ((w - 1) / w) * self.adx
+
+        if t == w:
+            return [0.0, 0.0, 0.0]
+        return [self.adx, di_plus, di_minus]
+
+    def _update_atr(self, high: float, low: float, prev_close: float, t: int) -> float:
+        """Wilder ATR, zero until the first full window"""
+        w = self.ATR_WINDOW
+        true_range = high - low
+        if t > 0:
+            true_range = max(true_range, abs(high - prev_close), abs(low - prev_close))
+        if t < w:
+            self.atr_seed.append(true_range)
+            if t < w - 1:
+                return 0.0
+            self.atr = float(np.mean(self.atr_seed))
+        else:
+            self.atr = (1.0 / w) * true_range + ((w - 1) / w) * self.atr
+        return self.atr
+
+
+class IncrementalFeatureUpdater:
+    """
+    Per-symbol online feature states for live prediction
+
+    Each call feeds only the bars newer than the last one seen for the symbol
+    and returns the latest feature row. The stream is rebuilt from the given
+    frame when it does not continue the previous one (gap, rewrite or reorder):
+    resuming needs a DatetimeIndex and the last OVERLAP_BARS bars seen (times
+    and closes) to reappear unchanged in the frame.
+    """
+
+    OVERLAP_BARS = 5
+
+    def __init__(self):
+        self.states: Dict[str, OnlineFeatureState] = {}
+        self._last_seen: Dict[str, tuple] = {}
+
+    def update(self, symbol: str, df: pd.DataFrame) -> Optional[pd.Series]:
+        """Latest feature row for symbol as a Series named by its bar"""
+        if df.empty:
+            return None
+        state = self.states.get(symbol)
+        start = self._resume_position(symbol, df) if state is not None else None
+        if start is None:
+            state = self.states[symbol] = OnlineFeatureState(
+                has_volume=df['volume'].sum() > 0,
+                has_spread='ask' in df.columns
+            )
+            start = 0
+
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        bid = df['bid'].to_numpy(dtype=np.float64) if state.has_spread else None
+        ask = df['ask'].to_numpy(dtype=np.float64) if state.has_spread else None
+
+        row = None
+        for i in range(start, len(df)):
+            row = state.update(high[i], low[i], close[i], volume[i],
+                               bid[i] if bid is not None else None,
+                               ask[i] if ask is not None else None)
+        if row is None:
+            row = self._last_seen[symbol][2]
+
+        tail = max(len(df) - self.OVERLAP_BARS, 0)
+        self._last_seen[symbol] = (df.index[tail:], close[tail:], row)
+        return pd.Series(row, index=state.names, name=df.index[-1])
+
+    def _resume_position(self, symbol: str, df: pd.DataFrame) -> Optional[int]:
+        """Position of the first unseen bar, or None if df does not extend the stream"""
+        last_times, last_closes, _ = self._last_seen[symbol]
+        if not isinstance(df.index, pd.DatetimeIndex) or not isinstance(last_times, pd.DatetimeIndex) \
+                or not df.index.is_monotonic_increasing:
+            return None
+        end = df.index.searchsorted(last_times[-1], side='right')
+        start = end - len(last_times)
+        if start < 0 or not df.index[start:end].equals(last_times):
+            return None
+        if not np.array_equal(df['close'].to_numpy(dtype=np.float64)[start:end], last_closes):
+            return None
+        return end
+
+    def reset(self, symbol: str = None):
+        """Drop state for one symbol, or for all"""
+        if symbol is None:
+            self.states.clear()
+            self._last_seen.clear()
+        else:
+            self.states.pop(symbol, None)
+            self._last_seen.pop(symbol, None)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep Engine
+Runs SignalBacktester over a grid or random sample of weight / risk
+parameters in a process pool, with the market data in shared memory
+"""
+
+import itertools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from checkpoint import (CheckpointJournal, data_fingerprint, load_checkpoint, remove_checkpoint,
+                        save_checkpoint)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARAMS = {
+    'position_size': 0.02,
+    'stop_loss': 0.02,
+    'take_profit': 0.04,
+    'min_probability': 60
+}
+WEIGHT_PREFIX = 'weights.'
+METRIC_FIELDS = ('total_return_pct', 'win_rate', 'profit_factor', 'sharpe_ratio',
+                 'max_drawdown_pct', 'total_trades')
+
+
+def grid_space(space: Dict[str, Sequence]) -> List[dict]:
+    """
+    Every combination of the listed values
+
+    Keys are backtest parameters (see DEFAULT_PARAMS) or 'weights.<indicator>'
+    for a single indicator weight.
+    """
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_space(space: Dict[str, Sequence], n: int, seed: Optional[int] = None) -> List[dict]:
+    """
+    n random configurations: a (low, high) tuple samples uniformly, a list
+    picks one of its values
+    """
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(n):
+        config = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                config[key] = float(rng.uniform(*values))
+            else:
+                config[key] = values[int(rng.integers(len(values)))]
+        configs.append(config)
+    return configs
+
+
+def expand_params(config: dict) -> dict:
+    """Backtest parameters for a config: defaults, plus weights collected into one dict"""
+    params = dict(DEFAULT_PARAMS)
+    weights = dict(config.get('weights') or {})
+    for key, value in config.items():
+        if key.startswith(WEIGHT_PREFIX):
+            weights[key[len(WEIGHT_PREFIX):]] = value
+        elif key != 'weights':
+            params[key] = value
+    params['weights'] = weights
+    return params
+
+
+def make_backtester(params: dict, initial_capital: float = 10000.0):
+    """SignalBacktester set up with expanded parameters"""
+    from backtester import SignalBacktester
+    from indicators.signal_engine import SignalEngine
+
+    backtester = SignalBacktester(
+        signal_engine=SignalEngine(custom_weights=params['weights'] or None),
+        initial_capital=initial_capital)
+    backtester.position_size = params['position_size']
+    backtester.stop_loss_pct = params['stop_loss']
+    backtester.take_profit_pct = params['take_profit']
+    backtester.min_probability = params['min_probability']
+    return backtester
+
+
+def run_backtest(df: pd.DataFrame, config: dict, symbol: str = 'UNKNOWN',
+                 initial_capital: float = 10000.0):
+    """Run one SignalBacktester configuration over df"""
+    return make_backtester(expand_params(config), initial_capital).run(df, symbol=symbol)
+
+
+def reweight_sweep(df: pd.DataFrame, configs: Sequence[dict], symbol: str = 'UNKNOWN',
+                   initial_capital: float = 10000.0, panel=None) -> 'ResultTable':
+    """
+    Backtest many configs from one pass of indicator evaluation
+
+    Indicators are evaluated once per bar into an IndicatorPanel (or the
+    given panel is reused); each config then only re-combines the stored
+    indicator outputs under its weights and replays the trades, a few
+    milliseconds per config. Results match run_backtest.
+    """
+    from indicators.signal_engine import SignalEngine
+
+    if panel is None:
+        panel = SignalEngine().precompute(df, symbol)
+    params = [expand_params(config) for config in configs]
+    series = panel.combine_many([p['weights'] for p in params])
+
+    table = ResultTable()
+    for config_id, (config, p, signals) in enumerate(zip(configs, params, series)):
+        result = make_backtester(p, initial_capital).run_series(df, signals, symbol)
+        table.append(dict(result_row(config, result), config_id=config_id))
+    return table
+
+
+class SharedFrame:
+    """
+    Numeric columns and index of a DataFrame in one shared memory block
+
+    Workers attach by name and wrap the block as a read-only DataFrame, so
+    the data is neither pickled nor copied per worker.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        columns = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        values = df[columns].to_numpy(dtype=np.float64).T
+        is_time = isinstance(df.index, pd.DatetimeIndex)
+        index_bytes = 8 * len(df) if is_time else 0
+        self._shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes + index_bytes, 1))
+        np.ndarray(values.shape, dtype=np.float64, buffer=self._shm.buf)[:] = values
+        if is_time:
+            np.ndarray(len(df), dtype=np.int64, buffer=self._shm.buf,
+                       offset=values.nbytes)[:] = df.index.asi8
+        self.spec = {
+            'name': self._shm.name,
+            'columns': columns,
+            'rows': len(df),
+            'index_is_time': is_time,
+            'index_tz': str(df.index.tz) if is_time and df.index.tz else '',
+            # Non-time indexes are small enough to send along
+            'index': None if is_time else df.index
+        }
+
+    @staticmethod
+    def attach(spec: dict):
+        """(SharedMemory handle, DataFrame view); keep the handle alive while using the frame"""
+        shm = shared_memory.SharedMemory(name=spec['name'])
+        rows, columns = spec['rows'], spec['columns']
+        values = np.ndarray((len(columns), rows), dtype=np.float64, buffer=shm.buf)
+        values.flags.writeable = False
+        if spec['index_is_time']:
+            stamps = np.ndarray(rows, dtype=np.int64, buffer=shm.buf, offset=values.nbytes)
+            index = pd.DatetimeIndex(stamps.view('datetime64[ns]'))
+            if spec['index_tz']:
+                index = index.tz_localize('UTC').tz_convert(spec['index_tz'])
+        else:
+            index = spec['index']
+        return shm, pd.DataFrame(values.T, index=index, columns=columns, copy=False)
+
+    def close(self):
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Per-process state of sweep workers
+_worker_shm = None
+_worker_frame = None
+
+
+def _attach_worker(spec: dict, log_level: int):
+    global _worker_shm, _worker_frame
+    logging.getLogger('backtester').setLevel(log_level)
+    _worker_shm, _worker_frame = SharedFrame.attach(spec)
+
+
+def _run_worker(config_id: int, config: dict, symbol: str, initial_capital: float,
+                keep_result: bool):
+    result = run_backtest(_worker_frame, config, symbol, initial_capital)
+    return config_id, result_row(config, result), result if keep_result else None
+
+
+def result_row(config: dict, result) -> dict:
+    """Flat record of a config's parameters and headline metrics"""
+    row = {key: value for key, value in config.items() if key != 'weights'}
+    for name, weight in (config.get('weights') or {}).items():
+        row[f"{WEIGHT_PREFIX}{name}"] = weight
+    for field in METRIC_FIELDS:
+        row[field] = getattr(result, field)
+    return row
+
+
+class ResultTable:
+    """Sweep results held column by column as they arrive"""
+
+    def __init__(self):
+        self.columns: Dict[str, list] = {}
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def append(self, row: dict):
+        for key in row:
+            if key not in self.columns:
+                self.columns[key] = [None] * self._rows
+        for key, values in self.columns.items():
+            values.append(row.get(key))
+        self._rows += 1
+
+    def column(self, name: str) -> np.ndarray:
+        return np.asarray(self.columns[name])
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
+
+    def best(self, metric: str = 'sharpe_ratio') -> dict:
+        """Row with the highest value of metric"""
+        i = int(np.nanargmax(self.column(metric).astype(np.float64)))
+        return {key: values[i] for key, values in self.columns.items()}
+
+
+class ParameterSweep:
+    """
+    Backtests many configurations of one dataset over a process pool
+
+    Args:
+        df: OHLCV data shared by every run
+        symbol: symbol passed to the backtester
+        workers: process count (None or -1: all cores)
+        initial_capital: starting capital of each run
+        checkpoint_path: where run() saves the finished rows, so resume()
+            can skip them after an interruption
+        checkpoint_every: finished runs between checkpoints
+    """
+
+    def __init__(self, df: pd.DataFrame, symbol: str = 'UNKNOWN',
+                 workers: Optional[int] = None, initial_capital: float = 10000.0,
+                 checkpoint_path: Optional[str] = None, checkpoint_every: int = 10):
+        from training_pipeline import resolve_cores
+
+        self.df = df
+        self.symbol = symbol
+        self.workers = resolve_cores(workers if workers is not None else -1)
+        self.initial_capital = initial_capital
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+
+    def iter_results(self, configs: Sequence[dict], keep_results: bool = False,
+                     done: Sequence[int] = ()) -> Iterator[tuple]:
+        """
+        Yield (config_id, row, BacktestResult or None) as runs finish, in
+        completion order, skipping the config ids in done
+        """
+        done = set(done)
+        pending = [(i, config) for i, config in enumerate(configs) if i not in done]
+        if not pending:
+            return
+        with SharedFrame(self.df) as shared:
+            # spawn: workers start clean and attach to the shared block once
+            with ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(pending)),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_attach_worker,
+                    initargs=(shared.spec, logging.WARNING)) as pool:
+                futures = [pool.submit(_run_worker, i, config, self.symbol,
+                                       self.initial_capital, keep_results)
+                           for i, config in pending]
+                for future in as_completed(futures):
+                    yield future.result()
+
+    def run(self, configs: Sequence[dict], keep_results: bool = False):
+        """
+        Run every config, appending rows (with a config_id column) to a
+        ResultTable as runs finish; with keep_results, also returns
+        {config_id: BacktestResult}
+        """
+        return self._run(configs, keep_results)
+
+    def resume(self, configs: Sequence[dict], keep_results: bool = False):
+        """
+        Finish an interrupted run() of the same configs: rows saved at its
+        last checkpoint are kept and only the remaining configs are run
+        """
+        return self._run(configs, keep_results, self._load_checkpoint(configs, keep_results))
+
+    def _fingerprint(self, configs: Sequence[dict], keep_results: bool) -> str:
+        return data_fingerprint(self.df, self.symbol, self.initial_capital,
+                                list(configs), keep_results)
+
+    def _load_checkpoint(self, configs: Sequence[dict], keep_results: bool) -> Optional[dict]:
+        if not self.checkpoint_path:
+            return None
+        return load_checkpoint(self.checkpoint_path, type(self).__name__,
+                               self._fingerprint(configs, keep_results))
+
+    def _run(self, configs: Sequence[dict], keep_results: bool, state: Optional[dict] = None):
+        fingerprint = self._fingerprint(configs, keep_results) if self.checkpoint_path else None
+        # Rows and results only grow, so they go to the journal, not the checkpoint
+        journal = (CheckpointJournal(self.checkpoint_path, ('rows', 'results'))
+                   if fingerprint else None)
+        if state:
+            records = journal.restore(state['journal'])
+            rows, finished = records['rows'], records['results']
+            logger.info(f"Resuming sweep with {len(rows)}/{len(configs)} configs done")
+        else:
+            rows, finished = [], []
+            if journal is not None:
+                journal.start()
+
+        table = ResultTable()
+        for row in rows:
+            table.append(row)
+        done = [row['config_id'] for row in rows]
+        for config_id, row, result in self.iter_results(configs, keep_results, done):
+            row = dict(row, config_id=config_id)
+            table.append(row)
+            rows.append(row)
+            if result is not None:
+                finished.append((config_id, result))
+            logger.info(f"Sweep {len(table)}/{len(configs)}: config {config_id} "
+                        f"sharpe={row['sharpe_ratio']:.2f} return={row['total_return_pct']:.2f}%")
+            if fingerprint and len(rows) % self.checkpoint_every == 0:
+                save_checkpoint(self.checkpoint_path, type(self).__name__, fingerprint,
+                                {'journal': journal.append({'rows': rows, 'results': finished})})
+        if fingerprint:
+            remove_checkpoint(self.checkpoint_path)
+        results = dict(finished)
+        return (table, results) if keep_results else table
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Portfolio Backtester
+Trades a basket of symbols from one account: per-symbol signals are
+computed in parallel workers, then every symbol's bars are replayed on a
+single time-ordered clock against a shared position book
+"""
+
+import copy
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtester import Trade
+from exit_kernel import max_adverse_excursion, resolve_exits
+from indicators.signal_engine import SignalEngine, SignalSeries, SignalStrength
+from indicators.streaming import stream_series
+
+logger = logging.getLogger(__name__)
+
+BUY_SIGNALS = (SignalStrength.STRONG_BUY.value, SignalStrength.BUY.value)
+SELL_SIGNALS = (SignalStrength.STRONG_SELL.value, SignalStrength.SELL.value)
+
+
+@dataclass
+class PortfolioResult:
+    """Results from a portfolio backtest run"""
+    start_date: datetime
+    end_date: datetime
+    symbols: List[str]
+    initial_capital: float
+    final_capital: float
+    total_return: float
+    total_return_pct: float
+    trades: List[Trade]
+    win_rate: float
+    profit_factor: float
+    sharpe_ratio: float
+    max_drawdown_pct: float
+    total_trades: int
+    max_concurrent_positions: int
+    symbol_performance: Dict[str, Dict]
+    equity_curve: pd.Series = field(repr=False)
+
+
+def _series_worker(engine: SignalEngine, symbol: str, df: pd.DataFrame):
+    return symbol, stream_series(engine, df, symbol)
+
+
+class _Book:
+    """Bar columns, signal rows and exit plan of one symbol"""
+
+    __slots__ = ('symbol', 'close', 'high', 'low', 'index', 'rows', 'series',
+                 'entry_bar', 'exit_bar', 'exit_reason')
+
+    def __init__(self, symbol: str, df: pd.DataFrame, series: SignalSeries):
+        self.symbol = symbol
+        self.close = df['close'].to_numpy(dtype=np.float64)
+        self.high = df['high'].to_numpy(dtype=np.float64)
+        self.low = df['low'].to_numpy(dtype=np.float64)
+        self.index = df.index
+        self.rows = series.index.get_indexer(df.index)  # -1: no signal for the bar
+        self.series = series
+        self.entry_bar = 0
+        self.exit_bar = -1
+        self.exit_reason = ''
+
+
+class PortfolioBacktester:
+    """
+    Multi-symbol backtester with one account and one position book
+
+    Entry, exit and sizing rules follow SignalBacktester, applied per symbol
+    with at most one position per symbol and max_positions across the
+    basket; sizing risks position_size of the shared realized capital.
+    Bars of all symbols are merged in time order (ties in symbol order) and
+    equity is marked once per timestamp.
+
+    Args:
+        signal_engine: engine whose indicator weights every symbol uses
+        initial_capital: starting capital of the account
+        workers: processes computing per-symbol signals (None or -1: all cores)
+    """
+
+    def __init__(self, signal_engine: Optional[SignalEngine] = None,
+                 initial_capital: float = 10000.0, workers: Optional[int] = None):
+        from training_pipeline import resolve_cores
+
+        self.signal_engine = signal_engine or SignalEngine()
+        self.initial_capital = initial_capital
+        self.workers = resolve_cores(workers if workers is not None else -1)
+
+        # Risk management parameters
+        self.position_size = 0.02  # 2% of capital per trade
+        self.stop_loss_pct = 0.02   # 2% stop loss
+        self.take_profit_pct = 0.04 # 4% take profit
+        self.min_probability = 60   # Minimum signal probability (%) to enter
+        self.max_positions = 5      # Maximum concurrent positions across the basket
+
+    def compute_signals(self, data: Dict[str, pd.DataFrame]) -> Dict[str, SignalSeries]:
+        """Per-bar signals of every symbol, one symbol per worker process"""
+        # Each symbol gets its own copy of the engine (and its market state)
+        if self.workers == 1 or len(data) == 1:
+            return {symbol: _series_worker(copy.deepcopy(self.signal_engine), symbol, df)[1]
+                    for symbol, df in data.items()}
+
+        signals = {}
+        # spawn: workers start clean, as in ParameterSweep
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(data)),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(_series_worker, self.signal_engine, symbol, df)
+                       for symbol, df in data.items()]
+            for future in as_completed(futures):
+                symbol, series = future.result()
+                signals[symbol] = series
+                logger.info(f"Signals ready for {symbol} ({len(signals)}/{len(data)})")
+        return signals
+
+    def run(self, data: Dict[str, pd.DataFrame],
+            signals: Optional[Dict[str, SignalSeries]] = None) -> PortfolioResult:
+        """
+        Backtest the basket in data ({symbol: OHLC DataFrame}); signals
+        from compute_signals (or an earlier run) skip the indicator pass
+
+        Every frame needs a DatetimeIndex, since bars of all symbols are
+        merged onto one clock by timestamp; otherwise ValueError is raised.
+        """
+        symbols = list(data)
+        untimed = [symbol for symbol in symbols
+                   if not isinstance(data[symbol].index, pd.DatetimeIndex)]
+        if untimed:
+            raise ValueError(f"Portfolio backtests need a DatetimeIndex on every frame; "
+                             f"missing for {', '.join(map(str, untimed))}")
+        logger.info(f"Starting portfolio backtest for {len(symbols)} symbols")
+        if signals is None:
+            signals = self.compute_signals(data)
+        books = [_Book(symbol, data[symbol], signals[symbol]) for symbol in symbols]
+
+        # Unified clock: every tradable bar of every symbol, in time order
+        start = self.signal_engine.get_required_periods()
+        times, owners, bars = [], [], []
+        for k, book in enumerate(books):
+            n = max(len(book.close) - start, 0)
+            times.append(book.index.asi8[start:])
+            owners.append(np.full(n, k, dtype=np.int32))
+            bars.append(np.arange(start, start + n))
+        times = np.concatenate(times) if times else np.array([], dtype=np.int64)
+        owners = np.concatenate(owners) if owners else np.array([], dtype=np.int32)
+        bars = np.concatenate(bars) if bars else np.array([], dtype=np.int64)
+        order = np.lexsort((owners, times))
+        times, owners, bars = times[order], owners[order], bars[order]
+
+        self.capital = self.initial_capital
+        self.trades: List[Trade] = []
+        self.positions: Dict[int, Trade] = {}
+        self._max_concurrent = 0
+        last_close = np.full(len(books), np.nan)
+        equity, equity_times = [self.initial_capital], []
+
+        for e in range(len(times)):
+            book = books[owners[e]]
+            k, i = int(owners[e]), int(bars[e])
+            current_time = book.index[i]
+            last_close[k] = book.close[i]
+
+            # Check stop loss and take profit for an open position
+            if k in self.positions and i == book.exit_bar:
+                self._close_position(k, book, i, book.close[i], current_time, book.exit_reason)
+
+            row = book.rows[i]
+            if row >= 0:
+                self._process_signal(k, book, i, row, current_time)
+
+            # Mark equity once every symbol's bar at this time is processed
+            if e + 1 == len(times) or times[e + 1] != times[e]:
+                equity.append(self._equity(last_close))
+                equity_times.append(current_time)
+
+        # Close any open positions at end
+        for k in list(self.positions):
+            book = books[k]
+            self._close_position(k, book, len(book.close) - 1, book.close[-1],
+                                 book.index[-1], 'End of backtest')
+
+        return self._calculate_results(books, equity, equity_times)
+
+    def _process_signal(self, k: int, book: _Book, i: int, row: int, current_time):
+        """Enter or reverse out of the symbol's position on its signal"""
+        series = book.series
+        signal = int(series.signal[row])
+        position = self.positions.get(k)
+
+        if position is None:
+            if series.probability[row] <= self.min_probability or \
+               len(self.positions) >= self.max_positions:
+                return
+            if signal in BUY_SIGNALS:
+                direction = 'long'
+            elif signal in SELL_SIGNALS:
+                direction = 'short'
+            else:
+                return
+            name = SignalStrength(signal).name
+            self._open_position(k, book, i, direction, current_time,
+                                f"{name} (P={series.probability[row]:.1f}%)",
+                                float(series.confidence[row]))
+
+        # Exit on opposite signal
+        elif (position.direction == 'long' and signal in SELL_SIGNALS) or \
+             (position.direction == 'short' and signal in BUY_SIGNALS):
+            self._close_position(k, book, i, book.close[i], current_time,
+                                 SignalStrength(signal).name)
+
+    def _open_position(self, k: int, book: _Book, i: int, direction: str, time,
+                       signal: str, confidence: float):
+        """Open a position on book's symbol at bar i's close"""
+        price = book.close[i]
+        risk_amount = self.capital * self.position_size
+        stop_distance = price * self.stop_loss_pct
+
+        self.positions[k] = Trade(
+            entry_time=time,
+            exit_time=None,
+            symbol=book.symbol,
+            direction=direction,
+            entry_price=price,
+            size=risk_amount / stop_distance,
+            entry_signal=signal,
+            entry_confidence=confidence
+        )
+        self._max_concurrent = max(self._max_concurrent, len(self.positions))
+
+        # Resolve the stop loss / take profit bar once, from this bar's close on
+        long = direction == 'long'
+        if long:
+            stop = price * (1 - self.stop_loss_pct)
+            target = price * (1 + self.take_profit_pct)
+        else:
+            stop = price * (1 + self.stop_loss_pct)
+            target = price * (1 - self.take_profit_pct)
+        plan = resolve_exits(book.close, book.close, book.close, i, long,
+                             price, stop, target, fill='close')
+        book.entry_bar = i
+        book.exit_bar = int(plan.index[0])
+        book.exit_reason = plan.reason_labels()[0]
+
+        logger.debug(f"Opened {direction} {book.symbol} at {price:.5f} - {signal}")
+
+    def _close_position(self, k: int, book: _Book, i: int, price: float, time, reason: str):
+        """Close book's position and book the P&L into the shared capital"""
+        position = self.positions.pop(k)
+        position.max_drawdown = float(max_adverse_excursion(
+            book.high, book.low, book.entry_bar, i,
+            position.direction == 'long', position.entry_price)[0])
+        position.close(price, time)
+        position.exit_signal = reason
+        self.capital += position.pnl
+        self.trades.append(position)
+
+        logger.debug(f"Closed {book.symbol} at {price:.5f} - P&L: {position.pnl:.2f} - {reason}")
+
+    def _equity(self, last_close: np.ndarray) -> float:
+        """Capital plus the unrealized P&L of every open position"""
+        equity = self.capital
+        for k, position in self.positions.items():
+            move = last_close[k] - position.entry_price
+            equity += move * position.size if position.direction == 'long' else -move * position.size
+        return equity
+
+    def _calculate_results(self, books: List[_Book], equity: List[float],
+                           equity_times: list) -> PortfolioResult:
+        """Calculate portfolio statistics"""
+        trades = self.trades
+        starts = [book.index[0] for book in books if len(book.index)]
+        ends = [book.index[-1] for book in books if len(book.index)]
+        winning = [t.pnl for t in trades if t.pnl > 0]
+        losing = [t.pnl for t in trades if t.pnl <= 0]
+
+        total_return = self.capital - self.initial_capital
+        total_losses = abs(sum(losing))
+        profit_factor = (sum(winning) / total_losses if total_losses > 0
+                         else (float('inf') if winning else 0))
+
+        # Sharpe ratio (simplified) and max drawdown of the marked equity
+        equity_series = pd.Series(equity)
+        equity_returns = equity_series.pct_change().dropna()
+        sharpe_ratio = ((equity_returns.mean() / equity_returns.std()) * np.sqrt(252)
+                        if len(equity_returns) > 1 and equity_returns.std() > 0 else 0)
+        rolling_max = equity_series.expanding().max()
+        max_drawdown = abs(((equity_series - rolling_max) / rolling_max).min())
+
+        symbol_performance = {}
+        for book in books:
+            pnl = [t.pnl for t in trades if t.symbol == book.symbol]
+            symbol_performance[book.symbol] = {
+                'trades': len(pnl),
+                'win_rate': sum(p > 0 for p in pnl) / len(pnl) if pnl else 0,
+                'total_pnl': float(sum(pnl))
+            }
+
+        return PortfolioResult(
+            start_date=min(starts) if starts else None,
+            end_date=max(ends) if ends else None,
+            symbols=[book.symbol for book in books],
+            initial_capital=self.initial_capital,
+            final_capital=self.capital,
+            total_return=total_return,
+            total_return_pct=(total_return / self.initial_capital) * 100,
+            trades=trades,
+            win_rate=len(winning) / len(trades) if trades else 0,
+            profit_factor=profit_factor,
+            sharpe_ratio=sharpe_ratio,
+            max_drawdown_pct=max_drawdown * 100,
+            total_trades=len(trades),
+            max_concurrent_positions=self._max_concurrent,
+            symbol_performance=symbol_performance,
+            equity_curve=pd.Series(equity[1:], index=pd.Index(equity_times), name='equity')
+        )
+
+    def print_summary(self, result: PortfolioResult):
+        """Print portfolio backtest summary"""
+        print("\n" + "="*60)
+        print("PORTFOLIO BACKTEST RESULTS")
+        print("="*60)
+        if result.start_date is not None:
+            print(f"Period: {result.start_date.date()} to {result.end_date.date()}")
+        print(f"Symbols: {len(result.symbols)}")
+        print(f"Initial Capital: ${result.initial_capital:,.2f}")
+        print(f"Final Capital: ${result.final_capital:,.2f}")
+        print(f"Total Return: ${result.total_return:,.2f} ({result.total_return_pct:.2f}%)")
+        print(f"\nTotal Trades: {result.total_trades}")
+        print(f"Win Rate: {result.win_rate:.1%}")
+        print(f"Profit Factor: {result.profit_factor:.2f}")
+        print(f"Sharpe Ratio: {result.sharpe_ratio:.2f}")
+        print(f"Max Drawdown: {result.max_drawdown_pct:.2f}%")
+        print(f"Max Concurrent Positions: {result.max_concurrent_positions}")
+
+        print("\n" + "-"*60)
+        print("SYMBOL PERFORMANCE")
+        print("-"*60)
+        for symbol, stats in result.symbol_performance.items():
+            print(f"{symbol:.<15} "
+                  f"Trades: {stats['trades']:>4} "
+                  f"Win Rate: {stats['win_rate']:>6.1%} "
+                  f"P&L: ${stats['total_pnl']:>9.2f}")
+        print("="*60 + "\n")
+
+
+def run_portfolio_example():
+    """Example of backtesting a small basket"""
+    from test_signal_engine import generate_test_data
+
+    symbols = ['EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD']
+    print("Generating test data...")
+    # Staggered histories so the symbols' bars differ on the shared clock
+    data = {symbol: generate_test_data(symbol, periods=1000 - 75 * k)
+            for k, symbol in enumerate(symbols)}
+
+    backtester = PortfolioBacktester(initial_capital=10000)
+    backtester.max_positions = 3
+
+    print("Running portfolio backtest...")
+    result = backtester.run(data)
+    backtester.print_summary(result)
+    return result
+
+
+if __name__ == "__main__":
+    run_portfolio_example()
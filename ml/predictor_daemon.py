@@ -21,10 +21,14 @@ import pandas as pd
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from ml.technical_predictor import TechnicalPredictor, get_realistic_base_price
+from ml.model_trainer import BackgroundTrainer, feature_drift
 
 # Load environment variables
 load_dotenv('ml/.env')
 
+# Current model artifact (see model_artifact)
+MODEL_DIR = Path(os.getenv('MODEL_DIR', 'ml/models/technical'))
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -53,6 +57,17 @@ class PredictorDaemon:
         self.last_predictions = {}
         self.model_trained = False
 
+        # Background retraining: on a schedule, or when features drift from training
+        self.retrain_interval = int(os.getenv('MODEL_RETRAIN_INTERVAL', 24 * 3600))
+        self.drift_threshold = float(os.getenv('MODEL_DRIFT_THRESHOLD', 1.0))
+        self.drift_window = int(os.getenv('MODEL_DRIFT_WINDOW', 100))
+        self.drift_score = 0.0
+        self.next_retrain = 0.0
+        self.retry_after = 0.0
+        self.trainer = BackgroundTrainer(
+            MODEL_DIR, min_accuracy=float(os.getenv('MODEL_MIN_ACCURACY', 0.5)),
+            cores=int(os.getenv('MODEL_TRAIN_CORES', -1)))
+
         # Ensure directories exist
         os.makedirs(self.bridge_data_dir, exist_ok=True)
         os.makedirs(self.predictions_dir, exist_ok=True)
@@ -123,45 +138,89 @@ class PredictorDaemon:
             logger.error(f"Error loading market data for {symbol}: {e}")
             return None
 
-    def train_models_if_needed(self):
-        """Train models on available data if not already trained"""
-        if self.model_trained:
-            return True
-        
-        logger.info("Training prediction models...")
-        
-        # Combine data from all symbols for training
-        all_data = []
+    def collect_training_data(self):
+        """Market data for every symbol with enough history, keyed by symbol"""
+        frames = {}
         for symbol in self.symbols:
             df = self.load_market_data(symbol)
             if df is not None and len(df) > 100:
-                all_data.append(df)
-        
-        if not all_data:
+                frames[symbol] = df
+        return frames
+
+    def train_models_if_needed(self, wait=False):
+        """
+        Start background retraining when there is no model, the schedule is
+        due or features have drifted, and swap in any newly published model.
+        Never blocks the prediction cycle unless wait is set, in which case a
+        job started here is awaited and its model loaded (single runs).
+        """
+        self._apply_training_result(self.trainer.poll())
+
+        if self.trainer.running or time.time() < self.retry_after:
+            return self.model_trained
+
+        if not self.model_trained:
+            reason = 'no model'
+        elif self.drift_score >= self.drift_threshold:
+            reason = f"feature drift {self.drift_score:.2f}"
+        elif time.time() >= self.next_retrain:
+            reason = 'schedule'
+        else:
+            return self.model_trained
+
+        frames = self.collect_training_data()
+        if not frames:
             logger.error("No sufficient data for training")
-            return False
-        
-        # Use the symbol with most data for training
-        training_data = max(all_data, key=len)
-        
+        elif self.trainer.submit(frames, reason):
+            self.drift_score = 0.0
+            if wait:
+                self._apply_training_result(self.trainer.wait())
+        return self.model_trained
+
+    def _apply_training_result(self, result):
+        """Load a newly published model, or back off after a rejected one"""
+        if result is None:
+            return
+        if result.get('published'):
+            self.load_model_state()
+            logger.info(f"Swapped in model {result['version']} "
+                        f"(accuracy {result['direction_accuracy']:.3f}, "
+                        f"{result['samples']} samples from {', '.join(result['symbols'])})")
+        else:
+            # Retry sooner than the schedule, but not every cycle
+            self.retry_after = time.time() + min(self.retrain_interval, 10 * self.poll_interval)
+            logger.warning(f"Retrained model not published: {result.get('reason')}")
+
+    def update_drift(self, market_data):
+        """Track the largest feature drift seen this cycle against the current model"""
+        models = self.predictor.compiled_models
+        if models is None:
+            return
+        recent = market_data.iloc[-(self.drift_window + 100):].copy(deep=False)
+        features = self.predictor.calculate_technical_indicators(recent)
+        self.drift_score = max(self.drift_score,
+                               feature_drift(models, features.iloc[-self.drift_window:]))
+
+    def predict_watchlist(self, market_data):
+        """Candle predictions for every loaded symbol from one batched model pass"""
         try:
-            self.model_trained = self.predictor.train(training_data)
-            if self.model_trained:
-                logger.info("Models trained successfully")
-                # Save model state
-                self.save_model_state()
-            return self.model_trained
+            features, prices = self.predictor.latest_feature_rows(market_data)
+            analyses = {symbol: self.predictor.analyze_signals(market_data[symbol], symbol)
+                        for symbol in features.index}
+            return self.predictor.predict_batch(features, prices, n_candles=5,
+                                                signal_analyses=analyses)
         except Exception as e:
-            logger.error(f"Model training failed: {e}")
-            return False
+            logger.error(f"Batch prediction failed: {e}")
+            return {}
 
-    def generate_predictions(self, symbol, market_data):
-        """Generate predictions for a symbol"""
+    def generate_predictions(self, symbol, market_data, predictions=None):
+        """Generate predictions for a symbol (reusing batch predictions if given)"""
         try:
             logger.info(f"Generating predictions for {symbol}")
 
             # Get predictions
-            predictions = self.predictor.predict_next_candles(market_data, n_candles=5)
+            if predictions is None:
+                predictions = self.predictor.predict_next_candles(market_data, n_candles=5, symbol=symbol)
             
             # Analyze market regime
             regime = self.predictor.analyze_market_regime(market_data)
@@ -226,24 +285,17 @@ class PredictorDaemon:
         except Exception as e:
             logger.error(f"Error saving predictions: {e}")
 
-    def save_model_state(self):
-        """Save trained model state"""
-        try:
-            import pickle
-            model_file = Path('ml/models/technical_model.pkl')
-            with open(model_file, 'wb') as f:
-                pickle.dump({
-                    'predictor': self.predictor,
-                    'trained_at': datetime.now().isoformat(),
-                    'version': '2.0'
-                }, f)
-            logger.info("Model state saved")
-        except Exception as e:
-            logger.error(f"Error saving model: {e}")
-
     def load_model_state(self):
         """Load previously trained model if available"""
         try:
+            if self.predictor.load_model(MODEL_DIR):
+                self.model_trained = True
+                self.next_retrain = time.time() + self.retrain_interval
+                trained_at = self.predictor.compiled_models.metadata.get('trained_at')
+                logger.info(f"Loaded model trained at {trained_at}")
+                return True
+
+            # Models saved before the artifact format
             import pickle
             model_file = Path('ml/models/technical_model.pkl')
             if model_file.exists():
@@ -257,27 +309,32 @@ class PredictorDaemon:
             logger.error(f"Error loading model: {e}")
         return False
 
-    def run_once(self):
-        """Run one prediction cycle"""
+    def run_once(self, wait_for_training=False):
+        """Run one prediction cycle (wait_for_training: see train_models_if_needed)"""
         signals = []
         
-        # Ensure models are trained
+        # Load a saved model, then keep retraining in the background
         if not self.model_trained:
             self.load_model_state()
-            if not self.model_trained:
-                self.train_models_if_needed()
+        self.train_models_if_needed(wait=wait_for_training)
         
+        # Load market data
+        watchlist = {}
         for symbol in self.symbols:
+            market_data = self.load_market_data(symbol)
+            if market_data is None:
+                logger.warning(f"Skipping {symbol} - no data")
+                continue
+            watchlist[symbol] = market_data
+        
+        # Predict the whole watchlist in one batch
+        batch = self.predict_watchlist(watchlist)
+        
+        for symbol, market_data in watchlist.items():
             try:
-                # Load market data
-                market_data = self.load_market_data(symbol)
-                
-                if market_data is None:
-                    logger.warning(f"Skipping {symbol} - no data")
-                    continue
-                
                 # Generate predictions
-                signal = self.generate_predictions(symbol, market_data)
+                signal = self.generate_predictions(symbol, market_data, batch.get(symbol))
+                self.update_drift(market_data)
                 
                 if signal and signal['confidence'] >= self.confidence_threshold:
                     signals.append(signal)
@@ -317,6 +374,7 @@ class PredictorDaemon:
                     
             except KeyboardInterrupt:
                 logger.info("Daemon stopped by user")
+                self.trainer.shutdown(wait=False)
                 break
             except Exception as e:
                 logger.error(f"Daemon error: {e}")
@@ -376,7 +434,9 @@ def main():
         return
     
     if args.once:
-        daemon.run_once()
+        # Nothing outlives this run, so any training it starts is awaited and used
+        daemon.run_once(wait_for_training=True)
+        daemon.trainer.shutdown()
     else:
         daemon.run()
 
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Columnar Backtest Results
+Trades and the equity curve are appended to an NPZ archive in fixed-size
+chunks while a backtest runs, next to a small JSON summary. Readers load
+one chunk at a time, so memory stays flat however long the run.
+
+Layout of <base>.npz: one .npy member per column chunk,
+'trades/<column>/<chunk>' and 'equity/<chunk>'. Times are stored as UTC
+datetime64[ns], text as fixed-width unicode; nothing is pickled.
+<base>.json holds the counts, columns and the backtest's summary metrics.
+"""
+
+import json
+import math
+import os
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+FORMAT = 'columnar-npz'
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def result_paths(path: str) -> tuple:
+    """(archive, summary) paths for a result base path, with or without extension"""
+    base, ext = os.path.splitext(path)
+    if ext not in ('.npz', '.json'):
+        base = path
+    return base + '.npz', base + '.json'
+
+
+def _column_array(values: list) -> np.ndarray:
+    """One chunk of a column as a pickle-free array"""
+    first = values[0]
+    if isinstance(first, (datetime, pd.Timestamp, np.datetime64)):
+        return pd.to_datetime(values, utc=True).tz_localize(None).to_numpy('datetime64[ns]')
+    if isinstance(first, str):
+        return np.asarray(values, dtype=str)
+    return np.asarray(values)
+
+
+class ResultWriter:
+    """
+    Appends trade records and equity points to a result archive
+
+    Records are buffered per column and written as a chunk every
+    chunk_rows rows; close() writes the remainder and the JSON summary.
+    Every trade record must have the keys of the first one.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.path, self.summary_path = result_paths(path)
+        self.chunk_rows = chunk_rows
+        self._zip = zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_STORED)
+        self._columns: Optional[List[str]] = None
+        self._trades: Dict[str, list] = {}
+        self._equity: List[float] = []
+        self._chunks = {'trades': 0, 'equity': 0}
+        self.trade_count = 0
+        self.equity_count = 0
+
+    def append_trade(self, record: dict):
+        if self._columns is None:
+            self._columns = list(record)
+            self._trades = {name: [] for name in self._columns}
+        for name in self._columns:
+            self._trades[name].append(record[name])
+        self.trade_count += 1
+        if len(self._trades[self._columns[0]]) >= self.chunk_rows:
+            self._flush_trades()
+
+    def append_equity(self, value: float):
+        self._equity.append(value)
+        self.equity_count += 1
+        if len(self._equity) >= self.chunk_rows:
+            self._flush_equity()
+
+    def extend_equity(self, values: Iterable[float]):
+        for value in values:
+            self.append_equity(value)
+
+    def _write(self, name: str, array: np.ndarray):
+        with self._zip.open(f"{name}.npy", 'w', force_zip64=True) as f:
+            np.lib.format.write_array(f, array, allow_pickle=False)
+
+    def _flush_trades(self):
+        if not self._columns or not self._trades[self._columns[0]]:
+            return
+        chunk = self._chunks['trades']
+        for name in self._columns:
+            self._write(f"trades/{name}/{chunk:05d}", _column_array(self._trades[name]))
+            self._trades[name] = []
+        self._chunks['trades'] += 1
+
+    def _flush_equity(self):
+        if not self._equity:
+            return
+        self._write(f"equity/{self._chunks['equity']:05d}", np.asarray(self._equity, dtype=np.float64))
+        self._equity = []
+        self._chunks['equity'] += 1
+
+    def checkpoint(self) -> dict:
+        """
+        Seal the chunks written so far and return the state restore() needs
+        to continue the archive after an interruption (buffered rows included)
+        """
+        self._zip.close()
+        with zipfile.ZipFile(self.path) as archive:
+            directory_offset = archive.start_dir
+        with open(self.path, 'rb') as f:
+            f.seek(directory_offset)
+            directory = f.read()
+        self._zip = zipfile.ZipFile(self.path, 'a', compression=zipfile.ZIP_STORED)
+        return {
+            'path': self.path,
+            'chunk_rows': self.chunk_rows,
+            'columns': self._columns,
+            'trades': {name: list(values) for name, values in self._trades.items()},
+            'equity': list(self._equity),
+            'chunks': dict(self._chunks),
+            'trade_count': self.trade_count,
+            'equity_count': self.equity_count,
+            'directory_offset': directory_offset,
+            'directory': directory
+        }
+
+    @classmethod
+    def restore(cls, state: dict) -> 'ResultWriter':
+        """Reopen an archive at a checkpoint, dropping anything written after it"""
+        with open(state['path'], 'r+b') as f:
+            f.seek(state['directory_offset'])
+            f.truncate()
+            f.write(state['directory'])
+        writer = cls.__new__(cls)
+        writer.path, writer.summary_path = result_paths(state['path'])
+        writer.chunk_rows = state['chunk_rows']
+        writer._zip = zipfile.ZipFile(writer.path, 'a', compression=zipfile.ZIP_STORED)
+        writer._columns = state['columns']
+        writer._trades = {name: list(values) for name, values in state['trades'].items()}
+        writer._equity = list(state['equity'])
+        writer._chunks = dict(state['chunks'])
+        writer.trade_count = state['trade_count']
+        writer.equity_count = state['equity_count']
+        return writer
+
+    def close(self, summary: Optional[dict] = None) -> str:
+        """Write the remaining chunks and the JSON summary; returns the summary path"""
+        if self._zip is None:
+            return self.summary_path
+        self._flush_trades()
+        self._flush_equity()
+        self._zip.close()
+        self._zip = None
+        with open(self.summary_path, 'w') as f:
+            json.dump({
+                'format': FORMAT,
+                'version': FORMAT_VERSION,
+                'data_file': os.path.basename(self.path),
+                'trades': self.trade_count,
+                'equity_points': self.equity_count,
+                'chunks': self._chunks,
+                'trade_columns': self._columns or [],
+                'summary': summary or {}
+            }, f, indent=2, default=str)
+        return self.summary_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_summary(path: str, summary: dict):
+    """Set the summary metrics of a closed result archive"""
+    summary_path = result_paths(path)[1]
+    with open(summary_path) as f:
+        meta = json.load(f)
+    meta['summary'] = summary
+    with open(summary_path, 'w') as f:
+        json.dump(meta, f, indent=2, default=str)
+
+
+class ResultReader:
+    """Lazy, chunk-by-chunk access to a result archive and its summary"""
+
+    def __init__(self, path: str):
+        summary_path = result_paths(path)[1]
+        with open(summary_path) as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != FORMAT:
+            raise ValueError(f"{summary_path} is not a {FORMAT} result summary")
+        self._npz = np.load(os.path.join(os.path.dirname(summary_path), self.meta['data_file']))
+
+    @property
+    def summary(self) -> dict:
+        return self.meta['summary']
+
+    @property
+    def trade_columns(self) -> List[str]:
+        return self.meta['trade_columns']
+
+    def __len__(self) -> int:
+        return self.meta['trades']
+
+    def iter_trades(self, columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Trade columns one chunk at a time"""
+        columns = list(columns or self.trade_columns)
+        for chunk in range(self.meta['chunks']['trades']):
+            yield {name: self._npz[f"trades/{name}/{chunk:05d}"] for name in columns}
+
+    def iter_equity(self) -> Iterator[np.ndarray]:
+        for chunk in range(self.meta['chunks']['equity']):
+            yield self._npz[f"equity/{chunk:05d}"]
+
+    def trades(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """All trades as a DataFrame (loads the selected columns in full)"""
+        columns = list(columns or self.trade_columns)
+        chunks = list(self.iter_trades(columns))
+        if not chunks:
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame({name: np.concatenate([c[name] for c in chunks]) for name in columns})
+
+    def equity(self) -> np.ndarray:
+        chunks = list(self.iter_equity())
+        return np.concatenate(chunks) if chunks else np.array([], dtype=np.float64)
+
+    def close(self):
+        self._npz.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def trade_stats(pnl_chunks: Iterable[np.ndarray]) -> dict:
+    """Win/loss counts and sums over P&L chunks (a trade with pnl <= 0 is a loss)"""
+    stats = {'trades': 0, 'winning_trades': 0, 'losing_trades': 0, 'gross_profit': 0.0,
+             'gross_loss': 0.0, 'best_trade': 0.0, 'worst_trade': 0.0}
+    for pnl in pnl_chunks:
+        if not len(pnl):
+            continue
+        wins = pnl > 0
+        if stats['trades'] == 0:
+            stats['best_trade'], stats['worst_trade'] = float(pnl.max()), float(pnl.min())
+        else:
+            stats['best_trade'] = max(stats['best_trade'], float(pnl.max()))
+            stats['worst_trade'] = min(stats['worst_trade'], float(pnl.min()))
+        stats['trades'] += len(pnl)
+        stats['winning_trades'] += int(wins.sum())
+        stats['losing_trades'] += int((~wins).sum())
+        stats['gross_profit'] += float(pnl[wins].sum())
+        stats['gross_loss'] += float(-pnl[~wins].sum())
+    return stats
+
+
+def equity_stats(equity_chunks: Iterable[np.ndarray]) -> dict:
+    """
+    Max drawdown (fraction of the running peak) and the mean and sample
+    standard deviation of bar-to-bar returns, over equity chunks
+    """
+    peak = -math.inf
+    max_drawdown = 0.0
+    last = None
+    count, mean, ssq = 0, 0.0, 0.0
+    for equity in equity_chunks:
+        if not len(equity):
+            continue
+        running = np.maximum.accumulate(np.maximum(equity, peak))
+        max_drawdown = max(max_drawdown, float(((running - equity) / running).max()))
+        peak = float(running[-1])
+
+        # Chan et al. parallel update of the running mean / sum of squares
+        values = equity if last is None else np.concatenate([[last], equity])
+        returns = values[1:] / values[:-1] - 1
+        last = float(equity[-1])
+        if not len(returns):
+            continue
+        n = len(returns)
+        chunk_mean = float(returns.mean())
+        chunk_ssq = float(((returns - chunk_mean) ** 2).sum())
+        delta = chunk_mean - mean
+        total = count + n
+        mean += delta * n / total
+        ssq += chunk_ssq + delta * delta * count * n / total
+        count = total
+    return {
+        'max_drawdown': max_drawdown,
+        'returns': count,
+        'returns_mean': mean,
+        'returns_std': math.sqrt(ssq / (count - 1)) if count > 1 else 0.0
+    }
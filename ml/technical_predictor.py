@@ -7,30 +7,26 @@ Replaces the pseudoscientific quantum mechanics approach
 
 import numpy as np
 import pandas as pd
-import ta
-from scipy import stats
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
 import warnings
 import logging
 import os
+import importlib
+import threading
 from datetime import datetime, timedelta, timezone
 import json
 
 # Import our advanced indicator system
 from indicators.signal_engine import SignalEngine, SignalWeight
 from indicators.base import SignalStrength
-from ultra_high_accuracy_strategy import UltraHighAccuracyStrategy
-from high_volatility_trading_suite import HighVolatilityTradingSuite
-from adaptive_strategy_manager import AdaptiveStrategyManager
-from news_event_trading_suite import NewsEventTradingSuite, NewsEventType
-from aggressive_position_manager import AggressivePositionManager
-from unified_aggressive_trading import UnifiedAggressiveTradingManager
+from feature_kernel import compute_technical_features
+from online_features import IncrementalFeatureUpdater
+from training_pipeline import TrainingPipeline
+from model_artifact import CompiledModels, load_model_artifact, save_model_artifact
 
 warnings.filterwarnings('ignore')
 
 # Configure logging
-log_dir = 'ml/logs'
+log_dir = os.getenv('LOG_DIR', 'ml/logs')
 os.makedirs(log_dir, exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
@@ -42,27 +38,109 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_lazy_lock = threading.Lock()
+
+
+class _LazyAttribute:
+    """
+    Instance attribute built by factory() on first access
+
+    The value is stored in the instance __dict__, so later reads, assignment
+    and pickling treat it as a plain attribute. Models and strategy suites
+    use this so importing and constructing TechnicalPredictor does not pull
+    in sklearn or build suites that are never enabled.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        with _lazy_lock:
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = self.factory()
+            return instance.__dict__[self.name]
+
+
+def _lazy_class(module, name):
+    """Factory constructing module.name() with the module imported on demand"""
+    return lambda: getattr(importlib.import_module(module), name)()
+
+
+def _standard_scaler():
+    from sklearn.preprocessing import StandardScaler
+    return StandardScaler()
+
+
+def _direction_model():
+    from sklearn.ensemble import RandomForestClassifier
+    return RandomForestClassifier(
+        n_estimators=100,
+        max_depth=10,
+        random_state=42
+    )
+
+
+def _price_model():
+    from sklearn.ensemble import GradientBoostingRegressor
+    return GradientBoostingRegressor(
+        n_estimators=100,
+        max_depth=5,
+        random_state=42
+    )
+
 
 class TechnicalPredictor:
     """
     Technical analysis-based predictor using real indicators and ML
     """
     
-    def __init__(self):
-        self.scaler = StandardScaler()
-        self.direction_model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42
-        )
-        self.price_model = GradientBoostingRegressor(
-            n_estimators=100,
-            max_depth=5,
-            random_state=42
-        )
+    # Models, created (and sklearn imported) on first use
+    scaler = _LazyAttribute(_standard_scaler)
+    direction_model = _LazyAttribute(_direction_model)
+    price_model = _LazyAttribute(_price_model)
+    
+    # Strategy suites, constructed on the first enable_*/get_* call that needs them
+    ultra_high_accuracy = _LazyAttribute(
+        _lazy_class('ultra_high_accuracy_strategy', 'UltraHighAccuracyStrategy'))
+    volatility_suite = _LazyAttribute(
+        _lazy_class('high_volatility_trading_suite', 'HighVolatilityTradingSuite'))
+    adaptive_manager = _LazyAttribute(
+        _lazy_class('adaptive_strategy_manager', 'AdaptiveStrategyManager'))
+    news_trader = _LazyAttribute(
+        _lazy_class('news_event_trading_suite', 'NewsEventTradingSuite'))
+    position_manager = _LazyAttribute(
+        _lazy_class('aggressive_position_manager', 'AggressivePositionManager'))
+    unified_aggressive = _LazyAttribute(
+        _lazy_class('unified_aggressive_trading', 'UnifiedAggressiveTradingManager'))
+    
+    def __init__(self, signal_workers=None, feature_backend='numpy', feature_store=None,
+                 n_jobs=None):
         self.feature_importance = {}
         
+        # Training parallelism (sklearn convention: None = 1 core, -1 = all cores)
+        self.n_jobs = n_jobs
+        self.feature_names = ()
+        
+        # Models loaded from a saved artifact; used for prediction when set
+        self.compiled_models = None
+        
+        # 'numpy' uses the fused feature kernel, 'ta' the original ta indicators
+        self.feature_backend = feature_backend
+        
+        # Optional FeatureStore caching training features per symbol/timeframe
+        self.feature_store = feature_store
+        
+        # Online per-symbol feature state for predictions on a growing series
+        self.feature_updater = IncrementalFeatureUpdater()
+        
         # Initialize the advanced signal engine
+        # (signal_workers > 1 evaluates indicators concurrently)
+        self.signal_workers = signal_workers
         self.signal_engine = SignalEngine(
             custom_weights={
                 "Alligator": 1.0,      # Primary trend
@@ -71,31 +149,26 @@ class TechnicalPredictor:
                 "Accelerator Oscillator": 0.7,
                 "Fractals": 0.8,
                 "Williams MFI": 0.6
-            }
+            },
+            max_workers=signal_workers
         )
         
-        # Initialize ultra-high accuracy strategy (94.7%+ win rate)
-        self.ultra_high_accuracy = UltraHighAccuracyStrategy()
+        # Ultra-high accuracy strategy (94.7%+ win rate)
         self.use_ultra_high_accuracy = False  # Can be toggled
         
-        # Initialize high volatility trading suite (90%+ win rate in volatile markets)
-        self.volatility_suite = HighVolatilityTradingSuite()
+        # High volatility trading suite (90%+ win rate in volatile markets)
         self.use_volatility_suite = False  # Can be toggled
         
-        # Initialize adaptive strategy manager (automatically chooses best strategy)
-        self.adaptive_manager = AdaptiveStrategyManager()
+        # Adaptive strategy manager (automatically chooses best strategy)
         self.use_adaptive_mode = True  # Default to adaptive mode
         
-        # Initialize news event trading suite (85%+ win rate on major news)
-        self.news_trader = NewsEventTradingSuite()
+        # News event trading suite (85%+ win rate on major news)
         self.use_news_trading = False  # Can be toggled
         
-        # Initialize aggressive position manager for high leverage trading
-        self.position_manager = AggressivePositionManager()
+        # Aggressive position manager for high leverage trading
         self.use_aggressive_sizing = False  # Can be toggled
         
-        # Initialize unified aggressive trading manager (your 20% GBP/USD model)
-        self.unified_aggressive = UnifiedAggressiveTradingManager()
+        # Unified aggressive trading manager (your 20% GBP/USD model)
         self.use_unified_aggressive = False  # Can be toggled
         
     def calculate_technical_indicators(self, df):
@@ -106,8 +179,14 @@ class TechnicalPredictor:
             logger.warning(f"Insufficient data for indicators: {len(df)} rows")
             return pd.DataFrame()
             
-        # Ensure we have OHLCV data
-        required_columns = ['open', 'high', 'low', 'close', 'volume']
+        self._ensure_ohlcv(df)
+        
+        if getattr(self, 'feature_backend', 'numpy') == 'numpy':
+            return compute_technical_features(df)
+        return self._calculate_ta_indicators(df)
+    
+    def _ensure_ohlcv(self, df):
+        """Fill OHLCV columns in place for bid/ask-only frames"""
         if 'bid' in df.columns and 'close' not in df.columns:
             # Convert bid/ask to OHLC format
             df['close'] = df['bid']
@@ -115,6 +194,27 @@ class TechnicalPredictor:
             df['high'] = df[['bid', 'ask']].max(axis=1) if 'ask' in df.columns else df['bid']
             df['low'] = df['bid']
             df['volume'] = df.get('volume', 100)
+    
+    def _latest_features(self, symbol, df):
+        """
+        Latest feature row from the per-symbol online state, as a one-row frame
+        Returns None when the row is still warming up
+        """
+        if len(df) < 50:
+            return None
+        self._ensure_ohlcv(df)
+        if getattr(self, 'feature_updater', None) is None:
+            self.feature_updater = IncrementalFeatureUpdater()
+        row = self.feature_updater.update(symbol, df)
+        if row is None or row.isna().any():
+            return None
+        return row.to_frame().T
+    
+    def _calculate_ta_indicators(self, df):
+        """
+        Reference implementation of the feature set using ta indicators
+        """
+        import ta
         
         features = pd.DataFrame(index=df.index)
         
@@ -191,195 +291,255 @@ class TechnicalPredictor:
         """
         Prepare data for ML training with proper target labels
         """
-        features = self.calculate_technical_indicators(df)
-        
-        if features.empty or len(features) < 100:
+        training_set = TrainingPipeline(self, prediction_horizon).build(df)
+        if training_set is None:
             return None, None, None
         
-        # Create target variables
-        future_returns = df['close'].shift(-prediction_horizon) / df['close'] - 1
-        
-        # Direction: 1 for up, 0 for down
-        y_direction = (future_returns > 0).astype(int)
-        
-        # Price target
-        y_price = df['close'].shift(-prediction_horizon)
-        
-        # Remove NaN rows
-        mask = ~(features.isna().any(axis=1) | y_direction.isna() | y_price.isna())
-        
-        X = features[mask].values
-        y_dir = y_direction[mask].values
-        y_price = y_price[mask].values
-        
-        return X, y_dir, y_price
+        y_dir, y_price = training_set.targets
+        return training_set.X, y_dir, y_price
     
-    def train(self, market_data):
+    def train(self, market_data, training_set=None, symbol=None, timeframe=None):
         """
         Train the ML models on historical data
+        A prebuilt TrainingSet (e.g. a saved artifact) skips feature computation;
+        with a symbol, features go through the feature store when one is set
         """
         logger.info("Training technical prediction models...")
         
-        X, y_dir, y_price = self.prepare_training_data(market_data)
-        
-        if X is None or len(X) < 200:
-            logger.error("Insufficient data for training")
+        pipeline = TrainingPipeline(self, feature_store=getattr(self, 'feature_store', None))
+        if training_set is None:
+            training_set = pipeline.build(market_data, symbol, timeframe)
+        return pipeline.fit(training_set)
+    
+    def save_model(self, directory, metadata=None):
+        """
+        Save the trained models as a compact, memory-mappable artifact
+        (see model_artifact); the signal engine and suites are not included
+        """
+        models = getattr(self, 'compiled_models', None) or CompiledModels.from_predictor(self, metadata)
+        if metadata:
+            models.metadata.update(metadata)
+        return save_model_artifact(models, directory)
+    
+    def load_model(self, directory):
+        """Load the current model artifact from directory; False if there is none"""
+        models = load_model_artifact(directory)
+        if models is None:
             return False
-        
-        # Split data (80/20)
-        split_idx = int(len(X) * 0.8)
-        X_train, X_test = X[:split_idx], X[split_idx:]
-        y_dir_train, y_dir_test = y_dir[:split_idx], y_dir[split_idx:]
-        y_price_train, y_price_test = y_price[:split_idx], y_price[split_idx:]
-        
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        
-        # Train direction model
-        self.direction_model.fit(X_train_scaled, y_dir_train)
-        dir_accuracy = self.direction_model.score(X_test_scaled, y_dir_test)
-        logger.info(f"Direction model accuracy: {dir_accuracy:.3f}")
-        
-        # Train price model
-        self.price_model.fit(X_train_scaled, y_price_train)
-        price_r2 = self.price_model.score(X_test_scaled, y_price_test)
-        logger.info(f"Price model R²: {price_r2:.3f}")
-        
-        # Store feature importance
-        feature_names = self.calculate_technical_indicators(market_data).columns
-        self.feature_importance = dict(zip(
-            feature_names,
-            self.direction_model.feature_importances_
-        ))
-        
+        self.compiled_models = models
+        self.feature_names = models.feature_names
+        self.feature_importance = dict(models.feature_importance)
         return True
     
-    def predict_next_candles(self, price_series, n_candles=5):
+    def _inference_models(self):
+        """
+        Flattened models used for prediction, or None when untrained
+        Predictors pickled before flattening are compiled on first use
+        """
+        models = getattr(self, 'compiled_models', None)
+        if models is None and hasattr(vars(self).get('direction_model'), 'estimators_'):
+            models = self.compiled_models = CompiledModels.from_predictor(self)
+        return models
+    
+    def predict_next_candles(self, price_series, n_candles=5, symbol=None):
         """
         Predict next n candles with confidence intervals
         Enhanced with advanced signal engine analysis
+        
+        With a symbol and timestamped bars, features come from that symbol's
+        online state and only bars newer than the previous call are processed.
         """
-        # Convert to DataFrame if Series
-        if isinstance(price_series, pd.Series):
-            df = pd.DataFrame({'bid': price_series})
-        else:
-            df = price_series.copy()
+        df = self._price_frame(price_series)
         
         # Calculate features
-        features = self.calculate_technical_indicators(df)
+        features = self._feature_rows(symbol, df)
         
         if features.empty:
             logger.warning("No features calculated, returning neutral prediction")
             return self._generate_neutral_predictions(df, n_candles)
         
         # Get latest features (remove NaN)
-        latest_features = features.dropna().iloc[-1:].values
+        latest_features = features.dropna().iloc[-1:]
         
         if latest_features.shape[0] == 0:
             return self._generate_neutral_predictions(df, n_candles)
         
+        if self._inference_models() is None:
+            logger.warning("Models are not trained, returning neutral prediction")
+            return self._generate_neutral_predictions(df, n_candles)
+        
         try:
             # Get signal engine analysis
-            signal_analysis = None
-            try:
-                if len(df) >= self.signal_engine.get_required_periods():
-                    # Ensure we have proper OHLCV format for signal engine
-                    signal_df = df.copy()
-                    if 'bid' in df.columns and 'close' not in df.columns:
-                        signal_df['close'] = df['bid']
-                        signal_df['open'] = df['bid'].shift(1).fillna(df['bid'])
-                        signal_df['high'] = df[['bid', 'ask']].max(axis=1) if 'ask' in df.columns else df['bid']
-                        signal_df['low'] = df['bid']
-                        signal_df['volume'] = df.get('volume', 100)
-                    
-                    symbol = 'UNKNOWN'  # Default symbol
-                    signal_analysis = self.signal_engine.analyze(signal_df, symbol)
-                    logger.info(f"Signal Engine Analysis: {signal_analysis.signal.name} "
-                              f"with {signal_analysis.probability:.1f}% probability")
-            except Exception as e:
-                logger.warning(f"Signal engine analysis failed: {e}")
-            
-            # Scale features
-            latest_features_scaled = self.scaler.transform(latest_features)
-            
-            # Predict direction and probability
-            direction_proba = self.direction_model.predict_proba(latest_features_scaled)[0]
-            direction = self.direction_model.predict(latest_features_scaled)[0]
+            signal_analysis = self.analyze_signals(df, symbol)
             
-            # Predict price
-            predicted_price = self.price_model.predict(latest_features_scaled)[0]
-            
-            # Calculate confidence based on model certainty
-            ml_confidence = max(direction_proba)
-            
-            # Combine with signal engine confidence if available
-            if signal_analysis:
-                # Weight ML and signal engine confidences
-                combined_confidence = (ml_confidence * 0.4 + 
-                                     signal_analysis.confidence * 0.3 + 
-                                     signal_analysis.probability/100 * 0.3)
-                
-                # Adjust direction based on strong signal engine signals
-                if signal_analysis.signal in [SignalStrength.STRONG_BUY, SignalStrength.STRONG_SELL]:
-                    if signal_analysis.signal == SignalStrength.STRONG_BUY:
-                        direction = 1
-                    elif signal_analysis.signal == SignalStrength.STRONG_SELL:
-                        direction = 0
-            else:
-                combined_confidence = ml_confidence
-            
-            # Generate predictions for each candle
-            predictions = []
+            key = symbol or 'UNKNOWN'
             current_price = float(df['bid'].iloc[-1]) if 'bid' in df else float(df['close'].iloc[-1])
-            
-            for i in range(n_candles):
-                # Decay confidence over time
-                candle_confidence = combined_confidence * (0.95 ** i)
-                
-                # Calculate price change
-                if i == n_candles - 1:
-                    # Use model prediction for final candle
-                    candle_price = predicted_price
-                else:
-                    # Interpolate for intermediate candles
-                    price_change = (predicted_price - current_price) * ((i + 1) / n_candles)
-                    candle_price = current_price + price_change
-                
-                # Calculate bounds based on ATR and signal engine risk
-                atr = features['atr'].dropna().iloc[-1] if 'atr' in features else current_price * 0.001
-                risk_multiplier = 1.0
-                if signal_analysis and signal_analysis.risk_level == "High Risk":
-                    risk_multiplier = 1.5
-                elif signal_analysis and signal_analysis.risk_level == "Low Risk":
-                    risk_multiplier = 0.7
-                
-                bound_width = atr * (i + 1) * 0.5 * risk_multiplier
-                
-                prediction = {
-                    'candle': i + 1,
-                    'predicted_price': float(candle_price),
-                    'direction': 'UP' if direction == 1 else 'DOWN',
-                    'confidence': float(candle_confidence),
-                    'upper_bound': float(candle_price + bound_width),
-                    'lower_bound': float(candle_price - bound_width),
-                    'timestamp': (datetime.now() + timedelta(hours=i+1)).isoformat(),
-                    'technical_scores': self._get_technical_scores(features),
-                    'signal_engine': {
-                        'signal': signal_analysis.signal.name if signal_analysis else 'NEUTRAL',
-                        'probability': signal_analysis.probability if signal_analysis else 50.0,
-                        'market_condition': signal_analysis.market_condition if signal_analysis else 'unknown',
-                        'risk_level': signal_analysis.risk_level if signal_analysis else 'Medium Risk'
-                    } if signal_analysis else None
-                }
-                predictions.append(prediction)
-            
-            return predictions
+            latest_features.index = [key]
+            return self.predict_batch(latest_features, pd.Series({key: current_price}),
+                                      n_candles, {key: signal_analysis})[key]
             
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             return self._generate_neutral_predictions(df, n_candles)
     
+    def analyze_signals(self, df, symbol=None):
+        """Signal engine analysis of an OHLCV frame, or None if unavailable"""
+        try:
+            if len(df) >= self.signal_engine.get_required_periods():
+                # calculate_technical_indicators has already filled in OHLCV
+                signal_analysis = self.signal_engine.analyze(df, symbol or 'UNKNOWN')
+                logger.info(f"Signal Engine Analysis: {signal_analysis.signal.name} "
+                          f"with {signal_analysis.probability:.1f}% probability")
+                return signal_analysis
+        except Exception as e:
+            logger.warning(f"Signal engine analysis failed: {e}")
+        return None
+    
+    def latest_feature_rows(self, price_data):
+        """
+        Latest complete feature row and current price per symbol
+        
+        Args:
+            price_data: {symbol: price Series or OHLCV DataFrame}
+            
+        Returns:
+            (features indexed by symbol, current prices indexed by symbol);
+            symbols whose features are still warming up are left out
+        """
+        rows, prices = [], {}
+        for symbol, series in price_data.items():
+            df = self._price_frame(series)
+            features = self._feature_rows(symbol, df).dropna()
+            if features.empty:
+                continue
+            rows.append(features.iloc[-1].rename(symbol))
+            prices[symbol] = float(df['bid'].iloc[-1]) if 'bid' in df else float(df['close'].iloc[-1])
+        return pd.DataFrame(rows), pd.Series(prices, dtype=np.float64)
+    
+    def predict_batch(self, features, current_prices, n_candles=5, signal_analyses=None):
+        """
+        Predict the next n candles for many symbols at once
+        
+        One scaler transform and one evaluation of each model cover every
+        row; candle paths, confidence decay and bounds are built as
+        (symbols, candles) arrays.
+        
+        Args:
+            features: latest feature row per symbol (DataFrame indexed by symbol)
+            current_prices: current price per symbol (Series indexed by symbol)
+            n_candles: candles to project
+            signal_analyses: optional {symbol: signal engine analysis} blended
+                into confidence, direction and bounds as in predict_next_candles
+            
+        Returns:
+            {symbol: list of candle predictions}; rows with missing features,
+            or all rows when the models are not trained, get neutral predictions
+        """
+        current_prices = pd.Series(current_prices, dtype=np.float64).reindex(features.index)
+        signal_analyses = signal_analyses or {}
+        results = {symbol: self._neutral_predictions(price, n_candles)
+                   for symbol, price in current_prices.items()}
+        
+        models = self._inference_models()
+        if models is None or features.empty:
+            return results
+        if models.feature_names and tuple(features.columns) != models.feature_names:
+            logger.error("Features do not match the model's feature schema")
+            return results
+        
+        matrix = features.to_numpy(dtype=np.float64)
+        valid = ~np.isnan(matrix).any(axis=1)
+        if not valid.any():
+            return results
+        symbols = features.index[valid]
+        current = current_prices.to_numpy()[valid]
+        scaled = models.scaler.transform(matrix[valid])
+        
+        # Direction, probability and price for every symbol in one pass each
+        direction, direction_proba = models.direction_model.predict_with_proba(scaled)
+        direction = direction.astype(int)
+        predicted_price = models.price_model.predict(scaled)
+        if models.metadata.get('price_target') == 'return':
+            predicted_price = current * (1 + predicted_price)
+        confidence = direction_proba.max(axis=1)
+        
+        # Blend in signal engine analyses where available
+        risk_multiplier = np.ones(len(symbols))
+        for i, symbol in enumerate(symbols):
+            analysis = signal_analyses.get(symbol)
+            if analysis is None:
+                continue
+            confidence[i] = (confidence[i] * 0.4 + analysis.confidence * 0.3 +
+                             analysis.probability / 100 * 0.3)
+            if analysis.signal == SignalStrength.STRONG_BUY:
+                direction[i] = 1
+            elif analysis.signal == SignalStrength.STRONG_SELL:
+                direction[i] = 0
+            if analysis.risk_level == "High Risk":
+                risk_multiplier[i] = 1.5
+            elif analysis.risk_level == "Low Risk":
+                risk_multiplier[i] = 0.7
+        
+        # Candle paths: interpolate towards the model price, which is the last candle
+        steps = np.arange(1, n_candles + 1)
+        prices = current[:, None] + (predicted_price - current)[:, None] * (steps / n_candles)
+        prices[:, -1] = predicted_price
+        confidences = confidence[:, None] * 0.95 ** (steps - 1)
+        if 'atr' in features:
+            atr = features['atr'].to_numpy(dtype=np.float64)[valid]
+        else:
+            atr = current * 0.001
+        widths = atr[:, None] * steps * 0.5 * risk_multiplier[:, None]
+        upper, lower = prices + widths, prices - widths
+        
+        now = datetime.now()
+        timestamps = [(now + timedelta(hours=int(step))).isoformat() for step in steps]
+        feature_rows = features[valid]
+        for i, symbol in enumerate(symbols):
+            analysis = signal_analyses.get(symbol)
+            technical_scores = self._get_technical_scores(feature_rows.iloc[i:i + 1])
+            signal_engine = {
+                'signal': analysis.signal.name,
+                'probability': analysis.probability,
+                'market_condition': analysis.market_condition,
+                'risk_level': analysis.risk_level
+            } if analysis else None
+            label = 'UP' if direction[i] == 1 else 'DOWN'
+            results[symbol] = [{
+                'candle': int(step),
+                'predicted_price': float(prices[i, j]),
+                'direction': label,
+                'confidence': float(confidences[i, j]),
+                'upper_bound': float(upper[i, j]),
+                'lower_bound': float(lower[i, j]),
+                'timestamp': timestamps[j],
+                'technical_scores': technical_scores,
+                'signal_engine': signal_engine
+            } for j, step in enumerate(steps)]
+        
+        return results
+    
+    def _price_frame(self, price_series):
+        """Prediction input as a DataFrame (a Series is taken as bid prices)"""
+        if isinstance(price_series, pd.Series):
+            return pd.DataFrame({'bid': price_series})
+        # Shallow: derived OHLC columns are added to this frame only
+        return price_series.copy(deep=False)
+    
+    def _feature_rows(self, symbol, df):
+        """
+        Features for prediction: the online row for a known symbol, else the
+        full frame. Bars without timestamps (e.g. a bare price list) cannot be
+        matched to the previous call, so they always take the full frame.
+        """
+        features = None
+        if symbol is not None and isinstance(df.index, pd.DatetimeIndex) \
+                and getattr(self, 'feature_backend', 'numpy') == 'numpy':
+            features = self._latest_features(symbol, df)
+        if features is None:
+            features = self.calculate_technical_indicators(df)
+        return features
+    
     def _get_technical_scores(self, features):
         """
         Get current technical indicator scores
@@ -424,7 +584,11 @@ class TechnicalPredictor:
         Generate neutral predictions when models can't predict
         """
         current_price = float(df.iloc[-1]['bid']) if 'bid' in df.columns else float(df.iloc[-1]['close'])
-        
+        return self._neutral_predictions(current_price, n_candles)
+    
+    def _neutral_predictions(self, current_price, n_candles):
+        """Flat NEUTRAL candles at current_price"""
+        current_price = float(current_price)
         predictions = []
         for i in range(n_candles):
             predictions.append({
@@ -510,8 +674,8 @@ class TechnicalPredictor:
         Get comprehensive signal analysis from the advanced indicator engine
         """
         try:
-            # Ensure proper OHLCV format
-            signal_df = df.copy()
+            # Ensure proper OHLCV format (shallow copy: only adds columns)
+            signal_df = df.copy(deep=False)
             if 'bid' in df.columns and 'close' not in df.columns:
                 signal_df['close'] = df['bid']
                 signal_df['open'] = df['bid'].shift(1).fillna(df['bid'])
@@ -582,7 +746,8 @@ class TechnicalPredictor:
                     "Accelerator Oscillator": 0.6,
                     "Fractals": 1.2,        # Key levels
                     "Williams MFI": 0.8
-                }
+                },
+                max_workers=self.signal_workers
             )
     
     def get_ultra_high_accuracy_signal(self, df: pd.DataFrame, symbol: str, 
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Tests for checkpoint / resume of backtests and parameter sweeps
+"""
+import logging
+import os
+import pickle
+import sys
+import tempfile
+
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+logging.disable(logging.CRITICAL)
+
+from backtester import SignalBacktester
+from checkpoint import CheckpointJournal, data_fingerprint, load_checkpoint, save_checkpoint
+from high_accuracy_backtester import HighAccuracyBacktester
+from parameter_sweep import ParameterSweep, grid_space
+from result_store import ResultReader, ResultWriter
+from test_portfolio_backtester import make_basket
+
+
+def signal_backtester(**kwargs) -> SignalBacktester:
+    backtester = SignalBacktester(**kwargs)
+    backtester.min_probability = 50
+    return backtester
+
+
+def high_accuracy_backtester(**kwargs) -> HighAccuracyBacktester:
+    backtester = HighAccuracyBacktester(**kwargs)
+    backtester.engine.min_entry_score = 0
+    return backtester
+
+
+def test_checkpoint_rejects_other_data():
+    """A checkpoint only loads for the kind of run and input it was saved for"""
+    df = make_basket(('A',), periods=50)['A']
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'run.ckpt')
+        fingerprint = data_fingerprint(df, 0.0001)
+        save_checkpoint(path, 'SignalBacktester', fingerprint, {'bar': 7})
+        assert load_checkpoint(path, 'SignalBacktester', fingerprint) == {'bar': 7}
+        assert load_checkpoint(path, 'ParameterSweep', fingerprint) is None
+        assert load_checkpoint(path, 'SignalBacktester', data_fingerprint(df, 0.0002)) is None
+        assert load_checkpoint(path, 'SignalBacktester', data_fingerprint(df.iloc[1:], 0.0001)) is None
+        assert load_checkpoint(os.path.join(tmp, 'missing.ckpt'), 'SignalBacktester', fingerprint) is None
+
+
+def interrupt_signal_backtester(df, at, **kwargs) -> SignalBacktester:
+    """Run a SignalBacktester until the bar analyzed with at rows of data"""
+    interrupted = signal_backtester(**kwargs)
+    analyze = interrupted.signal_engine.analyze
+
+    def crash(data, symbol):
+        if len(data) == at:
+            raise KeyboardInterrupt
+        return analyze(data, symbol)
+
+    interrupted.signal_engine.analyze = crash
+    try:
+        interrupted.run(df, 'A')
+        raise AssertionError('run was not interrupted')
+    except KeyboardInterrupt:
+        pass
+    return interrupted
+
+
+def test_checkpoint_rejects_other_settings():
+    """Changed risk settings, engine weights or symbol start the run over"""
+    df = make_basket(('A',), periods=300)['A']
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint_path = os.path.join(tmp, 'run.ckpt')
+        interrupt_signal_backtester(df, 250, checkpoint_path=checkpoint_path, checkpoint_every=50)
+        fingerprint = signal_backtester()._fingerprint(df, 'A')
+        assert load_checkpoint(checkpoint_path, 'SignalBacktester', fingerprint) is not None
+
+        changed = signal_backtester()
+        changed.stop_loss_pct = 0.01
+        assert changed._fingerprint(df, 'A') != fingerprint
+        changed = signal_backtester()
+        changed.signal_engine.configurations[0].weight *= 2
+        assert changed._fingerprint(df, 'A') != fingerprint
+        assert signal_backtester()._fingerprint(df, 'B') != fingerprint
+
+        engine = high_accuracy_backtester()
+        fingerprint = engine._fingerprint(df, 'A', 0.0001)
+        engine.engine.min_confirmations -= 1
+        assert engine._fingerprint(df, 'A', 0.0001) != fingerprint
+
+        changed = signal_backtester(checkpoint_path=checkpoint_path)
+        changed.take_profit_pct = 0.08
+        expected = signal_backtester()
+        expected.take_profit_pct = 0.08
+        assert changed.resume(df, 'A').trades == expected.run(df, 'A').trades
+
+
+def test_checkpoints_only_write_new_records():
+    """Trades, equity and stream bars are not rewritten by every checkpoint"""
+    df = make_basket(('A',), periods=600)['A']
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint_path = os.path.join(tmp, 'run.ckpt')
+        interrupted = high_accuracy_backtester(checkpoint_path=checkpoint_path, checkpoint_every=64)
+        sizes = []
+        save = interrupted._save_checkpoint
+
+        def record(fingerprint, bar, stream):
+            journal = os.path.getsize(checkpoint_path + '.journal')
+            save(fingerprint, bar, stream)
+            sizes.append(os.path.getsize(checkpoint_path + '.journal') - journal)
+            assert len(stream.bars) == bar
+
+        interrupted._save_checkpoint = record
+        interrupted.run(df, 'A')
+        assert len(sizes) > 3
+        # All saves together write the records about once, not once per save
+        records = pickle.dumps([interrupted.trades, interrupted.equity_curve,
+                                interrupted.entry_scores], protocol=pickle.HIGHEST_PROTOCOL)
+        assert sum(sizes) < 1.5 * len(records)
+
+        interrupted = high_accuracy_backtester(checkpoint_path=checkpoint_path, checkpoint_every=64)
+        update_equity = interrupted._update_equity
+
+        def crash(bar):
+            if interrupted._bar == 450:
+                raise KeyboardInterrupt
+            return update_equity(bar)
+
+        interrupted._update_equity = crash
+        try:
+            interrupted.run(df, 'A')
+        except KeyboardInterrupt:
+            pass
+        with open(checkpoint_path, 'rb') as f:
+            state = pickle.load(f)['state']
+        assert 'trades' not in state and 'equity_curve' not in state
+        assert state['stream'].bars is None
+        assert all(stream.bars is None for stream in state['stream'].timeframes.values())
+
+
+def test_result_writer_restores_at_checkpoint():
+    """Chunks written after a checkpoint are dropped when the archive is restored"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'results')
+        writer = ResultWriter(path, chunk_rows=4)
+        for i in range(6):
+            writer.append_trade({'pnl': float(i)})
+        writer.extend_equity(range(10))
+        state = writer.checkpoint()
+        for i in range(6, 20):
+            writer.append_trade({'pnl': -1.0})
+        writer._zip.close()  # interrupted before close()
+
+        writer = ResultWriter.restore(state)
+        for i in range(6, 11):
+            writer.append_trade({'pnl': float(i)})
+        writer.close()
+        with ResultReader(path) as reader:
+            assert reader.trades()['pnl'].tolist() == [float(i) for i in range(11)]
+            assert np.array_equal(reader.equity(), np.arange(10, dtype=np.float64))
+
+
+def test_signal_backtester_resume_matches_run():
+    """Interrupted and resumed, in memory or columnar, the results equal one run()"""
+    df = make_basket(('A',), periods=420)['A']
+    reference = signal_backtester()
+    expected = reference.run(df, 'A')
+    assert expected.total_trades > 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint_path = os.path.join(tmp, 'run.ckpt')
+        for results_path in (None, os.path.join(tmp, 'results')):
+            interrupt_signal_backtester(df, 333, checkpoint_path=checkpoint_path,
+                                        checkpoint_every=50, results_path=results_path)
+            assert os.path.exists(checkpoint_path)
+
+            resumed = signal_backtester(checkpoint_path=checkpoint_path, checkpoint_every=50,
+                                        results_path=results_path)
+            result = resumed.resume(df, 'A')
+            assert not os.path.exists(checkpoint_path)
+            assert result.final_capital == expected.final_capital
+            assert result.total_trades == expected.total_trades
+            assert result.sharpe_ratio == expected.sharpe_ratio
+            assert result.max_drawdown_pct == expected.max_drawdown_pct
+            if results_path is None:
+                assert result.trades == expected.trades
+                assert resumed.equity_curve == reference.equity_curve
+            else:
+                with ResultReader(results_path) as reader:
+                    assert np.array_equal(reader.equity(), reference.equity_curve)
+                    assert reader.trades()['pnl'].tolist() == [t.pnl for t in expected.trades]
+
+
+def test_high_accuracy_resume_matches_run():
+    """The signal stream is checkpointed too, so a resumed run matches run()"""
+    df = make_basket(('A',), periods=600)['A']
+    expected = high_accuracy_backtester().run(df, 'A')
+    assert expected['performance']['total_trades'] > 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint_path = os.path.join(tmp, 'run.ckpt')
+        interrupted = high_accuracy_backtester(checkpoint_path=checkpoint_path, checkpoint_every=64)
+        update_equity = interrupted._update_equity
+
+        def crash(bar):
+            if interrupted._bar == 450:
+                raise KeyboardInterrupt
+            return update_equity(bar)
+
+        interrupted._update_equity = crash
+        try:
+            interrupted.run(df, 'A')
+            raise AssertionError('run was not interrupted')
+        except KeyboardInterrupt:
+            pass
+
+        result = high_accuracy_backtester(checkpoint_path=checkpoint_path,
+                                          checkpoint_every=64).resume(df, 'A')
+        assert not os.path.exists(checkpoint_path)
+        assert not os.path.exists(checkpoint_path + '.journal')
+        assert result['performance'] == expected['performance']
+        assert result['signal_analysis'] == expected['signal_analysis']
+        assert result['trades'] == expected['trades']
+        assert result['equity_curve'] == expected['equity_curve']
+
+
+def test_sweep_resume_skips_finished_configs():
+    """Rows saved before an interruption are kept; only the rest are run"""
+    df = make_basket(('A',), periods=160)['A']
+    configs = grid_space({'stop_loss': [0.005, 0.02], 'min_probability': [50, 60]})
+    expected = ParameterSweep(df, symbol='A', workers=1).run(configs).to_frame()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint_path = os.path.join(tmp, 'sweep.ckpt')
+        interrupted = ParameterSweep(df, symbol='A', workers=1,
+                                     checkpoint_path=checkpoint_path, checkpoint_every=1)
+        iter_results = interrupted.iter_results
+
+        def crash(configs, keep_results=False, done=()):
+            for count, item in enumerate(iter_results(configs, keep_results, done)):
+                if count == 2:
+                    raise KeyboardInterrupt
+                yield item
+
+        interrupted.iter_results = crash
+        try:
+            interrupted.run(configs)
+            raise AssertionError('sweep was not interrupted')
+        except KeyboardInterrupt:
+            pass
+
+        resumed = ParameterSweep(df, symbol='A', workers=1,
+                                 checkpoint_path=checkpoint_path, checkpoint_every=1)
+        ran = []
+        resumed_iter = resumed.iter_results
+
+        def record(configs, keep_results=False, done=()):
+            for item in resumed_iter(configs, keep_results, done):
+                ran.append(item[0])
+                yield item
+
+        resumed.iter_results = record
+        table = resumed.resume(configs).to_frame()
+        assert len(ran) == len(configs) - 2
+        assert not os.path.exists(checkpoint_path)
+        table = table.sort_values('config_id').reset_index(drop=True)
+        expected = expected.sort_values('config_id').reset_index(drop=True)
+        assert table[expected.columns].equals(expected)
+
+
+def test_sweep_checkpoints_only_write_new_rows():
+    """Finished rows and kept results go to the journal, not into every checkpoint"""
+    df = make_basket(('A',), periods=160)['A']
+    configs = grid_space({'stop_loss': [0.005, 0.01, 0.02], 'min_probability': [50, 60]})
+    expected_table, expected = ParameterSweep(df, symbol='A', workers=1).run(configs, keep_results=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint_path = os.path.join(tmp, 'sweep.ckpt')
+        interrupted = ParameterSweep(df, symbol='A', workers=1,
+                                     checkpoint_path=checkpoint_path, checkpoint_every=1)
+        iter_results = interrupted.iter_results
+
+        def crash(configs, keep_results=False, done=()):
+            for count, item in enumerate(iter_results(configs, keep_results, done)):
+                if count == 4:
+                    raise KeyboardInterrupt
+                yield item
+
+        interrupted.iter_results = crash
+        try:
+            interrupted.run(configs, keep_results=True)
+            raise AssertionError('sweep was not interrupted')
+        except KeyboardInterrupt:
+            pass
+        with open(checkpoint_path, 'rb') as f:
+            state = pickle.load(f)['state']
+        assert list(state) == ['journal']
+        # All four saves together write the rows and results about once
+        records = CheckpointJournal(checkpoint_path, ('rows', 'results')).restore(state['journal'])
+        assert len(records['rows']) == len(records['results']) == 4
+        assert os.path.getsize(checkpoint_path + '.journal') < 1.5 * len(
+            pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL))
+
+        table, results = ParameterSweep(df, symbol='A', workers=1, checkpoint_path=checkpoint_path,
+                                        checkpoint_every=1).resume(configs, keep_results=True)
+        assert not os.path.exists(checkpoint_path + '.journal')
+        assert sorted(results) == sorted(expected) == list(range(len(configs)))
+        for config_id, result in results.items():
+            assert result.total_return == expected[config_id].total_return
+            assert len(result.trades) == len(expected[config_id].trades)
+        table = table.to_frame().sort_values('config_id').reset_index(drop=True)
+        expected_table = expected_table.to_frame().sort_values('config_id').reset_index(drop=True)
+        assert table[expected_table.columns].equals(expected_table)
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} checkpoint tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized stop-loss / take-profit exit kernel
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from exit_kernel import (EXIT_OPEN, EXIT_SIGNAL, EXIT_STOP, EXIT_TARGET, max_adverse_excursion,
+                         resolve_exits)
+
+
+def make_bars(n=3000, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 1.1 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    high = close * (1 + np.abs(rng.normal(0, 0.0008, n)))
+    low = close * (1 - np.abs(rng.normal(0, 0.0008, n)))
+    return high, low, close
+
+
+def reference_exit(high, low, close, entry, long, entry_price, stop, target,
+                   trail=None, signal_exit=-1, fill='level', same_bar='stop'):
+    """Bar-by-bar loop in the style of the backtesters' _check_exit_conditions"""
+    for t in range(entry + 1, len(close)):
+        if trail is not None and not np.isnan(trail[t]):
+            if long and close[t] > entry_price:
+                stop = max(stop, close[t] - trail[t])
+            elif not long and close[t] < entry_price:
+                stop = min(stop, close[t] + trail[t])
+        stop_hit = low[t] <= stop if long else high[t] >= stop
+        target_hit = high[t] >= target if long else low[t] <= target
+        if stop_hit and (same_bar == 'stop' or not target_hit):
+            return t, (stop if fill == 'level' else close[t]), EXIT_STOP, stop
+        if target_hit:
+            return t, (target if fill == 'level' else close[t]), EXIT_TARGET, stop
+        if t == signal_exit:
+            return t, close[t], EXIT_SIGNAL, stop
+    return -1, np.nan, EXIT_OPEN, stop
+
+
+def random_trades(close, count, seed, width=(0.002, 0.03)):
+    rng = np.random.default_rng(seed)
+    entry = rng.integers(0, len(close) - 1, count)
+    long = rng.random(count) < 0.5
+    price = close[entry]
+    stop_pct, target_pct = rng.uniform(*width, count), rng.uniform(*width, count)
+    stop = np.where(long, price * (1 - stop_pct), price * (1 + stop_pct))
+    target = np.where(long, price * (1 + target_pct), price * (1 - target_pct))
+    return entry, long, price, stop, target
+
+
+def check_against_reference(plan, high, low, close, trades, **options):
+    entry, long, price, stop, target = trades
+    signal_exit = options.pop('signal_exit', None)
+    for k in range(len(entry)):
+        signal = -1 if signal_exit is None else signal_exit[k]
+        index, fill_price, reason, final_stop = reference_exit(
+            high, low, close, entry[k], long[k], price[k], stop[k], target[k],
+            signal_exit=signal, **options)
+        assert plan.index[k] == index, k
+        assert plan.reason[k] == reason, k
+        assert np.array_equal(plan.price[k], fill_price, equal_nan=True), k
+        assert plan.stop[k] == final_stop, k
+
+
+def test_fixed_levels_match_bar_loop():
+    """High/low breaches, fills and same-bar ties match a bar-by-bar loop, over long holds too"""
+    high, low, close = make_bars()
+    for seed, width in ((1, (0.002, 0.03)), (2, (0.0005, 0.002)), (3, (0.05, 0.2))):
+        trades = random_trades(close, 300, seed, width)
+        for same_bar in ('stop', 'target'):
+            plan = resolve_exits(high, low, close, *trades, same_bar=same_bar)
+            check_against_reference(plan, high, low, close, trades, same_bar=same_bar)
+    assert (plan.reason == EXIT_OPEN).any() and (plan.reason == EXIT_TARGET).any()
+
+
+def test_close_triggers_and_signal_exits():
+    """Close-only triggers and earlier signal exits resolve like the loop"""
+    high, low, close = make_bars(seed=9)
+    trades = random_trades(close, 300, 4)
+    signal_exit = trades[0] + np.random.default_rng(4).integers(1, 200, 300)
+    plan = resolve_exits(close, close, close, *trades, signal_exit=signal_exit, fill='close')
+    check_against_reference(plan, close, close, close, trades, signal_exit=signal_exit, fill='close')
+    assert {EXIT_STOP, EXIT_TARGET, EXIT_SIGNAL} <= set(plan.reason.tolist())
+
+
+def test_trailing_stop_matches_bar_loop():
+    """The ratcheting stop is carried across search windows and reported at exit"""
+    high, low, close = make_bars(seed=11)
+    trail = np.abs(np.random.default_rng(11).normal(0.003, 0.001, len(close)))
+    trail[:20] = np.nan
+    trades = random_trades(close, 300, 5, (0.004, 0.08))
+    plan = resolve_exits(high, low, close, *trades, trail_distance=trail)
+    check_against_reference(plan, high, low, close, trades, trail=trail)
+    assert (plan.stop != trades[3]).any()
+
+
+def test_max_adverse_excursion():
+    """Worst move against the trade over the held bars, zero when only favourable"""
+    high = np.array([1.0, 1.02, 1.05, 1.01])
+    low = np.array([1.0, 0.98, 0.99, 0.97])
+    excursion = max_adverse_excursion(high, low, [0, 0, 1], [2, 3, 1], [True, False, True], 1.0)
+    assert np.allclose(excursion, [0.02, 0.05, 0.0])
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} exit kernel tests passed")
+
+
+if __name__ == "__main__":
+    main()
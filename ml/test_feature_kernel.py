@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the fused feature kernel against the ta-based features
+
+The ta comparisons are skipped when ta (ml/requirements.txt, not the CI
+test requirements) is not installed; the kernel and online tests always run.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_features import make_quotes
+from feature_kernel import compute_technical_features
+from online_features import IncrementalFeatureUpdater, OnlineFeatureState
+from technical_predictor import TechnicalPredictor
+
+
+def assert_close(reference, fused):
+    """Same columns, same NaN layout, values equal to rounding"""
+    assert list(reference.columns) == list(fused.columns)
+    for column in reference.columns:
+        expected = reference[column].to_numpy()
+        actual = fused[column].to_numpy()
+        assert np.array_equal(np.isnan(expected), np.isnan(actual)), column
+        scale = np.maximum(np.abs(expected), 1.0)
+        assert np.nanmax(np.abs(expected - actual) / scale) < 1e-9, column
+
+
+def test_kernel_matches_ta_features():
+    """Every column matches the ta implementation, with and without quotes"""
+    pytest.importorskip('ta')
+    predictor = TechnicalPredictor(feature_backend='ta')
+    df = make_quotes(2000, seed=3)
+    assert_close(predictor.calculate_technical_indicators(df), compute_technical_features(df))
+
+    candles = df.drop(columns=['bid', 'ask'])
+    assert_close(predictor.calculate_technical_indicators(candles),
+                 compute_technical_features(candles))
+
+
+def test_kernel_handles_flat_prices():
+    """Flat stretches give the same zero-variance results as pandas"""
+    pytest.importorskip('ta')
+    predictor = TechnicalPredictor(feature_backend='ta')
+    df = make_quotes(300, seed=5)
+    df.iloc[100:140, :] = df.iloc[100].to_numpy()
+    assert_close(predictor.calculate_technical_indicators(df), compute_technical_features(df))
+
+
+def test_online_state_matches_kernel():
+    """Bar-by-bar online rows equal the batch kernel, flat stretches included"""
+    df = make_quotes(600, seed=11)
+    df.iloc[200:240, :] = df.iloc[200].to_numpy()
+    state = OnlineFeatureState(has_volume=True, has_spread=True)
+    rows = [state.update(bar.high, bar.low, bar.close, bar.volume, bar.bid, bar.ask)
+            for bar in df.itertuples()]
+    reference = compute_technical_features(df)
+    assert_close(reference, pd.DataFrame(rows, index=df.index, columns=state.names))
+
+
+def test_updater_resumes_and_rebuilds():
+    """The updater extends a growing frame and restarts on a rewritten one"""
+    df = make_quotes(400, seed=13).drop(columns=['bid', 'ask'])
+    updater = IncrementalFeatureUpdater()
+    for end in (300, 301, 350, 400):
+        row = updater.update('EURUSD', df.iloc[:end])
+        expected = compute_technical_features(df.iloc[:end]).iloc[-1]
+        assert row.name == df.index[end - 1]
+        assert np.allclose(row.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+    assert updater.states['EURUSD'].bars == 400
+
+    shifted = df.iloc[50:].copy()
+    shifted['close'] *= 1.01
+    row = updater.update('EURUSD', shifted)
+    expected = compute_technical_features(shifted).iloc[-1]
+    assert np.allclose(row.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+    assert updater.states['EURUSD'].bars == 350
+
+
+def test_updater_rebuilds_unless_bars_overlap():
+    """Frames without timestamps, or whose recent closes changed, start a new stream"""
+    df = make_quotes(400, seed=13).drop(columns=['bid', 'ask'])
+    updater = IncrementalFeatureUpdater()
+    updater.update('EURUSD', df.iloc[:350])
+    stream = updater.states['EURUSD']
+    updater.update('EURUSD', df.iloc[:360])
+    assert updater.states['EURUSD'] is stream
+    revised = df.iloc[:400].copy()
+    revised.iloc[357, revised.columns.get_loc('close')] *= 1.001
+    row = updater.update('EURUSD', revised)
+    expected = compute_technical_features(revised).iloc[-1]
+    assert np.allclose(row.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+    assert updater.states['EURUSD'] is not stream
+
+    # A 0..n-1 window shifted by 50 bars can end on the same position and close
+    shifted = df.iloc[50:400].reset_index(drop=True)
+    shifted.iloc[-1, shifted.columns.get_loc('close')] = df['close'].iloc[349]
+    updater.reset()
+    updater.update('EURUSD', df.iloc[:350].reset_index(drop=True))
+    stream = updater.states['EURUSD']
+    row = updater.update('EURUSD', shifted)
+    assert updater.states['EURUSD'] is not stream
+    expected = compute_technical_features(shifted).iloc[-1]
+    assert np.allclose(row.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        try:
+            test()
+        except pytest.skip.Exception as e:
+            print(f"- {test.__name__} skipped: {e}")
+            continue
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} feature kernel tests run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk feature store
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_features import make_quotes
+from feature_kernel import compute_technical_features
+from feature_store import FeatureKey, FeatureStore
+
+
+class CountingCompute:
+    """Feature function that records the length of every frame it sees"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, df):
+        self.calls.append(len(df))
+        return compute_technical_features(df)
+
+
+def test_store_serves_appends_and_recomputes():
+    """Covered ranges load from disk, new bars append, revised history rewrites"""
+    df = make_quotes(1000, seed=8).drop(columns=['bid', 'ask'])
+    key = FeatureKey('EURUSD', 'M1', 'technical', '1')
+    compute = CountingCompute()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeatureStore(tmp)
+        first = store.get_or_compute(key, df.iloc[:800], compute)
+
+        cached = store.get_or_compute(key, df.iloc[:800], compute)
+        assert compute.calls == [800]
+        assert not cached.to_numpy().flags.writeable
+        np.testing.assert_array_equal(cached.to_numpy(), first.to_numpy())
+        assert cached.index.equals(df.index[:800])
+
+        store.get_or_compute(key, df, compute)
+        assert [s['rows'] for s in store.schema(key)['segments']] == [800, 200]
+        reference = compute_technical_features(df)
+        window = store.load(key, df.index[700], df.index[900])
+        np.testing.assert_array_equal(window.to_numpy(), reference.iloc[700:901].to_numpy())
+
+        revised = df.copy()
+        revised['close'] *= 1.001
+        store.get_or_compute(key, revised, compute)
+        assert compute.calls == [800, 1000, 1000]
+        assert len(store.schema(key)['segments']) == 1
+
+
+def test_store_sub_ranges_match_fresh_computation():
+    """Shorter frames never replace a longer history and always equal compute(df)"""
+    df = make_quotes(1000, seed=8).drop(columns=['bid', 'ask'])
+    key = FeatureKey('EURUSD', 'M1', 'technical', '1')
+    compute = CountingCompute()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeatureStore(tmp)
+        store.get_or_compute(key, df, compute)
+
+        prefix = store.get_or_compute(key, df.iloc[:500], compute)
+        np.testing.assert_array_equal(prefix.to_numpy(),
+                                      compute_technical_features(df.iloc[:500]).to_numpy())
+        assert compute.calls == [1000]
+
+        for window in (df.iloc[200:], df.iloc[200:600]):
+            features = store.get_or_compute(key, window, compute)
+            np.testing.assert_array_equal(features.to_numpy(),
+                                          compute_technical_features(window).to_numpy())
+        assert compute.calls == [1000, 800, 400]
+
+        store.get_or_compute(key, df, compute)
+        assert compute.calls == [1000, 800, 400]
+        assert store.schema(key)['segments'][0]['rows'] == 1000
+
+
+def test_store_versions_and_invalidation():
+    """A new version replaces the old one; invalidate removes matching entries"""
+    df = make_quotes(300, seed=9)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeatureStore(tmp)
+        old = FeatureKey('GBPUSD', 'H1', 'technical', '1')
+        new = FeatureKey('GBPUSD', 'H1', 'technical', '2')
+        other = FeatureKey('XAUUSD', 'H1', 'technical', '2')
+        features = compute_technical_features(df)
+        store.write(old, features)
+        store.write(new, features)
+        store.write(other, features)
+        assert store.load(old) is None and store.load(new) is not None
+
+        store.MAX_SEGMENTS = 2
+        for end in (320, 340):
+            more = make_quotes(end, seed=9)
+            store.append(new, compute_technical_features(more))
+        assert len(store.schema(new)['segments']) == 1 and len(store.load(new)) == 340
+
+        store.invalidate(symbol='GBPUSD')
+        assert store.load(new) is None and store.load(other) is not None
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} feature store tests passed")
+
+
+if __name__ == "__main__":
+    main()
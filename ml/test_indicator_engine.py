@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Behavioural tests for the indicator package and signal engine
+"""
+import os
+import sys
+import pickle
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from indicators.base import Indicator, MarketFrame, SignalStrength
+from indicators.chaos_indicators import FractalsIndicator
+from indicators.elliott_wave import ElliottWaveDetector
+from indicators.signal_engine import IndicatorPanel, SignalEngine, SignalWeight, SignalSeries
+from indicators.streaming import Ewm, RollingMean, RollingVar, SignalStream, stream_series
+
+
+def make_ohlcv(periods=300, seed=7):
+    """Generate a deterministic OHLCV frame"""
+    rng = np.random.default_rng(seed)
+    close = 1.08 * np.cumprod(1 + rng.normal(0.0001, 0.002, periods))
+    spread = np.abs(rng.normal(0, 0.001, (2, periods)))
+    return pd.DataFrame({
+        'open': np.concatenate([[close[0]], close[:-1]]),
+        'high': close * (1 + spread[0]),
+        'low': close * (1 - spread[1]),
+        'close': close,
+        'volume': rng.integers(1000, 10000, periods).astype(float)
+    }, index=pd.date_range('2024-01-01', periods=periods, freq='h'))
+
+
+class FailingIndicator(Indicator):
+    """Indicator that always raises, used to check error isolation"""
+
+    def __init__(self):
+        super().__init__("Failing")
+
+    def get_required_periods(self) -> int:
+        return 10
+
+    def calculate(self, df, symbol):
+        raise RuntimeError("boom")
+
+
+def _signal_summary(combined):
+    return (combined.signal, round(combined.confidence, 12),
+            round(float(combined.probability), 12), list(combined.contributing_signals))
+
+
+def test_concurrent_matches_sequential():
+    """Concurrent evaluation returns the same ordered results as sequential"""
+    df = make_ohlcv()
+    sequential = SignalEngine()
+    concurrent = SignalEngine(max_workers=4)
+    try:
+        assert _signal_summary(sequential.analyze(df, 'EURUSD')) == \
+            _signal_summary(concurrent.analyze(df, 'EURUSD'))
+    finally:
+        concurrent.shutdown()
+
+
+def test_concurrent_error_isolation():
+    """A failing indicator does not affect the others in concurrent mode"""
+    df = make_ohlcv()
+    engine = SignalEngine(max_workers=4)
+    engine.add_indicator(FailingIndicator(), category=SignalWeight.CONFIRMING)
+    try:
+        results = engine._calculate_all_indicators(df, 'EURUSD')
+        names = [config.indicator.name for config, _ in results]
+        assert 'Failing' not in names
+        assert names == [c.indicator.name for c in engine.configurations
+                         if c.indicator.name in names]
+    finally:
+        engine.shutdown()
+
+
+def test_engine_pickles_with_executor():
+    """An engine with a live thread pool can still be pickled"""
+    engine = SignalEngine(max_workers=2)
+    engine.analyze(make_ohlcv(), 'EURUSD')
+    restored = pickle.loads(pickle.dumps(engine))
+    assert restored._executor is None
+    assert restored.analyze(make_ohlcv(), 'EURUSD').signal in SignalStrength
+    engine.shutdown()
+
+
+def test_market_frame_validation():
+    """The frame validates once and indicators honour its flag"""
+    df = make_ohlcv()
+    frame = MarketFrame(df)
+    assert frame.valid and frame.close.dtype == np.float64
+    assert frame.close.flags['C_CONTIGUOUS']
+    assert frame['close'] is frame['close']
+
+    broken = df.copy()
+    broken.iloc[5, broken.columns.get_loc('low')] = np.nan
+    assert not MarketFrame(broken).valid
+    assert FractalsIndicator().calculate(MarketFrame(broken), 'EURUSD') is None
+    assert not MarketFrame(df.drop(columns=['volume'])).valid
+
+
+def test_fractals_match_reference():
+    """Vectorized fractal search matches the bar-by-bar definition"""
+    df = make_ohlcv(200)
+    indicator = FractalsIndicator()
+    half = indicator.period // 2
+    high, low = df['high'].to_numpy(), df['low'].to_numpy()
+    expected_up = [(i, high[i]) for i in range(half, len(df) - half)
+                   if all(high[j] < high[i] for j in range(i - half, i + half + 1) if j != i)]
+    expected_down = [(i, low[i]) for i in range(half, len(df) - half)
+                     if all(low[j] > low[i] for j in range(i - half, i + half + 1) if j != i)]
+    frame = MarketFrame(df)
+    assert indicator._find_up_fractals(frame) == expected_up
+    assert indicator._find_down_fractals(frame) == expected_down
+
+
+def test_swing_points_match_reference():
+    """Vectorized swing detection matches the bar-by-bar definition"""
+    df = make_ohlcv(300)
+    detector = ElliottWaveDetector()
+    p = detector.swing_period
+    high, low = df['high'].to_numpy(), df['low'].to_numpy()
+    expected_highs = [i for i in range(p, len(df) - p)
+                      if high[i] > high[i - p:i].max() and high[i] >= high[i + 1:i + p + 1].max()]
+    expected_lows = [i for i in range(p, len(df) - p)
+                     if low[i] < low[i - p:i].min() and low[i] <= low[i + 1:i + p + 1].min()]
+    highs, lows = detector._find_swing_points(MarketFrame(df))
+    assert [w.index for w in highs] == expected_highs
+    assert [w.index for w in lows] == expected_lows
+
+
+def test_lazy_results_materialize_and_pickle():
+    """Lazy result fields build on access and survive pickling"""
+    df = make_ohlcv()
+    result = FractalsIndicator().calculate(df, 'EURUSD')
+    assert callable(result._metadata)
+    assert result.metadata['fractal_period'] == FractalsIndicator().period
+    combined = SignalEngine().analyze(df, 'EURUSD')
+    assert list(combined.indicator_names) == list(combined.contributing_signals)
+    restored = pickle.loads(pickle.dumps(combined))
+    assert restored.contributing_signals == combined.contributing_signals
+    assert restored.timestamp == combined.timestamp
+
+
+def test_analyze_series_matches_analyze():
+    """Series analysis rows equal per-window analyze calls"""
+    df = make_ohlcv(120)
+    engine = SignalEngine()
+    series = engine.analyze_series(df, 'EURUSD', start=110)
+    assert isinstance(series, SignalSeries) and len(series) == 11
+    assert series.index[-1] == df.index[-1]
+    for row, end in enumerate(range(110, 121)):
+        expected = engine.analyze(df.iloc[:end], 'EURUSD')
+        assert series.signal_at(row) == expected.signal
+        assert series.probability[row] == expected.probability
+        assert series.market_condition_labels()[row] == expected.market_condition
+
+
+def test_reweighted_panel_matches_analyze_series():
+    """Re-combining stored indicator outputs equals analyzing with those weights"""
+    df = make_ohlcv(200)
+    panel = SignalEngine().precompute(df, 'EURUSD', start=150)
+    assert isinstance(panel, IndicatorPanel) and len(panel) == 51
+    weight_sets = [None, {'Alligator': 2.0, 'Fractals': 0.2}, {'Williams MFI': 1.5}]
+    for weights, combined in zip(weight_sets, panel.combine_many(weight_sets)):
+        expected = SignalEngine(custom_weights=weights).analyze_series(df, 'EURUSD', start=150)
+        assert combined.index.equals(expected.index)
+        assert np.array_equal(combined.signal, expected.signal)
+        assert np.allclose(combined.probability, expected.probability, rtol=0, atol=1e-9)
+        assert np.allclose(combined.confidence, expected.confidence, rtol=0, atol=1e-12)
+        assert np.array_equal(combined.market_condition, expected.market_condition)
+        assert np.array_equal(combined.indicators_used, expected.indicators_used)
+
+
+def test_incremental_wave_patterns_match_full_scan():
+    """Bar-by-bar pattern index matches a full rescan of every window"""
+    df = make_ohlcv(400, seed=3)
+    detector = ElliottWaveDetector()
+
+    def key(patterns):
+        return [[(w.wave_type, w.start_point.index, w.end_point.index, w.confidence)
+                 for w in pattern] for pattern in patterns]
+
+    for end in range(detector.get_required_periods(), len(df) + 1):
+        frame = MarketFrame(df.iloc[:end])
+        detector.calculate(frame, 'EURUSD')
+        index = detector._indices['EURUSD', df.index[1] - df.index[0]]
+        swings = detector._merge_swing_points(*detector._find_swing_points(frame))
+        assert [p.index for p in index.swings] == [p.index for p in swings]
+        impulse, corrective = index.patterns()
+        assert key(impulse) == key(detector._detect_impulse_waves(swings, frame))
+        assert key(corrective) == key(detector._detect_corrective_waves(swings, frame))
+    assert impulse and corrective
+
+
+def test_compact_frame_views_and_guards():
+    """Compact frames are float32, read-only, slice without copying and still analyze"""
+    df = make_ohlcv(400)
+    frame = MarketFrame.compact(df)
+    assert frame.close.dtype == np.float32 and frame.epoch.dtype == np.int64
+    assert frame.nbytes < 0.6 * MarketFrame(df).nbytes
+    assert frame.index.equals(df.index)
+    try:
+        frame.close[0] = 0.0
+        assert False, "compact arrays must be read-only"
+    except ValueError:
+        pass
+
+    window = frame.slice(stop=300)
+    assert np.shares_memory(window.close, frame.close) and window.valid
+    hourly = frame.slice(step=4)
+    assert len(hourly) == 100 and hourly.index[1] == df.index[4]
+
+    broken = df.copy()
+    broken.iloc[250, broken.columns.get_loc('high')] = np.nan
+    broken_frame = MarketFrame.compact(broken)
+    assert broken_frame.slice(stop=250).valid and not broken_frame.slice(stop=251).valid
+    assert broken_frame.slice(step=5).valid is False and broken_frame.slice(step=3).valid
+
+    combined = SignalEngine().analyze(window, 'EURUSD')
+    assert combined.indicators_used > 0
+
+
+def test_rolling_kernels_match_pandas():
+    """Streamed rolling mean/var and EWM equal pandas, including flat runs and NaN prefixes"""
+    rng = np.random.default_rng(1)
+    values = np.round(1.1 * np.exp(np.cumsum(rng.normal(0, 1e-3, 2000))), 4)
+    values[100:130] = values[100]
+    values[:15] = np.nan
+    series = pd.Series(values)
+    for window in (5, 14, 20):
+        mean, var = RollingMean(window), RollingVar(window)
+        assert np.array_equal([mean.push(x) for x in values],
+                              series.rolling(window).mean(), equal_nan=True)
+        assert np.array_equal([var.push(x) for x in values],
+                              series.rolling(window).var(), equal_nan=True)
+    for span in (9, 12, 26):
+        ewm = Ewm(span)
+        assert np.array_equal([ewm.push(x) for x in values],
+                              series.ewm(span=span).mean(), equal_nan=True)
+
+
+def test_signal_stream_matches_analyze():
+    """A bar-by-bar stream gives analyze's signal on every prefix, fallback indicators included"""
+    df = make_ohlcv(260, seed=4)
+    engine = SignalEngine()
+    engine.add_indicator(FailingIndicator())
+    stream = SignalStream(engine, 'EURUSD')
+    bars = df[['open', 'high', 'low', 'close', 'volume']].to_numpy()
+    for end in range(1, len(df) + 1):
+        stream.push(df.index[end - 1], *bars[end - 1])
+        if end < engine.get_required_periods():
+            continue
+        expected = engine.analyze(df.iloc[:end], 'EURUSD')
+        streamed = stream.signal()
+        assert _signal_summary(streamed) == _signal_summary(expected)
+        assert streamed.market_condition == expected.market_condition
+    try:
+        SignalStream(engine, 'EURUSD').signal()
+        assert False, "too few bars must raise like analyze"
+    except ValueError:
+        pass
+
+
+def test_stream_series_matches_analyze_series():
+    """Streamed per-bar series equal analyze_series, including a later start"""
+    df = make_ohlcv(260, seed=6)
+    for start in (None, 120):
+        expected = SignalEngine().analyze_series(df, 'EURUSD', start)
+        streamed = stream_series(SignalEngine(), df, 'EURUSD', start)
+        assert streamed.index.equals(expected.index)
+        for field in ('signal', 'confidence', 'probability', 'indicators_used', 'market_condition'):
+            assert np.array_equal(getattr(streamed, field), getattr(expected, field))
+
+
+def test_high_accuracy_stream_matches_analyze_enhanced():
+    """Streamed enhanced signals equal analyze_enhanced on the same prefixes"""
+    from high_accuracy_engine import HighAccuracyEngine
+    df = make_ohlcv(700, seed=9)
+    engine = HighAccuracyEngine()
+    stream = engine.stream('EURUSD')
+    bars = df[['open', 'high', 'low', 'close', 'volume']].to_numpy()
+    for end in range(1, len(df) + 1):
+        stream.push(df.index[end - 1], *bars[end - 1])
+        if end >= 50 and (end % 9 == 0 or end > 690):
+            expected = engine.analyze_enhanced(df.iloc[:end], 'EURUSD')
+            streamed = stream.signal()
+            for field in ('primary_signal', 'confidence', 'probability', 'confirmations',
+                          'timeframe_alignment', 'market_regime', 'volatility_score',
+                          'entry_score', 'risk_reward_ratio', 'filters_failed'):
+                assert getattr(streamed, field) == getattr(expected, field), (end, field)
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} indicator engine tests passed")
+
+
+if __name__ == "__main__":
+    main()
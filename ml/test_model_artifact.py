@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for compact model artifacts
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_features import make_quotes
+from model_artifact import current_version, load_model_artifact
+from technical_predictor import TechnicalPredictor
+
+
+def _without_timestamps(predictions):
+    return [{k: v for k, v in p.items() if k != 'timestamp'} for p in predictions]
+
+
+def test_artifact_round_trip_predicts_the_same():
+    """A predictor loaded from the artifact predicts exactly like the trained one"""
+    df = make_quotes(1200, seed=21).drop(columns=['bid', 'ask'])
+    trained = TechnicalPredictor()
+    assert trained.train(df.iloc[:1000])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trained.save_model(tmp, metadata={'symbol': 'EURUSD'})
+        loaded = TechnicalPredictor()
+        assert loaded.load_model(tmp)
+        models = loaded.compiled_models
+        assert isinstance(models.direction_model.threshold, np.memmap)
+        assert models.metadata['symbol'] == 'EURUSD'
+        assert loaded.feature_importance == trained.feature_importance
+        assert 'direction_model' not in vars(loaded)
+
+        for end in (1100, 1200):
+            assert _without_timestamps(loaded.predict_next_candles(df.iloc[:end])) == \
+                _without_timestamps(trained.predict_next_candles(df.iloc[:end]))
+
+        # Quote frames have extra columns the model was not trained on
+        neutral = loaded.predict_next_candles(make_quotes(200, seed=22))
+        assert all(p['confidence'] == 0.5 for p in neutral)
+
+
+def test_artifact_versions_swap_atomically():
+    """Each save becomes current through the pointer and old versions are pruned"""
+    df = make_quotes(800, seed=23).drop(columns=['bid', 'ask'])
+    predictor = TechnicalPredictor()
+    assert predictor.train(df)
+    with tempfile.TemporaryDirectory() as tmp:
+        assert load_model_artifact(tmp) is None
+        versions = [predictor.save_model(tmp).name for _ in range(3)]
+        assert current_version(tmp) == versions[-1]
+        assert sorted(os.listdir(tmp)) == sorted(['CURRENT'] + versions[1:])
+        assert load_model_artifact(tmp).metadata['version'] == versions[-1]
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} model artifact tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for background retraining and drift detection
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_features import make_quotes
+from feature_kernel import compute_technical_features
+from model_artifact import current_version, load_model_artifact
+from model_trainer import (BackgroundTrainer, feature_drift, train_model_artifact,
+                           train_symbol_artifacts)
+from technical_predictor import TechnicalPredictor
+
+
+def make_frames():
+    return {symbol: make_quotes(900, seed=seed).drop(columns=['bid', 'ask'])
+            for symbol, seed in (('EURUSD', 31), ('GBPUSD', 32))}
+
+
+def test_background_training_publishes_and_validates():
+    """A worker process trains on pooled symbols and publishes; a failed gate keeps the old model"""
+    frames = make_frames()
+    with tempfile.TemporaryDirectory() as tmp:
+        trainer = BackgroundTrainer(tmp, min_accuracy=0.0)
+        assert trainer.submit(frames, 'test') and not trainer.submit(frames, 'again')
+        deadline = time.time() + 120
+        while (result := trainer.poll()) is None and time.time() < deadline:
+            time.sleep(0.2)
+        trainer.shutdown()
+        assert result['published'], result
+        assert result['symbols'] == ['EURUSD', 'GBPUSD']
+        assert result['samples'] > 1600
+        assert current_version(tmp) == result['version']
+
+        strict = BackgroundTrainer(tmp, min_accuracy=1.01)
+        assert strict.wait() is None
+        assert strict.submit(frames, 'test')
+        rejected = strict.wait()
+        strict.shutdown()
+        assert not rejected['published'] and not strict.running
+        assert current_version(tmp) == result['version']
+
+
+def test_pooled_price_model_serves_every_price_level():
+    """Pooled symbols at ~1.1 and ~2000 share a return target, priced per symbol"""
+    frames = make_frames()
+    gold = frames['GBPUSD'].copy()
+    gold[['open', 'high', 'low', 'close']] *= 1800
+    frames = {'EURUSD': frames['EURUSD'], 'XAUUSD': gold}
+    with tempfile.TemporaryDirectory() as tmp:
+        result = train_model_artifact(frames, tmp, min_accuracy=0.0)
+        assert result['published'], result
+        predictor = TechnicalPredictor()
+        assert predictor.load_model(tmp)
+        assert predictor.compiled_models.metadata['price_target'] == 'return'
+        features, prices = predictor.latest_feature_rows(frames)
+        batch = predictor.predict_batch(features, prices, n_candles=1)
+        for symbol, price in prices.items():
+            assert abs(batch[symbol][0]['predicted_price'] / price - 1) < 0.05, symbol
+
+        # A challenger whose price error is not below the champion's is not published
+        rejected = train_model_artifact(frames, tmp, min_accuracy=0.0, tolerance=1.0,
+                                        price_tolerance=-1.0)
+        assert not rejected['published'] and 'price error' in rejected['reason']
+        assert rejected['current_price_mae'] > 0
+        assert current_version(tmp) == result['version']
+
+
+def test_per_symbol_training_publishes_each_symbol():
+    """Symbols train in separate worker processes, each into its own model directory"""
+    frames = make_frames()
+    with tempfile.TemporaryDirectory() as tmp:
+        results = train_symbol_artifacts(frames, tmp, cores=2, min_accuracy=0.0)
+        assert sorted(results) == ['EURUSD', 'GBPUSD']
+        for symbol, result in results.items():
+            assert result['published'], result
+            assert result['symbols'] == [symbol]
+            assert current_version(os.path.join(tmp, symbol)) == result['version']
+
+
+def test_feature_drift_flags_shifted_features():
+    """Drift is small on the training distribution and large after a level shift"""
+    frames = make_frames()
+    with tempfile.TemporaryDirectory() as tmp:
+        train_model_artifact(frames, tmp, min_accuracy=0.0)
+        models = load_model_artifact(tmp)
+        same = compute_technical_features(frames['EURUSD']).iloc[-100:]
+        shifted = frames['EURUSD'].copy()
+        shifted[['open', 'high', 'low', 'close']] *= 1.5
+        moved = compute_technical_features(shifted).iloc[-100:]
+        assert feature_drift(models, same) < 1.0 < feature_drift(models, moved)
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} model trainer tests passed")
+
+
+if __name__ == "__main__":
+    main()
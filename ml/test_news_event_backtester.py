@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized Monte Carlo trade simulation in NewsEventBacktester
+"""
+import logging
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from news_event_backtester import PATH_EXIT_REASONS, NewsEventBacktester
+from test_signal_engine import generate_test_data
+
+logging.disable(logging.CRITICAL)
+
+
+def reference_exit(path, is_long, stop, tp1, tp2):
+    """Step-by-step loop in the style of the original _simulate_trade_outcome"""
+    for i, price in enumerate(path):
+        if is_long:
+            if price <= stop:
+                return stop, 'stop_loss', i + 1
+            if price >= tp1:
+                return tp1, 'target_1', i + 1
+            if price >= tp2:
+                return tp2, 'target_2', i + 1
+        else:
+            if price >= stop:
+                return stop, 'stop_loss', i + 1
+            if price <= tp1:
+                return tp1, 'target_1', i + 1
+            if price <= tp2:
+                return tp2, 'target_2', i + 1
+    return path[-1], 'time_stop', len(path)
+
+
+def test_path_exits_match_loop():
+    """Batched first-hit exits agree with the per-path loop"""
+    backtester = NewsEventBacktester(seed=1)
+    paths = backtester._generate_price_paths(1.25, 0.004, 60, 2000)
+    assert paths.shape == (2000, 60)
+
+    for is_long, stop, tp1, tp2 in [(True, 1.247, 1.2525, 1.255), (False, 1.253, 1.2475, 1.245),
+                                    (True, 1.2, 1.3, 1.4)]:
+        exit_price, reason, hold = backtester._resolve_path_exits(paths, is_long, stop, tp1, tp2)
+        for k, path in enumerate(paths):
+            ref_price, ref_reason, ref_hold = reference_exit(path, is_long, stop, tp1, tp2)
+            assert exit_price[k] == ref_price
+            assert PATH_EXIT_REASONS[reason[k]] == ref_reason
+            assert hold[k] == ref_hold
+
+
+def test_first_path_is_unchanged_by_path_count():
+    """Path 0 is the same walk whether one path or many are drawn"""
+    backtester = NewsEventBacktester()
+    backtester.rng = np.random.default_rng(7)
+    single = backtester._generate_price_paths(1.1, 0.003, 30, 1)
+    backtester.rng = np.random.default_rng(7)
+    batch = backtester._generate_price_paths(1.1, 0.003, 30, 50)
+    np.testing.assert_array_equal(single[0], batch[0])
+
+    # Sequential cumulative product, same as compounding p * (1 + change) step by step
+    rng = np.random.default_rng(7)
+    changes = rng.normal(0, 0.003 / np.sqrt(30), (1, 30))[0]
+    price, walk = 1.1, []
+    for change in changes:
+        price = price * (1 + change)
+        walk.append(price)
+    np.testing.assert_array_equal(single[0], walk)
+
+
+def run_backtest(**kwargs):
+    df = generate_test_data('GBPUSD', periods=1000)
+    end = datetime.now(timezone.utc)
+    return NewsEventBacktester(**kwargs).run_comprehensive_backtest(
+        df, 'GBPUSD', end - timedelta(days=90), end)
+
+
+def test_seed_reproduces_backtest():
+    first = run_backtest(seed=11)
+    second = run_backtest(seed=11)
+    assert first['summary'] == second['summary']
+    assert [t['pnl'] for t in first['trades']] == [t['pnl'] for t in second['trades']]
+    assert 'monte_carlo' not in first
+
+
+def test_traded_results_are_unchanged_by_path_count():
+    """Every trade's traded path, and so the headline numbers, ignore the path count"""
+    single = run_backtest(seed=42)
+    batch = run_backtest(seed=42, monte_carlo_paths=500)
+    assert single['trades']
+    assert single['summary'] == batch['summary']
+    for a, b in zip(single['trades'], batch['trades'], strict=True):
+        assert (a['pnl'], a['exit_price'], a['exit_reason'], a['hold_time']) == \
+               (b['pnl'], b['exit_price'], b['exit_reason'], b['hold_time'])
+
+
+def test_monte_carlo_distributions():
+    results = run_backtest(seed=11, monte_carlo_paths=200)
+    trades = results['trades']
+    assert trades
+
+    for trade in trades:
+        mc = trade['monte_carlo']
+        assert mc['paths'] == 200
+        assert 0.0 <= mc['win_probability'] <= 1.0
+        assert abs(sum(mc['exit_reasons'].values()) - 1.0) < 1e-9
+        percentiles = list(mc['pnl_percentiles'].values())
+        assert percentiles == sorted(percentiles)
+        assert trade['exit_reason'] in PATH_EXIT_REASONS
+
+    summary = results['monte_carlo']
+    assert summary['paths_per_trade'] == 200
+    assert np.isclose(summary['expected_total_pnl'],
+                      sum(t['monte_carlo']['expected_pnl'] for t in trades))
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} news event backtester tests passed")
+
+
+if __name__ == "__main__":
+    main()
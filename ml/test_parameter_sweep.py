@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel parameter sweep engine
+"""
+import os
+import sys
+
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from parameter_sweep import (ParameterSweep, SharedFrame, expand_params, grid_space,
+                             random_space, reweight_sweep, run_backtest)
+from test_signal_engine import generate_test_data
+
+
+def test_spaces_expand_to_configs():
+    """Grids take every combination; random draws are reproducible and in range"""
+    grid = grid_space({'stop_loss': [0.01, 0.02], 'weights.Alligator': [0.5, 1.0, 1.5]})
+    assert len(grid) == 6 and grid[0] == {'stop_loss': 0.01, 'weights.Alligator': 0.5}
+
+    space = {'take_profit': (0.02, 0.06), 'min_probability': [55, 60, 65]}
+    draws = random_space(space, 20, seed=3)
+    assert draws == random_space(space, 20, seed=3)
+    assert all(0.02 <= d['take_profit'] <= 0.06 and d['min_probability'] in (55, 60, 65)
+               for d in draws)
+
+    params = expand_params({'weights': {'Fractals': 0.8}, 'weights.Alligator': 2.0, 'stop_loss': 0.03})
+    assert params['weights'] == {'Fractals': 0.8, 'Alligator': 2.0}
+    assert params['stop_loss'] == 0.03 and params['take_profit'] == 0.04
+
+
+def test_shared_frame_round_trip():
+    """Workers see the same values and index through shared memory, read-only"""
+    df = generate_test_data('EURUSD', periods=120)
+    with SharedFrame(df) as shared:
+        shm, view = SharedFrame.attach(shared.spec)
+        try:
+            assert view.index.equals(df.index)
+            assert np.array_equal(view[['open', 'high', 'low', 'close']].to_numpy(),
+                                  df[['open', 'high', 'low', 'close']].to_numpy())
+            assert not view['close'].to_numpy().flags.writeable
+        finally:
+            del view
+            shm.close()
+
+
+def test_sweep_matches_sequential_backtests():
+    """Runs in worker processes give the same metrics as running in-process"""
+    df = generate_test_data('EURUSD', periods=160)
+    configs = grid_space({'stop_loss': [0.005, 0.02], 'min_probability': [50, 60]})
+    table, results = ParameterSweep(df, symbol='EURUSD', workers=2).run(configs, keep_results=True)
+    assert len(table) == len(configs) == len(results)
+    for row in table.to_frame().to_dict('records'):
+        expected = run_backtest(df, configs[row['config_id']], 'EURUSD')
+        assert row['total_trades'] == expected.total_trades
+        assert np.isclose(row['total_return_pct'], expected.total_return_pct)
+        assert results[row['config_id']].final_capital == expected.final_capital
+    assert table.best('total_return_pct')['total_return_pct'] == table.column('total_return_pct').max()
+
+
+def test_reweight_sweep_matches_full_backtests():
+    """Configs re-scored from one indicator pass trade exactly as full backtests"""
+    df = generate_test_data('EURUSD', periods=220)
+    configs = grid_space({'weights.Alligator': [0.5, 2.0], 'stop_loss': [0.002, 0.02],
+                          'min_probability': [55, 65]})
+    table = reweight_sweep(df, configs, symbol='EURUSD')
+    assert list(table.column('config_id')) == list(range(len(configs)))
+    for config, row in zip(configs, table.to_frame().to_dict('records')):
+        expected = run_backtest(df, config, 'EURUSD')
+        assert row['total_trades'] == expected.total_trades
+        assert row['total_return_pct'] == expected.total_return_pct
+        assert row['max_drawdown_pct'] == expected.max_drawdown_pct
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} parameter sweep tests passed")
+
+
+if __name__ == "__main__":
+    main()
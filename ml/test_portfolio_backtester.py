@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-symbol portfolio backtester
+"""
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backtester import SignalBacktester
+from indicators.signal_engine import SignalEngine
+from indicators.streaming import stream_series
+from portfolio_backtester import PortfolioBacktester
+
+logging.disable(logging.CRITICAL)
+
+
+def make_basket(symbols=('EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD'), periods=400):
+    """Random-walk bars per symbol on staggered hourly clocks"""
+    data = {}
+    for k, symbol in enumerate(symbols):
+        rng = np.random.default_rng(k + 1)
+        close = 1.1 * np.exp(np.cumsum(rng.normal(0, 0.004, periods)))
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        spread = np.abs(rng.normal(0, 0.002, periods))
+        start = pd.Timestamp('2024-01-01') + pd.Timedelta(minutes=30 * k)
+        index = pd.date_range(start, periods=periods, freq='h')
+        data[symbol] = pd.DataFrame({
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + spread),
+            'low': np.minimum(open_, close) * (1 - spread),
+            'close': close,
+            'volume': rng.integers(100, 1000, periods).astype(float)
+        }, index=index)
+    return data
+
+
+def trade_records(trades):
+    return [(t.entry_time, t.exit_time, t.direction, t.entry_price, t.exit_price, t.pnl,
+             t.exit_signal, t.max_drawdown) for t in trades]
+
+
+def test_single_symbol_matches_signal_backtester():
+    """One symbol with one position slot trades exactly like SignalBacktester"""
+    df = make_basket(('EURUSD',))['EURUSD']
+    series = stream_series(SignalEngine(), df, 'EURUSD')
+    reference = SignalBacktester()
+    reference.min_probability = 50
+    expected = reference.run_series(df, series, 'EURUSD')
+
+    backtester = PortfolioBacktester(workers=1)
+    backtester.max_positions = 1
+    backtester.min_probability = 50
+    result = backtester.run({'EURUSD': df}, {'EURUSD': series})
+    assert result.total_trades == expected.total_trades > 0
+    assert trade_records(result.trades) == trade_records(expected.trades)
+    assert result.final_capital == expected.final_capital
+
+
+def test_basket_shares_one_book():
+    """Positions across symbols respect the limit and settle into one capital"""
+    data = make_basket()
+    backtester = PortfolioBacktester(workers=1)
+    backtester.max_positions = 2
+    backtester.min_probability = 50
+    result = backtester.run(data)
+
+    assert result.total_trades > 0
+    assert 1 <= result.max_concurrent_positions <= 2
+    assert {t.symbol for t in result.trades} <= set(data)
+    assert np.isclose(result.final_capital, result.initial_capital + sum(t.pnl for t in result.trades))
+    assert sum(s['trades'] for s in result.symbol_performance.values()) == result.total_trades
+
+    # No more than two positions overlap at any time
+    for trade in result.trades:
+        overlapping = [t for t in result.trades
+                       if t.entry_time <= trade.entry_time < t.exit_time]
+        assert len(overlapping) <= 2
+
+    # Equity is marked once per timestamp of the merged clock
+    curve = result.equity_curve
+    assert curve.index.is_monotonic_increasing and curve.index.is_unique
+    required = backtester.signal_engine.get_required_periods()
+    clock = set()
+    for df in data.values():
+        clock.update(df.index[required:])
+    assert len(curve) == len(clock)
+
+
+def test_parallel_signals_match_serial():
+    data = make_basket(('EURUSD', 'GBPUSD'), periods=200)
+    serial = PortfolioBacktester(workers=1).compute_signals(data)
+    parallel = PortfolioBacktester(workers=2).compute_signals(data)
+    for symbol in data:
+        assert parallel[symbol].index.equals(serial[symbol].index)
+        assert np.array_equal(parallel[symbol].signal, serial[symbol].signal)
+        assert np.array_equal(parallel[symbol].probability, serial[symbol].probability)
+
+
+def test_frames_without_timestamps_are_rejected():
+    """A RangeIndex frame cannot join the shared clock, so run() says so up front"""
+    data = make_basket(('EURUSD', 'GBPUSD'), periods=120)
+    data['GBPUSD'] = data['GBPUSD'].reset_index(drop=True)
+    try:
+        PortfolioBacktester(workers=1).run(data)
+        raise AssertionError('RangeIndex frame was accepted')
+    except ValueError as e:
+        assert 'DatetimeIndex' in str(e) and 'GBPUSD' in str(e) and 'EURUSD' not in str(e)
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} portfolio backtester tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for columnar backtest results (chunked NPZ archive + JSON summary)
+"""
+import logging
+import os
+import sys
+import tempfile
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backtester import SignalBacktester
+from indicators.signal_engine import SignalEngine
+from indicators.streaming import stream_series
+from result_store import ResultReader, ResultWriter, equity_stats, trade_stats
+from test_portfolio_backtester import make_basket
+
+logging.disable(logging.CRITICAL)
+
+
+def test_chunked_round_trip():
+    """Records written across many chunks read back unchanged"""
+    rng = np.random.default_rng(3)
+    times = pd.date_range('2024-01-01', periods=50, freq='h', tz='UTC')
+    pnl = rng.normal(0, 10, 50)
+    equity = 10000 + np.cumsum(rng.normal(0, 5, 123))
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'run')
+        writer = ResultWriter(path, chunk_rows=7)
+        for k in range(50):
+            writer.append_trade({'entry_time': times[k], 'direction': 'long' if k % 2 else 'short',
+                                 'pnl': pnl[k], 'bars': k})
+        writer.extend_equity(equity)
+        writer.close({'total_trades': 50})
+
+        with ResultReader(path + '.json') as reader:
+            assert len(reader) == 50 and reader.summary == {'total_trades': 50}
+            assert reader.meta['chunks'] == {'trades': 8, 'equity': 18}
+            assert all(len(chunk['pnl']) <= 7 for chunk in reader.iter_trades(['pnl']))
+            trades = reader.trades()
+            assert np.array_equal(trades['pnl'], pnl)
+            assert np.array_equal(trades['bars'], np.arange(50))
+            assert list(trades['direction'][:2]) == ['short', 'long']
+            assert (pd.DatetimeIndex(trades['entry_time']).tz_localize('UTC') == times).all()
+            assert np.array_equal(reader.equity(), equity)
+
+            # Streamed statistics equal the full-array ones
+            stats = trade_stats(chunk['pnl'] for chunk in reader.iter_trades(['pnl']))
+            assert stats['winning_trades'] == (pnl > 0).sum()
+            assert np.isclose(stats['gross_loss'], -pnl[pnl <= 0].sum())
+            assert stats['best_trade'] == pnl.max() and stats['worst_trade'] == pnl.min()
+            series = pd.Series(equity)
+            returns = series.pct_change().dropna()
+            streamed = equity_stats(reader.iter_equity())
+            assert np.isclose(streamed['returns_mean'], returns.mean())
+            assert np.isclose(streamed['returns_std'], returns.std())
+            drawdown = abs(((series - series.expanding().max()) / series.expanding().max()).min())
+            assert streamed['max_drawdown'] == drawdown
+
+
+def test_signal_backtester_columnar_results():
+    """A run written to results_path reports the same metrics as one kept in memory"""
+    df = make_basket(('EURUSD',), periods=1000)['EURUSD']
+    series = stream_series(SignalEngine(), df, 'EURUSD')
+    memory = SignalBacktester()
+    memory.min_probability = 50
+    expected = memory.run_series(df, series, 'EURUSD')
+
+    with tempfile.TemporaryDirectory() as folder:
+        streamed = SignalBacktester(results_path=os.path.join(folder, 'run'))
+        streamed.min_probability = 50
+        result = streamed.run_series(df, series, 'EURUSD')
+        assert result.trades == [] and result.total_trades == expected.total_trades > 0
+        for field, value in asdict(expected).items():
+            if field == 'trades':
+                continue
+            got = getattr(result, field)
+            if isinstance(value, float):
+                assert np.isclose(got, value), field
+            else:
+                assert got == value, field
+
+        with ResultReader(os.path.join(folder, 'run')) as reader:
+            assert np.array_equal(reader.equity(), memory.equity_curve)
+            trades = reader.trades()
+            assert list(trades['pnl']) == [t.pnl for t in expected.trades]
+            assert list(trades['exit_signal']) == [t.exit_signal for t in expected.trades]
+            assert np.isclose(reader.summary['sharpe_ratio'], expected.sharpe_ratio)
+
+
+def test_high_accuracy_columnar_results():
+    """HighAccuracyBacktester writes the same trades and metrics it would keep in memory"""
+    from high_accuracy_backtester import HighAccuracyBacktester
+    df = make_basket(('EURUSD',), periods=500)['EURUSD']
+
+    def backtester(**kwargs):
+        backtester = HighAccuracyBacktester(**kwargs)
+        # Take every signal so the short series produces trades
+        backtester.engine.should_enter_trade = lambda signal: (True, '')
+        return backtester
+
+    memory = backtester()
+    expected = memory.run(df, 'EURUSD')
+    with tempfile.TemporaryDirectory() as folder:
+        results = backtester(results_path=os.path.join(folder, 'high_accuracy')).run(df, 'EURUSD')
+        assert results['trades'] == [] and os.path.exists(results['results_file'])
+        assert results['performance']['total_trades'] == len(expected['trades']) > 0
+        for section in ('performance', 'signal_analysis'):
+            for key, value in expected[section].items():
+                assert np.isclose(results[section][key], value), key
+
+        with ResultReader(results['results_file']) as reader:
+            assert reader.summary['performance']['total_trades'] == len(expected['trades'])
+            assert np.array_equal(reader.equity(), expected['equity_curve'])
+            trades = reader.trades(['pnl', 'exit_signal'])
+            assert list(trades['pnl']) == [t['pnl'] for t in expected['trades']]
+            assert list(trades['exit_signal']) == [t['exit_signal'] for t in expected['trades']]
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} result store tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for TechnicalPredictor construction, lazy components and batch prediction
+"""
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_features import make_quotes
+from technical_predictor import TechnicalPredictor
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_import_skips_heavy_modules():
+    """Importing and constructing the predictor loads neither sklearn nor the suites"""
+    code = ("import sys; from technical_predictor import TechnicalPredictor; TechnicalPredictor(); "
+            "print(sorted(m for m in ('sklearn', 'ta', 'scipy.signal', 'unified_aggressive_trading')"
+            " if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ML_DIR,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == '[]'
+
+
+def test_suites_build_on_demand():
+    """Suites are built once on first use and pickle like plain attributes"""
+    predictor = TechnicalPredictor()
+    assert 'news_trader' not in vars(predictor)
+    predictor.enable_aggressive_sizing(True, account_balance=2500)
+    assert 'position_manager' in vars(predictor)
+    assert predictor.position_manager is predictor.position_manager
+    assert 'unified_aggressive' not in vars(predictor)
+
+    restored = pickle.loads(pickle.dumps(predictor))
+    assert restored.position_manager.account_balance == 2500
+    assert 'unified_aggressive' not in vars(restored)
+    assert restored.unified_aggressive is not None
+
+
+def test_predict_batch_matches_single_symbol_predictions():
+    """One batched call reproduces predict_next_candles for every symbol"""
+    frames = {symbol: make_quotes(600, seed=seed).drop(columns=['bid', 'ask'])
+              for symbol, seed in (('EURUSD', 41), ('GBPUSD', 42), ('USDJPY', 43))}
+    predictor = TechnicalPredictor()
+    assert predictor.train(frames['EURUSD'])
+
+    features, prices = predictor.latest_feature_rows(frames)
+    assert list(features.index) == list(frames) and list(prices.index) == list(frames)
+    analyses = {symbol: predictor.analyze_signals(df, symbol) for symbol, df in frames.items()}
+    batch = predictor.predict_batch(features, prices, n_candles=4, signal_analyses=analyses)
+    for symbol, df in frames.items():
+        single = predictor.predict_next_candles(df, n_candles=4, symbol=symbol)
+        assert len(batch[symbol]) == len(single) == 4
+        for ours, theirs in zip(batch[symbol], single):
+            assert ours['direction'] == theirs['direction']
+            assert ours['signal_engine'] == theirs['signal_engine']
+            assert ours['technical_scores'] == theirs['technical_scores']
+            for key in ('predicted_price', 'confidence', 'upper_bound', 'lower_bound'):
+                assert np.isclose(ours[key], theirs[key], rtol=1e-12), key
+
+
+def test_untimestamped_prices_use_fresh_features():
+    """Price lists without timestamps are never matched to an earlier request"""
+    prices = make_quotes(400, seed=45)['bid'].to_numpy()
+    prices[349] = prices[399]
+    predictor = TechnicalPredictor()
+    predictor.latest_feature_rows({'EURUSD': pd.Series(prices[:350])})
+    features, _ = predictor.latest_feature_rows({'EURUSD': pd.Series(prices[50:400])})
+    expected = predictor.calculate_technical_indicators(
+        pd.DataFrame({'bid': pd.Series(prices[50:400])})).dropna().iloc[-1]
+    assert np.allclose(features.loc['EURUSD'].to_numpy(dtype=np.float64),
+                       expected.to_numpy(dtype=np.float64), rtol=1e-12)
+
+
+def test_predict_batch_is_neutral_without_models():
+    """Untrained predictors return neutral candles at each symbol's price"""
+    frames = {'EURUSD': make_quotes(300, seed=44).drop(columns=['bid', 'ask'])}
+    predictor = TechnicalPredictor()
+    features, prices = predictor.latest_feature_rows(frames)
+    batch = predictor.predict_batch(features, prices, n_candles=3)
+    assert [p['direction'] for p in batch['EURUSD']] == ['NEUTRAL'] * 3
+    assert batch['EURUSD'][0]['predicted_price'] == prices['EURUSD']
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} technical predictor tests passed")
+
+
+if __name__ == "__main__":
+    main()
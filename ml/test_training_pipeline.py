@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the training pipeline and its feature matrix artifact
+"""
+import os
+import sys
+import tempfile
+from unittest import mock
+
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_features import make_quotes
+from feature_kernel import compute_technical_features
+from technical_predictor import TechnicalPredictor
+from training_pipeline import TrainingPipeline, TrainingSet, resolve_cores
+
+
+class CountingPredictor(TechnicalPredictor):
+    """Predictor that counts feature computations"""
+
+    def __init__(self):
+        super().__init__()
+        self.feature_calls = 0
+
+    def calculate_technical_indicators(self, df):
+        self.feature_calls += 1
+        return super().calculate_technical_indicators(df)
+
+
+def test_train_computes_features_once():
+    """Training builds the matrix once and names importances from it"""
+    df = make_quotes(800, seed=4).drop(columns=['bid', 'ask'])
+    predictor = CountingPredictor()
+    assert predictor.train(df)
+    assert predictor.feature_calls == 1
+    assert list(predictor.feature_importance) == \
+        list(predictor.calculate_technical_indicators(df).columns)
+
+
+def test_training_set_round_trip():
+    """A saved set reloads with identical matrix, mask and targets and trains the same"""
+    df = make_quotes(800, seed=6).drop(columns=['bid', 'ask'])
+    pipeline = TrainingPipeline(TechnicalPredictor())
+    built = pipeline.build(df)
+    X, y_dir, y_price = pipeline.predictor.prepare_training_data(df)
+    assert np.array_equal(built.X, X) and np.array_equal(built.targets[0], y_dir)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'EURUSD_M1.npz')
+        built.save(path)
+        loaded = TrainingSet.load(path)
+        assert loaded.feature_names == built.feature_names
+        assert loaded.index.equals(built.index)
+        assert np.array_equal(loaded.mask, built.mask)
+        assert np.array_equal(loaded.features, built.features, equal_nan=True)
+        assert pipeline.load_or_build(df, path).index.equals(df.index)
+
+        fresh, reloaded = TechnicalPredictor(), TechnicalPredictor()
+        assert fresh.train(df) and reloaded.train(None, training_set=loaded)
+        assert fresh.feature_importance == reloaded.feature_importance
+
+
+def test_stale_training_sets_are_rebuilt():
+    """Revised bars, another feature backend or a feature set bump force a rebuild"""
+    df = make_quotes(800, seed=6).drop(columns=['bid', 'ask'])
+    predictor = CountingPredictor()
+    pipeline = TrainingPipeline(predictor)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'EURUSD_M1.npz')
+        pipeline.load_or_build(df, path)
+        pipeline.load_or_build(df.copy(), path)
+        assert predictor.feature_calls == 1
+
+        revised = df.copy()
+        revised.iloc[-20:, revised.columns.get_loc('close')] *= 1.001
+        rebuilt = pipeline.load_or_build(revised, path)
+        assert predictor.feature_calls == 2
+        assert np.array_equal(rebuilt.features, pipeline.build(revised).features, equal_nan=True)
+        predictor.feature_calls = 0
+
+        with mock.patch('training_pipeline.FEATURE_SET_VERSION', 2):
+            pipeline.load_or_build(revised, path)
+            pipeline.load_or_build(revised, path)
+        assert predictor.feature_calls == 1
+        assert TrainingSet.load(path).feature_set == 'technical-numpy-v2'
+
+        predictor.feature_backend = 'ta'
+        with mock.patch.object(TechnicalPredictor, 'calculate_technical_indicators',
+                               lambda self, frame: compute_technical_features(frame)):
+            pipeline.load_or_build(revised, path)
+        assert predictor.feature_calls == 2
+        assert TrainingSet.load(path).feature_set == 'technical-ta-v1'
+
+
+def test_parallel_fit_matches_sequential():
+    """Fitting both models concurrently, with a parallel forest, gives the same models"""
+    df = make_quotes(800, seed=8).drop(columns=['bid', 'ask'])
+    training_set = TrainingPipeline(TechnicalPredictor()).build(df)
+    sequential, parallel = TechnicalPredictor(), TechnicalPredictor(n_jobs=-1)
+    with mock.patch('os.cpu_count', return_value=4):
+        assert resolve_cores(-1) == 4 and resolve_cores(8) == 4
+        assert sequential.train(None, training_set=training_set)
+        assert parallel.train(None, training_set=training_set)
+    assert parallel.direction_model.n_jobs == 3
+    assert sequential.training_metrics == parallel.training_metrics
+    for component in ('direction_model', 'price_model'):
+        flat_seq = getattr(sequential.compiled_models, component).arrays()
+        flat_par = getattr(parallel.compiled_models, component).arrays()
+        assert all(np.array_equal(flat_seq[k], flat_par[k]) for k in flat_seq)
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} training pipeline tests passed")
+
+
+if __name__ == "__main__":
+    main()
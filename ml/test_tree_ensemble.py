@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Parity tests for flattened tree-ensemble inference against sklearn
+"""
+import os
+import sys
+
+import numpy as np
+from sklearn.ensemble import (GradientBoostingClassifier, GradientBoostingRegressor,
+                              RandomForestClassifier, RandomForestRegressor)
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from adaptive_learner import ModelEnsemble
+from tree_ensemble import FlatTreeEnsemble
+
+
+def make_data(seed=0):
+    """Features plus binary, three-class and continuous targets"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(1200, 12))
+    noise = rng.normal(size=1200)
+    return (X, (X[:, 0] + noise > 0).astype(int),
+            np.digitize(X[:, 1] + noise, [-0.5, 0.5]), X[:, 2] * 3 + noise,
+            rng.normal(size=(200, 12)))
+
+
+def test_classifiers_match_sklearn():
+    """Probabilities and labels match for forests and binary/multiclass boosting"""
+    X, binary, three_class, _, X_new = make_data()
+    models = [
+        (RandomForestClassifier(n_estimators=40, max_depth=8, random_state=1), binary),
+        (RandomForestClassifier(n_estimators=20, random_state=2), three_class),
+        (GradientBoostingClassifier(n_estimators=40, random_state=3), binary),
+        (GradientBoostingClassifier(n_estimators=20, random_state=4), three_class),
+    ]
+    for model, y in models:
+        model.fit(X, y)
+        flat = FlatTreeEnsemble.from_sklearn(model)
+        labels, proba = flat.predict_with_proba(X_new)
+        assert np.allclose(proba, model.predict_proba(X_new), rtol=0, atol=1e-12)
+        assert np.array_equal(labels, model.predict(X_new))
+        assert np.allclose(flat.predict_proba(X_new[7]), model.predict_proba(X_new[7:8]),
+                           rtol=0, atol=1e-12)
+
+
+def test_regressors_match_sklearn():
+    """Boosting and forest regressors agree to rounding, batch and single row"""
+    X, _, _, target, X_new = make_data(1)
+    for model in (GradientBoostingRegressor(n_estimators=60, max_depth=5, random_state=5),
+                  RandomForestRegressor(n_estimators=20, random_state=6)):
+        model.fit(X, target)
+        flat = FlatTreeEnsemble.from_sklearn(model)
+        assert np.allclose(flat.predict(X_new), model.predict(X_new), rtol=1e-12, atol=1e-12)
+        assert np.allclose(flat.predict(X_new[:1]), model.predict(X_new[:1]),
+                           rtol=1e-12, atol=1e-12)
+
+
+def test_model_ensemble_uses_flat_models():
+    """ModelEnsemble flattens its tree models and keeps sklearn's answers"""
+    X, binary, _, _, X_new = make_data(2)
+    ensemble = ModelEnsemble()
+    ensemble.update_model('trending', X, binary)
+    assert set(ensemble.compiled) == {'random_forest', 'gradient_boost'}
+    for row in X_new[:20]:
+        expected = [model.predict_proba(ensemble.scaler.transform(row.reshape(1, -1)))[0][1]
+                    for model in ensemble.models.values()]
+        assert np.allclose(ensemble.predict_all(row), expected, rtol=0, atol=1e-12)
+
+
+def test_model_ensemble_parallel_fit():
+    """Fitting the ensemble's models concurrently gives the same forest"""
+    X, binary, _, _, X_new = make_data(2)
+    sequential, parallel = ModelEnsemble(), ModelEnsemble(n_jobs=2)
+    for ensemble in (sequential, parallel):
+        ensemble.models['random_forest'].set_params(random_state=7)
+        ensemble.update_model('trending', X, binary)
+    assert set(parallel.compiled) == {'random_forest', 'gradient_boost'}
+    assert np.array_equal(sequential.compiled['random_forest'].predict_proba(X_new),
+                          parallel.compiled['random_forest'].predict_proba(X_new))
+
+
+def main():
+    """Run all tests"""
+    tests = [obj for name, obj in sorted(globals().items())
+             if name.startswith('test_') and callable(obj)]
+    for test in tests:
+        test()
+        print(f"✓ {test.__name__}")
+    print(f"\n✓ {len(tests)} tree ensemble tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Training Pipeline
+Computes the TechnicalPredictor feature matrix once per history and keeps it,
+with its column names, row mask and targets, as a reusable artifact
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from checkpoint import data_fingerprint
+from feature_kernel import FEATURE_SET_VERSION, frame_feature_names
+from feature_store import FeatureKey
+from model_artifact import CompiledModels
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 3
+
+# The price model predicts the return over the horizon, a target that pools
+# across symbols of any price level; predictions are priced from the current close
+PRICE_TARGET = 'return'
+
+
+def resolve_cores(n_jobs: Optional[int]) -> int:
+    """Cores for an n_jobs setting: None means 1, negative counts back from all cores"""
+    if not n_jobs:
+        return 1
+    available = os.cpu_count() or 1
+    if n_jobs < 0:
+        return max(available + 1 + n_jobs, 1)
+    return min(n_jobs, available)
+
+
+@dataclass
+class TrainingSet:
+    """Feature matrix over every input bar plus the mask of trainable rows"""
+    features: np.ndarray        # (bars, features), NaN where indicators warm up
+    feature_names: Tuple[str, ...]
+    index: pd.Index
+    mask: np.ndarray            # rows with complete features and targets
+    y_direction: np.ndarray     # aligned with features; valid where mask is set
+    y_price: np.ndarray
+    close: np.ndarray           # close of each bar, which y_price is relative to
+    prediction_horizon: int
+    feature_set: str = ''       # backend and feature set version the matrix was built with
+    data_hash: str = ''         # fingerprint of the input bars ('' for pooled sets)
+
+    def __len__(self) -> int:
+        return int(self.mask.sum())
+
+    @property
+    def X(self) -> np.ndarray:
+        return self.features[self.mask]
+
+    @property
+    def targets(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.y_direction[self.mask].astype(int), self.y_price[self.mask]
+
+    @property
+    def returns(self) -> np.ndarray:
+        """Price model target: return from each row's close to its y_price"""
+        return self.y_price[self.mask] / self.close[self.mask] - 1
+
+    @classmethod
+    def concat(cls, sets: Sequence['TrainingSet']) -> 'TrainingSet':
+        """
+        Pool sets with the same features (e.g. several symbols) into one,
+        ordered by bar time so a chronological split stays chronological
+        """
+        sets = [s for s in sets if s is not None]
+        names = sets[0].feature_names
+        if any(s.feature_names != names for s in sets):
+            raise ValueError("Cannot pool training sets with different features")
+        index = sets[0].index.append([s.index for s in sets[1:]])
+        order = np.argsort(np.asarray(index), kind='stable')
+        return cls(
+            features=np.concatenate([s.features for s in sets])[order],
+            feature_names=names,
+            index=index[order],
+            mask=np.concatenate([s.mask for s in sets])[order],
+            y_direction=np.concatenate([s.y_direction for s in sets])[order],
+            y_price=np.concatenate([s.y_price for s in sets])[order],
+            close=np.concatenate([s.close for s in sets])[order],
+            prediction_horizon=sets[0].prediction_horizon,
+            feature_set=sets[0].feature_set
+        )
+
+    def frame(self) -> pd.DataFrame:
+        """Feature matrix as a DataFrame view"""
+        return pd.DataFrame(self.features, index=self.index,
+                            columns=list(self.feature_names), copy=False)
+
+    def save(self, path) -> Path:
+        """Write the set as an uncompressed .npz artifact"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        index = self.index
+        is_time = isinstance(index, pd.DatetimeIndex)
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                version=np.array(ARTIFACT_VERSION),
+                features=self.features,
+                feature_names=np.array(self.feature_names),
+                index=index.asi8 if is_time else np.asarray(index),
+                index_is_time=np.array(is_time),
+                index_tz=np.array(str(index.tz) if is_time and index.tz else ''),
+                mask=self.mask,
+                y_direction=self.y_direction,
+                y_price=self.y_price,
+                close=self.close,
+                prediction_horizon=np.array(self.prediction_horizon),
+                feature_set=np.array(self.feature_set),
+                data_hash=np.array(self.data_hash)
+            )
+        return path
+
+    @classmethod
+    def load(cls, path) -> 'TrainingSet':
+        """Read an artifact written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported training set version in {path}")
+            index = data['index']
+            if bool(data['index_is_time']):
+                index = pd.DatetimeIndex(index.view('datetime64[ns]'))
+                tz = str(data['index_tz'])
+                if tz:
+                    index = index.tz_localize('UTC').tz_convert(tz)
+            else:
+                index = pd.Index(index)
+            return cls(
+                features=data['features'],
+                feature_names=tuple(data['feature_names'].tolist()),
+                index=index,
+                mask=data['mask'],
+                y_direction=data['y_direction'],
+                y_price=data['y_price'],
+                close=data['close'],
+                prediction_horizon=int(data['prediction_horizon']),
+                feature_set=str(data['feature_set']),
+                data_hash=str(data['data_hash'])
+            )
+
+
+class TrainingPipeline:
+    """
+    Builds a TrainingSet for a predictor and fits its models from it
+
+    Features are engineered once per build; fitting, feature importance and
+    any later retrain on the same history reuse the stored matrix. With a
+    FeatureStore, builds for a symbol/timeframe read stored features and
+    compute only bars the store has not seen.
+    """
+
+    MIN_BARS = 100
+    MIN_SAMPLES = 200
+
+    def __init__(self, predictor, prediction_horizon: int = 5, feature_store=None):
+        self.predictor = predictor
+        self.prediction_horizon = prediction_horizon
+        self.feature_store = feature_store
+
+    def feature_key(self, symbol: str, timeframe: str = None) -> FeatureKey:
+        backend = getattr(self.predictor, 'feature_backend', 'numpy')
+        return FeatureKey(symbol, timeframe or 'default', f"technical-{backend}",
+                          str(FEATURE_SET_VERSION))
+
+    def feature_set_id(self) -> str:
+        """Feature backend and feature set version, as stored in a TrainingSet"""
+        key = self.feature_key('')
+        return f"{key.feature_set}-v{key.version}"
+
+    def build(self, df: pd.DataFrame, symbol: str = None,
+              timeframe: str = None) -> Optional[TrainingSet]:
+        """Compute features and targets for df, or None if it is too short"""
+        if self.feature_store is not None and symbol is not None:
+            self.predictor._ensure_ohlcv(df)
+            features = self.feature_store.get_or_compute(
+                self.feature_key(symbol, timeframe), df,
+                self.predictor.calculate_technical_indicators)
+        else:
+            features = self.predictor.calculate_technical_indicators(df)
+        if features.empty or len(features) < self.MIN_BARS:
+            return None
+
+        close = df['close'].to_numpy(dtype=np.float64)
+        horizon = self.prediction_horizon
+        y_price = np.full(len(close), np.nan)
+        if horizon < len(close):
+            y_price[:len(close) - horizon] = close[horizon:]
+        future_returns = y_price / close - 1
+        y_direction = (future_returns > 0).astype(np.int8)
+
+        matrix = features.to_numpy(dtype=np.float64)
+        mask = ~(np.isnan(matrix).any(axis=1) | np.isnan(y_price))
+        return TrainingSet(
+            features=matrix,
+            feature_names=tuple(features.columns),
+            index=features.index,
+            mask=mask,
+            y_direction=y_direction,
+            y_price=y_price,
+            close=close,
+            prediction_horizon=horizon,
+            feature_set=self.feature_set_id(),
+            data_hash=data_fingerprint(df)
+        )
+
+    def load_or_build(self, df: pd.DataFrame, path) -> Optional[TrainingSet]:
+        """
+        Reuse the artifact at path when it was built from the same bars
+        (timestamps and values), horizon, feature backend and feature set
+        version, otherwise build and save a fresh one
+        """
+        path = Path(path)
+        if path.exists():
+            try:
+                cached = TrainingSet.load(path)
+                self.predictor._ensure_ohlcv(df)
+                if (cached.prediction_horizon == self.prediction_horizon
+                        and cached.feature_set == self.feature_set_id()
+                        and cached.feature_names == tuple(frame_feature_names(df))
+                        and cached.index.equals(df.index)
+                        and cached.data_hash == data_fingerprint(df)):
+                    return cached
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring training set at {path}: {e}")
+        training_set = self.build(df)
+        if training_set is not None:
+            training_set.save(path)
+        return training_set
+
+    @staticmethod
+    def split(training_set: TrainingSet, train_fraction: float = 0.8):
+        """Chronological train/test split of X, direction and price model (return) targets"""
+        X = training_set.X
+        y_dir = training_set.targets[0]
+        y_ret = training_set.returns
+        split_idx = int(len(X) * train_fraction)
+        return (X[:split_idx], X[split_idx:], y_dir[:split_idx], y_dir[split_idx:],
+                y_ret[:split_idx], y_ret[split_idx:])
+
+    def fit(self, training_set: Optional[TrainingSet]) -> bool:
+        """Fit the predictor's scaler and models on an 80/20 split"""
+        predictor = self.predictor
+        if training_set is None or len(training_set) < self.MIN_SAMPLES:
+            logger.error("Insufficient data for training")
+            return False
+
+        # Split data (80/20)
+        X_train, X_test, y_dir_train, y_dir_test, y_ret_train, y_ret_test = \
+            self.split(training_set)
+
+        # Scale features
+        X_train_scaled = predictor.scaler.fit_transform(X_train)
+        X_test_scaled = predictor.scaler.transform(X_test)
+
+        # Train direction and price models
+        cores = resolve_cores(getattr(predictor, 'n_jobs', None))
+        if cores > 1:
+            # The forest builds trees on all but one core while the (inherently
+            # sequential) boosting model trains alongside; both release the GIL
+            predictor.direction_model.set_params(n_jobs=cores - 1)
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                fits = [pool.submit(predictor.direction_model.fit, X_train_scaled, y_dir_train),
+                        pool.submit(predictor.price_model.fit, X_train_scaled, y_ret_train)]
+                for fit in fits:
+                    fit.result()
+        else:
+            predictor.direction_model.fit(X_train_scaled, y_dir_train)
+            predictor.price_model.fit(X_train_scaled, y_ret_train)
+
+        dir_accuracy = predictor.direction_model.score(X_test_scaled, y_dir_test)
+        logger.info(f"Direction model accuracy: {dir_accuracy:.3f}")
+        predicted_returns = predictor.price_model.predict(X_test_scaled)
+        price_r2 = predictor.price_model.score(X_test_scaled, y_ret_test)
+        # Price error as a fraction of the close, comparable across symbols
+        price_mae = float(np.mean(np.abs(predicted_returns - y_ret_test)))
+        logger.info(f"Price model R² (returns): {price_r2:.3f}, error: {price_mae:.5f}")
+
+        # Store feature importance
+        predictor.feature_importance = dict(zip(
+            training_set.feature_names,
+            predictor.direction_model.feature_importances_
+        ))
+        predictor.feature_names = training_set.feature_names
+        predictor.training_metrics = {
+            'direction_accuracy': float(dir_accuracy),
+            'price_r2': float(price_r2),
+            'price_mae': price_mae,
+            'samples': len(training_set)
+        }
+        # Prediction runs on the flattened models (replacing any loaded artifact)
+        predictor.compiled_models = CompiledModels.from_predictor(
+            predictor, dict(predictor.training_metrics, price_target=PRICE_TARGET))
+        return True
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Flat Tree Ensembles
+Tree ensembles stored as contiguous node arrays, evaluated with NumPy
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+ARRAY_FIELDS = ('left', 'right', 'feature', 'threshold', 'value', 'roots')
+
+
+class FlatTreeEnsemble:
+    """
+    All trees of an ensemble in one set of node arrays
+
+    Child indices are global, and leaves point to themselves, so every sample
+    walks every tree in lock step for `depth` iterations with no branching.
+    The raw score is base + scale * sum of the reached leaf values, which
+    covers averaged forests (scale = 1 / trees) and gradient boosting
+    (scale = learning_rate, base = initial estimate). Multiclass boosting
+    trees write their leaf value into their own class column.
+
+    Args:
+        kind: 'classifier' or 'regressor'
+        link: maps raw scores to class probabilities - 'identity' (forest
+            leaves already hold class fractions), 'logistic' (binary
+            boosting) or 'softmax' (multiclass boosting)
+    """
+
+    def __init__(self, kind: str, left: np.ndarray, right: np.ndarray,
+                 feature: np.ndarray, threshold: np.ndarray, value: np.ndarray,
+                 roots: np.ndarray, depth: int, n_features: int, scale: float,
+                 base: Sequence[float] = (0.0,), classes: Optional[Sequence] = None,
+                 link: str = 'identity'):
+        self.kind = kind
+        self.link = link
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.depth = int(depth)
+        self.n_features = int(n_features)
+        self.scale = float(scale)
+        self.base = np.asarray(base, dtype=np.float64)
+        self.classes_ = np.asarray(classes) if classes is not None else None
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_sklearn(cls, estimator) -> 'FlatTreeEnsemble':
+        """Flatten a fitted random forest or gradient boosting model"""
+        name = type(estimator).__name__
+        if name in ('RandomForestClassifier', 'ExtraTreesClassifier'):
+            trees = [tree.tree_ for tree in estimator.estimators_]
+            return cls._flatten(trees, 'classifier', 1.0 / len(trees),
+                                classes=estimator.classes_)
+        if name in ('RandomForestRegressor', 'ExtraTreesRegressor'):
+            trees = [tree.tree_ for tree in estimator.estimators_]
+            return cls._flatten(trees, 'regressor', 1.0 / len(trees))
+        if name == 'GradientBoostingRegressor':
+            trees = [stage[0].tree_ for stage in estimator.estimators_]
+            base = np.ravel(estimator._raw_predict_init(np.zeros((1, estimator.n_features_in_))))
+            return cls._flatten(trees, 'regressor', estimator.learning_rate, base=base)
+        if name == 'GradientBoostingClassifier':
+            stages, outputs = estimator.estimators_.shape
+            trees = [estimator.estimators_[i, k].tree_ for i in range(stages) for k in range(outputs)]
+            columns = [k for _ in range(stages) for k in range(outputs)]
+            base = np.ravel(estimator._raw_predict_init(np.zeros((1, estimator.n_features_in_))))
+            return cls._flatten(trees, 'classifier', estimator.learning_rate, base=base,
+                                classes=estimator.classes_, columns=columns, outputs=outputs,
+                                link='logistic' if outputs == 1 else 'softmax')
+        raise TypeError(f"Cannot flatten {name}")
+
+    @classmethod
+    def _flatten(cls, trees, kind, scale, base=(0.0,), classes=None,
+                 columns=None, outputs=1, link='identity'):
+        sizes = [tree.node_count for tree in trees]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int32)
+        total = int(sum(sizes))
+
+        left = np.empty(total, dtype=np.int32)
+        right = np.empty(total, dtype=np.int32)
+        feature = np.zeros(total, dtype=np.int32)
+        threshold = np.zeros(total, dtype=np.float64)
+        leaf_fractions = link == 'identity' and kind == 'classifier'
+        width = trees[0].value.shape[2] if leaf_fractions else outputs
+        value = np.zeros((total, width), dtype=np.float64)
+
+        for i, (tree, offset) in enumerate(zip(trees, offsets)):
+            nodes = np.arange(tree.node_count, dtype=np.int32) + offset
+            is_leaf = tree.children_left == -1
+            left[nodes] = np.where(is_leaf, nodes, tree.children_left + offset)
+            right[nodes] = np.where(is_leaf, nodes, tree.children_right + offset)
+            feature[nodes] = np.where(is_leaf, 0, tree.feature)
+            threshold[nodes] = np.where(is_leaf, 0.0, tree.threshold)
+            if leaf_fractions:
+                # Leaf class fractions, as DecisionTreeClassifier.predict_proba reports
+                counts = tree.value[:, 0, :]
+                total_count = counts.sum(axis=1, keepdims=True)
+                total_count[total_count == 0] = 1.0
+                value[nodes] = counts / total_count
+            else:
+                value[nodes, columns[i] if columns else 0] = tree.value[:, 0, 0]
+
+        return cls(kind, left, right, feature, threshold, value, offsets,
+                   depth=max(tree.max_depth for tree in trees),
+                   n_features=trees[0].n_features, scale=scale, base=base,
+                   classes=classes, link=link)
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Node arrays by name, for saving"""
+        return {name: getattr(self, name) for name in ARRAY_FIELDS}
+
+    def attributes(self) -> dict:
+        """JSON-serializable scalars needed to rebuild the ensemble"""
+        return {
+            'kind': self.kind,
+            'depth': self.depth,
+            'n_features': self.n_features,
+            'scale': self.scale,
+            'base': self.base.tolist(),
+            'classes': self.classes_.tolist() if self.classes_ is not None else None,
+            'link': self.link
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], attributes: dict) -> 'FlatTreeEnsemble':
+        """Rebuild from arrays() and attributes(); arrays may be memory-mapped"""
+        return cls(attributes['kind'], *(arrays[name] for name in ARRAY_FIELDS),
+                   depth=attributes['depth'], n_features=attributes['n_features'],
+                   scale=attributes['scale'], base=attributes['base'],
+                   classes=attributes['classes'], link=attributes.get('link', 'identity'))
+
+    # ------------------------------------------------------------------
+    # Inference
+    # ------------------------------------------------------------------
+
+    def apply(self, X) -> np.ndarray:
+        """Leaf reached in every tree, shape (samples, trees)"""
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1 or len(X) == 1:
+            # Single row: plain 1-D gathers, no row broadcasting
+            x = X.reshape(-1)
+            node = self.roots
+            for _ in range(self.depth):
+                node = np.where(x[self.feature[node]] <= self.threshold[node],
+                                self.left[node], self.right[node])
+            return node.reshape(1, -1)
+
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        rows = np.arange(len(X))[:, None]
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def decision(self, X) -> np.ndarray:
+        """base + scale * summed leaf values, shape (samples, outputs)"""
+        leaves = self.apply(X)
+        return self.base + self.scale * self.value[leaves].sum(axis=1)
+
+    def predict_with_proba(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """Class labels and class probabilities from a single traversal"""
+        proba = self.predict_proba(X)
+        return self.classes_[np.argmax(proba, axis=1)], proba
+
+    def predict_proba(self, X) -> np.ndarray:
+        if self.kind != 'classifier':
+            raise AttributeError("predict_proba needs a classifier ensemble")
+        raw = self.decision(X)
+        if self.link == 'logistic':
+            positive = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        if self.link == 'softmax':
+            shifted = np.exp(raw - raw.max(axis=1, keepdims=True))
+            return shifted / shifted.sum(axis=1, keepdims=True)
+        return raw
+
+    def predict(self, X) -> np.ndarray:
+        if self.kind == 'classifier':
+            return self.predict_with_proba(X)[0]
+        return self.decision(X)[:, 0]